@@ -0,0 +1,167 @@
+"""
+Benchmark for the per-branch add-on inventory.
+
+1. Reserving and releasing add-ons for 100,000 reservations over two years with segment-tree
+   day counters, compared to a counter list per add-on which is scanned and updated day by day.
+2. Availability checks of 1 to 365 day windows with both approaches.
+3. Creating 2,000 reservations with two stocked add-ons through Customer.create_reservation.
+
+Run with: python -m benchmarks.bench_add_on_inventory
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.branch.add_on_inventory import AddOnInventory
+from src.reservation.add_on import AddOn
+
+ADD_ONS = 20
+STOCK = 5_000
+DAYS = 730
+RESERVATIONS = 100_000
+WINDOWS = (1, 7, 30, 365)
+CHECKS = 20_000
+CREATED = 2_000
+
+
+class DayCounters:
+    """Baseline keeping one reserved counter per add-on and day"""
+
+    def __init__(self, first_day):
+        self.origin = first_day.toordinal()
+        self.stock = {}
+        self.days = {}
+
+    def set_stock(self, add_on_id, quantity):
+        self.stock[add_on_id] = quantity
+        self.days[add_on_id] = [0] * DAYS
+
+    def reserved(self, add_on_id, pickup_date, return_date):
+        first = pickup_date.toordinal() - self.origin
+        stop = max(return_date.toordinal() - self.origin, first + 1)
+        return max(self.days[add_on_id][first:stop])
+
+    def reserve(self, add_on_id, pickup_date, return_date):
+        if self.reserved(add_on_id, pickup_date, return_date) >= self.stock[add_on_id]:
+            raise ValueError(add_on_id)
+        first = pickup_date.toordinal() - self.origin
+        stop = max(return_date.toordinal() - self.origin, first + 1)
+        days = self.days[add_on_id]
+        for day in range(first, stop):
+            days[day] += 1
+
+    def release(self, add_on_id, pickup_date, return_date):
+        first = pickup_date.toordinal() - self.origin
+        stop = max(return_date.toordinal() - self.origin, first + 1)
+        days = self.days[add_on_id]
+        for day in range(first, stop):
+            days[day] -= 1
+
+
+def create_requests(start):
+    """Returns (reservation id, add-on id, pickup date, return date) of random rentals"""
+    rng = random.Random(42)
+    requests = []
+    for index in range(RESERVATIONS):
+        pickup = start + timedelta(days=rng.randrange(DAYS - 30))
+        length = rng.choice((1, 2, 3, 7, 14, 28))
+        requests.append(
+            (
+                f"reservation-{index}",
+                f"add-on-{rng.randrange(ADD_ONS)}",
+                pickup,
+                pickup + timedelta(days=length),
+            )
+        )
+    return requests
+
+
+if __name__ == "__main__":
+    start = date.today() + timedelta(days=1)
+    requests = create_requests(start)
+
+    common.print_header(f"Reserving and releasing {RESERVATIONS:,} add-ons")
+    inventory = AddOnInventory()
+    baseline = DayCounters(date.today())
+    for index in range(ADD_ONS):
+        inventory.set_stock(f"add-on-{index}", STOCK)
+        baseline.set_stock(f"add-on-{index}", STOCK)
+    for name, reserve, release in (
+        (
+            "segment tree",
+            lambda request: inventory.reserve(*request),
+            lambda request: inventory.release(request[0], request[1]),
+        ),
+        (
+            "day counters",
+            lambda request: baseline.reserve(*request[1:]),
+            lambda request: baseline.release(*request[1:]),
+        ),
+    ):
+        elapsed, _ = common.timed(lambda: [reserve(request) for request in requests])
+        print(f"{name} reserve: {elapsed / RESERVATIONS * 1e6:.1f} us")
+        elapsed, _ = common.timed(
+            lambda: [release(request) for request in requests[::2]]
+        )
+        print(f"{name} release: {elapsed / (RESERVATIONS // 2) * 1e6:.1f} us")
+
+    common.print_header(f"{CHECKS:,} availability checks")
+    rng = random.Random(1)
+    for days in WINDOWS:
+        windows = []
+        for _ in range(CHECKS):
+            pickup = start + timedelta(days=rng.randrange(DAYS - days))
+            windows.append(
+                (
+                    f"add-on-{rng.randrange(ADD_ONS)}",
+                    pickup,
+                    pickup + timedelta(days=days),
+                )
+            )
+        tree_elapsed, tree_counts = common.timed(
+            lambda: [inventory.reserved(*window) for window in windows]
+        )
+        scan_elapsed, scan_counts = common.timed(
+            lambda: [baseline.reserved(*window) for window in windows]
+        )
+        assert tree_counts == scan_counts
+        print(
+            f"{days:>3} days: segment tree {tree_elapsed / CHECKS * 1e6:.1f} us, "
+            f"day counters {scan_elapsed / CHECKS * 1e6:.1f} us"
+        )
+
+    common.print_header(f"Creating {CREATED:,} reservations with two add-ons")
+    branch = common.create_branch(0)
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    add_ons = [
+        AddOn(name="GPS", description="Navigation", price_per_day=5.0),
+        AddOn(name="Child seat", description="Child seat", price_per_day=7.0),
+    ]
+    customers = common.create_customers(CREATED)
+    fleet = common.create_fleet(CREATED, vehicle_class, branch)
+    pickup_date, return_date = common.rental_window()
+    for name, stock in (("unlimited", None), ("stocked", CREATED)):
+        for add_on in add_ons:
+            branch.add_on_inventory.set_stock(add_on.id, stock)
+        elapsed, reservations = common.timed(
+            lambda: [
+                customer.create_reservation(
+                    vehicle=vehicle,
+                    insurance_tier=insurance_tier,
+                    pickup_branch=branch,
+                    return_branch=branch,
+                    pickup_date=pickup_date,
+                    return_date=return_date,
+                    add_ons=add_ons,
+                )
+                for customer, vehicle in zip(customers, fleet)
+            ]
+        )
+        print(f"{name} add-ons: {elapsed / CREATED * 1e6:.1f} us per reservation")
+        for customer, reservation in zip(customers, reservations):
+            customer.cancel_reservation(reservation.id)
@@ -0,0 +1,116 @@
+"""
+Benchmark for the schema-driven binary codec.
+
+Encodes and decodes a graph of branches, vehicles, customers, reservations and invoices with the
+binary codec, pickle protocol 5 and JSON, and reports size and the best of three runs. JSON objects
+use ids for references like the binary codec, and decoding JSON stops at plain dicts.
+
+Run with: python -m benchmarks.bench_binary_codec
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import json
+import pickle
+import random
+from datetime import date, timedelta
+from enum import Enum
+
+from benchmarks import common
+from src.enums import ReservationStatus
+from src.reservation.add_on import AddOn
+from src.reservation.reservation import Reservation
+from src.serialization.binary_codec import decode_many, encode_many, schemas
+
+RESERVATIONS = 20_000
+REPEATS = 3
+
+
+def create_object_graph():
+    """Returns a list of every object of a reservation data set"""
+    random.seed(7)
+    branches = [common.create_branch(index) for index in range(10)]
+    vehicle_class = common.create_vehicle_class()
+    fleet = [
+        vehicle
+        for branch in branches
+        for vehicle in common.create_fleet(100, vehicle_class, branch)
+    ]
+    customers = common.create_customers(2_000)
+    insurance_tier = common.create_insurance_tier()
+    add_on = AddOn(name="GPS", description="Navigation", price_per_day=5.0)
+    reservations = []
+    for index in range(RESERVATIONS):
+        pickup_date = date.today() + timedelta(days=random.randrange(365))
+        reservations.append(
+            Reservation(
+                status=ReservationStatus.PENDING,
+                creator=customers[index % len(customers)],
+                vehicle=fleet[index % len(fleet)],
+                insurance_tier=insurance_tier,
+                pickup_branch=branches[index % len(branches)],
+                return_branch=branches[index % len(branches)],
+                pickup_date=pickup_date,
+                return_date=pickup_date + timedelta(days=3),
+                add_ons=[add_on] if index % 2 else None,
+            )
+        )
+    return (
+        branches
+        + [vehicle_class, insurance_tier, add_on]
+        + fleet
+        + customers
+        + reservations
+        + [reservation.invoice for reservation in reservations]
+    )
+
+
+def to_json_dict(obj) -> dict:
+    """Returns the schema fields of an object as a JSON-compatible dict"""
+    result = {"type": type(obj).__name__}
+    for field in schemas()[type(obj)].fields:
+        value = obj.__dict__[field.attribute]
+        name = field.attribute.split("__", 1)[1]
+        if field.kind == "ref":
+            value = value.id if value is not None else None
+        elif field.kind == "ref_list":
+            value = [item.id for item in value]
+        elif field.kind == "date":
+            value = value.isoformat()
+        elif field.kind == "strategy":
+            value = type(value.strategy).__name__
+        elif isinstance(value, Enum):
+            value = value.value
+        result[name] = value
+    return result
+
+
+if __name__ == "__main__":
+    objects = create_object_graph()
+    common.print_header(f"{len(objects):,} objects")
+    print(f"{'format':>8} {'size MB':>9} {'encode ms':>10} {'decode ms':>10}")
+
+    codecs = [
+        ("binary", lambda: encode_many(objects), decode_many),
+        ("pickle", lambda: pickle.dumps(objects, protocol=5), pickle.loads),
+        (
+            "json",
+            lambda: json.dumps([to_json_dict(obj) for obj in objects]).encode(),
+            json.loads,
+        ),
+    ]
+    for name, encoder, decoder in codecs:
+        encode_elapsed, data = min(
+            (common.timed(encoder) for _ in range(REPEATS)),
+            key=lambda result: result[0],
+        )
+        decode_elapsed, decoded = min(
+            (common.timed(lambda: decoder(data)) for _ in range(REPEATS)),
+            key=lambda result: result[0],
+        )
+        assert len(decoded) == len(objects)
+        print(
+            f"{name:>8} {len(data) / 1e6:>9.2f} "
+            f"{encode_elapsed * 1000:>10.0f} {decode_elapsed * 1000:>10.0f}"
+        )
@@ -0,0 +1,104 @@
+"""
+Benchmark for the nearest-branch alternative search.
+
+1. Indexing 5,000 branches with random coordinates in Europe.
+2. The 5 nearest branches to a coordinate with the KD-tree, compared to computing the haversine
+   distance of every branch and sorting.
+3. The 5 nearest branches with an available vehicle of a class while 50 %, 90 % and 99 % of the
+   branches are sold out, compared to filtering and sorting every branch.
+
+Run with: python -m benchmarks.bench_branch_locator
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+
+from benchmarks import common
+from src.enums import VehicleStatus
+from src.branch.branch_locator import BranchLocator, haversine_km
+
+BRANCHES = 5_000
+QUERIES = 2_000
+K = 5
+SOLD_OUT = (0.5, 0.9, 0.99)
+
+
+def scan_nearest(branches, latitude, longitude, k, has_vehicle=None):
+    """Returns the k nearest branches by computing the distance of every branch"""
+    distances = [
+        (haversine_km(latitude, longitude, b.latitude, b.longitude), index)
+        for index, b in enumerate(branches)
+        if has_vehicle is None or has_vehicle(b)
+    ]
+    distances.sort()
+    return [branches[index] for _, index in distances[:k]]
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    branches = []
+    for index in range(BRANCHES):
+        branch = common.create_branch(index)
+        branch.set_coordinates(rng.uniform(36, 70), rng.uniform(-10, 40))
+        branches.append(branch)
+    vehicle_class = common.create_vehicle_class()
+    fleet = [common.create_fleet(1, vehicle_class, branch)[0] for branch in branches]
+    queries = [(rng.uniform(36, 70), rng.uniform(-10, 40)) for _ in range(QUERIES)]
+    pickup_date, return_date = common.rental_window()
+
+    common.print_header(f"Indexing {BRANCHES:,} branches")
+    locator = BranchLocator(branches, fleet)
+    elapsed, _ = common.timed(lambda: len(locator))
+    print(f"KD-tree build: {elapsed * 1e3:.1f} ms")
+
+    common.print_header(f"{K} nearest branches, {QUERIES:,} queries")
+    elapsed, found = common.timed(
+        lambda: [
+            locator.nearest(latitude, longitude, K) for latitude, longitude in queries
+        ]
+    )
+    scan_elapsed, scanned = common.timed(
+        lambda: [
+            scan_nearest(branches, latitude, longitude, K)
+            for latitude, longitude in queries[:100]
+        ]
+    )
+    assert [[b for b, _ in result] for result in found[:100]] == scanned
+    print(
+        f"KD-tree: {elapsed / QUERIES * 1e6:.1f} us, "
+        f"scan and sort: {scan_elapsed / 100 * 1e6:,.0f} us"
+    )
+
+    for share in SOLD_OUT:
+        for vehicle in fleet:
+            vehicle.status = VehicleStatus.AVAILABLE
+        for vehicle in rng.sample(fleet, int(BRANCHES * share)):
+            vehicle.status = VehicleStatus.RESERVED
+        common.print_header(f"{K} nearest with availability, {share:.0%} sold out")
+        elapsed, found = common.timed(
+            lambda: [
+                locator.nearest_available(
+                    latitude, longitude, vehicle_class, pickup_date, return_date, K
+                )
+                for latitude, longitude in queries
+            ]
+        )
+        scan_elapsed, scanned = common.timed(
+            lambda: [
+                scan_nearest(
+                    branches,
+                    latitude,
+                    longitude,
+                    K,
+                    lambda b: locator.available_vehicles(b, vehicle_class) > 0,
+                )
+                for latitude, longitude in queries[:100]
+            ]
+        )
+        assert [[a.branch for a in result] for result in found[:100]] == scanned
+        print(
+            f"KD-tree: {elapsed / QUERIES * 1e6:.1f} us, "
+            f"filter, scan and sort: {scan_elapsed / 100 * 1e6:,.0f} us"
+        )
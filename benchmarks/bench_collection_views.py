@@ -0,0 +1,108 @@
+"""
+Benchmark for the read-only collection views.
+
+1. Bytes allocated by 100,000 getter calls of Reservation.add_ons, Vehicle.maintenance_records,
+   VehicleClass.features and ConcreteNotificationManager.subscribers, compared to the defensive
+   copies the getters used to return.
+2. Latency of the same getter calls.
+3. Latency of the duplicate check of Vehicle.add_maintenance_record with 1,000 records.
+
+Run with: python -m benchmarks.bench_collection_views
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import tracemalloc
+
+from benchmarks import common
+from src.notification.notification_manager import ConcreteNotificationManager
+from src.notification.subscribers import CustomerSubscriber
+from src.reservation.add_on import AddOn
+from src.vehicle.maintenance_record import MaintenanceRecord
+
+CALLS = 100_000
+RECORDS = 1_000
+
+
+def allocated(function) -> int:
+    """Returns the bytes allocated by function, including memory freed before it returns"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def keep_all(getter):
+    """Calls getter CALLS times and keeps every result, so copies are not freed in between"""
+    return lambda: [getter() for _ in range(CALLS)]
+
+
+if __name__ == "__main__":
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    for index in range(10):
+        vehicle_class.add_feature(f"Feature {index}")
+    (vehicle,) = common.create_fleet(1, vehicle_class, branch)
+    for _ in range(50):
+        vehicle.add_maintenance_record(MaintenanceRecord(vehicle))
+    (customer,) = common.create_customers(1)
+    pickup_date, return_date = common.rental_window()
+    add_ons = [
+        AddOn(name=f"Add-on {index}", description="Benchmark", price_per_day=1.0)
+        for index in range(5)
+    ]
+    reservation = customer.create_reservation(
+        vehicle=vehicle,
+        insurance_tier=common.create_insurance_tier(),
+        pickup_branch=branch,
+        return_branch=branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=add_ons,
+    )
+    manager = ConcreteNotificationManager()
+    for _ in range(20):
+        manager.attach(CustomerSubscriber())
+
+    getters = {
+        "Reservation.add_ons (5)": lambda: reservation.add_ons,
+        "Vehicle.maintenance_records (50)": lambda: vehicle.maintenance_records,
+        "VehicleClass.features (11)": lambda: vehicle_class.features,
+        "subscribers (20)": lambda: manager.subscribers,
+    }
+
+    common.print_header(f"Bytes allocated by {CALLS:,} getter calls")
+    for name, getter in getters.items():
+        copy_bytes = allocated(keep_all(lambda: list(getter())))
+        view_bytes = allocated(keep_all(getter))
+        print(
+            f"{name:<34} copy: {copy_bytes / 1e6:6.2f} MB, view: {view_bytes / 1e6:6.2f} MB"
+        )
+
+    common.print_header(f"Latency of {CALLS:,} getter calls")
+    for name, getter in getters.items():
+        copy_time, _ = common.timed(lambda: [list(getter()) for _ in range(CALLS)])
+        view_time, _ = common.timed(lambda: [getter() for _ in range(CALLS)])
+        print(
+            f"{name:<34} copy: {copy_time * 1e3:6.1f} ms, view: {view_time * 1e3:6.1f} ms"
+        )
+
+    common.print_header(
+        f"Duplicate checks of add_maintenance_record with {RECORDS:,} records"
+    )
+    (serviced,) = common.create_fleet(1, vehicle_class, branch)
+    records = [MaintenanceRecord(serviced) for _ in range(RECORDS)]
+    serviced.maintenance_records = records
+    copy_time, _ = common.timed(
+        lambda: [record in list(serviced.maintenance_records) for record in records]
+    )
+    view_time, _ = common.timed(
+        lambda: [record in serviced.maintenance_records for record in records]
+    )
+    print(
+        f"copy and search: {copy_time / RECORDS * 1e6:.1f} us, "
+        f"search the view: {view_time / RECORDS * 1e6:.1f} us per check"
+    )
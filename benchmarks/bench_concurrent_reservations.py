@@ -0,0 +1,120 @@
+"""
+Stress benchmark for thread-safe reservation creation.
+
+1. Scaling: every thread reserves its own set of vehicles, nothing conflicts.
+2. Contention: 32+ threads race for a small set of hot vehicles, every vehicle must be
+   reserved exactly once and all other attempts must fail with VehicleNotAvailableError.
+
+Run with: python -m benchmarks.bench_concurrent_reservations
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import threading
+
+from benchmarks import common
+from src.custom_errors import VehicleNotAvailableError
+
+RESERVATIONS_PER_THREAD = 500
+THREAD_COUNTS = [1, 2, 4, 8, 16, 32, 64]
+HOT_VEHICLES = 8
+CONTENTION_THREADS = 64
+
+
+def run_threads(count: int, target) -> float:
+    """Runs target(index) on count threads started together and returns elapsed seconds"""
+    barrier = threading.Barrier(count + 1)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+
+    def release_and_join() -> None:
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+
+    elapsed, _ = common.timed(release_and_join)
+    return elapsed
+
+
+def bench_scaling() -> None:
+    """Measures throughput of non-conflicting reservations at increasing thread counts"""
+    common.print_header("Non-conflicting reservations")
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    pickup_date, return_date = common.rental_window()
+
+    for thread_count in THREAD_COUNTS:
+        customers = common.create_customers(thread_count)
+        fleet = common.create_fleet(
+            thread_count * RESERVATIONS_PER_THREAD, vehicle_class, branch
+        )
+
+        def reserve(index: int) -> None:
+            customer = customers[index]
+            start = index * RESERVATIONS_PER_THREAD
+            for vehicle in fleet[start : start + RESERVATIONS_PER_THREAD]:
+                customer.create_reservation(
+                    vehicle=vehicle,
+                    insurance_tier=insurance_tier,
+                    pickup_branch=branch,
+                    return_branch=branch,
+                    pickup_date=pickup_date,
+                    return_date=return_date,
+                )
+
+        elapsed = run_threads(thread_count, reserve)
+        total = thread_count * RESERVATIONS_PER_THREAD
+        print(
+            f"threads={thread_count:>3} reservations={total:>6} rate={total / elapsed:>10,.0f}/s"
+        )
+
+
+def bench_contention() -> None:
+    """Races many threads for a few vehicles and checks there is no double booking"""
+    common.print_header(
+        f"{CONTENTION_THREADS} threads racing for {HOT_VEHICLES} vehicles"
+    )
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    pickup_date, return_date = common.rental_window()
+    customers = common.create_customers(CONTENTION_THREADS)
+    fleet = common.create_fleet(HOT_VEHICLES, vehicle_class, branch)
+    successes, failures = [], []
+
+    def reserve(index: int) -> None:
+        for vehicle in fleet:
+            try:
+                successes.append(
+                    customers[index].create_reservation(
+                        vehicle=vehicle,
+                        insurance_tier=insurance_tier,
+                        pickup_branch=branch,
+                        return_branch=branch,
+                        pickup_date=pickup_date,
+                        return_date=return_date,
+                    )
+                )
+            except VehicleNotAvailableError:
+                failures.append(vehicle)
+
+    elapsed = run_threads(CONTENTION_THREADS, reserve)
+    booked = {reservation.vehicle.id for reservation in successes}
+    print(
+        f"attempts={CONTENTION_THREADS * HOT_VEHICLES} succeeded={len(successes)} failed_fast={len(failures)} elapsed={elapsed * 1000:.2f}ms"
+    )
+    print(f"double bookings: {len(successes) - len(booked)}")
+    assert len(successes) == len(booked) == HOT_VEHICLES
+
+
+if __name__ == "__main__":
+    bench_scaling()
+    bench_contention()
@@ -0,0 +1,76 @@
+"""
+Benchmark for the indexed customer directory.
+
+1. Loading 1,000,000 customers with add_many and 10,000 customers one by one with add.
+2. Lookups by email, phone number and name prefix, compared to a linear scan of the customers.
+3. Email, phone number and name changes of indexed customers.
+
+Run with: python -m benchmarks.bench_customer_directory
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from benchmarks import common
+from src.users.customer_directory import CustomerDirectory
+
+CUSTOMERS = 1_000_000
+SINGLE_ADDS = 10_000
+LOOKUPS = 10_000
+SCANS = 10
+
+
+def linear_find_by_email(customers, email):
+    """Returns the customer with the email by scanning every customer"""
+    for customer in customers:
+        if customer.email == email:
+            return customer
+    return None
+
+
+if __name__ == "__main__":
+    common.print_header(f"Loading {CUSTOMERS:,} customers")
+    elapsed, customers = common.timed(lambda: common.create_customers(CUSTOMERS))
+    print(f"construction: {elapsed:.1f} s")
+    directory = CustomerDirectory()
+    elapsed, _ = common.timed(lambda: directory.add_many(customers[SINGLE_ADDS:]))
+    print(f"add_many: {elapsed:.1f} s, {elapsed / CUSTOMERS * 1e6:.1f} us per customer")
+    elapsed, _ = common.timed(
+        lambda: [directory.add(c) for c in customers[:SINGLE_ADDS]]
+    )
+    print(f"add: {elapsed / SINGLE_ADDS * 1e6:.1f} us per customer")
+
+    common.print_header(f"Lookups with {len(directory):,} customers")
+    step = CUSTOMERS // LOOKUPS
+    sample = customers[::step]
+    emails = [c.email.upper() for c in sample]
+    phone_numbers = [c.phone_number for c in sample]
+    names = [f"customer {c.last_name[:-1]}" for c in sample]
+    elapsed, _ = common.timed(lambda: [directory.find_by_email(e) for e in emails])
+    print(f"find_by_email: {elapsed / LOOKUPS * 1e6:.2f} us")
+    elapsed, _ = common.timed(
+        lambda: [directory.find_by_phone_number(p) for p in phone_numbers]
+    )
+    print(f"find_by_phone_number: {elapsed / LOOKUPS * 1e6:.2f} us")
+    elapsed, _ = common.timed(lambda: [directory.search_by_name(n) for n in names])
+    print(f"search_by_name (up to 20 results): {elapsed / LOOKUPS * 1e6:.2f} us")
+    scan_emails = [c.email for c in sample[-SCANS:]]
+    elapsed, _ = common.timed(
+        lambda: [linear_find_by_email(customers, e) for e in scan_emails]
+    )
+    print(f"linear scan by email: {elapsed / SCANS * 1e6:,.0f} us")
+
+    common.print_header("Setter updates of indexed customers")
+    updated = sample[:LOOKUPS]
+    elapsed, _ = common.timed(
+        lambda: [setattr(c, "email", f"new.{c.email}") for c in updated]
+    )
+    print(f"email: {elapsed / LOOKUPS * 1e6:.2f} us")
+    elapsed, _ = common.timed(
+        lambda: [setattr(c, "phone_number", "+44" + c.phone_number) for c in updated]
+    )
+    print(f"phone_number: {elapsed / LOOKUPS * 1e6:.2f} us")
+    elapsed, _ = common.timed(
+        lambda: [setattr(c, "first_name", "Client") for c in updated]
+    )
+    print(f"first_name: {elapsed / LOOKUPS * 1e6:.2f} us")
@@ -0,0 +1,137 @@
+"""
+Benchmark for the reverse dependency index of reservations.
+
+1. Indexing 100,000 open reservations.
+2. Finding the reservations of a vehicle, an add-on and an insurance tier from the index, compared
+   to scanning the reservations of every customer.
+3. Repricing after an add-on price change, the dependents from the index compared to repricing
+   every open reservation.
+
+Run with: python -m benchmarks.bench_dependency_index
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import ReservationStatus
+from src.reservation.add_on import AddOn
+from src.reservation.dependency_index import ReservationDependencyIndex
+from src.reservation.insurance_tier import InsuranceTier
+from src.reservation.repricing_job import RepricingJob
+from src.reservation.reservation import Reservation
+
+BRANCHES = 20
+VEHICLES_PER_BRANCH = 100
+CUSTOMERS = 10_000
+RESERVATIONS = 100_000
+ADD_ONS = 50
+INSURANCE_TIERS = 5
+LOOKUPS = 100
+
+
+def create_reservations(customers, fleet, insurance_tiers, add_ons):
+    """Creates open reservations over the next year, each customer keeps its reservations"""
+    random.seed(7)
+    today = date.today()
+    reservations = []
+    for index in range(RESERVATIONS):
+        customer = customers[index % len(customers)]
+        vehicle = random.choice(fleet)
+        pickup_date = today + timedelta(days=random.randrange(365))
+        reservation = Reservation(
+            status=ReservationStatus.PENDING,
+            creator=customer,
+            vehicle=vehicle,
+            insurance_tier=random.choice(insurance_tiers),
+            pickup_branch=vehicle.current_branch,
+            return_branch=vehicle.current_branch,
+            pickup_date=pickup_date,
+            return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+            add_ons=random.sample(add_ons, random.randint(0, 2)),
+        )
+        customer.reservations.append(reservation)
+        reservations.append(reservation)
+    return reservations
+
+
+def scan_customers(customers, matches):
+    """Returns the reservations of every customer which match"""
+    return [
+        reservation
+        for customer in customers
+        for reservation in customer.reservations
+        if matches(reservation)
+    ]
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_class = common.create_vehicle_class()
+    fleet = [
+        vehicle
+        for branch in branches
+        for vehicle in common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch)
+    ]
+    customers = common.create_customers(CUSTOMERS)
+    insurance_tiers = [
+        InsuranceTier(f"Tier {index}", "Benchmark", 5.0 + index)
+        for index in range(INSURANCE_TIERS)
+    ]
+    add_ons = [AddOn(f"Add-on {index}", "Benchmark", 2.0) for index in range(ADD_ONS)]
+    reservations = create_reservations(customers, fleet, insurance_tiers, add_ons)
+
+    common.print_header(f"Indexing {RESERVATIONS:,} reservations")
+    index = ReservationDependencyIndex()
+    elapsed, _ = common.timed(lambda: index.track_many(reservations))
+    print(f"track_many: {elapsed:.2f} s")
+
+    common.print_header(f"Finding dependents, average of {LOOKUPS} lookups")
+    # Objects to look up and how a scan matches their reservations
+    targets = {
+        "vehicle": (
+            random.sample(fleet, LOOKUPS),
+            lambda target, reservation: reservation.vehicle is target,
+        ),
+        "add-on": (
+            [random.choice(add_ons) for _ in range(LOOKUPS)],
+            lambda target, reservation: target in reservation.add_ons,
+        ),
+        "insurance tier": (
+            [random.choice(insurance_tiers) for _ in range(LOOKUPS)],
+            lambda target, reservation: reservation.insurance_tier is target,
+        ),
+    }
+    for name, (objects, matches) in targets.items():
+        scan_time, _ = common.timed(
+            lambda: [
+                scan_customers(customers, lambda r: matches(target, r))
+                for target in objects
+            ]
+        )
+        index_time, _ = common.timed(
+            lambda: [index.reservations_of(target) for target in objects]
+        )
+        print(
+            f"{name:<15} scan: {scan_time / LOOKUPS * 1e3:8.2f} ms, "
+            f"index: {index_time / LOOKUPS * 1e3:8.3f} ms"
+        )
+
+    common.print_header("Repricing after an add-on price change")
+    add_on = add_ons[0]
+    setter_time, _ = common.timed(lambda: setattr(add_on, "price_per_day", 3.0))
+    report = index.last_report
+    job = RepricingJob(workers=0)
+    index_time, _ = common.timed(lambda: index.reprice(add_on, dry_run=True))
+    full_time, full_report = common.timed(lambda: job.run(reservations, dry_run=True))
+    print(
+        f"dependents: {index_time * 1e3:.1f} ms, all open reservations: "
+        f"{full_time * 1e3:.1f} ms"
+    )
+    print(
+        f"setter repricing {report.applied:,} dependents: {setter_time * 1e3:.1f} ms, "
+        f"{len(full_report.diffs):,} reservations left to reprice"
+    )
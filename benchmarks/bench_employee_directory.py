@@ -0,0 +1,92 @@
+"""
+Benchmark for the indexed employee directory of a branch.
+
+1. Loading 5,000 to 50,000 employees into one branch, the time per employee stays flat.
+2. The same loads into a list with a duplicate scan per insert, as before the directory.
+3. Membership checks and active agent lookups with 50,000 employees.
+
+Run with: python -m benchmarks.bench_employee_directory
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+
+from benchmarks import common
+from src.enums import EmploymentType, Gender
+from src.users.agent import Agent
+from src.users.manager import Manager
+
+SIZES = (5_000, 10_000, 25_000, 50_000)
+LIST_SIZES = (2_500, 5_000, 10_000)
+LOOKUPS = 10_000
+EMPLOYMENT_TYPES = list(EmploymentType)
+
+
+def create_employees(branch, count):
+    """Creates count employees of the branch, every tenth is a manager"""
+    return [
+        (Manager if index % 10 == 0 else Agent)(
+            first_name="Employee",
+            last_name=str(index),
+            gender=Gender.FEMALE,
+            birth_date=date(1990, 1, 1),
+            email=f"employee{index}@bench.com",
+            address="Kadiköy",
+            phone_number="+905343940796",
+            branch=branch,
+            is_active=index % 7 != 0,
+            salary=20_000.0,
+            hire_date=date(2015, 1, 1),
+            employment_type=EMPLOYMENT_TYPES[index % len(EMPLOYMENT_TYPES)],
+        )
+        for index in range(count)
+    ]
+
+
+def list_load(employees):
+    """Adds employees to a list after scanning it for duplicates"""
+    loaded = []
+    for employee in employees:
+        if any(other.id == employee.id for other in loaded):
+            raise ValueError("Employee is already working in the branch.")
+        loaded.append(employee)
+    return loaded
+
+
+if __name__ == "__main__":
+    common.print_header("Loading employees into one branch")
+    employees = []
+    for size in SIZES:
+        branch = common.create_branch(size)
+        elapsed, employees = common.timed(lambda: create_employees(branch, size))
+        print(
+            f"{size:,} employees: {elapsed:.2f} s, "
+            f"{elapsed / size * 1e6:.1f} us per employee (including construction)"
+        )
+
+    common.print_header("Duplicate scan per insert into a list")
+    for size in LIST_SIZES:
+        elapsed, _ = common.timed(lambda: list_load(employees[:size]))
+        print(
+            f"{size:,} employees: {elapsed:.2f} s, {elapsed / size * 1e6:.1f} us per employee"
+        )
+
+    common.print_header(f"Lookups with {len(employees):,} employees")
+    ids = [employee.id for employee in employees[-LOOKUPS:]]
+    elapsed, _ = common.timed(lambda: [branch.has_employee(i) for i in ids])
+    print(f"has_employee: {elapsed / LOOKUPS * 1e9:.0f} ns")
+    elapsed, scanned = common.timed(
+        lambda: [e for e in branch.employees if isinstance(e, Agent) and e.is_active]
+    )
+    print(f"active agents by scanning all employees: {elapsed * 1000:.1f} ms")
+    elapsed, indexed = common.timed(
+        lambda: [e for e in branch.get_employees_by_role("agent") if e.is_active]
+    )
+    assert indexed == scanned
+    print(f"active agents from the role index: {elapsed * 1000:.1f} ms")
+    elapsed, inactive = common.timed(lambda: branch.get_employees_by_status(False))
+    print(
+        f"inactive employees view: {elapsed * 1e6:.1f} us for {len(inactive):,} employees"
+    )
@@ -0,0 +1,84 @@
+"""
+Benchmark for the shared-memory fleet status table.
+
+1. Availability scan over Vehicle objects compared to a zero-copy scan of the table.
+2. Reader processes scanning the table while the writer keeps applying vehicle changes.
+
+Run with: python -m benchmarks.bench_fleet_table
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import multiprocessing
+import random
+
+from benchmarks import common
+from src.enums import VehicleStatus
+from src.vehicle.fleet_table import FleetTableReader, FleetTableWriter
+
+FLEET_SIZE = 100_000
+SCANS = 20
+READERS = 4
+WRITES = 50_000
+
+
+def reader_process(name: str, capacity: int, scans: int, queue) -> None:
+    """Runs availability and health scans in a reader process"""
+    with FleetTableReader(name, capacity) as reader:
+        elapsed, _ = common.timed(
+            lambda: [
+                (reader.available_vehicles(), reader.fleet_health())
+                for _ in range(scans)
+            ]
+        )
+    queue.put(elapsed / scans)
+
+
+if __name__ == "__main__":
+    branch = common.create_branch()
+    fleet = common.create_fleet(FLEET_SIZE, common.create_vehicle_class(), branch)
+    for vehicle in fleet[::3]:
+        vehicle.reserve()
+
+    with FleetTableWriter(capacity=FLEET_SIZE) as writer:
+        elapsed, _ = common.timed(lambda: writer.register_many(fleet))
+        common.print_header(f"Fleet of {FLEET_SIZE:,} vehicles")
+        print(f"register: {elapsed:.2f}s")
+
+        available = VehicleStatus.AVAILABLE.value
+        objects, _ = common.timed(
+            lambda: [[v for v in fleet if v.status == available] for _ in range(SCANS)]
+        )
+        with FleetTableReader(writer.name, writer.capacity) as reader:
+            table, _ = common.timed(
+                lambda: [reader.available_vehicles() for _ in range(SCANS)]
+            )
+        print(f"availability scan over objects: {objects / SCANS * 1000:>8.2f}ms")
+        print(f"availability scan over table:   {table / SCANS * 1000:>8.2f}ms")
+
+        common.print_header(f"{READERS} reader processes while writing")
+        queue = multiprocessing.Queue()
+        readers = [
+            multiprocessing.Process(
+                target=reader_process, args=(writer.name, writer.capacity, SCANS, queue)
+            )
+            for _ in range(READERS)
+        ]
+        for process in readers:
+            process.start()
+
+        def write() -> None:
+            for _ in range(WRITES):
+                vehicle = random.choice(fleet)
+                vehicle.odometer = vehicle.odometer + 10
+
+        elapsed, _ = common.timed(write)
+        for process in readers:
+            process.join()
+
+        scan_times = [queue.get() for _ in readers]
+        print(f"writer: {WRITES / elapsed:>10,.0f} updates/s")
+        print(
+            f"reader scan (availability + health): {max(scan_times) * 1000:.2f}ms worst"
+        )
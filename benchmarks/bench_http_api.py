@@ -0,0 +1,140 @@
+"""
+Load generator for the asyncio HTTP API.
+
+Starts the demo server in a separate process and drives POST /quotes requests over
+keep-alive connections at increasing concurrency, with and without pipelining.
+Reports requests per second and p50/p95/p99 latency for each level.
+
+Run with: python -m benchmarks.bench_http_api
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import json
+import time
+import asyncio
+import multiprocessing
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.api.http_server import HttpServer, RentalApi, create_demo_service
+
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+PIPELINE_DEPTHS = [1, 8]
+REQUESTS_PER_LEVEL = 4_000
+FLEET_SIZE = 200
+
+
+def server_process(port_queue) -> None:
+    """Runs the demo server and reports its port through the queue"""
+
+    async def serve():
+        service = create_demo_service(FLEET_SIZE)
+        server = HttpServer(RentalApi(service).handle, port=0)
+        await server.start()
+        port_queue.put((server.port, service.summary()))
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def build_quote_request(summary: dict) -> bytes:
+    """Returns a raw keep-alive POST /quotes request"""
+    pickup_date = date.today() + timedelta(days=1)
+    body = json.dumps(
+        {
+            "customer_id": summary["customers"][0],
+            "vehicle_id": summary["vehicles"][0],
+            "insurance_tier_id": summary["insurance_tiers"][0],
+            "pickup_date": pickup_date.isoformat(),
+            "return_date": (pickup_date + timedelta(days=3)).isoformat(),
+            "add_on_ids": summary["add_ons"][:1],
+        }
+    ).encode()
+    return (
+        f"POST /quotes HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def read_response(reader) -> int:
+    """Reads one response and returns its status code"""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port: int, request: bytes, count: int, depth: int, latencies: list):
+    """Sends count requests on one connection in pipelined bursts of depth requests"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    sent = 0
+    while sent < count:
+        burst = min(depth, count - sent)
+        started = time.perf_counter()
+        writer.write(request * burst)
+        await writer.drain()
+        for _ in range(burst):
+            if await read_response(reader) != 200:
+                raise RuntimeError("Unexpected response status")
+            latencies.append(time.perf_counter() - started)
+        sent += burst
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_level(port: int, request: bytes, concurrency: int, depth: int):
+    """Runs one load level and returns (requests per second, latencies)"""
+    latencies = []
+    per_client = REQUESTS_PER_LEVEL // concurrency
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(port, request, per_client, depth, latencies)
+            for _ in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, sorted(latencies)
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    """Returns a percentile of sorted latencies in milliseconds"""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+
+if __name__ == "__main__":
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=server_process, args=(port_queue,))
+    server.start()
+    port, summary = port_queue.get()
+    request = build_quote_request(summary)
+
+    common.print_header(
+        f"POST /quotes, {REQUESTS_PER_LEVEL:,} requests per level, "
+        f"{FLEET_SIZE} vehicles"
+    )
+    print(
+        f"{'connections':>12} {'pipeline':>9} {'req/s':>10} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    try:
+        for depth in PIPELINE_DEPTHS:
+            for concurrency in CONCURRENCY_LEVELS:
+                rps, latencies = asyncio.run(
+                    run_level(port, request, concurrency, depth)
+                )
+                print(
+                    f"{concurrency:>12} {depth:>9} {rps:>10,.0f} "
+                    f"{percentile(latencies, 0.50):>8.2f} "
+                    f"{percentile(latencies, 0.95):>8.2f} "
+                    f"{percentile(latencies, 0.99):>8.2f}"
+                )
+    finally:
+        server.terminate()
+        server.join()
@@ -0,0 +1,149 @@
+"""
+Benchmark for the overhead of the low-overhead instrumentation.
+
+1. PricingStrategy.calculate_price without the decorator, with its subsystem off and on.
+2. The reservation flow (create, approve, pay) with all subsystems off and on.
+3. Cost of exporting the collected metrics in the Prometheus text format.
+
+Run with: python -m benchmarks.bench_instrumentation
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import io
+import contextlib
+from datetime import date
+
+from benchmarks import common
+from src.enums import EmploymentType, Gender
+from src.instrumentation import metrics
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.users.agent import Agent
+
+PRICE_CALLS = 100_000
+RESERVATIONS = 5_000
+REPEATS = 5
+
+
+def best_of(function) -> float:
+    """Returns the fastest of REPEATS runs in seconds"""
+    return min(common.timed(function)[0] for _ in range(REPEATS))
+
+
+def create_agent(branch) -> Agent:
+    """Creates an active benchmark agent"""
+    return Agent(
+        first_name="Agent",
+        last_name="Bench",
+        gender=Gender.MALE,
+        birth_date=date(1990, 1, 1),
+        email="agent@bench.com",
+        address="Beşiktaş",
+        phone_number="+905343940796",
+        branch=branch,
+        is_active=True,
+        salary=1_000.0,
+        hire_date=date(2020, 1, 1),
+        employment_type=EmploymentType.FULL_TIME,
+    )
+
+
+def reservation_flow(customers, fleet, insurance_tier, branch, agent, window):
+    """Creates, approves and pays one reservation per customer"""
+
+    def run():
+        for index, customer in enumerate(customers):
+            reservation = customer.create_reservation(
+                vehicle=fleet[index],
+                insurance_tier=insurance_tier,
+                pickup_branch=branch,
+                return_branch=branch,
+                pickup_date=window[0],
+                return_date=window[1],
+            )
+            agent.approve_reservation(reservation)
+            customer.make_creditcard_payment(
+                reservation, "1234 1234 1234 1234", "123", "12/30"
+            )
+
+    return run
+
+
+if __name__ == "__main__":
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    vehicle = common.create_fleet(1, vehicle_class, branch)[0]
+    window = common.rental_window()
+    pricing = PricingStrategy(common.create_customers(1)[0])
+    raw_calculate_price = PricingStrategy.calculate_price.__wrapped__
+
+    common.print_header(f"calculate_price, {PRICE_CALLS:,} calls, best of {REPEATS}")
+    variants = {
+        "undecorated": (
+            lambda: raw_calculate_price(pricing, vehicle, insurance_tier, *window),
+            False,
+        ),
+        "subsystem off": (
+            lambda: pricing.calculate_price(vehicle, insurance_tier, *window),
+            False,
+        ),
+        "subsystem on": (
+            lambda: pricing.calculate_price(vehicle, insurance_tier, *window),
+            True,
+        ),
+    }
+    # Variants are interleaved, so a noisy neighbour slows all of them alike
+    results = dict.fromkeys(variants, float("inf"))
+    for _ in range(REPEATS):
+        for name, (call, enabled) in variants.items():
+            if enabled:
+                metrics.enable("pricing")
+            elapsed, _ = common.timed(lambda: [call() for _ in range(PRICE_CALLS)])
+            results[name] = min(results[name], elapsed)
+            metrics.disable()
+    baseline = results["undecorated"]
+    for name, elapsed in results.items():
+        overhead = (elapsed - baseline) / PRICE_CALLS * 1e9
+        print(
+            f"{name}: {elapsed / PRICE_CALLS * 1e9:.0f} ns per call, "
+            f"overhead {overhead:+.0f} ns ({elapsed / baseline - 1:+.1%})"
+        )
+    metrics.reset()
+
+    common.print_header(f"Reservation flow, {RESERVATIONS:,} reservations")
+    agent = create_agent(branch)
+    flow_times = {"all off": float("inf"), "all on": float("inf")}
+    for _ in range(REPEATS):
+        for name in flow_times:
+            if name == "all on":
+                metrics.enable()
+            customers = common.create_customers(RESERVATIONS)
+            fleet = common.create_fleet(RESERVATIONS, vehicle_class, branch)
+            # Payment products print every step, which would dominate the timing
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed, _ = common.timed(
+                    reservation_flow(
+                        customers, fleet, insurance_tier, branch, agent, window
+                    )
+                )
+            flow_times[name] = min(flow_times[name], elapsed)
+            metrics.disable()
+    for name, elapsed in flow_times.items():
+        print(f"{name}: {elapsed / RESERVATIONS * 1e6:.1f} us per reservation")
+    print(
+        f"overhead with all subsystems on: {flow_times['all on'] / flow_times['all off'] - 1:+.1%}"
+    )
+
+    for subsystem, operations in metrics.latency_report().items():
+        for operation, stats in operations.items():
+            print(
+                f"{subsystem}.{operation}: {stats['count']:,} calls, "
+                f"p50 {stats['p50_us']:.1f} us, p99 {stats['p99_us']:.1f} us"
+            )
+
+    common.print_header("Prometheus export")
+    elapsed, text = common.timed(metrics.export_prometheus)
+    print(f"{len(text.splitlines())} lines in {elapsed * 1000:.2f} ms")
+    metrics.disable()
@@ -0,0 +1,85 @@
+"""
+Benchmark for the streaming invoice exporter.
+
+1. Export throughput in rows per second for CSV, JSONL and gzip-compressed JSONL.
+2. Peak memory of the export pipeline for a growing number of invoices, which should stay flat.
+
+Run with: python -m benchmarks.bench_invoice_exporter
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+import random
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import ExportFormat, ReservationStatus
+from src.export.invoice_exporter import export_invoices
+from src.reservation.add_on import AddOn
+from src.reservation.reservation import Reservation
+
+INVOICES = 100_000
+
+
+def create_invoices(count: int):
+    """Creates invoices of count reservations, about half of them paid"""
+    random.seed(7)
+    branch = common.create_branch()
+    fleet = common.create_fleet(100, common.create_vehicle_class(), branch)
+    customers = common.create_customers(1_000)
+    insurance_tier = common.create_insurance_tier()
+    add_ons = [AddOn(name="GPS", description="Navigation", price_per_day=5.0)]
+    invoices = []
+    for index in range(count):
+        pickup_date = date.today() + timedelta(days=random.randrange(365))
+        reservation = Reservation(
+            status=ReservationStatus.PENDING,
+            creator=customers[index % len(customers)],
+            vehicle=fleet[index % len(fleet)],
+            insurance_tier=insurance_tier,
+            pickup_branch=branch,
+            return_branch=branch,
+            pickup_date=pickup_date,
+            return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+            add_ons=add_ons if index % 3 == 0 else None,
+        )
+        if index % 2 == 0:
+            reservation.invoice.payment_completed()
+        invoices.append(reservation.invoice)
+    return invoices
+
+
+def peak_memory(invoices, path: str) -> int:
+    """Returns peak bytes allocated while exporting"""
+    tracemalloc.start()
+    export_invoices(invoices, path, ExportFormat.CSV)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    elapsed, invoices = common.timed(lambda: create_invoices(INVOICES))
+    print(f"Created {INVOICES:,} invoices in {elapsed:.1f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        common.print_header("Export throughput")
+        for export_format in ExportFormat:
+            path = os.path.join(directory, f"invoices.{export_format.value}")
+            elapsed, count = common.timed(
+                lambda: export_invoices(invoices, path, export_format)
+            )
+            print(
+                f"{export_format.value:>9}: {count / elapsed:>9,.0f} rows/s, "
+                f"{os.path.getsize(path) / 1e6:>6.1f} MB"
+            )
+
+        common.print_header("Peak memory of a CSV export")
+        path = os.path.join(directory, "invoices.csv")
+        for count in [INVOICES // 10, INVOICES // 2, INVOICES]:
+            peak = peak_memory(invoices[:count], path)
+            print(f"{count:>9,} invoices: {peak / 1024:>7.0f} KiB")
@@ -0,0 +1,85 @@
+"""
+Benchmark for the integer cents money representation.
+
+1. The arithmetic of one discounted quote with floats, Decimals and int cents.
+2. Revenue of 1,000,000 invoices summed as Python floats, Decimals, int cents and an int64
+   NumPy array, with the error of each sum against the exact total.
+
+Run with: python -m benchmarks.bench_money
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import math
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from benchmarks import common
+from src.money import apply_discount, cents_array, sum_cents, to_amount
+
+QUOTES = 200_000
+INVOICES = 1_000_000
+RENTAL_DAYS = 3
+
+
+def float_quote(vehicle, insurance, add_ons):
+    """Quote with the float formula used before the money module"""
+    subtotal = (vehicle + insurance + add_ons) * RENTAL_DAYS
+    return subtotal - subtotal * 0.15
+
+
+def decimal_quote(vehicle, insurance, add_ons):
+    """Quote with Decimals rounded to a cent"""
+    subtotal = (vehicle + insurance + add_ons) * RENTAL_DAYS
+    discount = (subtotal * Decimal("0.15")).quantize(
+        Decimal("0.01"), rounding=ROUND_HALF_UP
+    )
+    return subtotal - discount
+
+
+def cents_quote(vehicle, insurance, add_ons):
+    """Quote in int cents, as the pricing strategies calculate it"""
+    return apply_discount((vehicle + insurance + add_ons) * RENTAL_DAYS, 15)
+
+
+if __name__ == "__main__":
+    common.print_header(f"Arithmetic of {QUOTES:,} discounted quotes")
+    prices = [(5503, 1850, 750), (4500, 500, 1000), (12999, 3000, 0)]
+    variants = {
+        "float": (float_quote, [tuple(to_amount(p) for p in row) for row in prices]),
+        "Decimal": (
+            decimal_quote,
+            [tuple(Decimal(p) / 100 for p in row) for row in prices],
+        ),
+        "int cents": (cents_quote, prices),
+    }
+    for name, (quote, rows) in variants.items():
+        elapsed, _ = common.timed(
+            lambda: [quote(*rows[index % 3]) for index in range(QUOTES)]
+        )
+        print(f"{name}: {elapsed / QUOTES * 1e9:.0f} ns per quote")
+
+    common.print_header(f"Revenue of {INVOICES:,} invoices")
+    rng = np.random.default_rng(7)
+    cents = rng.integers(1_000, 500_000, INVOICES).tolist()
+    floats = [to_amount(value) for value in cents]
+    decimals = [Decimal(value) / 100 for value in cents]
+    array = cents_array(cents)
+    exact = Decimal(sum(cents)) / 100
+
+    sums = [
+        ("sum of floats", lambda: sum(floats)),
+        ("math.fsum of floats", lambda: math.fsum(floats)),
+        ("sum of Decimals", lambda: sum(decimals, Decimal(0))),
+        ("sum of int cents", lambda: sum(cents)),
+        ("int64 NumPy sum_cents", lambda: sum_cents(array)),
+        ("sum_cents from a list", lambda: sum_cents(cents)),
+    ]
+    for name, function in sums:
+        elapsed, total = common.timed(function)
+        if isinstance(total, int):
+            total = Decimal(total) / 100
+        error = abs(Decimal(total) - exact)
+        print(f"{name}: {elapsed * 1e3:.1f} ms, error {float(error):.2g}")
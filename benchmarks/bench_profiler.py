@@ -0,0 +1,76 @@
+"""
+Benchmark for the overhead of the sampling profiler.
+
+1. Reservation and pricing workload without the profiler and with 100, 1000 samples per second.
+2. Samples per subsystem and the hottest functions of the profiled run.
+
+Run with: python -m benchmarks.bench_profiler
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from benchmarks import common
+from src.instrumentation.profiler import DEFAULT_RATE, SamplingProfiler
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+
+RESERVATIONS = 10_000
+QUOTES_PER_RESERVATION = 5
+REPEATS = 5
+RATES = (None, DEFAULT_RATE, 1_000)
+
+
+def workload(customers, fleet, insurance_tier, branch, window):
+    """Quotes and creates one reservation per customer"""
+
+    def run():
+        for customer, vehicle in zip(customers, fleet):
+            pricing = PricingStrategy(customer)
+            for _ in range(QUOTES_PER_RESERVATION):
+                pricing.calculate_price(vehicle, insurance_tier, *window)
+            customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_branch=branch,
+                return_branch=branch,
+                pickup_date=window[0],
+                return_date=window[1],
+            )
+
+    return run
+
+
+if __name__ == "__main__":
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    window = common.rental_window()
+
+    common.print_header(f"{RESERVATIONS:,} reservations, best of {REPEATS}")
+    # Rates are interleaved, so a noisy neighbour slows all of them alike
+    results = dict.fromkeys(RATES, float("inf"))
+    profiler = None
+    for _ in range(REPEATS):
+        for rate in RATES:
+            run = workload(
+                common.create_customers(RESERVATIONS),
+                common.create_fleet(RESERVATIONS, vehicle_class, branch),
+                insurance_tier,
+                branch,
+                window,
+            )
+            if rate is None:
+                elapsed, _ = common.timed(run)
+            else:
+                profiler = SamplingProfiler(rate=rate)
+                with profiler:
+                    elapsed, _ = common.timed(run)
+            results[rate] = min(results[rate], elapsed)
+
+    baseline = results[None]
+    for rate, elapsed in results.items():
+        name = "no profiler" if rate is None else f"{rate} samples/s"
+        print(f"{name}: {elapsed * 1000:.0f} ms ({elapsed / baseline - 1:+.1%})")
+
+    common.print_header(f"Report of the last run at {RATES[-1]} samples/s")
+    print(profiler.report(10))
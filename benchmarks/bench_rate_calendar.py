@@ -0,0 +1,167 @@
+"""
+Benchmark for the seasonal rate calendar.
+
+1. Bulk loading three years of rules for 50 branches, 10 vehicle classes and 500 vehicles.
+2. Vehicle cost of rental windows from 1 to 365 days with prefix sums, compared to adding up
+   the daily prices of every day from per-day rule dictionaries.
+3. Cost of DailyStrategy.calculate with an empty and with the loaded calendar.
+
+Run with: python -m benchmarks.bench_rate_calendar
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.pricing_strategy.concrete_strategies import DailyStrategy
+from src.pricing_strategy.rate_calendar import (
+    RateCalendar,
+    RateRule,
+    set_rate_calendar,
+)
+
+BRANCHES = 50
+VEHICLE_CLASSES = 10
+VEHICLES_PER_BRANCH = 100
+VEHICLE_OVERRIDES = 500
+YEARS = 3
+WINDOWS = (1, 7, 30, 365)
+QUOTES = 2_000
+WEEKEND = (5, 6)
+
+
+def create_rules(branches, vehicle_classes, vehicles, start):
+    """Summer multipliers per branch, weekend multipliers per class and holiday overrides"""
+    rules = []
+    for year in range(YEARS):
+        summer = date(start.year + year, 7, 1)
+        for branch in branches:
+            rules.append(RateRule(branch, summer, summer + timedelta(days=62), 1.2))
+        for vehicle_class in vehicle_classes:
+            first = date(start.year + year, 1, 1)
+            rules.append(
+                RateRule(
+                    vehicle_class,
+                    first,
+                    first + timedelta(days=365),
+                    multiplier=1.15,
+                    weekdays=WEEKEND,
+                )
+            )
+        for vehicle in vehicles[:VEHICLE_OVERRIDES]:
+            new_year = date(start.year + year, 12, 31)
+            rules.append(
+                RateRule(
+                    vehicle, new_year, new_year + timedelta(days=1), override=150.0
+                )
+            )
+    return rules
+
+
+def naive_rules(rules):
+    """Returns {(level target id): {date: (multiplier, override)}} with one entry per day"""
+    by_target = {}
+    for rule in rules:
+        days = by_target.setdefault(rule.target.id, {})
+        day = rule.start
+        while day < rule.end:
+            if rule.weekdays is None or day.weekday() in rule.weekdays:
+                multiplier, override = days.get(day, (1.0, None))
+                if rule.multiplier is not None:
+                    multiplier = rule.multiplier
+                if rule.override is not None:
+                    override = rule.override
+                days[day] = multiplier, override
+            day += timedelta(days=1)
+    return by_target
+
+
+def naive_cost(by_target, vehicle, pickup_date, return_date):
+    """Adds up the price of every day of the window"""
+    levels = [
+        by_target.get(vehicle.current_branch.id, {}),
+        by_target.get(vehicle.vehicle_class.id, {}),
+        by_target.get(vehicle.id, {}),
+    ]
+    total = 0
+    day = pickup_date
+    while day < return_date:
+        multiplier, override = 1.0, None
+        for days in levels:
+            day_multiplier, day_override = days.get(day, (1.0, None))
+            multiplier *= day_multiplier
+            override = day_override if day_override is not None else override
+        total += (
+            round(override * 100)
+            if override is not None
+            else vehicle.price_per_day_cents * multiplier
+        )
+        day += timedelta(days=1)
+    return round(total)
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_classes = [common.create_vehicle_class() for _ in range(VEHICLE_CLASSES)]
+    vehicles = []
+    for index, branch in enumerate(branches):
+        vehicle_class = vehicle_classes[index % VEHICLE_CLASSES]
+        vehicles.extend(common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch))
+    start = date.today() + timedelta(days=1)
+    rules = create_rules(branches, vehicle_classes, vehicles, start)
+
+    common.print_header(f"Loading {len(rules):,} rules")
+    calendar = RateCalendar()
+    elapsed, _ = common.timed(lambda: calendar.update(rules))
+    print(f"update: {elapsed * 1e3:.1f} ms, {calendar.days:,} days stored")
+    elapsed, by_target = common.timed(lambda: naive_rules(rules))
+    print(f"per-day dictionaries: {elapsed * 1e3:.1f} ms")
+    elapsed, _ = common.timed(
+        lambda: calendar.update(
+            [RateRule(vehicle_classes[0], start, start + timedelta(days=30), 1.3)]
+        )
+    )
+    print(f"one more rule: {elapsed * 1e6:.0f} us")
+
+    sample = vehicles[:: len(vehicles) // QUOTES][:QUOTES]
+    common.print_header(f"Vehicle cost of {len(sample):,} windows")
+    elapsed, _ = common.timed(
+        lambda: [
+            calendar.vehicle_cost(vehicle, start, start + timedelta(days=7))
+            for vehicle in sample
+        ]
+    )
+    print(f"first quotes, building prefix sums: {elapsed / len(sample) * 1e6:.1f} us")
+    for days in WINDOWS:
+        end = start + timedelta(days=days)
+        elapsed, costs = common.timed(
+            lambda: [calendar.vehicle_cost(vehicle, start, end) for vehicle in sample]
+        )
+        naive_elapsed, naive_costs = common.timed(
+            lambda: [
+                naive_cost(by_target, vehicle, start, end) for vehicle in sample[:200]
+            ]
+        )
+        print(
+            f"{days:>3} days: prefix sums {elapsed / len(sample) * 1e6:.1f} us, "
+            f"per day {naive_elapsed / 200 * 1e6:,.0f} us"
+        )
+
+    common.print_header("DailyStrategy.calculate, 7 days")
+    insurance_tier = common.create_insurance_tier()
+    end = start + timedelta(days=7)
+    strategy = DailyStrategy()
+    for name, active in (
+        ("empty calendar", RateCalendar()),
+        ("loaded calendar", calendar),
+    ):
+        set_rate_calendar(active)
+        elapsed, _ = common.timed(
+            lambda: [
+                strategy.calculate_cents(vehicle, insurance_tier, start, end)
+                for vehicle in sample
+            ]
+        )
+        print(f"{name}: {elapsed / len(sample) * 1e6:.1f} us")
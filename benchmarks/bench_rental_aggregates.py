@@ -0,0 +1,155 @@
+"""
+Benchmark for the incremental revenue and utilization aggregates.
+
+1. Full rebuild from reservations spread over three years.
+2. Dashboard queries answered from prefix sums compared to walking every reservation.
+3. Cost of one incremental update.
+
+Run with: python -m benchmarks.bench_rental_aggregates
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.analytics.rental_aggregates import RentalAggregates
+from src.enums import ReservationStatus
+from src.reservation.reservation import Reservation
+
+BRANCHES = 50
+VEHICLE_CLASSES = 10
+VEHICLES_PER_BRANCH = 20
+RESERVATIONS = 100_000
+HISTORY_DAYS = 3 * 365
+QUERIES = 200
+
+
+def create_reservations(customers, fleet, insurance_tier, branches):
+    """Creates reservations with random windows and statuses"""
+    random.seed(7)
+    statuses = [
+        ReservationStatus.PENDING,
+        ReservationStatus.PICKED_UP,
+        ReservationStatus.COMPLETED,
+        ReservationStatus.CANCELLED,
+    ]
+    reservations = []
+    for index in range(RESERVATIONS):
+        pickup_date = date.today() + timedelta(days=random.randrange(HISTORY_DAYS))
+        vehicle = random.choice(fleet)
+        reservation = Reservation(
+            status=ReservationStatus.PENDING,
+            creator=customers[index % len(customers)],
+            vehicle=vehicle,
+            insurance_tier=insurance_tier,
+            pickup_branch=vehicle.current_branch,
+            return_branch=random.choice(branches),
+            pickup_date=pickup_date,
+            return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+        )
+        status = random.choice(statuses)
+        if status in (ReservationStatus.PICKED_UP, ReservationStatus.COMPLETED):
+            reservation.invoice.payment_completed()
+        reservation.status = status
+        reservations.append(reservation)
+    return reservations
+
+
+def naive_revenue_by_branch(reservations, start, end):
+    """Walks every reservation and reads its invoice"""
+    revenue = {}
+    for reservation in reservations:
+        invoice = reservation.invoice
+        if invoice.status == "completed" and start <= invoice.date <= end:
+            branch_id = reservation.pickup_branch.id
+            revenue[branch_id] = revenue.get(branch_id, 0) + invoice.total_price_cents
+    return revenue
+
+
+def naive_utilization(reservations, fleet_size, start, end, vehicle_class_id):
+    """Walks every reservation and counts rented days inside the range"""
+    rented_days = 0
+    for reservation in reservations:
+        if reservation.status not in ("picked_up", "completed"):
+            continue
+        if reservation.vehicle.vehicle_class.id != vehicle_class_id:
+            continue
+        first = max(start, reservation.pickup_date)
+        last = min(end, reservation.return_date - timedelta(days=1))
+        rented_days += max(0, (last - first).days + 1)
+    return rented_days / (fleet_size * ((end - start).days + 1))
+
+
+def as_total(result) -> float:
+    """Sums per-key query results, so both query paths can be compared"""
+    return sum(result.values()) if isinstance(result, dict) else result
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_classes = [common.create_vehicle_class() for _ in range(VEHICLE_CLASSES)]
+    fleet = [
+        vehicle
+        for index, branch in enumerate(branches)
+        for vehicle in common.create_fleet(
+            VEHICLES_PER_BRANCH, vehicle_classes[index % VEHICLE_CLASSES], branch
+        )
+    ]
+    customers = common.create_customers(1_000)
+    elapsed, reservations = common.timed(
+        lambda: create_reservations(
+            customers, fleet, common.create_insurance_tier(), branches
+        )
+    )
+    print(f"Created {RESERVATIONS:,} reservations in {elapsed:.1f} s")
+
+    aggregates = RentalAggregates()
+    aggregates.add_vehicles(fleet)
+    common.print_header("Full rebuild")
+    elapsed, _ = common.timed(lambda: aggregates.rebuild(reservations))
+    print(f"{RESERVATIONS:,} reservations: {elapsed * 1000:.0f} ms")
+
+    start, end = date.today(), date.today() + timedelta(days=365)
+    vehicle_class_id = vehicle_classes[0].id
+    fleet_size = sum(1 for v in fleet if v.vehicle_class.id == vehicle_class_id)
+    common.print_header(f"Dashboard queries, average of {QUERIES}")
+    for name, naive, aggregated in [
+        (
+            "revenue per branch, one year",
+            lambda: naive_revenue_by_branch(reservations, start, end),
+            lambda: aggregates.by_branch("revenue", start, end),
+        ),
+        (
+            "utilization of one class, one year",
+            lambda: naive_utilization(
+                reservations, fleet_size, start, end, vehicle_class_id
+            ),
+            lambda: aggregates.utilization(
+                start, end, vehicle_class_id=vehicle_class_id
+            ),
+        ),
+    ]:
+        naive_elapsed, expected = common.timed(naive)
+        elapsed, _ = common.timed(lambda: [aggregated() for _ in range(QUERIES)])
+        assert abs(as_total(aggregated()) - as_total(expected)) < 1e-3
+        print(
+            f"{name}: walk {naive_elapsed * 1000:.1f} ms, "
+            f"prefix sums {elapsed / QUERIES * 1000:.3f} ms"
+        )
+
+    common.print_header("Incremental update")
+    pending = [r for r in reservations if r.status == "pending"][:QUERIES]
+
+    def pick_up_and_query():
+        for reservation in pending:
+            reservation.invoice.payment_completed()
+            reservation.status = ReservationStatus.PICKED_UP
+            aggregates.total("revenue", start, end)
+
+    elapsed, _ = common.timed(pick_up_and_query)
+    print(
+        f"payment + pickup + revenue query: {elapsed / len(pending) * 1e6:.0f} us per reservation"
+    )
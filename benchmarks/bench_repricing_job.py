@@ -0,0 +1,123 @@
+"""
+Benchmark for the bulk repricing of open reservations.
+
+1. Repricing every reservation one by one with its pricing strategy, as before.
+2. Dry run of RepricingJob in the calling process and with a process pool.
+3. Applying the new totals in one batch.
+
+Run with: python -m benchmarks.bench_repricing_job [reservations]
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import ReservationStatus
+from src.pricing_strategy.rate_calendar import RateRule, get_rate_calendar
+from src.reservation.repricing_job import RepricingJob
+from src.reservation.reservation import Reservation
+
+BRANCHES = 20
+VEHICLES_PER_BRANCH = 50
+RESERVATIONS = 200_000
+HORIZON_DAYS = 365
+
+
+def create_reservations(count, customers, fleet, insurance_tier):
+    """Creates open reservations with random windows over the next year"""
+    random.seed(7)
+    today = date.today()
+    reservations = []
+    for index in range(count):
+        pickup_date = today + timedelta(days=random.randrange(HORIZON_DAYS))
+        vehicle = random.choice(fleet)
+        reservations.append(
+            Reservation(
+                status=random.choice(
+                    [ReservationStatus.PENDING, ReservationStatus.APPROVED]
+                ),
+                creator=customers[index % len(customers)],
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_branch=vehicle.current_branch,
+                return_branch=vehicle.current_branch,
+                pickup_date=pickup_date,
+                return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+            )
+        )
+    return reservations
+
+
+def strategy_totals(reservations):
+    """Prices every reservation with its pricing strategy"""
+    return [
+        reservation.pricing_strategy.calculate_price_cents(
+            vehicle=reservation.vehicle,
+            insurance_tier=reservation.insurance_tier,
+            pickup_date=reservation.pickup_date,
+            return_date=reservation.return_date,
+            add_ons=list(reservation.add_ons),
+            pickup_branch=reservation.pickup_branch,
+        )
+        for reservation in reservations
+    ]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESERVATIONS
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_class = common.create_vehicle_class()
+    fleet = [
+        vehicle
+        for branch in branches
+        for vehicle in common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch)
+    ]
+    customers = common.create_customers(1_000)
+    reservations = create_reservations(
+        count, customers, fleet, common.create_insurance_tier()
+    )
+
+    # Summer rates for every branch and a weekend surcharge for the vehicle class
+    today = date.today()
+    summer = (today + timedelta(days=150), today + timedelta(days=240))
+    rules = [RateRule(branch, *summer, multiplier=1.2) for branch in branches]
+    rules.append(
+        RateRule(
+            vehicle_class,
+            today,
+            today + timedelta(days=HORIZON_DAYS),
+            multiplier=1.1,
+            weekdays=[5, 6],
+        )
+    )
+    get_rate_calendar().update(rules)
+
+    common.print_header(f"Repricing {count:,} reservations one by one")
+    elapsed, expected = common.timed(lambda: strategy_totals(reservations))
+    print(f"pricing strategies: {elapsed:.2f} s")
+
+    cpus = os.cpu_count() or 1
+    for workers in sorted({0, cpus}):
+        label = "calling process" if workers == 0 else f"{workers} worker processes"
+        common.print_header(f"Dry run, {label}")
+        job = RepricingJob(workers=workers, chunk_size=max(count // (4 * cpus), 1))
+        elapsed, report = common.timed(
+            lambda: job.run(reservations, rules=rules, dry_run=True)
+        )
+        print(
+            f"total: {elapsed:.2f} s, {len(report.diffs):,} changed, "
+            f"{report.unchanged:,} unchanged, {report.skipped:,} skipped"
+        )
+
+    common.print_header("Applying the new totals")
+    elapsed, report = common.timed(
+        lambda: RepricingJob(workers=cpus).run(reservations, rules=rules)
+    )
+    print(f"total: {elapsed:.2f} s, {report.applied:,} applied")
+    actual = [reservation.total_price_cents for reservation in reservations]
+    print(f"equal to the pricing strategies: {actual == expected}")
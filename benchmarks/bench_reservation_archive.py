@@ -0,0 +1,153 @@
+"""
+Benchmark for the archive tier of closed reservations.
+
+1. Traced memory of 5,000 customers with 100,000 reservations before and after archiving the
+   closed ones.
+2. Archiving the closed reservations into a compressed segment.
+3. Reading the history of a customer from the archive, the first time and from the cache, and
+   reading one year of it.
+4. Opening the archive again from its directory.
+
+Run with: python -m benchmarks.bench_reservation_archive
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import gc
+import random
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import ReservationStatus
+from src.reservation.add_on import AddOn
+from src.reservation.reservation import Reservation
+from src.serialization.reservation_archive import (
+    ReservationArchive,
+    set_reservation_archive,
+)
+
+BRANCHES = 10
+VEHICLES_PER_BRANCH = 100
+CUSTOMERS = 5_000
+RESERVATIONS_PER_CUSTOMER = 20
+OPEN_SHARE = 0.1
+READS = 1_000
+# Every reservation was returned at least hot_days before
+ARCHIVE_DAY = date.today() + timedelta(days=4 * 365)
+
+
+def create_reservations(customers, fleet, insurance_tier, add_ons):
+    """Creates reservations over the next three years, most of them closed"""
+    random.seed(7)
+    today = date.today()
+    for customer in customers:
+        for _ in range(RESERVATIONS_PER_CUSTOMER):
+            vehicle = random.choice(fleet)
+            pickup_date = today + timedelta(days=random.randrange(3 * 365))
+            reservation = Reservation(
+                status=ReservationStatus.PENDING,
+                creator=customer,
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_branch=vehicle.current_branch,
+                return_branch=vehicle.current_branch,
+                pickup_date=pickup_date,
+                return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+                add_ons=random.sample(add_ons, random.randint(0, 2)),
+            )
+            if random.random() >= OPEN_SHARE:
+                reservation.status = random.choice(
+                    (ReservationStatus.COMPLETED, ReservationStatus.CANCELLED)
+                )
+            customer.reservations.append(reservation)
+
+
+def traced_megabytes() -> float:
+    """Returns the traced memory in megabytes after a full collection"""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1e6
+
+
+def create_customers(branches, fleet, insurance_tier, add_ons):
+    """Creates customers with their reservations"""
+    customers = common.create_customers(CUSTOMERS)
+    create_reservations(customers, fleet, insurance_tier, add_ons)
+    return customers
+
+
+def archive_megabytes(directory, known, catalog) -> tuple:
+    """Returns the traced memory of the reservations before and after archiving"""
+    tracemalloc.start()
+    before = traced_megabytes()
+    customers = create_customers(*catalog)
+    hot = traced_megabytes() - before
+    with ReservationArchive(directory, known) as archive:
+        archive.archive(customers, ARCHIVE_DAY)
+    cold = traced_megabytes() - before
+    tracemalloc.stop()
+    return hot, cold
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_class = common.create_vehicle_class()
+    fleet = [
+        vehicle
+        for branch in branches
+        for vehicle in common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch)
+    ]
+    insurance_tier = common.create_insurance_tier()
+    add_ons = [AddOn(f"Add-on {index}", "Benchmark", 2.0) for index in range(10)]
+    catalog = (branches, fleet, insurance_tier, add_ons)
+    known = {obj.id: obj for obj in [*branches, *fleet, insurance_tier, *add_ons]}
+    count = CUSTOMERS * RESERVATIONS_PER_CUSTOMER
+
+    common.print_header(f"Memory of {count:,} reservations of {CUSTOMERS:,} customers")
+    with tempfile.TemporaryDirectory() as directory:
+        hot, cold = archive_megabytes(directory, known, catalog)
+    print(f"before archiving: {hot:.1f} MB, after archiving: {cold:.1f} MB")
+
+    # Timings use a second set of customers, tracing memory slows every allocation down
+    customers = create_customers(*catalog)
+    with tempfile.TemporaryDirectory() as directory:
+        # Every decoded block of the readers fits into the cache
+        archive = ReservationArchive(directory, known, cache_size=4 * READS)
+        set_reservation_archive(archive)
+
+        common.print_header("Archiving the closed reservations")
+        elapsed, report = common.timed(lambda: archive.archive(customers, ARCHIVE_DAY))
+        print(
+            f"archive: {elapsed:.2f} s, {report.reservations:,} reservations, "
+            f"{report.raw_bytes / 1e6:.1f} MB of frames compressed to "
+            f"{report.compressed_bytes / 1e6:.1f} MB"
+        )
+
+        common.print_header(f"Reading the history of {READS:,} customers")
+        readers = random.sample(customers, READS)
+        cold, _ = common.timed(
+            lambda: [customer.get_reservations() for customer in readers]
+        )
+        warm, _ = common.timed(
+            lambda: [customer.get_reservations() for customer in readers]
+        )
+        year = date.today() + timedelta(days=365)
+        one_year, _ = common.timed(
+            lambda: [
+                customer.get_reservations(year, year + timedelta(days=364))
+                for customer in customers[:READS]
+            ]
+        )
+        print(
+            f"first read: {cold / READS * 1e3:.3f} ms, cached: {warm / READS * 1e3:.3f} ms, "
+            f"one year: {one_year / READS * 1e3:.3f} ms per customer"
+        )
+
+        common.print_header("Opening the archive")
+        archive.close()
+        elapsed, reopened = common.timed(lambda: ReservationArchive(directory, known))
+        print(f"open: {elapsed * 1e3:.1f} ms, {len(reopened):,} archived reservations")
+        reopened.close()
+        set_reservation_archive(None)
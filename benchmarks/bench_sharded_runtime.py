@@ -0,0 +1,80 @@
+"""
+Throughput benchmark for the branch-sharded multi-process runtime.
+
+The same fleet and the same reservation requests are processed by 1, 2, 4 and 8 shards.
+Reservation creation can only scale up to the number of available cores.
+
+Run with: python -m benchmarks.bench_sharded_runtime
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+
+from benchmarks import common
+from src.sharding.messages import ReservationRequest
+from src.sharding.sharded_runtime import ShardedRuntime
+
+SHARD_COUNTS = [1, 2, 4, 8]
+BRANCHES = 16
+VEHICLES_PER_BRANCH = 1_000
+CUSTOMERS = 500
+BATCH_SIZE = 2_000
+
+
+def bench_shards(shard_count: int) -> None:
+    """Creates one reservation per vehicle on a runtime with shard_count shards"""
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    customers = common.create_customers(CUSTOMERS)
+    pickup_date, return_date = common.rental_window()
+
+    runtime = ShardedRuntime(shard_count=shard_count)
+    runtime.add_customers(customers)
+    runtime.add_catalog(insurance_tiers=[insurance_tier])
+
+    requests = []
+    for index in range(BRANCHES):
+        branch = common.create_branch(index)
+        fleet = common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch)
+        runtime.add_branch(branch, fleet)
+        requests.extend(
+            ReservationRequest(
+                customer_id=customers[(index + number) % CUSTOMERS].id,
+                vehicle_id=vehicle.id,
+                insurance_tier_id=insurance_tier.id,
+                pickup_branch_id=branch.id,
+                return_branch_id=branch.id,
+                pickup_date=pickup_date,
+                return_date=return_date,
+            )
+            for number, vehicle in enumerate(fleet)
+        )
+
+    # Interleave branches so every batch hits every shard
+    requests.sort(key=lambda request: request.vehicle_id)
+
+    with runtime:
+
+        def create_all() -> int:
+            created = 0
+            for start in range(0, len(requests), BATCH_SIZE):
+                results = runtime.create_reservations(
+                    requests[start : start + BATCH_SIZE]
+                )
+                created += sum(ok for ok, _ in results)
+            return created
+
+        elapsed, created = common.timed(create_all)
+
+    print(
+        f"shards={shard_count} reservations={created:>6} "
+        f"elapsed={elapsed:>6.2f}s rate={created / elapsed:>10,.0f}/s"
+    )
+
+
+if __name__ == "__main__":
+    common.print_header(f"Sharded reservation creation ({os.cpu_count()} cores)")
+    for count in SHARD_COUNTS:
+        bench_shards(count)
@@ -0,0 +1,100 @@
+"""
+Benchmark for whole-system snapshots.
+
+Saves and restores a system of branches, fleet, customers, reservations and invoices, and compares
+it with pickling the same objects into one stream. The number of reservations is 1,000,000 by
+default and can be given as the first argument.
+
+Run with: python -m benchmarks.bench_snapshot [reservations]
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+import sys
+import pickle
+import random
+import tempfile
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import ReservationStatus
+from src.reservation.add_on import AddOn
+from src.reservation.reservation import Reservation
+from src.serialization.snapshot import load_snapshot, save_snapshot
+
+RESERVATIONS = 1_000_000
+BRANCHES = 50
+VEHICLES_PER_BRANCH = 200
+CUSTOMERS = 100_000
+
+
+def create_system(reservation_count: int):
+    """Returns the roots of a system with reservation_count reservations"""
+    random.seed(7)
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_class = common.create_vehicle_class()
+    fleet = [
+        vehicle
+        for branch in branches
+        for vehicle in common.create_fleet(VEHICLES_PER_BRANCH, vehicle_class, branch)
+    ]
+    customers = common.create_customers(CUSTOMERS)
+    insurance_tier = common.create_insurance_tier()
+    add_on = AddOn(name="GPS", description="Navigation", price_per_day=5.0)
+    for index in range(reservation_count):
+        customer = customers[index % len(customers)]
+        vehicle = fleet[index % len(fleet)]
+        pickup_date = date.today() + timedelta(days=random.randrange(365))
+        reservation = Reservation(
+            status=ReservationStatus.PENDING,
+            creator=customer,
+            vehicle=vehicle,
+            insurance_tier=insurance_tier,
+            pickup_branch=vehicle.current_branch,
+            return_branch=vehicle.current_branch,
+            pickup_date=pickup_date,
+            return_date=pickup_date + timedelta(days=random.randint(1, 14)),
+            add_ons=[add_on] if index % 2 else None,
+        )
+        customer.reservations.append(reservation)
+    return branches + fleet + customers + [insurance_tier, add_on]
+
+
+if __name__ == "__main__":
+    reservation_count = int(sys.argv[1]) if len(sys.argv) > 1 else RESERVATIONS
+    elapsed, roots = common.timed(lambda: create_system(reservation_count))
+    print(f"Created {reservation_count:,} reservations in {elapsed:.1f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "system.snapshot")
+        pickle_path = os.path.join(directory, "system.pickle")
+
+        common.print_header("Snapshot")
+        elapsed, count = common.timed(lambda: save_snapshot(snapshot_path, roots))
+        print(
+            f"save: {elapsed:.1f} s, {count:,} objects, "
+            f"{os.path.getsize(snapshot_path) / 1e6:.0f} MB"
+        )
+        elapsed, restored = common.timed(lambda: load_snapshot(snapshot_path))
+        print(f"restore: {elapsed:.1f} s")
+        reservation = restored["Reservation"][0]
+        assert reservation.creator.reservations[0] is reservation
+        del restored, reservation
+
+        common.print_header("Pickle, one stream")
+        sys.setrecursionlimit(100_000)
+
+        def dump():
+            with open(pickle_path, "wb") as file:
+                pickle.dump(roots, file, protocol=5)
+
+        def load():
+            with open(pickle_path, "rb") as file:
+                return pickle.load(file)
+
+        elapsed, _ = common.timed(dump)
+        print(f"save: {elapsed:.1f} s, {os.path.getsize(pickle_path) / 1e6:.0f} MB")
+        elapsed, _ = common.timed(load)
+        print(f"restore: {elapsed:.1f} s")
@@ -0,0 +1,78 @@
+"""
+Benchmark for the on-duty staffing engine.
+
+1. Building the schedule bitmaps and coverage matrix for 50,000 employees in 50 branches.
+2. "Who is on shift at T" over the whole workforce, from the bitmaps compared to parsing
+   get_work_schedule() of every employee.
+3. Hours per week of every employee and coverage gaps of every branch for next week.
+
+Run with: python -m benchmarks.bench_staffing_engine
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import datetime
+
+from benchmarks import common
+from benchmarks.bench_employee_directory import create_employees
+from src.staffing.staffing_engine import WEEKDAYS, StaffingEngine
+
+BRANCHES = 50
+EMPLOYEES_PER_BRANCH = 1_000
+QUERIES = 100
+
+
+def naive_on_shift(employees, moment):
+    """Parses the work schedule of every employee"""
+    day = WEEKDAYS[moment.weekday()]
+    clock_time = moment.strftime("%H:%M")
+    on_duty = []
+    for employee in employees:
+        hours = employee.get_work_schedule()[day]
+        if employee.is_active and hours != "off":
+            start, end = hours.split("-")
+            if start <= clock_time < end:
+                on_duty.append(employee)
+    return on_duty
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    employees = [
+        employee
+        for branch in branches
+        for employee in create_employees(branch, EMPLOYEES_PER_BRANCH)
+    ]
+    common.print_header(f"{len(employees):,} employees in {BRANCHES} branches")
+    elapsed, engine = common.timed(lambda: StaffingEngine(branches))
+    print(f"bitmaps and coverage matrix: {elapsed * 1000:.0f} ms")
+
+    common.print_header("Who is on shift")
+    moment = datetime(2026, 10, 19, 9, 30)
+    naive_elapsed, expected = common.timed(lambda: naive_on_shift(employees, moment))
+    elapsed, _ = common.timed(lambda: [engine.on_shift(moment) for _ in range(QUERIES)])
+    assert engine.on_shift(moment) == expected
+    print(
+        f"parsing schedules: {naive_elapsed * 1000:.1f} ms, "
+        f"bitmaps: {elapsed / QUERIES * 1000:.2f} ms ({len(expected):,} on duty)"
+    )
+    branch_id = branches[0].id
+    elapsed, _ = common.timed(
+        lambda: [engine.on_shift(moment, branch_id, "agent") for _ in range(QUERIES)]
+    )
+    print(f"agents of one branch: {elapsed / QUERIES * 1e6:.0f} us")
+
+    common.print_header("Hours and coverage")
+    elapsed, hours = common.timed(engine.hours_per_week)
+    print(f"hours per week of {len(hours):,} employees: {elapsed * 1000:.1f} ms")
+    elapsed, gaps = common.timed(
+        lambda: [
+            engine.coverage_gaps(branch.id, required=300, role="agent")
+            for branch in branches
+        ]
+    )
+    print(
+        f"coverage gaps of {BRANCHES} branches for next week: {elapsed * 1000:.1f} ms "
+        f"({sum(map(len, gaps))} gaps below 300 agents)"
+    )
@@ -0,0 +1,140 @@
+"""
+Benchmark for the batched ingestion of vehicle telemetry.
+
+1. Applying 1,000,000 odometer and fuel level readings of 10,000 vehicles one at a time with the
+   vehicle setters, a rollback check and a service check.
+2. The same readings pushed in batches of 20,000 and flushed after every batch.
+3. Latency of pushing a single reading.
+
+Run with: python -m benchmarks.bench_telemetry
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+
+import numpy as np
+
+from benchmarks import common
+from src.enums import EmploymentType, Gender
+from src.users.agent import Agent
+from src.vehicle.telemetry import TelemetryIngestor
+
+FLEET_SIZE = 10_000
+READINGS = 1_000_000
+BATCH_SIZE = 20_000
+PUSHES = 100_000
+SERVICE_INTERVAL = 10_000
+
+
+def create_agent(branch) -> Agent:
+    """Creates the agent requesting maintenance"""
+    return Agent(
+        first_name="Agent",
+        last_name="Bench",
+        gender=Gender.MALE,
+        birth_date=date(1990, 1, 1),
+        email="agent@bench.com",
+        address="Beşiktaş",
+        phone_number="+905343940796",
+        branch=branch,
+        is_active=True,
+        salary=1_000.0,
+        hire_date=date(2020, 1, 1),
+        employment_type=EmploymentType.FULL_TIME,
+    )
+
+
+def create_readings(fleet):
+    """Returns vehicle numbers, odometers, fuel levels and timestamps, 0.1 % are anomalies"""
+    rng = np.random.default_rng(7)
+    numbers = rng.integers(0, len(fleet), READINGS)
+    # Every vehicle drives 1 m per reading of the fleet, odometers never decrease
+    odometers = np.array([vehicle.odometer for vehicle in fleet], dtype=float)[numbers]
+    odometers += np.arange(READINGS) * 0.001
+    fuel_levels = rng.uniform(0, 80, READINGS)
+    broken = rng.choice(READINGS, READINGS // 1_000, replace=False)
+    odometers[broken[::2]] = 0.0
+    fuel_levels[broken[1::2]] = -1.0
+    timestamps = np.arange(READINGS, dtype=np.float64)
+    return numbers, odometers, fuel_levels, timestamps
+
+
+def apply_with_setters(agent, fleet, numbers, odometers, fuel_levels):
+    """Applies every reading with the vehicle setters, returns the rejected count"""
+    rejected = 0
+    requested = set()
+    for number, odometer, fuel_level in zip(numbers, odometers, fuel_levels):
+        vehicle = fleet[number]
+        if odometer < vehicle.odometer or fuel_level < 0:
+            rejected += 1
+            continue
+        vehicle.odometer = odometer
+        vehicle.fuel_level = fuel_level
+        driven = vehicle.odometer - vehicle.last_service_odometer
+        if driven >= SERVICE_INTERVAL and number not in requested:
+            requested.add(number)
+            agent.create_maintenance_request(vehicle, note="Service due")
+    return rejected
+
+
+def ingest(ingestor, ids, odometers, fuel_levels, timestamps):
+    """Pushes the readings in batches and flushes after every batch"""
+    reports = []
+    for start in range(0, READINGS, BATCH_SIZE):
+        end = start + BATCH_SIZE
+        ingestor.push_many(
+            ids[start:end],
+            odometers[start:end],
+            fuel_levels[start:end],
+            timestamps[start:end],
+        )
+        reports.append(ingestor.flush())
+    return reports
+
+
+if __name__ == "__main__":
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    agent = create_agent(branch)
+    numbers, odometers, fuel_levels, timestamps = create_readings(
+        common.create_fleet(FLEET_SIZE, vehicle_class, branch)
+    )
+
+    common.print_header(f"{READINGS:,} readings of {FLEET_SIZE:,} vehicles")
+    fleet = common.create_fleet(FLEET_SIZE, vehicle_class, branch)
+    elapsed, rejected = common.timed(
+        lambda: apply_with_setters(
+            agent, fleet, numbers.tolist(), odometers.tolist(), fuel_levels.tolist()
+        )
+    )
+    print(
+        f"setters:  {elapsed:6.2f} s, {READINGS / elapsed:12,.0f} readings/s, "
+        f"{rejected:,} rejected"
+    )
+
+    fleet = common.create_fleet(FLEET_SIZE, vehicle_class, branch)
+    ingestor = TelemetryIngestor(
+        fleet, agent, service_interval=SERVICE_INTERVAL, capacity=BATCH_SIZE
+    )
+    ids = [fleet[number].id for number in numbers.tolist()]
+    elapsed, reports = common.timed(
+        lambda: ingest(ingestor, ids, odometers, fuel_levels, timestamps)
+    )
+    anomalies = sum(len(report.anomalies) for report in reports)
+    applied = sum(report.applied for report in reports)
+    requests = sum(len(report.maintenance_requests) for report in reports)
+    print(
+        f"batched:  {elapsed:6.2f} s, {READINGS / elapsed:12,.0f} readings/s, "
+        f"{anomalies:,} rejected, {applied:,} applied, {requests:,} maintenance requests"
+    )
+
+    common.print_header(f"Pushing {PUSHES:,} single readings")
+    elapsed, _ = common.timed(
+        lambda: [
+            ingestor.push(ids[index], odometers[index], fuel_levels[index], index)
+            for index in range(PUSHES)
+        ]
+    )
+    print(f"push: {elapsed / PUSHES * 1e6:.2f} us per reading")
@@ -0,0 +1,102 @@
+"""
+Benchmark for the vehicle recommender.
+
+1. Latency of the 10 cheapest vehicles with lower-bound pruning, compared to quoting every
+   candidate and sorting the quotes, for growing fleets.
+2. The same with seasonal rates, where the bound is lowered by a discount multiplier.
+3. Latency of the 10 best scored vehicles over price, features and fuel level.
+
+Run with: python -m benchmarks.bench_vehicle_recommender
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+
+from benchmarks import common
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.pricing_strategy.rate_calendar import RateCalendar, set_rate_calendar
+from src.pricing_strategy.vehicle_recommender import ScoreWeights, VehicleRecommender
+
+FLEET_SIZES = (1_000, 10_000, 50_000)
+K = 10
+
+
+def price_all_then_sort(customer, vehicles, insurance_tier, pickup_date, return_date):
+    """Returns the K cheapest vehicles by quoting all of them"""
+    pricing = PricingStrategy(customer)
+    quotes = [
+        (
+            pricing.calculate_price_cents(vehicle, insurance_tier, pickup_date, return_date),
+            position,
+        )
+        for position, vehicle in enumerate(vehicles)
+    ]
+    quotes.sort()
+    return [vehicles[position] for _, position in quotes[:K]]
+
+
+def compare(customer, vehicles, insurance_tier, pickup_date, return_date):
+    """Prints the latency of price-all-then-sort and of the pruned recommendation"""
+    elapsed, expected = common.timed(
+        lambda: price_all_then_sort(
+            customer, vehicles, insurance_tier, pickup_date, return_date
+        )
+    )
+    print(f"{len(vehicles):>7,} vehicles price-all-then-sort: {elapsed * 1e3:8.1f} ms")
+    recommender = VehicleRecommender(customer, insurance_tier, pickup_date, return_date)
+    elapsed, recommendations = common.timed(lambda: recommender.cheapest(vehicles, K))
+    assert [r.vehicle.id for r in recommendations] == [v.id for v in expected]
+    print(
+        f"{len(vehicles):>7,} vehicles cheapest:            {elapsed * 1e3:8.1f} ms, "
+        f"{recommender.quotes:,} quotes"
+    )
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    branch = common.create_branch()
+    vehicle_class = common.create_vehicle_class()
+    insurance_tier = common.create_insurance_tier()
+    (customer,) = common.create_customers(1)
+    pickup_date, return_date = common.rental_window(days=7)
+    fleets = {}
+    for size in FLEET_SIZES:
+        fleet = common.create_fleet(size, vehicle_class, branch)
+        for vehicle in fleet:
+            vehicle.price_per_day = round(30 + rng.random() * 170, 2)
+        fleets[size] = fleet
+
+    common.print_header(f"{K} cheapest vehicles of a 7 day window")
+    set_rate_calendar(RateCalendar())
+    for fleet in fleets.values():
+        compare(customer, fleet, insurance_tier, pickup_date, return_date)
+
+    common.print_header(
+        "With seasonal rates, 20% off the branch and a weekend surcharge"
+    )
+    calendar = RateCalendar()
+    calendar.set_multiplier(branch, pickup_date, return_date, 0.8)
+    calendar.set_multiplier(
+        vehicle_class, pickup_date, return_date, 1.3, weekdays=(5, 6)
+    )
+    set_rate_calendar(calendar)
+    for fleet in fleets.values():
+        compare(customer, fleet, insurance_tier, pickup_date, return_date)
+
+    common.print_header(f"{K} best scored vehicles")
+    weights = ScoreWeights(price=1.0, features=0.2, fuel=0.3)
+    for fleet in fleets.values():
+        recommender = VehicleRecommender(
+            customer, insurance_tier, pickup_date, return_date
+        )
+        elapsed, _ = common.timed(
+            lambda: recommender.best_scored(
+                fleet, K, weights, ["Air conditioning"], full_tank=100.0
+            )
+        )
+        print(
+            f"{len(fleet):>7,} vehicles best_scored: {elapsed * 1e3:8.1f} ms, "
+            f"{recommender.quotes:,} quotes"
+        )
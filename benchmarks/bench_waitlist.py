@@ -0,0 +1,108 @@
+"""
+Benchmark for the waitlist.
+
+1. Joining 50,000 requests for 10 vehicle classes in 50 branches.
+2. Latency of make_available allocating the vehicle to the best waiting request, compared to
+   scanning a list of all waiting requests for the best one.
+3. Latency of make_available when no request is waiting for the vehicle.
+
+Run with: python -m benchmarks.bench_waitlist
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks import common
+from src.enums import VehicleStatus
+from src.reservation.waitlist import Waitlist
+
+BRANCHES = 50
+VEHICLE_CLASSES = 10
+REQUESTS = 50_000
+CUSTOMERS = 5_000
+ALLOCATIONS = 1_000
+
+
+def scan_best(requests, branch, vehicle_class):
+    """Returns the best waiting request by scanning all of them"""
+    best = None
+    for request in requests:
+        if request.pickup_branch is branch and request.vehicle_class is vehicle_class:
+            if best is None or request.pickup_date < best.pickup_date:
+                best = request
+    return best
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    vehicle_classes = [common.create_vehicle_class() for _ in range(VEHICLE_CLASSES)]
+    insurance_tier = common.create_insurance_tier()
+    customers = common.create_customers(CUSTOMERS)
+    fleet = []
+    for branch in branches:
+        for vehicle_class in vehicle_classes:
+            fleet.extend(common.create_fleet(2, vehicle_class, branch))
+    for vehicle in fleet:
+        vehicle.status = VehicleStatus.RESERVED
+
+    waitlist = Waitlist()
+    waitlist.watch(fleet)
+    today = date.today()
+
+    def join_all():
+        requests = []
+        for index in range(REQUESTS):
+            pickup_date = today + timedelta(days=rng.randrange(1, 90))
+            requests.append(
+                waitlist.join(
+                    customers[index % CUSTOMERS],
+                    vehicle_classes[rng.randrange(VEHICLE_CLASSES)],
+                    insurance_tier,
+                    branches[rng.randrange(BRANCHES)],
+                    branches[0],
+                    pickup_date,
+                    pickup_date + timedelta(days=3),
+                )
+            )
+        return requests
+
+    common.print_header(f"Joining {REQUESTS:,} requests")
+    elapsed, requests = common.timed(join_all)
+    print(f"join: {elapsed / REQUESTS * 1e6:.1f} us per request")
+
+    common.print_header(
+        f"{ALLOCATIONS:,} vehicles freed with {len(waitlist):,} waiting"
+    )
+    sample = rng.sample(fleet, ALLOCATIONS // 2) * 2
+    elapsed, _ = common.timed(
+        lambda: [
+            scan_best(requests, vehicle.current_branch, vehicle.vehicle_class)
+            for vehicle in sample[:50]
+        ]
+    )
+    print(f"scanning for the best request: {elapsed / 50 * 1e6:,.0f} us")
+
+    def free_all():
+        for vehicle in sample:
+            vehicle.make_available()
+
+    elapsed, _ = common.timed(free_all)
+    print(
+        f"make_available with allocation: {elapsed / ALLOCATIONS * 1e6:.1f} us, "
+        f"{waitlist.metrics()['allocated']:,} allocated"
+    )
+
+    common.print_header("No waiting request")
+    empty_waitlist = Waitlist()
+    spare = common.create_fleet(
+        ALLOCATIONS, vehicle_classes[0], common.create_branch(99)
+    )
+    for vehicle in spare:
+        vehicle.status = VehicleStatus.RESERVED
+    empty_waitlist.watch(spare)
+    elapsed, _ = common.timed(lambda: [vehicle.make_available() for vehicle in spare])
+    print(f"make_available: {elapsed / ALLOCATIONS * 1e6:.1f} us")
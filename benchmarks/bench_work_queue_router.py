@@ -0,0 +1,114 @@
+"""
+Benchmark for the work-queue router.
+
+1. Submit, assign and acknowledge throughput for 100,000 pending reservations in 50 branches
+   with 20 agents each.
+2. Assigning 5,000 reservations of one branch by scanning for the earliest reservation and the
+   least-loaded agent, as a baseline.
+
+Run with: python -m benchmarks.bench_work_queue_router
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks import common
+from benchmarks.bench_employee_directory import create_employees
+from src.enums import ReservationStatus
+from src.reservation.reservation import Reservation
+from src.staffing.work_queue_router import WorkQueueRouter
+
+BRANCHES = 50
+AGENTS_PER_BRANCH = 20
+RESERVATIONS = 100_000
+SCAN_RESERVATIONS = 5_000
+
+
+def create_reservations(customers, fleet, insurance_tier, branches, count):
+    """Creates pending reservations with random pickup branches and dates"""
+    random.seed(11)
+    reservations = []
+    for index in range(count):
+        pickup_date = date.today() + timedelta(days=random.randrange(1, 60))
+        branch = random.choice(branches)
+        reservations.append(
+            Reservation(
+                status=ReservationStatus.PENDING,
+                creator=customers[index % len(customers)],
+                vehicle=fleet[index % len(fleet)],
+                insurance_tier=insurance_tier,
+                pickup_branch=branch,
+                return_branch=branch,
+                pickup_date=pickup_date,
+                return_date=pickup_date + timedelta(days=3),
+            )
+        )
+    return reservations
+
+
+def scan_assign(reservations, agents):
+    """Assigns by scanning for the earliest reservation and the least-loaded agent"""
+    pending = list(reservations)
+    loads = {agent.id: 0 for agent in agents}
+    assignments = []
+    while pending:
+        reservation = min(pending, key=lambda r: r.pickup_date)
+        pending.remove(reservation)
+        agent = min((a for a in agents if a.is_active), key=lambda a: loads[a.id])
+        loads[agent.id] += 1
+        assignments.append((reservation, agent))
+    return assignments
+
+
+if __name__ == "__main__":
+    branches = [common.create_branch(index) for index in range(BRANCHES)]
+    for branch in branches:
+        create_employees(branch, AGENTS_PER_BRANCH)
+    fleet = common.create_fleet(1_000, common.create_vehicle_class(), branches[0])
+    customers = common.create_customers(1_000)
+    insurance_tier = common.create_insurance_tier()
+    reservations = create_reservations(
+        customers, fleet, insurance_tier, branches, RESERVATIONS
+    )
+
+    common.print_header(f"{RESERVATIONS:,} reservations, {BRANCHES} branches")
+    router = WorkQueueRouter()
+    elapsed, _ = common.timed(lambda: router.submit_many(reservations))
+    print(f"submit: {RESERVATIONS / elapsed:,.0f} reservations/s")
+
+    elapsed, assignments = common.timed(
+        lambda: [a for branch in branches for a in router.assign(branch)]
+    )
+    print(f"assign: {len(assignments) / elapsed:,.0f} assignments/s")
+    depth = sum(m["in_flight"] for m in router.metrics().values())
+    print(f"in flight: {depth:,}, queue depth: {router.queue_depth():,}")
+
+    sample = assignments[:10_000]
+    elapsed, _ = common.timed(
+        lambda: [router.release(a.reservation.id) for a in sample]
+    )
+    print(f"release: {len(sample) / elapsed:,.0f} releases/s")
+    elapsed, _ = common.timed(
+        lambda: [router.acknowledge(a.reservation.id) for a in assignments[10_000:]]
+    )
+    print(
+        f"acknowledge (including approve_reservation): "
+        f"{(len(assignments) - 10_000) / elapsed:,.0f} acknowledgements/s"
+    )
+
+    common.print_header(
+        f"Scan baseline, {SCAN_RESERVATIONS:,} reservations of one branch"
+    )
+    branch_reservations = create_reservations(
+        customers, fleet, insurance_tier, branches[:1], SCAN_RESERVATIONS
+    )
+    agents = list(branches[0].get_employees_by_role("agent"))
+    elapsed, _ = common.timed(lambda: scan_assign(branch_reservations, agents))
+    print(f"scan: {SCAN_RESERVATIONS / elapsed:,.0f} assignments/s")
+    router = WorkQueueRouter()
+    router.submit_many(branch_reservations)
+    elapsed, _ = common.timed(lambda: router.assign(branches[0]))
+    print(f"router: {SCAN_RESERVATIONS / elapsed:,.0f} assignments/s")
@@ -0,0 +1,101 @@
+"""
+This module implements shared helpers for the benchmark scripts, so every benchmark builds
+its data set the same way and reports its results in the same format.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+from src.branch.branch import Branch
+from src.users.customer import Customer
+from src.vehicle.vehicle import Vehicle
+from src.vehicle.vehicle_class import VehicleClass
+from src.reservation.insurance_tier import InsuranceTier
+from src.enums import Gender, VehicleStatus
+
+
+def create_branch(index: int = 0) -> Branch:
+    """Creates a benchmark branch"""
+    return Branch(
+        name=f"Branch {index}",
+        city="Istanbul",
+        address=f"Street {index}",
+        phone_number="+905343940796",
+    )
+
+
+def create_vehicle_class() -> VehicleClass:
+    """Creates a benchmark vehicle class"""
+    return VehicleClass(
+        name="Economy",
+        description="Benchmark vehicle class",
+        base_daily_rate=30.0,
+        features=["Air conditioning"],
+    )
+
+
+def create_insurance_tier() -> InsuranceTier:
+    """Creates a benchmark insurance tier"""
+    return InsuranceTier(
+        tier_name="Basic", description="Benchmark insurance tier", price_per_day=5.0
+    )
+
+
+def create_customers(count: int) -> List[Customer]:
+    """Creates count customers with unique emails"""
+    return [
+        Customer(
+            first_name="Customer",
+            last_name=str(index),
+            gender=Gender.FEMALE,
+            birth_date=date(1990, 1, 1),
+            email=f"customer{index}@bench.com",
+            address="Beşiktaş",
+            phone_number=f"+90{index:010d}",
+        )
+        for index in range(count)
+    ]
+
+
+def create_fleet(
+    count: int, vehicle_class: VehicleClass, branch: Branch
+) -> List[Vehicle]:
+    """Creates count available vehicles"""
+    return [
+        Vehicle(
+            vehicle_class=vehicle_class,
+            current_branch=branch,
+            status=VehicleStatus.AVAILABLE,
+            brand="Toyota",
+            model="Yaris",
+            color="White",
+            licence_plate=f"BNC-{index:06d}",
+            fuel_level=80.0,
+            last_service_odometer=10_000,
+            odometer=10_000 + index % 20_000,
+            price_per_day=vehicle_class.base_daily_rate + index % 50,
+        )
+        for index in range(count)
+    ]
+
+
+def rental_window(days: int = 3) -> Tuple[date, date]:
+    """Returns a pickup and return date starting tomorrow"""
+    pickup_date = date.today() + timedelta(days=1)
+    return pickup_date, pickup_date + timedelta(days=days)
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    """Runs function once and returns elapsed seconds and its result"""
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def print_header(title: str) -> None:
+    """Prints a benchmark section header"""
+    print("-" * 20, title, "-" * 20)
@@ -0,0 +1,543 @@
+"""
+This module implements materialized revenue and utilization aggregates.
+Aggregates are NumPy arrays keyed by branch x vehicle class x day. They are updated incrementally
+from reservation and invoice change events, and range queries are answered from per-row prefix
+sums, so a dashboard query costs the same for one week or for years of history.
+
+Metrics:
+    - revenue: total price of completed invoices in cents, on the invoice date and pickup branch.
+    - rented_days: vehicles on rent, every day from pickup date until return date.
+    - pickups: picked up reservations, on the pickup date and pickup branch.
+    - returns: completed reservations, on the return date and return branch.
+    - cancellations: cancelled reservations, on the pickup date and pickup branch.
+
+Business Logic:
+    - Events are keyed by reservation and invoice dates, so rebuilding from the reservations
+      always gives the same aggregates as applying their changes one by one.
+    - Every event of a reservation is counted at most once. When a tracked reservation is moved
+      to other dates, branches or a vehicle, its applied events are moved with it, and events
+      which stop applying (e.g. a reopened cancellation) are removed.
+    - Branch, vehicle class and day axes grow automatically when new keys are seen.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.enums import InvoiceStatus, ReservationStatus
+
+if TYPE_CHECKING:
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.invoice import Invoice
+    from src.reservation.reservation import Reservation
+
+METRIC_DTYPES: Dict[str, type] = {
+    "revenue": np.int64,
+    "rented_days": np.int32,
+    "pickups": np.int32,
+    "returns": np.int32,
+    "cancellations": np.int32,
+}
+
+# Events caused by each reservation status, in the order they happen
+_STATUS_EVENTS: Dict[str, Tuple[str, ...]] = {
+    ReservationStatus.PICKED_UP.value: ("pickups",),
+    ReservationStatus.COMPLETED.value: ("pickups", "returns"),
+    ReservationStatus.CANCELLED.value: ("cancellations",),
+}
+
+# Reservation fields which events are keyed by
+_EVENT_FIELDS = frozenset(
+    (
+        "status",
+        "vehicle",
+        "pickup_branch",
+        "return_branch",
+        "pickup_date",
+        "return_date",
+    )
+)
+
+# Days allocated when the first event is seen
+_INITIAL_DAYS = 366
+
+
+class RentalAggregates:
+    """
+    Concrete class maintaining revenue and utilization aggregates of tracked reservations.
+
+    Usage:
+        aggregates = RentalAggregates()
+        aggregates.add_vehicles(fleet)
+        aggregates.track(reservation)  # for every new reservation
+        aggregates.total("revenue", start, end, branch_id=branch.id)
+    """
+
+    def __init__(self) -> None:
+        """Constructor method for RentalAggregates class"""
+        self.__branch_numbers: Dict[str, int] = {}
+        self.__class_numbers: Dict[str, int] = {}
+        self.__origin: Optional[int] = None  # Ordinal of the first stored day
+        self.__metrics: Dict[str, np.ndarray] = {
+            name: np.zeros((0, 0, 0), dtype=dtype)
+            for name, dtype in METRIC_DTYPES.items()
+        }
+        self.__fleet = np.zeros((0, 0), dtype=np.int64)
+        self.__prefix: Dict[str, Optional[np.ndarray]] = dict.fromkeys(METRIC_DTYPES)
+        self.__dirty: Dict[str, Set[Tuple[int, int]]] = {
+            name: set() for name in METRIC_DTYPES
+        }
+        self.__tracked: Dict[str, "Reservation"] = {}
+        # Applied (branch id, class id, first day, last day, amount) by reservation and metric
+        self.__applied: Dict[str, Dict[str, Tuple[str, str, date, date, int]]] = {}
+
+    @property
+    def branch_ids(self) -> List[str]:
+        """Getter for branch_ids property."""
+        return list(self.__branch_numbers)
+
+    @property
+    def vehicle_class_ids(self) -> List[str]:
+        """Getter for vehicle_class_ids property."""
+        return list(self.__class_numbers)
+
+    @property
+    def tracked_count(self) -> int:
+        """Getter for tracked_count property."""
+        return len(self.__tracked)
+
+    def __number_of(self, numbers: Dict[str, int], key: str) -> int:
+        """Returns the dense number of a key, assigning a new one if needed"""
+        number = numbers.get(key)
+        if number is None:
+            number = numbers[key] = len(numbers)
+        return number
+
+    def __resize(self, branches: int, classes: int, first: int, last: int) -> None:
+        """Grows the arrays to hold the given number of keys and the ordinal day range"""
+        shape = self.__metrics["revenue"].shape
+        origin = self.__origin if self.__origin is not None else first
+        days = shape[2]
+        if (
+            branches <= shape[0]
+            and classes <= shape[1]
+            and origin <= first
+            and last < origin + days
+        ):
+            return
+
+        # Grow every axis at least by doubling, so growth is amortized
+        new_branches = max(
+            branches, shape[0], 2 * shape[0] if branches > shape[0] else 0
+        )
+        new_classes = max(classes, shape[1], 2 * shape[1] if classes > shape[1] else 0)
+        new_origin = min(origin, first)
+        if new_origin < origin and days:
+            new_origin = min(new_origin, origin - days)
+        new_end = max(origin + days, last + 1)
+        if days and new_end > origin + days:
+            new_end = max(new_end, origin + 2 * days)
+        new_end = max(new_end, new_origin + _INITIAL_DAYS)
+        shift = origin - new_origin
+
+        for name, values in self.__metrics.items():
+            grown = np.zeros(
+                (new_branches, new_classes, new_end - new_origin), dtype=values.dtype
+            )
+            grown[: shape[0], : shape[1], shift : shift + days] = values
+            self.__metrics[name] = grown
+            self.__prefix[name] = None
+            self.__dirty[name].clear()
+
+        fleet = np.zeros((new_branches, new_classes), dtype=self.__fleet.dtype)
+        fleet[: shape[0], : shape[1]] = self.__fleet
+        self.__fleet = fleet
+        self.__origin = new_origin
+
+    def __cell(
+        self, branch_id: str, vehicle_class_id: str, first: date, last: date
+    ) -> Tuple[int, int, int, int]:
+        """Returns the branch number, class number and day index range of an event, growing the arrays"""
+        branch = self.__number_of(self.__branch_numbers, branch_id)
+        vehicle_class = self.__number_of(self.__class_numbers, vehicle_class_id)
+        first, last = first.toordinal(), last.toordinal()
+        self.__resize(
+            len(self.__branch_numbers), len(self.__class_numbers), first, last
+        )
+        return branch, vehicle_class, first - self.__origin, last - self.__origin + 1
+
+    def __add(
+        self,
+        metric: str,
+        branch_id: str,
+        vehicle_class_id: str,
+        first: date,
+        last: date,
+        amount: int,
+    ) -> None:
+        """Adds amount to a metric for every day between first and last, inclusive"""
+        branch, vehicle_class, start, stop = self.__cell(
+            branch_id, vehicle_class_id, first, last
+        )
+        self.__metrics[metric][branch, vehicle_class, start:stop] += amount
+        self.__dirty[metric].add((branch, vehicle_class))
+
+    @staticmethod
+    def __events_of(
+        reservation: "Reservation",
+    ) -> Iterable[Tuple[str, str, date, date, int]]:
+        """Yields (metric, branch id, first day, last day, amount) for every event of a reservation"""
+        status_events = _STATUS_EVENTS.get(reservation.status, ())
+        pickup_branch_id = reservation.pickup_branch.id
+        if "pickups" in status_events:
+            yield "pickups", pickup_branch_id, reservation.pickup_date, reservation.pickup_date, 1
+            rental_days = (reservation.return_date - reservation.pickup_date).days
+            if rental_days > 0:
+                last_day = date.fromordinal(reservation.return_date.toordinal() - 1)
+                yield "rented_days", pickup_branch_id, reservation.pickup_date, last_day, 1
+        if "returns" in status_events:
+            return_date = reservation.return_date
+            yield "returns", reservation.return_branch.id, return_date, return_date, 1
+        if "cancellations" in status_events:
+            yield "cancellations", pickup_branch_id, reservation.pickup_date, reservation.pickup_date, 1
+        if reservation.invoice.status == InvoiceStatus.COMPLETED.value:
+            invoice = reservation.invoice
+            yield "revenue", pickup_branch_id, invoice.date, invoice.date, invoice.total_price_cents
+
+    def __apply(self, reservation: "Reservation") -> None:
+        """Applies new and changed events of a reservation and removes events which stopped applying"""
+        applied = self.__applied.setdefault(reservation.id, {})
+        vehicle_class_id = reservation.vehicle.vehicle_class.id
+        current = {
+            metric: (branch_id, vehicle_class_id, first, last, amount)
+            for metric, branch_id, first, last, amount in self.__events_of(reservation)
+        }
+        for metric in [metric for metric in applied if metric not in current]:
+            # E.g. a reopened cancellation or an invoice which is no longer completed
+            previous = applied.pop(metric)
+            self.__add(metric, *previous[:4], -previous[4])
+        for metric, event in current.items():
+            previous = applied.get(metric)
+            if previous == event:
+                continue
+            if previous is not None:
+                # The reservation was moved, its event is removed from the old cells
+                self.__add(metric, *previous[:4], -previous[4])
+            applied[metric] = event
+            self.__add(metric, *event)
+
+    def __on_reservation_changed(
+        self, reservation: "Reservation", field_name: str
+    ) -> None:
+        """Change listener of tracked reservations"""
+        if field_name in _EVENT_FIELDS:
+            self.__apply(reservation)
+
+    def __on_invoice_changed(self, invoice: "Invoice", field_name: str) -> None:
+        """Change listener of invoices of tracked reservations"""
+        if field_name == "status":
+            self.__apply(invoice.reservation)
+
+    def add_vehicle(self, vehicle: "Vehicle") -> None:
+        """
+        Adds a vehicle to the fleet size of its current branch and vehicle class.
+
+        Args:
+            vehicle (Vehicle): The vehicle to count.
+
+        Raises:
+            TypeError: If vehicle is not a Vehicle object.
+        """
+        from src.vehicle.vehicle import Vehicle
+
+        if not isinstance(vehicle, Vehicle):
+            raise TypeError("vehicle must be a Vehicle object")
+
+        branch = self.__number_of(self.__branch_numbers, vehicle.current_branch.id)
+        vehicle_class = self.__number_of(self.__class_numbers, vehicle.vehicle_class.id)
+        today = date.today().toordinal()
+        self.__resize(
+            len(self.__branch_numbers), len(self.__class_numbers), today, today
+        )
+        self.__fleet[branch, vehicle_class] += 1
+
+    def add_vehicles(self, vehicles: Iterable["Vehicle"]) -> None:
+        """Adds every vehicle to the fleet size"""
+        for vehicle in vehicles:
+            self.add_vehicle(vehicle)
+
+    def track(self, reservation: "Reservation") -> None:
+        """
+        Starts tracking a reservation. Events of its current state are applied immediately and later
+        changes are applied when the reservation or its invoice changes.
+
+        Args:
+            reservation (Reservation): The reservation to track.
+
+        Raises:
+            TypeError: If reservation is not a Reservation object.
+        """
+        from src.reservation.reservation import Reservation
+
+        if not isinstance(reservation, Reservation):
+            raise TypeError("reservation must be a Reservation object")
+        if reservation.id in self.__tracked:
+            return
+
+        self.__tracked[reservation.id] = reservation
+        reservation.add_change_listener(self.__on_reservation_changed)
+        reservation.invoice.add_change_listener(self.__on_invoice_changed)
+        self.__apply(reservation)
+
+    def untrack(self, reservation_id: str) -> None:
+        """Stops tracking a reservation, its applied events are kept"""
+        reservation = self.__tracked.pop(reservation_id, None)
+        if reservation is not None:
+            reservation.remove_change_listener(self.__on_reservation_changed)
+            reservation.invoice.remove_change_listener(self.__on_invoice_changed)
+
+    def rebuild(self, reservations: Iterable["Reservation"]) -> None:
+        """
+        Discards all aggregates and rebuilds them from the given reservations, which are tracked
+        afterwards. Used for backfills, events are collected first and added in bulk.
+
+        Args:
+            reservations (Iterable[Reservation]): Every reservation to aggregate.
+        """
+        for reservation_id in list(self.__tracked):
+            self.untrack(reservation_id)
+        self.__applied.clear()
+
+        # Collect events as ordinal day ranges
+        events: Dict[str, List[Tuple[int, int, int, int, int]]] = {
+            name: [] for name in METRIC_DTYPES
+        }
+        first_day, last_day = None, None
+        for reservation in reservations:
+            self.__tracked[reservation.id] = reservation
+            reservation.add_change_listener(self.__on_reservation_changed)
+            reservation.invoice.add_change_listener(self.__on_invoice_changed)
+            applied = self.__applied[reservation.id] = {}
+            vehicle_class_id = reservation.vehicle.vehicle_class.id
+            vehicle_class = self.__number_of(self.__class_numbers, vehicle_class_id)
+            for metric, branch_id, first, last, amount in self.__events_of(reservation):
+                applied[metric] = (branch_id, vehicle_class_id, first, last, amount)
+                branch = self.__number_of(self.__branch_numbers, branch_id)
+                first, last = first.toordinal(), last.toordinal()
+                events[metric].append((branch, vehicle_class, first, last, amount))
+                first_day = first if first_day is None else min(first_day, first)
+                last_day = last if last_day is None else max(last_day, last)
+
+        # Reset metrics, keep the fleet
+        for name, values in self.__metrics.items():
+            values[...] = 0
+            self.__prefix[name] = None
+            self.__dirty[name].clear()
+        if first_day is None:
+            # No events, the arrays still have to hold the newly numbered branches and classes
+            first_day = last_day = (
+                self.__origin if self.__origin is not None else date.today().toordinal()
+            )
+        self.__resize(
+            len(self.__branch_numbers), len(self.__class_numbers), first_day, last_day
+        )
+
+        for metric, rows in events.items():
+            if not rows:
+                continue
+            columns = np.array(rows, dtype=np.int64).T
+            branches, classes = columns[0].astype(np.intp), columns[1].astype(np.intp)
+            starts = columns[2].astype(np.intp) - self.__origin
+            stops = columns[3].astype(np.intp) - self.__origin + 1
+            values = self.__metrics[metric]
+            if np.all(stops - starts == 1):
+                np.add.at(
+                    values, (branches, classes, starts), columns[4].astype(values.dtype)
+                )
+                continue
+            # Day ranges are added to a difference array and accumulated along the day axis
+            difference = np.zeros(
+                (values.shape[0], values.shape[1], values.shape[2] + 1), dtype=np.int64
+            )
+            np.add.at(
+                difference, (branches, classes, starts), columns[4].astype(np.int64)
+            )
+            np.subtract.at(
+                difference, (branches, classes, stops), columns[4].astype(np.int64)
+            )
+            values += np.cumsum(difference[:, :, :-1], axis=2).astype(values.dtype)
+
+    def __prefix_of(self, metric: str) -> np.ndarray:
+        """Returns prefix sums of a metric along the day axis, updating only changed rows"""
+        values = self.__metrics[metric]
+        prefix = self.__prefix[metric]
+        if prefix is None:
+            prefix = np.zeros(values.shape[:2] + (values.shape[2] + 1,), dtype=np.int64)
+            np.cumsum(values, axis=2, out=prefix[:, :, 1:])
+            self.__prefix[metric] = prefix
+        else:
+            for branch, vehicle_class in self.__dirty[metric]:
+                np.cumsum(
+                    values[branch, vehicle_class], out=prefix[branch, vehicle_class, 1:]
+                )
+        self.__dirty[metric].clear()
+        return prefix
+
+    def __selection(self, branch_id: Optional[str], vehicle_class_id: Optional[str]):
+        """Returns index selectors for a branch and a vehicle class, or None if one is unknown"""
+        branch = (
+            slice(None) if branch_id is None else self.__branch_numbers.get(branch_id)
+        )
+        vehicle_class = (
+            slice(None)
+            if vehicle_class_id is None
+            else self.__class_numbers.get(vehicle_class_id)
+        )
+        if branch is None or vehicle_class is None:
+            return None
+        return branch, vehicle_class
+
+    def __day_range(self, start: date, end: date) -> Optional[Tuple[int, int]]:
+        """Returns the stored day index range of an inclusive date range, or None if it is empty"""
+        if not isinstance(start, date) or not isinstance(end, date):
+            raise TypeError("start and end must be instances of date class.")
+        if self.__origin is None:
+            return None
+        days = self.__metrics["revenue"].shape[2]
+        first = max(0, start.toordinal() - self.__origin)
+        stop = min(days, end.toordinal() - self.__origin + 1)
+        return (first, stop) if first < stop else None
+
+    def __range_sums(self, metric: str, start: date, end: date) -> Optional[np.ndarray]:
+        """Returns a branch x vehicle class matrix of metric sums over an inclusive date range"""
+        if metric not in METRIC_DTYPES:
+            raise ValueError(f"Unknown metric: {metric}")
+        day_range = self.__day_range(start, end)
+        if day_range is None:
+            return None
+        prefix = self.__prefix_of(metric)
+        return prefix[:, :, day_range[1]] - prefix[:, :, day_range[0]]
+
+    def total(
+        self,
+        metric: str,
+        start: date,
+        end: date,
+        branch_id: Optional[str] = None,
+        vehicle_class_id: Optional[str] = None,
+    ) -> int:
+        """
+        Returns the sum of a metric over an inclusive date range.
+
+        Args:
+            metric (str): One of revenue, rented_days, pickups, returns or cancellations.
+            start (date): First day of the range.
+            end (date): Last day of the range.
+            branch_id (Optional[str]): Only this branch if given, otherwise all branches.
+            vehicle_class_id (Optional[str]): Only this vehicle class if given, otherwise all classes.
+
+        Returns:
+            int: The sum, revenue in cents, 0 for unknown branches, classes and days.
+
+        Raises:
+            ValueError: If metric is unknown.
+            TypeError: If start or end is not a date.
+        """
+        sums = self.__range_sums(metric, start, end)
+        selection = self.__selection(branch_id, vehicle_class_id)
+        if sums is None or selection is None:
+            return 0
+        return sums[selection].sum().item()
+
+    def by_branch(
+        self,
+        metric: str,
+        start: date,
+        end: date,
+        vehicle_class_id: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Returns the sum of a metric over an inclusive date range for every branch"""
+        sums = self.__range_sums(metric, start, end)
+        selection = self.__selection(None, vehicle_class_id)
+        if sums is None or selection is None:
+            return dict.fromkeys(self.__branch_numbers, 0)
+        per_branch = sums[:, selection[1]].reshape(sums.shape[0], -1).sum(axis=1)
+        return {
+            branch_id: per_branch[number].item()
+            for branch_id, number in self.__branch_numbers.items()
+        }
+
+    def by_vehicle_class(
+        self, metric: str, start: date, end: date, branch_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """Returns the sum of a metric over an inclusive date range for every vehicle class"""
+        sums = self.__range_sums(metric, start, end)
+        selection = self.__selection(branch_id, None)
+        if sums is None or selection is None:
+            return dict.fromkeys(self.__class_numbers, 0)
+        per_class = sums[selection[0]].reshape(-1, sums.shape[1]).sum(axis=0)
+        return {
+            class_id: per_class[number].item()
+            for class_id, number in self.__class_numbers.items()
+        }
+
+    def daily(
+        self,
+        metric: str,
+        start: date,
+        end: date,
+        branch_id: Optional[str] = None,
+        vehicle_class_id: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Returns one value of a metric per day of an inclusive date range, for charts.
+
+        Raises:
+            ValueError: If metric is unknown or end is before start.
+        """
+        if metric not in METRIC_DTYPES:
+            raise ValueError(f"Unknown metric: {metric}")
+        if end < start:
+            raise ValueError("end cannot be before start.")
+        series = np.zeros((end - start).days + 1, dtype=METRIC_DTYPES[metric])
+        day_range = self.__day_range(start, end)
+        selection = self.__selection(branch_id, vehicle_class_id)
+        if day_range is None or selection is None:
+            return series
+
+        values = self.__metrics[metric][
+            selection[0], selection[1], day_range[0] : day_range[1]
+        ]
+        offset = self.__origin + day_range[0] - start.toordinal()
+        series[offset : offset + values.shape[-1]] = values.reshape(
+            -1, values.shape[-1]
+        ).sum(axis=0)
+        return series
+
+    def utilization(
+        self,
+        start: date,
+        end: date,
+        branch_id: Optional[str] = None,
+        vehicle_class_id: Optional[str] = None,
+    ) -> float:
+        """
+        Returns rented vehicle days divided by available vehicle days over an inclusive date range.
+
+        Returns:
+            float: Utilization between 0 and 1, or 0 if there are no vehicles.
+        """
+        selection = self.__selection(branch_id, vehicle_class_id)
+        if selection is None:
+            return 0.0
+        capacity = self.__fleet[selection].sum().item() * ((end - start).days + 1)
+        if capacity <= 0:
+            return 0.0
+        return (
+            self.total("rented_days", start, end, branch_id, vehicle_class_id)
+            / capacity
+        )
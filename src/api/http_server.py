@@ -0,0 +1,399 @@
+"""
+This module implements a small asyncio HTTP/1.1 server for the application API.
+It only depends on the standard library and supports persistent (keep-alive) connections and
+request pipelining: requests on one connection are answered in the order they were sent.
+
+Endpoints:
+    - GET  /                                       IDs of branches, customers, staff and catalog.
+    - GET  /branches/{branch_id}/vehicles          Search available vehicles (optional quotes).
+    - GET  /branches/{branch_id}/alternatives      Nearest other branches with a vehicle class.
+    - POST /quotes                                 Price quote for a vehicle at a pickup branch.
+    - POST /reservations                           Create a reservation.
+    - POST /reservations/{reservation_id}/approve  Approve a reservation by an agent.
+    - POST /reservations/{reservation_id}/pay      Pay a reservation by credit card.
+    - POST /reservations/{reservation_id}/pickup   Pick up the vehicle.
+    - POST /reservations/{reservation_id}/return   Return the vehicle.
+    - POST /reservations/{reservation_id}/cancel   Cancel a reservation.
+
+Run a demo server with: python -m src.api.http_server --port 8080
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import json
+import asyncio
+import argparse
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.api.rental_service import RentalService
+from src.custom_errors import (
+    AddOnUnavailableError,
+    VehicleNotAvailableError,
+    ReservationNotFoundError,
+    ReservationNotApprovedError,
+    PaymentRequiredForPickupError,
+    ReturnDateBeforePickupDateError,
+    InvalidReservationStatusForCancellationError,
+)
+
+# Limits protecting the server from oversized requests
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1 << 20
+
+# HTTP status of domain errors, checked in order
+ERROR_STATUSES: List[Tuple[type, HTTPStatus]] = [
+    (ReservationNotFoundError, HTTPStatus.NOT_FOUND),
+    (KeyError, HTTPStatus.NOT_FOUND),
+    (VehicleNotAvailableError, HTTPStatus.CONFLICT),
+    (AddOnUnavailableError, HTTPStatus.CONFLICT),
+    (ReservationNotApprovedError, HTTPStatus.CONFLICT),
+    (PaymentRequiredForPickupError, HTTPStatus.CONFLICT),
+    (InvalidReservationStatusForCancellationError, HTTPStatus.CONFLICT),
+    (ReturnDateBeforePickupDateError, HTTPStatus.BAD_REQUEST),
+    (TypeError, HTTPStatus.BAD_REQUEST),
+    (ValueError, HTTPStatus.BAD_REQUEST),
+]
+
+
+class HttpRequest(NamedTuple):
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    version: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Dict[str, Any]:
+        """Returns the JSON body of the request"""
+        if not self.body:
+            return {}
+        payload = json.loads(self.body)
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object.")
+        return payload
+
+
+Handler = Callable[[HttpRequest, List[str]], Awaitable[Tuple[HTTPStatus, Any]]]
+
+
+def _parse_date(value: Any, name: str) -> date:
+    """Parses an ISO date from a request"""
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be an ISO date string.")
+    return date.fromisoformat(value)
+
+
+class RentalApi:
+    """
+    Concrete class routing HTTP requests to a RentalService.
+
+    Args:
+        service (RentalService): Service implementing the use cases.
+    """
+
+    def __init__(self, service: RentalService) -> None:
+        """Constructor method for RentalApi class."""
+        self.__service = service
+        self.__routes: Dict[Tuple[str, str], Handler] = {
+            ("GET", ""): self.__index,
+            ("GET", "branches/*/vehicles"): self.__search,
+            ("GET", "branches/*/alternatives"): self.__alternatives,
+            ("POST", "quotes"): self.__quote,
+            ("POST", "reservations"): self.__reserve,
+            ("POST", "reservations/*/approve"): self.__approve,
+            ("POST", "reservations/*/pay"): self.__pay,
+            ("POST", "reservations/*/pickup"): self.__pickup,
+            ("POST", "reservations/*/return"): self.__return,
+            ("POST", "reservations/*/cancel"): self.__cancel,
+        }
+
+    async def handle(self, request: HttpRequest) -> Tuple[HTTPStatus, Any]:
+        """Routes a request and converts domain errors to HTTP errors"""
+        segments = [segment for segment in request.path.split("/") if segment]
+        # Every second segment is an id, replace ids with a wildcard to find the route
+        pattern = "/".join(
+            "*" if index % 2 else segment for index, segment in enumerate(segments)
+        )
+        handler = self.__routes.get((request.method, pattern))
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {
+                "error": f"No route for {request.method} {request.path}"
+            }
+
+        try:
+            return await handler(request, segments[1::2])
+        except Exception as error:
+            for error_type, status in ERROR_STATUSES:
+                if isinstance(error, error_type):
+                    message = error.args[0] if error.args else str(error)
+                    return status, {
+                        "error": type(error).__name__,
+                        "message": str(message),
+                    }
+            raise
+
+    async def __index(self, request: HttpRequest, ids: List[str]):
+        return HTTPStatus.OK, self.__service.summary()
+
+    async def __search(self, request: HttpRequest, ids: List[str]):
+        query = request.query
+        return HTTPStatus.OK, await self.__service.search(
+            branch_id=ids[0],
+            customer_id=query.get("customer_id"),
+            insurance_tier_id=query.get("insurance_tier_id"),
+            pickup_date=(
+                _parse_date(query["pickup_date"], "pickup_date")
+                if "pickup_date" in query
+                else None
+            ),
+            return_date=(
+                _parse_date(query["return_date"], "return_date")
+                if "return_date" in query
+                else None
+            ),
+        )
+
+    async def __alternatives(self, request: HttpRequest, ids: List[str]):
+        query = request.query
+        add_on_ids = query.get("add_on_ids")
+        return HTTPStatus.OK, self.__service.alternatives(
+            branch_id=ids[0],
+            vehicle_class_id=query.get("vehicle_class_id"),
+            pickup_date=_parse_date(query.get("pickup_date"), "pickup_date"),
+            return_date=_parse_date(query.get("return_date"), "return_date"),
+            k=int(query.get("k", 5)),
+            add_on_ids=add_on_ids.split(",") if add_on_ids else None,
+        )
+
+    async def __quote(self, request: HttpRequest, ids: List[str]):
+        body = request.json()
+        return HTTPStatus.OK, await self.__service.quote(
+            customer_id=body.get("customer_id"),
+            vehicle_id=body.get("vehicle_id"),
+            insurance_tier_id=body.get("insurance_tier_id"),
+            pickup_date=_parse_date(body.get("pickup_date"), "pickup_date"),
+            return_date=_parse_date(body.get("return_date"), "return_date"),
+            add_on_ids=body.get("add_on_ids"),
+            pickup_branch_id=body.get("pickup_branch_id"),
+        )
+
+    async def __reserve(self, request: HttpRequest, ids: List[str]):
+        body = request.json()
+        return HTTPStatus.CREATED, self.__service.reserve(
+            customer_id=body.get("customer_id"),
+            vehicle_id=body.get("vehicle_id"),
+            insurance_tier_id=body.get("insurance_tier_id"),
+            pickup_branch_id=body.get("pickup_branch_id"),
+            return_branch_id=body.get("return_branch_id"),
+            pickup_date=_parse_date(body.get("pickup_date"), "pickup_date"),
+            return_date=_parse_date(body.get("return_date"), "return_date"),
+            add_on_ids=body.get("add_on_ids"),
+        )
+
+    async def __approve(self, request: HttpRequest, ids: List[str]):
+        body = request.json()
+        return HTTPStatus.OK, self.__service.approve(ids[0], body.get("agent_id"))
+
+    async def __pay(self, request: HttpRequest, ids: List[str]):
+        body = request.json()
+        return HTTPStatus.OK, self.__service.pay(
+            ids[0], body.get("card_number"), body.get("cvv"), body.get("expiry")
+        )
+
+    async def __pickup(self, request: HttpRequest, ids: List[str]):
+        return HTTPStatus.OK, self.__service.pickup(ids[0])
+
+    async def __return(self, request: HttpRequest, ids: List[str]):
+        return HTTPStatus.OK, self.__service.return_vehicle(ids[0])
+
+    async def __cancel(self, request: HttpRequest, ids: List[str]):
+        return HTTPStatus.OK, self.__service.cancel(ids[0])
+
+
+class HttpServer:
+    """
+    Concrete class representing an asyncio HTTP/1.1 server.
+
+    Args:
+        handler (Callable[[HttpRequest], Awaitable[Tuple[HTTPStatus, Any]]]): Request handler,
+            its result is sent back as a JSON response.
+        host (str): Host to listen on. Defaults to 127.0.0.1.
+        port (int): Port to listen on, 0 picks a free port. Defaults to 8080.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[HttpRequest], Awaitable[Tuple[HTTPStatus, Any]]],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+    ) -> None:
+        """Constructor method for HttpServer class."""
+        self.__handler = handler
+        self.__host = host
+        self.__port = port
+        self.__server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        """Getter for port property, the real port once the server is started."""
+        if self.__server is not None:
+            return self.__server.sockets[0].getsockname()[1]
+        return self.__port
+
+    async def start(self) -> None:
+        """Starts listening for connections."""
+        self.__server = await asyncio.start_server(
+            self.__handle_connection, self.__host, self.__port
+        )
+
+    async def serve_forever(self) -> None:
+        """Starts the server if needed and serves until cancelled."""
+        if self.__server is None:
+            await self.start()
+        await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops listening for connections."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    @staticmethod
+    async def __read_request(reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+        """Reads one request from the connection, None if the client closed it"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, target, version = request_line.decode("latin-1").split()
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ValueError("Too many request headers.")
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body is too large.")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return HttpRequest(
+            method=method.upper(),
+            path=url.path,
+            version=version,
+            query=dict(parse_qsl(url.query)),
+            headers=headers,
+            body=body,
+        )
+
+    @staticmethod
+    def __keep_alive(request: HttpRequest) -> bool:
+        """Returns True if the connection stays open after the request"""
+        connection = request.headers.get("connection", "").lower()
+        if request.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    def __response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+        """Serializes a JSON response"""
+        body = json.dumps(payload, default=str).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def __handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves requests of one connection in order until it is closed"""
+        try:
+            while True:
+                try:
+                    request = await self.__read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(
+                        self.__response(
+                            HTTPStatus.BAD_REQUEST,
+                            {"error": "Malformed request"},
+                            False,
+                        )
+                    )
+                    break
+                if request is None:
+                    break
+
+                keep_alive = self.__keep_alive(request)
+                try:
+                    status, payload = await self.__handler(request)
+                except Exception as error:
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"error": type(error).__name__}
+
+                writer.write(self.__response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def create_demo_service(
+    fleet_size: int = 100, pricing_executor: Optional[Executor] = None
+) -> RentalService:
+    """Creates a RentalService with demo objects from utils and fleet_size vehicles"""
+    from src import utils
+
+    branch = utils.create_test_branch()
+    utils.create_test_agent(branch=branch)
+    utils.create_test_manager(branch=branch)
+    vehicle_class = utils.create_economy_vehicle_class()
+
+    return RentalService(
+        branches=[branch],
+        vehicles=[utils.create_bmw(vehicle_class, branch) for _ in range(fleet_size)],
+        customers=[utils.create_test_customer()],
+        insurance_tiers=[utils.create_premium_insurance_tier()],
+        add_ons=[utils.create_gps_addon(), utils.create_child_seat_addon()],
+        pricing_executor=pricing_executor,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CRFMS HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fleet-size", type=int, default=100)
+    arguments = parser.parse_args()
+
+    demo_service = create_demo_service(arguments.fleet_size)
+    demo_server = HttpServer(
+        RentalApi(demo_service).handle, host=arguments.host, port=arguments.port
+    )
+
+    async def serve_demo() -> None:
+        await demo_server.start()
+        # Startup banner of the demo server, with the ids to use in requests
+        print(f"Serving on http://{arguments.host}:{demo_server.port}")
+        print(json.dumps(demo_service.summary(), indent=2))
+        await demo_server.serve_forever()
+
+    asyncio.run(serve_demo())
@@ -0,0 +1,347 @@
+"""
+This module implements RentalService class which exposes the application use cases to the HTTP API.
+It keeps a registry of the objects created in the application and delegates every use case to the
+existing Customer, Agent, Manager and PricingStrategy APIs.
+
+Business Logic:
+    - Objects are looked up by their id, unknown ids raise KeyError.
+    - Prices are calculated on the event loop unless an executor is given. Pricing is pure Python
+      and holds the GIL, so a thread pool does not price in parallel, it only lets the event loop
+      answer other connections between the pricing calls of a long search.
+    - Quotes use the rates of the pickup branch, the current branch of the vehicle by default,
+      like the reservation created with the same pickup branch.
+    - Alternative branches are the nearest branches with coordinates which have an available vehicle
+      of the requested class, see BranchLocator.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import asyncio
+from datetime import date
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional, TypeVar, TYPE_CHECKING
+
+from src.enums import VehicleStatus
+from src.money import Cents, to_amount
+from src.users.manager import Manager
+from src.branch.branch_locator import BranchLocator
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+
+if TYPE_CHECKING:
+    from src.users.agent import Agent
+    from src.branch.branch import Branch
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.add_on import AddOn
+    from src.reservation.reservation import Reservation
+    from src.reservation.insurance_tier import InsuranceTier
+
+T = TypeVar("T")
+
+
+def _index(objects: Iterable[T]) -> Dict[str, T]:
+    """Returns a dictionary of objects keyed by their id"""
+    return {obj.id: obj for obj in objects}
+
+
+def _lookup(registry: Dict[str, T], object_id: Any, kind: str) -> T:
+    """Returns an object from a registry or raises KeyError"""
+    try:
+        return registry[object_id]
+    except (KeyError, TypeError):
+        raise KeyError(f"{kind} {object_id} not found.") from None
+
+
+class RentalService:
+    """
+    Concrete class representing the use cases of the application behind the HTTP API.
+
+    Args:
+        branches (Iterable[Branch]): Branches of the application.
+        vehicles (Iterable[Vehicle]): Vehicles of the application.
+        customers (Iterable[Customer]): Customers of the application.
+        insurance_tiers (Iterable[InsuranceTier]): Available insurance tiers.
+        add_ons (Iterable[AddOn]): Available add-ons.
+        pricing_executor (Optional[Executor]): Executor for price calculations.
+            Prices are calculated on the event loop if not provided.
+    """
+
+    def __init__(
+        self,
+        branches: Iterable["Branch"],
+        vehicles: Iterable["Vehicle"],
+        customers: Iterable["Customer"],
+        insurance_tiers: Iterable["InsuranceTier"],
+        add_ons: Iterable["AddOn"] = (),
+        pricing_executor: Optional[Executor] = None,
+    ) -> None:
+        """Constructor method for RentalService class."""
+        self.__branches = _index(branches)
+        self.__vehicles = _index(vehicles)
+        self.__customers = _index(customers)
+        self.__insurance_tiers = _index(insurance_tiers)
+        self.__add_ons = _index(add_ons)
+        self.__employees = _index(
+            employee
+            for branch in self.__branches.values()
+            for employee in branch.employees
+        )
+        self.__vehicle_classes = _index(
+            vehicle.vehicle_class for vehicle in self.__vehicles.values()
+        )
+        self.__locator = BranchLocator(
+            self.__branches.values(), self.__vehicles.values()
+        )
+        self.__reservations: Dict[str, "Reservation"] = {}
+        self.__pricing_executor = pricing_executor
+
+    def summary(self) -> Dict[str, List[str]]:
+        """Returns ids of the objects known to the service"""
+        return {
+            "branches": list(self.__branches),
+            "customers": list(self.__customers),
+            "vehicles": list(self.__vehicles),
+            "agents": [
+                e.id for e in self.__employees.values() if e.get_role() == "agent"
+            ],
+            "managers": [
+                e.id for e in self.__employees.values() if e.get_role() == "manager"
+            ],
+            "insurance_tiers": list(self.__insurance_tiers),
+            "add_ons": list(self.__add_ons),
+        }
+
+    def reservation(self, reservation_id: str) -> "Reservation":
+        """Returns a reservation created through the service"""
+        return _lookup(self.__reservations, reservation_id, "Reservation")
+
+    def __employee(self, employee_id: str, role: str):
+        """Returns an employee with the given role"""
+        employee = _lookup(self.__employees, employee_id, "Employee")
+        if employee.get_role() != role:
+            raise KeyError(f"Employee {employee_id} is not a {role}.")
+        return employee
+
+    def __add_ons_of(self, add_on_ids: Optional[List[str]]) -> List["AddOn"]:
+        """Returns add-ons by their ids"""
+        return [_lookup(self.__add_ons, a, "AddOn") for a in add_on_ids or []]
+
+    @staticmethod
+    def reservation_to_dict(reservation: "Reservation") -> Dict[str, Any]:
+        """Returns a JSON friendly summary of a reservation"""
+        return {
+            "id": reservation.id,
+            "status": reservation.status,
+            "customer_id": reservation.creator.id,
+            "vehicle_id": reservation.vehicle.id,
+            "pickup_branch_id": reservation.pickup_branch.id,
+            "return_branch_id": reservation.return_branch.id,
+            "pickup_date": reservation.pickup_date.isoformat(),
+            "return_date": reservation.return_date.isoformat(),
+            "total_price": reservation.total_price,
+            "total_price_cents": reservation.total_price_cents,
+            "invoice_status": reservation.invoice.status,
+        }
+
+    def __price(
+        self,
+        customer: "Customer",
+        vehicles: List["Vehicle"],
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: List["AddOn"],
+        pickup_branch: Optional["Branch"] = None,
+    ) -> List[Cents]:
+        """Calculates the price of several vehicles for one customer in cents"""
+        pricing_strategy = PricingStrategy(customer=customer)
+        return [
+            pricing_strategy.calculate_price_cents(
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_date=pickup_date,
+                return_date=return_date,
+                add_ons=add_ons,
+                pickup_branch=pickup_branch,
+            )
+            for vehicle in vehicles
+        ]
+
+    async def __price_async(self, *args: Any) -> List[Cents]:
+        """Calculates prices in the pricing executor if there is one"""
+        if self.__pricing_executor is None:
+            return self.__price(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__pricing_executor, self.__price, *args)
+
+    async def search(
+        self,
+        branch_id: str,
+        customer_id: Optional[str] = None,
+        insurance_tier_id: Optional[str] = None,
+        pickup_date: Optional[date] = None,
+        return_date: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns available vehicles at a branch.
+
+        If customer, insurance tier and dates are given, every vehicle also gets a price quote.
+        """
+        branch = _lookup(self.__branches, branch_id, "Branch")
+        vehicles = [
+            vehicle
+            for vehicle in self.__vehicles.values()
+            if vehicle.current_branch is branch
+            and vehicle.status == VehicleStatus.AVAILABLE.value
+        ]
+        results = [Manager.get_vehicle_information(vehicle) for vehicle in vehicles]
+        for result in results:
+            del result["vehicle_maintenance_records"]
+
+        if customer_id and insurance_tier_id and pickup_date and return_date:
+            prices = await self.__price_async(
+                _lookup(self.__customers, customer_id, "Customer"),
+                vehicles,
+                _lookup(self.__insurance_tiers, insurance_tier_id, "InsuranceTier"),
+                pickup_date,
+                return_date,
+                [],
+                branch,
+            )
+            for result, price in zip(results, prices):
+                result["total_price"] = to_amount(price)
+                result["total_price_cents"] = price
+
+        return results
+
+    def alternatives(
+        self,
+        branch_id: str,
+        vehicle_class_id: str,
+        pickup_date: date,
+        return_date: date,
+        k: int = 5,
+        add_on_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Returns the nearest other branches with an available vehicle of a class"""
+        alternatives = self.__locator.alternatives(
+            _lookup(self.__branches, branch_id, "Branch"),
+            _lookup(self.__vehicle_classes, vehicle_class_id, "VehicleClass"),
+            pickup_date,
+            return_date,
+            k,
+            self.__add_ons_of(add_on_ids),
+        )
+        return [
+            {
+                "branch_id": alternative.branch.id,
+                "name": alternative.branch.name,
+                "city": alternative.branch.city,
+                "distance_km": round(alternative.distance_km, 3),
+                "available_vehicles": alternative.available_vehicles,
+            }
+            for alternative in alternatives
+        ]
+
+    async def quote(
+        self,
+        customer_id: str,
+        vehicle_id: str,
+        insurance_tier_id: str,
+        pickup_date: date,
+        return_date: date,
+        add_on_ids: Optional[List[str]] = None,
+        pickup_branch_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns the price a customer would pay for a vehicle picked up at a branch, the current
+        branch of the vehicle if pickup_branch_id is not given.
+        """
+        customer = _lookup(self.__customers, customer_id, "Customer")
+        vehicle = _lookup(self.__vehicles, vehicle_id, "Vehicle")
+        insurance_tier = _lookup(
+            self.__insurance_tiers, insurance_tier_id, "InsuranceTier"
+        )
+        pickup_branch = (
+            vehicle.current_branch
+            if pickup_branch_id is None
+            else _lookup(self.__branches, pickup_branch_id, "Branch")
+        )
+        (price,) = await self.__price_async(
+            customer,
+            [vehicle],
+            insurance_tier,
+            pickup_date,
+            return_date,
+            self.__add_ons_of(add_on_ids),
+            pickup_branch,
+        )
+        return {
+            "vehicle_id": vehicle.id,
+            "pickup_branch_id": pickup_branch.id,
+            "total_price": to_amount(price),
+            "total_price_cents": price,
+        }
+
+    def reserve(
+        self,
+        customer_id: str,
+        vehicle_id: str,
+        insurance_tier_id: str,
+        pickup_branch_id: str,
+        return_branch_id: str,
+        pickup_date: date,
+        return_date: date,
+        add_on_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Creates a reservation for a customer"""
+        customer = _lookup(self.__customers, customer_id, "Customer")
+        reservation = customer.create_reservation(
+            vehicle=_lookup(self.__vehicles, vehicle_id, "Vehicle"),
+            insurance_tier=_lookup(
+                self.__insurance_tiers, insurance_tier_id, "InsuranceTier"
+            ),
+            pickup_branch=_lookup(self.__branches, pickup_branch_id, "Branch"),
+            return_branch=_lookup(self.__branches, return_branch_id, "Branch"),
+            pickup_date=pickup_date,
+            return_date=return_date,
+            add_ons=self.__add_ons_of(add_on_ids),
+        )
+        self.__reservations[reservation.id] = reservation
+        return self.reservation_to_dict(reservation)
+
+    def approve(self, reservation_id: str, agent_id: str) -> Dict[str, Any]:
+        """Approves a reservation by an agent"""
+        agent: "Agent" = self.__employee(agent_id, "agent")
+        reservation = self.reservation(reservation_id)
+        agent.approve_reservation(reservation)
+        return self.reservation_to_dict(reservation)
+
+    def pay(
+        self, reservation_id: str, card_number: str, cvv: str, expiry: str
+    ) -> Dict[str, Any]:
+        """Pays a reservation by credit card"""
+        reservation = self.reservation(reservation_id)
+        receipt = reservation.creator.make_creditcard_payment(
+            reservation, card_number, cvv, expiry
+        )
+        return {"receipt": receipt, **self.reservation_to_dict(reservation)}
+
+    def pickup(self, reservation_id: str) -> Dict[str, Any]:
+        """Picks up the vehicle of a reservation"""
+        reservation = self.reservation(reservation_id)
+        reservation.creator.pickup_vehicle(reservation_id)
+        return self.reservation_to_dict(reservation)
+
+    def return_vehicle(self, reservation_id: str) -> Dict[str, Any]:
+        """Returns the vehicle of a reservation"""
+        reservation = self.reservation(reservation_id)
+        reservation.creator.return_vehicle(reservation_id)
+        return self.reservation_to_dict(reservation)
+
+    def cancel(self, reservation_id: str) -> Dict[str, Any]:
+        """Cancels a reservation"""
+        reservation = self.reservation(reservation_id)
+        reservation.creator.cancel_reservation(reservation_id)
+        return self.reservation_to_dict(reservation)
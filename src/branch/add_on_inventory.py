@@ -0,0 +1,332 @@
+"""
+This module implements AddOnInventory class, the add-on stock of one branch.
+Every add-on with a stock level has one counter per day, the number of its units reserved on
+that day. Counters are kept in a segment tree with range increments and range maximum, so
+checking whether a unit is free for a whole window and reserving it are both O(log days).
+
+Business Logic:
+    - Add-ons without a stock level at the branch are unlimited and are not counted.
+    - A reservation holds a unit every day of [pickup_date, return_date), at least on the
+      pickup day.
+    - An add-on can be reserved if its reserved units on every day of the window are fewer
+      than its stock level.
+    - A stock level cannot be set lower than the units reserved on any day.
+    - Days before the first day of the inventory are in the past and are not counted.
+    - Stock levels and held units are encoded with the branch, so restored branches keep the
+      units held by their open reservations.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import struct
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.custom_errors import AddOnUnavailableError
+from src.serialization.wire_format import decode_str, encode_str
+
+# Days covered by a new inventory, doubled whenever a window ends after the last day
+_INITIAL_DAYS = 512
+
+# Encoded inventory: first day ordinal and stock count, then hold count after the stock levels
+_HEADER = struct.Struct("<iI")
+_COUNT = struct.Struct("<I")
+_QUANTITY = struct.Struct("<q")
+_HOLD_DAYS = struct.Struct("<ii")
+
+
+class _MaxSegmentTree:
+    """
+    Segment tree over day counters with range increment and range maximum, both O(log days).
+
+    Node values are the maximum of their children plus the increment applied to the whole
+    node, increments are pushed down only on the path of a query.
+    """
+
+    __slots__ = ("size", "height", "values", "pending")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.height = size.bit_length()
+        self.values = [0] * (2 * size)
+        # Increment applied to every day below an inner node
+        self.pending = [0] * size
+
+    def __rebuild(self, node: int) -> None:
+        """Recalculates the ancestors of a node"""
+        values, pending = self.values, self.pending
+        node >>= 1
+        while node:
+            left = values[2 * node]
+            right = values[2 * node + 1]
+            values[node] = (left if left > right else right) + pending[node]
+            node >>= 1
+
+    def __push(self, node: int) -> None:
+        """Moves pending increments of the ancestors of a node to their children"""
+        values, pending, size = self.values, self.pending, self.size
+        for shift in range(self.height, 0, -1):
+            ancestor = node >> shift
+            value = pending[ancestor]
+            if value:
+                child = 2 * ancestor
+                values[child] += value
+                values[child + 1] += value
+                if child < size:
+                    pending[child] += value
+                    pending[child + 1] += value
+                pending[ancestor] = 0
+
+    def add(self, first: int, stop: int, value: int) -> None:
+        """Adds value to the counters of the days [first, stop)"""
+        values, pending, size = self.values, self.pending, self.size
+        left, right = first + size, stop + size
+        while left < right:
+            if left & 1:
+                values[left] += value
+                if left < size:
+                    pending[left] += value
+                left += 1
+            if right & 1:
+                right -= 1
+                values[right] += value
+                if right < size:
+                    pending[right] += value
+            left >>= 1
+            right >>= 1
+        self.__rebuild(first + size)
+        self.__rebuild(stop - 1 + size)
+
+    def max(self, first: int, stop: int) -> int:
+        """Returns the largest counter of the days [first, stop)"""
+        left, right = first + self.size, stop + self.size
+        self.__push(left)
+        self.__push(right - 1)
+        values = self.values
+        result = 0
+        while left < right:
+            if left & 1:
+                if values[left] > result:
+                    result = values[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if values[right] > result:
+                    result = values[right]
+            left >>= 1
+            right >>= 1
+        return result
+
+
+class AddOnInventory:
+    """
+    Concrete class representing the add-on stock and reservations of one branch.
+
+    Args:
+        first_day (Optional[date]): First counted day. Defaults to today.
+    """
+
+    def __init__(self, first_day: Optional[date] = None) -> None:
+        """Constructor method for AddOnInventory class"""
+        if first_day is None:
+            first_day = date.today()
+        if not isinstance(first_day, date):
+            raise TypeError("first_day must be an instance of date class.")
+
+        self.__origin = first_day.toordinal()
+        self.__days = _INITIAL_DAYS
+        self.__stock: Dict[str, int] = {}
+        self.__counters: Dict[str, _MaxSegmentTree] = {}
+        # Reservation id -> (add-on id, first day, stop day) of every held unit
+        self.__holds: Dict[str, List[Tuple[str, int, int]]] = {}
+
+    @property
+    def first_day(self) -> date:
+        """Getter for the first counted day"""
+        return date.fromordinal(self.__origin)
+
+    def __window(self, pickup_date: date, return_date: date) -> Tuple[int, int]:
+        """Returns the counted day range [first, stop) of a rental window"""
+        if not isinstance(pickup_date, date) or not isinstance(return_date, date):
+            raise TypeError(
+                "pickup_date and return_date must be instances of date class."
+            )
+        if return_date < pickup_date:
+            raise ValueError("return_date must be after or equal to pickup_date.")
+        first = pickup_date.toordinal() - self.__origin
+        stop = max(return_date.toordinal() - self.__origin, first + 1)
+        if stop > self.__days:
+            self.__grow(stop)
+        return max(first, 0), max(stop, 0)
+
+    def __grow(self, stop: int) -> None:
+        """Doubles the counted days until stop is covered, counters are rebuilt from the holds"""
+        while self.__days < stop:
+            self.__days *= 2
+        self.__counters = {
+            add_on_id: _MaxSegmentTree(self.__days) for add_on_id in self.__stock
+        }
+        for holds in self.__holds.values():
+            for add_on_id, first, hold_stop in holds:
+                self.__counters[add_on_id].add(first, hold_stop, 1)
+
+    def to_bytes(self) -> bytes:
+        """Returns the stock levels and held units encoded for the binary codec"""
+        parts = [_HEADER.pack(self.__origin, len(self.__stock))]
+        for add_on_id, quantity in self.__stock.items():
+            encode_str(parts, add_on_id)
+            parts.append(_QUANTITY.pack(quantity))
+        parts.append(_COUNT.pack(sum(map(len, self.__holds.values()))))
+        for reservation_id, holds in self.__holds.items():
+            for add_on_id, first, stop in holds:
+                encode_str(parts, reservation_id)
+                encode_str(parts, add_on_id)
+                parts.append(_HOLD_DAYS.pack(first, stop))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "AddOnInventory":
+        """
+        Creates an inventory from the bytes of to_bytes, with the same stock levels and holds.
+
+        Raises:
+            ValueError: If data is not an encoded inventory.
+        """
+        try:
+            origin, stock_count = _HEADER.unpack_from(data, 0)
+            offset = _HEADER.size
+            stock: Dict[str, int] = {}
+            for _ in range(stock_count):
+                add_on_id, offset = decode_str(data, offset)
+                (stock[add_on_id],) = _QUANTITY.unpack_from(data, offset)
+                offset += _QUANTITY.size
+            (hold_count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            holds: Dict[str, List[Tuple[str, int, int]]] = {}
+            for _ in range(hold_count):
+                reservation_id, offset = decode_str(data, offset)
+                add_on_id, offset = decode_str(data, offset)
+                first, stop = _HOLD_DAYS.unpack_from(data, offset)
+                offset += _HOLD_DAYS.size
+                holds.setdefault(reservation_id, []).append((add_on_id, first, stop))
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError("Invalid add-on inventory") from error
+        if offset != len(data) or any(
+            hold[0] not in stock for held in holds.values() for hold in held
+        ):
+            raise ValueError("Invalid add-on inventory")
+
+        inventory = cls(date.fromordinal(origin))
+        inventory.__stock = stock
+        inventory.__holds = holds
+        # Rebuilds the counters from the holds, growing the days to the last hold
+        inventory.__grow(
+            max(
+                (hold[2] for held in holds.values() for hold in held),
+                default=inventory.__days,
+            )
+        )
+        return inventory
+
+    def stock(self, add_on_id: str) -> Optional[int]:
+        """Returns the stock level of an add-on, None if it is unlimited"""
+        return self.__stock.get(add_on_id)
+
+    def set_stock(self, add_on_id: str, quantity: Optional[int]) -> None:
+        """
+        Sets the stock level of an add-on, None makes it unlimited again.
+
+        Args:
+            add_on_id (str): Id of the add-on.
+            quantity (Optional[int]): Number of units at the branch.
+
+        Raises:
+            TypeError: If quantity is not an integer or None.
+            ValueError: If quantity is negative or lower than the units reserved on a day.
+        """
+        if quantity is None:
+            self.__stock.pop(add_on_id, None)
+            self.__counters.pop(add_on_id, None)
+            for holds in self.__holds.values():
+                holds[:] = [hold for hold in holds if hold[0] != add_on_id]
+            return
+        if isinstance(quantity, bool) or not isinstance(quantity, int):
+            raise TypeError("quantity must be an integer.")
+        if quantity < 0:
+            raise ValueError("quantity cannot be negative.")
+
+        counters = self.__counters.get(add_on_id)
+        if counters is None:
+            self.__counters[add_on_id] = _MaxSegmentTree(self.__days)
+        elif counters.max(0, self.__days) > quantity:
+            raise ValueError("quantity cannot be lower than the reserved units.")
+        self.__stock[add_on_id] = quantity
+
+    def reserved(self, add_on_id: str, pickup_date: date, return_date: date) -> int:
+        """Returns the most units of an add-on reserved on one day of a window"""
+        first, stop = self.__window(pickup_date, return_date)
+        counters = self.__counters.get(add_on_id)
+        if counters is None or first >= stop:
+            return 0
+        return counters.max(first, stop)
+
+    def available(
+        self, add_on_id: str, pickup_date: date, return_date: date
+    ) -> Optional[int]:
+        """Returns the units of an add-on free on every day of a window, None if unlimited"""
+        stock = self.__stock.get(add_on_id)
+        if stock is None:
+            return None
+        return stock - self.reserved(add_on_id, pickup_date, return_date)
+
+    def reserve(
+        self, reservation_id: str, add_on_id: str, pickup_date: date, return_date: date
+    ) -> None:
+        """
+        Reserves one unit of an add-on for a reservation.
+
+        Raises:
+            AddOnUnavailableError: If no unit is free on a day of the window.
+        """
+        stock = self.__stock.get(add_on_id)
+        if stock is None:
+            return
+        first, stop = self.__window(pickup_date, return_date)
+        if first >= stop:
+            return
+        counters = self.__counters[add_on_id]
+        if counters.max(first, stop) >= stock:
+            raise AddOnUnavailableError(add_on_id, pickup_date, return_date)
+        counters.add(first, stop, 1)
+        self.__holds.setdefault(reservation_id, []).append((add_on_id, first, stop))
+
+    def release(self, reservation_id: str, add_on_id: str) -> bool:
+        """Releases one unit of an add-on held by a reservation, returns False if it held none"""
+        holds = self.__holds.get(reservation_id, [])
+        for index, (held_add_on_id, first, stop) in enumerate(holds):
+            if held_add_on_id == add_on_id:
+                del holds[index]
+                self.__counters[add_on_id].add(first, stop, -1)
+                if not holds:
+                    del self.__holds[reservation_id]
+                return True
+        return False
+
+    def release_all(self, reservation_id: str) -> int:
+        """Releases every unit held by a reservation and returns their number"""
+        holds = self.__holds.pop(reservation_id, [])
+        for add_on_id, first, stop in holds:
+            self.__counters[add_on_id].add(first, stop, -1)
+        return len(holds)
+
+    def holds_of(self, reservation_id: str) -> List[str]:
+        """Returns the ids of the add-ons held by a reservation"""
+        return [hold[0] for hold in self.__holds.get(reservation_id, [])]
+
+    def daily_reserved(self, add_on_id: str, start: date, days: int) -> List[int]:
+        """Returns the reserved units of an add-on on every day from start, for reports"""
+        return [
+            self.reserved(add_on_id, day, day + timedelta(days=1))
+            for day in (start + timedelta(days=offset) for offset in range(days))
+        ]
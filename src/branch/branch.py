@@ -3,13 +3,20 @@ This module implements concrete Branch class.
 This class is a concrete class and can directly initialize in the app.
 
 Note: Since Branch has employees attribute, inner class Employee import is used to avoid circular import issue.
+Note: Unknown coordinates are stored as NaN, so they fit the float fields of the binary codec.
 
 Author: Peyman Khodabandehlouei
 Date: 30-10-2025
 """
 
+import math
 import uuid
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+from src.collection_views import DictValuesView
+from src.enums import EmploymentType
+from src.branch.employee_directory import EmployeeDirectory
+from src.branch.add_on_inventory import AddOnInventory
 
 if TYPE_CHECKING:
     from src.users.employee import Employee
@@ -25,16 +32,20 @@ class Branch:
         city (str): City of the branch.
         address (str): Address of the branch.
         phone_number (str): Phone number of the branch.
-        employees (Optional[List[Employee]]): List of employees working in the branch.
-            Defaults to an empty list if not provided.
+        employees (Optional[List[Employee]]): List of employees working in the branch, or the
+            employees view of another branch. Defaults to an empty list if not provided.
+        latitude (Optional[float]): Latitude of the branch in degrees. Defaults to unknown.
+        longitude (Optional[float]): Longitude of the branch in degrees. Defaults to unknown.
 
     Raises:
         TypeError: If name is not a string.
         TypeError: If city is not a string.
         TypeError: If address is not a string.
         TypeError: If phone_number is not a string.
-        TypeError: If employees is not a list.
+        TypeError: If employees is not a list or an employees view.
         TypeError: If any employee is not an instance of Employee class.
+        ValueError: If an employee is given more than once.
+        ValueError: If only one coordinate is given or a coordinate is out of range.
     """
 
     def __init__(
@@ -44,6 +55,8 @@ class Branch:
         address: str,
         phone_number: str,
         employees: Optional[List["Employee"]] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
     ) -> None:
         """Constructor method for Branch class."""
         # Validate name
@@ -67,7 +80,7 @@ class Branch:
             employees = []
 
         # Validate employee is a list
-        if not isinstance(employees, list):
+        if not isinstance(employees, (list, DictValuesView)):
             raise TypeError("employees must be a list.")
         # Validate all items in the list are Employee instances
         from src.users.employee import Employee  # To avoid circular import
@@ -75,13 +88,22 @@ class Branch:
         if not all(isinstance(employee, Employee) for employee in employees):
             raise TypeError("all employees must be instances of Employee class.")
 
+        # Validate coordinates
+        if (latitude is None) != (longitude is None):
+            raise ValueError("latitude and longitude must be given together.")
+        if latitude is not None:
+            self.__validate_coordinates(latitude, longitude)
+
         # Assign values
         self.__id = str(uuid.uuid4())
         self.__name = name
         self.__city = city
         self.__address = address
         self.__phone_number = phone_number
-        self.__employees = employees.copy()
+        self.__employees = EmployeeDirectory(employees)
+        self.__add_on_inventory = AddOnInventory()
+        self.__latitude = math.nan if latitude is None else float(latitude)
+        self.__longitude = math.nan if longitude is None else float(longitude)
 
     @property
     def id(self) -> str:
@@ -92,6 +114,52 @@ class Branch:
         """
         return self.__id
 
+    @property
+    def add_on_inventory(self) -> AddOnInventory:
+        """
+        Getter method for add_on_inventory property.
+
+        Note: Stock levels are set on the inventory, it cannot be replaced.
+        """
+        return self.__add_on_inventory
+
+    @staticmethod
+    def __validate_coordinates(latitude: float, longitude: float) -> None:
+        """Raises if latitude or longitude is not a number in degrees"""
+        for value, name, limit in ((latitude, "latitude", 90), (longitude, "longitude", 180)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(f"{name} must be a number.")
+            if not -limit <= value <= limit:
+                raise ValueError(f"{name} must be between -{limit} and {limit} degrees.")
+
+    @property
+    def latitude(self) -> Optional[float]:
+        """Getter method for latitude property, None if the coordinates are unknown."""
+        return None if math.isnan(self.__latitude) else self.__latitude
+
+    @property
+    def longitude(self) -> Optional[float]:
+        """Getter method for longitude property, None if the coordinates are unknown."""
+        return None if math.isnan(self.__longitude) else self.__longitude
+
+    def set_coordinates(self, latitude: float, longitude: float) -> None:
+        """
+        Sets the coordinates of the branch.
+
+        Note: A BranchLocator indexing the branch must be refreshed afterwards.
+
+        Args:
+            latitude (float): Latitude in degrees, between -90 and 90.
+            longitude (float): Longitude in degrees, between -180 and 180.
+
+        Raises:
+            TypeError: If latitude or longitude is not a number.
+            ValueError: If latitude or longitude is out of range.
+        """
+        self.__validate_coordinates(latitude, longitude)
+        self.__latitude = float(latitude)
+        self.__longitude = float(longitude)
+
     @property
     def name(self) -> str:
         """Getter method for name property."""
@@ -185,9 +253,9 @@ class Branch:
         self.__phone_number = phone_number
 
     @property
-    def employees(self) -> List["Employee"]:
-        """Getter method for employees"""
-        return self.__employees.copy()
+    def employees(self) -> Sequence["Employee"]:
+        """Getter method for employees, a read-only view which follows later changes"""
+        return self.__employees.view()
 
     @employees.setter
     def employees(self, new_employees: List["Employee"]) -> None:
@@ -195,13 +263,14 @@ class Branch:
         Setter method for employees property.
 
         Args:
-            new_employees (List[Employee]): A list of Employee instances.
+            new_employees (List[Employee]): A list of Employee instances or an employees view.
 
         Raises:
             TypeError: If new_employees is not a list or if employees items are not instances of Employee.
+            ValueError: If an employee is given more than once.
         """
         # Validation
-        if not isinstance(new_employees, list):
+        if not isinstance(new_employees, (list, DictValuesView)):
             raise TypeError("employees must be a list.")
 
         from src.users.employee import Employee  # To avoid circular import
@@ -209,8 +278,8 @@ class Branch:
         if not all(isinstance(emp, Employee) for emp in new_employees):
             raise TypeError("All employees must be instances of Employee class.")
 
-        # Business logic
-        self.__employees = new_employees.copy()
+        # Business logic, the directory is refilled so earlier views follow the new employees
+        self.__employees.replace(new_employees)
 
     def has_employee(self, employee_id: str) -> bool:
         """
@@ -230,7 +299,7 @@ class Branch:
             raise ValueError("Employee ID cannot be empty.")
 
         # Logic
-        return any(emp.id == employee_id for emp in self.__employees)
+        return employee_id in self.__employees
 
     def add_employee(self, employee: "Employee") -> None:
         """
@@ -249,11 +318,8 @@ class Branch:
         if not isinstance(employee, Employee):
             raise TypeError("Employee must be an instance of Employee class.")
 
-        # Validate if employee is not already working in the branch
-        if any(emp.id == employee.id for emp in self.__employees):
-            raise ValueError("Employee is already working in the branch.")
-
-        self.__employees.append(employee)
+        # Raises ValueError if the employee is already working in the branch
+        self.__employees.add(employee)
 
     def remove_employee(self, employee_id: str) -> None:
         """
@@ -270,12 +336,45 @@ class Branch:
         if not isinstance(employee_id, str):
             raise TypeError("Employee ID must be a string.")
 
-        # Check if employee exists in the branch
-        if not self.has_employee(employee_id):
-            raise ValueError("Employee with the given ID is not found.")
+        # Raises ValueError if the employee is not found in the branch
+        self.__employees.remove(employee_id)
+
+    def get_employee(self, employee_id: str) -> Optional["Employee"]:
+        """Returns the employee with the given id, None if the employee is not working in the branch"""
+        return self.__employees.get(employee_id)
+
+    def get_employees_by_role(self, role: str) -> Sequence["Employee"]:
+        """Returns a read-only view of the employees with the given role, "agent" or "manager" """
+        return self.__employees.by_role(role)
+
+    def get_employees_by_employment_type(
+        self, employment_type: EmploymentType
+    ) -> Sequence["Employee"]:
+        """
+        Returns a read-only view of the employees with the given employment type.
+
+        Raises:
+            TypeError: If employment_type is not an EmploymentType enum.
+        """
+        if not isinstance(employment_type, EmploymentType):
+            raise TypeError("employment_type must be an EmploymentType enum.")
+        return self.__employees.by_employment_type(employment_type)
+
+    def get_employees_by_status(self, is_active: bool) -> Sequence["Employee"]:
+        """
+        Returns a read-only view of the active or inactive employees.
+
+        Raises:
+            TypeError: If is_active is not a boolean.
+        """
+        if not isinstance(is_active, bool):
+            raise TypeError("is_active must be a boolean.")
+        return self.__employees.by_status(is_active)
 
-        self.__employees = [emp for emp in self.__employees if emp.id != employee_id]
+    def reindex_employee(self, employee: "Employee") -> None:
+        """Updates the indexes after the employment type or active status of an employee changed"""
+        self.__employees.reindex(employee)
 
     def __str__(self):
         """String representation of the Branch object."""
-        return f"Branch(id={self.__id}, name={self.__name}, city={self.__city}, address={self.__address}, phone_number={self.__phone_number}, employees={self.__employees})"
\ No newline at end of file
+        return f"Branch(id={self.__id}, name={self.__name}, city={self.__city}, address={self.__address}, phone_number={self.__phone_number}, employees={list(self.__employees)})"
\ No newline at end of file
@@ -0,0 +1,436 @@
+"""
+This module implements BranchLocator class, which finds the nearest branches that can serve a
+rental when the requested branch is sold out.
+Branch coordinates are converted to points on the unit sphere and indexed in a KD-tree, so the
+straight-line distance between points orders branches like their great-circle distance, also
+across the antimeridian. The tree is searched best-first, which returns branches one by one in
+order of distance, and the search stops as soon as enough of them have availability. Every
+node of the tree counts the branches below it with an available vehicle of a class, so sold out
+regions are skipped without visiting their branches.
+
+Business Logic:
+    - Only branches with coordinates are indexed.
+    - A branch can serve a rental if a watched vehicle of the vehicle class is AVAILABLE at the
+      branch and every requested add-on is in stock there for the rental window.
+    - Available vehicles are counted per branch and vehicle class from vehicle change events.
+    - Branches added or moved after the last query are indexed again on the next query.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import heapq
+import math
+from datetime import date
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from src.enums import VehicleStatus
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.vehicle.vehicle import Vehicle
+    from src.vehicle.vehicle_class import VehicleClass
+    from src.reservation.add_on import AddOn
+
+EARTH_RADIUS_KM = 6371.0088
+# Branches per leaf of the KD-tree
+_LEAF_SIZE = 8
+
+_Point = Tuple[float, float, float]
+
+
+def haversine_km(
+    latitude: float, longitude: float, other_latitude: float, other_longitude: float
+) -> float:
+    """Returns the great-circle distance between two coordinates in kilometres"""
+    phi, other_phi = math.radians(latitude), math.radians(other_latitude)
+    half_lat = (other_phi - phi) / 2
+    half_lon = math.radians(other_longitude - longitude) / 2
+    a = (
+        math.sin(half_lat) ** 2
+        + math.cos(phi) * math.cos(other_phi) * math.sin(half_lon) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _unit_vector(latitude: float, longitude: float) -> _Point:
+    """Returns the point of a coordinate on the unit sphere"""
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def _chord_to_km(squared_chord: float) -> float:
+    """Converts a squared straight-line distance on the unit sphere to kilometres"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared_chord) / 2))
+
+
+class _KDTree:
+    """
+    Static KD-tree over points on the unit sphere.
+
+    Nodes are (low corner, high corner, left child, right child, first point, stop point), leaves
+    have no children and own the points [first, stop) in the reordered point list.
+    Searches can skip subtrees using per-node counts of the points they are looking for, see
+    count_path.
+    """
+
+    __slots__ = ("points", "order", "nodes", "parents", "leaves")
+
+    def __init__(self, points: List[_Point]) -> None:
+        self.order = list(range(len(points)))
+        self.nodes: List[tuple] = []
+        self.parents: List[int] = []
+        # Leaf node of every original point number
+        self.leaves = [0] * len(points)
+        if points:
+            self.__build(points, 0, len(points), -1)
+        self.points = [points[index] for index in self.order]
+
+    def __build(self, points: List[_Point], first: int, stop: int, parent: int) -> int:
+        """Builds the subtree of the points order[first:stop] and returns its node number"""
+        members = [points[index] for index in self.order[first:stop]]
+        low = tuple(min(point[axis] for point in members) for axis in range(3))
+        high = tuple(max(point[axis] for point in members) for axis in range(3))
+        node = len(self.nodes)
+        self.nodes.append((low, high, -1, -1, first, stop))
+        self.parents.append(parent)
+        if stop - first <= _LEAF_SIZE:
+            for index in self.order[first:stop]:
+                self.leaves[index] = node
+            return node
+
+        axis = max(range(3), key=lambda axis: high[axis] - low[axis])
+        self.order[first:stop] = sorted(
+            self.order[first:stop], key=lambda index: points[index][axis]
+        )
+        middle = (first + stop) // 2
+        left = self.__build(points, first, middle, node)
+        right = self.__build(points, middle, stop, node)
+        self.nodes[node] = (low, high, left, right, first, stop)
+        return node
+
+    @staticmethod
+    def __box_distance(point: _Point, low: tuple, high: tuple) -> float:
+        """Returns the squared distance from a point to a box, 0 inside the box"""
+        distance = 0.0
+        for axis in range(3):
+            value = point[axis]
+            if value < low[axis]:
+                distance += (low[axis] - value) ** 2
+            elif value > high[axis]:
+                distance += (value - high[axis]) ** 2
+        return distance
+
+    def count_path(self, counts: List[int], number: int, delta: int) -> None:
+        """Adds delta to the counts of the nodes from the leaf of a point up to the root"""
+        node = self.leaves[number]
+        while node >= 0:
+            counts[node] += delta
+            node = self.parents[node]
+
+    def nearest(
+        self, point: _Point, counts: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, float]]:
+        """
+        Yields (original point number, squared distance) from the nearest point outwards.
+        With counts, subtrees whose count is 0 are skipped.
+        """
+        if not self.nodes or (counts is not None and not counts[0]):
+            return
+        x, y, z = point
+        points, nodes = self.points, self.nodes
+        # Entries are (squared distance, tie breaker, reference), nodes have references >= 0
+        # and points have ~position, so a point is yielded before boxes at the same distance
+        heap: List[Tuple[float, int, int]] = [(0.0, 0, 0)]
+        tie = 0
+        while heap:
+            distance, _, reference = heapq.heappop(heap)
+            if reference < 0:
+                yield self.order[~reference], distance
+                continue
+
+            low, high, left, right, first, stop = nodes[reference]
+            if left < 0:
+                for position in range(first, stop):
+                    px, py, pz = points[position]
+                    tie += 1
+                    heapq.heappush(
+                        heap,
+                        (
+                            (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2,
+                            -tie,
+                            ~position,
+                        ),
+                    )
+                continue
+            for child in (left, right):
+                if counts is not None and not counts[child]:
+                    continue
+                tie += 1
+                child_low, child_high = nodes[child][0], nodes[child][1]
+                heapq.heappush(
+                    heap,
+                    (self.__box_distance(point, child_low, child_high), tie, child),
+                )
+
+
+class BranchAlternative(NamedTuple):
+    """A branch which can serve a rental, with its distance and available vehicles"""
+
+    branch: "Branch"
+    distance_km: float
+    available_vehicles: int
+
+
+class BranchLocator:
+    """
+    Concrete class indexing branches by location and counting their available vehicles.
+
+    Args:
+        branches (Iterable[Branch]): Branches to index, branches without coordinates are skipped.
+        vehicles (Iterable[Vehicle]): Vehicles whose availability is counted.
+    """
+
+    def __init__(
+        self, branches: Iterable["Branch"] = (), vehicles: Iterable["Vehicle"] = ()
+    ) -> None:
+        """Constructor method for BranchLocator class"""
+        self.__branches: Dict[str, "Branch"] = {}
+        self.__indexed: List["Branch"] = []
+        self.__tree: Optional[_KDTree] = None
+        # Available vehicles per (branch id, vehicle class id), and the key of each vehicle
+        self.__available: Dict[Tuple[str, str], int] = {}
+        self.__vehicle_keys: Dict[str, Optional[Tuple[str, str]]] = {}
+        # Point number of every indexed branch, and per vehicle class the number of branches
+        # with an available vehicle below every node of the tree
+        self.__numbers: Dict[str, int] = {}
+        self.__class_counts: Dict[str, List[int]] = {}
+        self.add_branches(branches)
+        self.watch(vehicles)
+
+    def __len__(self) -> int:
+        """Returns the number of branches with coordinates"""
+        self.__ensure_index()
+        return len(self.__indexed)
+
+    def add_branches(self, branches: Iterable["Branch"]) -> None:
+        """Adds branches, they are indexed on the next query"""
+        from src.branch.branch import Branch
+
+        for branch in branches:
+            if not isinstance(branch, Branch):
+                raise TypeError("branch must be an instance of Branch class.")
+            self.__branches[branch.id] = branch
+        self.__tree = None
+
+    def refresh(self) -> None:
+        """Indexes the branches again, call it after set_coordinates of an indexed branch"""
+        self.__tree = None
+
+    def __ensure_index(self) -> _KDTree:
+        """Builds the KD-tree if branches were added or moved"""
+        if self.__tree is not None:
+            return self.__tree
+        self.__indexed = [
+            branch for branch in self.__branches.values() if branch.latitude is not None
+        ]
+        self.__tree = _KDTree(
+            [
+                _unit_vector(branch.latitude, branch.longitude)
+                for branch in self.__indexed
+            ]
+        )
+        self.__numbers = {
+            branch.id: number for number, branch in enumerate(self.__indexed)
+        }
+        self.__class_counts = {}
+        return self.__tree
+
+    def __counts(self, vehicle_class_id: str) -> List[int]:
+        """Returns the node counts of a vehicle class, building them on first use"""
+        counts = self.__class_counts.get(vehicle_class_id)
+        if counts is None:
+            tree = self.__ensure_index()
+            counts = self.__class_counts[vehicle_class_id] = [0] * len(tree.nodes)
+            for (branch_id, class_id), available in self.__available.items():
+                number = self.__numbers.get(branch_id)
+                if class_id == vehicle_class_id and available and number is not None:
+                    tree.count_path(counts, number, 1)
+        return counts
+
+    def watch(self, vehicles: Iterable["Vehicle"]) -> None:
+        """Counts the available vehicles and follows their status, branch and class changes"""
+        from src.vehicle.vehicle import Vehicle
+
+        for vehicle in vehicles:
+            if not isinstance(vehicle, Vehicle):
+                raise TypeError("vehicle must be an instance of Vehicle class.")
+            if vehicle.id in self.__vehicle_keys:
+                continue
+            self.__vehicle_keys[vehicle.id] = None
+            vehicle.add_change_listener(self.__on_vehicle_change)
+            self.__on_vehicle_change(vehicle, "status")
+
+    def __on_vehicle_change(self, vehicle: "Vehicle", field_name: str) -> None:
+        """Moves a vehicle between the available counters"""
+        if field_name not in ("status", "current_branch", "vehicle_class"):
+            return
+        old_key = self.__vehicle_keys.get(vehicle.id)
+        new_key = None
+        if vehicle.status == VehicleStatus.AVAILABLE.value:
+            new_key = vehicle.current_branch.id, vehicle.vehicle_class.id
+        if new_key == old_key:
+            return
+        if old_key is not None:
+            self.__available[old_key] -= 1
+            if not self.__available[old_key]:
+                self.__count_branch(old_key, -1)
+        if new_key is not None:
+            self.__available[new_key] = self.__available.get(new_key, 0) + 1
+            if self.__available[new_key] == 1:
+                self.__count_branch(new_key, 1)
+        self.__vehicle_keys[vehicle.id] = new_key
+
+    def __count_branch(self, key: Tuple[str, str], delta: int) -> None:
+        """Updates the node counts when a branch gets its first or loses its last vehicle"""
+        branch_id, class_id = key
+        counts = self.__class_counts.get(class_id)
+        number = self.__numbers.get(branch_id)
+        if self.__tree is not None and counts is not None and number is not None:
+            self.__tree.count_path(counts, number, delta)
+
+    def available_vehicles(
+        self, branch: "Branch", vehicle_class: "VehicleClass"
+    ) -> int:
+        """Returns the number of available vehicles of a class at a branch"""
+        return self.__available.get((branch.id, vehicle_class.id), 0)
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 5
+    ) -> List[Tuple["Branch", float]]:
+        """Returns the k nearest branches to a coordinate with their distance in kilometres"""
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        results = []
+        for branch, distance in self.__by_distance(latitude, longitude):
+            results.append((branch, distance))
+            if len(results) == k:
+                break
+        return results
+
+    def __by_distance(
+        self,
+        latitude: float,
+        longitude: float,
+        vehicle_class: Optional["VehicleClass"] = None,
+    ) -> Iterator[Tuple["Branch", float]]:
+        """
+        Yields branches from the nearest to a coordinate outwards. With a vehicle class, parts of
+        the tree without an available vehicle of the class are skipped.
+        """
+        tree = self.__ensure_index()
+        counts = None if vehicle_class is None else self.__counts(vehicle_class.id)
+        point = _unit_vector(latitude, longitude)
+        for number, squared_chord in tree.nearest(point, counts):
+            yield self.__indexed[number], _chord_to_km(squared_chord)
+
+    def nearest_available(
+        self,
+        latitude: float,
+        longitude: float,
+        vehicle_class: "VehicleClass",
+        pickup_date: date,
+        return_date: date,
+        k: int = 5,
+        add_ons: Optional[List["AddOn"]] = None,
+        exclude: Optional["Branch"] = None,
+    ) -> List[BranchAlternative]:
+        """
+        Returns the k nearest branches to a coordinate which can serve a rental.
+
+        Args:
+            latitude (float): Latitude of the customer in degrees.
+            longitude (float): Longitude of the customer in degrees.
+            vehicle_class (VehicleClass): Requested vehicle class.
+            pickup_date (date): Date when the vehicle will be picked up.
+            return_date (date): Date when the vehicle will be returned.
+            k (int): Maximum number of branches.
+            add_ons (Optional[List[AddOn]]): Add-ons which must be in stock for the window.
+            exclude (Optional[Branch]): Branch to leave out, for example the sold out one.
+
+        Returns:
+            List[BranchAlternative]: Branches ordered by distance, fewer than k if no other
+                branch can serve the rental.
+
+        Raises:
+            ValueError: If k is less than 1 or return_date is before pickup_date.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        if return_date < pickup_date:
+            raise ValueError("return_date must be after or equal to pickup_date.")
+
+        results = []
+        for branch, distance in self.__by_distance(latitude, longitude, vehicle_class):
+            if branch is exclude:
+                continue
+            available = self.__available.get((branch.id, vehicle_class.id), 0)
+            if not available:
+                continue
+            if add_ons and not self.__has_add_ons(
+                branch, add_ons, pickup_date, return_date
+            ):
+                continue
+            results.append(BranchAlternative(branch, distance, available))
+            if len(results) == k:
+                break
+        return results
+
+    @staticmethod
+    def __has_add_ons(
+        branch: "Branch", add_ons: List["AddOn"], pickup_date: date, return_date: date
+    ) -> bool:
+        """Returns True if every add-on is unlimited or has a free unit for the window"""
+        inventory = branch.add_on_inventory
+        for add_on in add_ons:
+            available = inventory.available(add_on.id, pickup_date, return_date)
+            if available is not None and available < 1:
+                return False
+        return True
+
+    def alternatives(
+        self,
+        branch: "Branch",
+        vehicle_class: "VehicleClass",
+        pickup_date: date,
+        return_date: date,
+        k: int = 5,
+        add_ons: Optional[List["AddOn"]] = None,
+    ) -> List[BranchAlternative]:
+        """
+        Returns the k nearest other branches to a branch which can serve a rental.
+
+        Raises:
+            ValueError: If the branch has no coordinates.
+        """
+        if branch.latitude is None:
+            raise ValueError("branch has no coordinates.")
+        return self.nearest_available(
+            branch.latitude,
+            branch.longitude,
+            vehicle_class,
+            pickup_date,
+            return_date,
+            k,
+            add_ons,
+            exclude=branch,
+        )
@@ -0,0 +1,184 @@
+"""
+This module implements EmployeeDirectory class, the indexed set of employees of a branch.
+Employees are stored in a dict keyed by id with secondary indexes by role, employment type and
+active status, so membership checks, additions and removals take constant time.
+
+Business Logic:
+    - An employee can be in the directory only once.
+    - Lookups return read-only sequence views which follow later changes of the directory, not
+      copies. Views are created once per index entry and returned again on every lookup.
+    - Employees keep their insertion order in the directory and in every index.
+    - The indexes are updated by reindex() when the role, employment type or active status of
+      an employee changes.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from src.collection_views import DictValuesView, ViewableDict
+from src.enums import EmploymentType
+
+if TYPE_CHECKING:
+    from src.users.employee import Employee
+
+
+class EmployeeDirectory:
+    """
+    Concrete class representing the indexed employees of a branch.
+
+    Args:
+        employees (Optional[Iterable[Employee]]): Initial employees.
+
+    Raises:
+        ValueError: If an employee is given more than once.
+    """
+
+    def __init__(self, employees: Optional[Iterable["Employee"]] = None) -> None:
+        """Constructor method for EmployeeDirectory class"""
+        self.__employees: ViewableDict[str, "Employee"] = ViewableDict()
+        self.__by_role: Dict[str, ViewableDict[str, "Employee"]] = {}
+        self.__by_employment_type: Dict[
+            EmploymentType, ViewableDict[str, "Employee"]
+        ] = {}
+        self.__by_status: Dict[bool, ViewableDict[str, "Employee"]] = {
+            True: ViewableDict(),
+            False: ViewableDict(),
+        }
+        self.__keys: Dict[str, Tuple[str, EmploymentType, bool]] = {}
+
+        for employee in employees or ():
+            self.add(employee)
+
+    def __len__(self) -> int:
+        return len(self.__employees)
+
+    def __iter__(self) -> Iterator["Employee"]:
+        return iter(self.__employees.values())
+
+    def __reduce__(self):
+        # Rebuilt from the employees, the cached views cannot be pickled
+        return type(self), (list(self.__employees.values()),)
+
+    def __reversed__(self) -> Iterator["Employee"]:
+        return reversed(self.__employees.values())
+
+    def __contains__(self, employee_id: object) -> bool:
+        return employee_id in self.__employees
+
+    @staticmethod
+    def __index_keys(employee: "Employee") -> Tuple[str, EmploymentType, bool]:
+        """Returns the role, employment type and active status of an employee"""
+        return (
+            employee.get_role(),
+            EmploymentType(employee.employment_type),
+            employee.is_active,
+        )
+
+    def __index(self, employee: "Employee") -> None:
+        """Adds an employee to the secondary indexes"""
+        keys = self.__keys[employee.id] = self.__index_keys(employee)
+        role, employment_type, is_active = keys
+        self.__by_role.setdefault(role, ViewableDict())[employee.id] = employee
+        self.__by_employment_type.setdefault(employment_type, ViewableDict())[
+            employee.id
+        ] = employee
+        self.__by_status[is_active][employee.id] = employee
+
+    def __unindex(self, employee_id: str) -> None:
+        """Removes an employee from the secondary indexes"""
+        role, employment_type, is_active = self.__keys.pop(employee_id)
+        del self.__by_role[role][employee_id]
+        del self.__by_employment_type[employment_type][employee_id]
+        del self.__by_status[is_active][employee_id]
+
+    def get(self, employee_id: str) -> Optional["Employee"]:
+        """Returns the employee with the given id, None if it is not in the directory"""
+        return self.__employees.get(employee_id)
+
+    def add(self, employee: "Employee") -> None:
+        """
+        Adds an employee to the directory.
+
+        Raises:
+            ValueError: If the employee is already in the directory.
+        """
+        if employee.id in self.__employees:
+            raise ValueError("Employee is already working in the branch.")
+        self.__employees[employee.id] = employee
+        self.__index(employee)
+
+    def remove(self, employee_id: str) -> "Employee":
+        """
+        Removes an employee from the directory and returns it.
+
+        Raises:
+            ValueError: If no employee has the given id.
+        """
+        employee = self.__employees.pop(employee_id, None)
+        if employee is None:
+            raise ValueError("Employee with the given ID is not found.")
+        self.__unindex(employee_id)
+        return employee
+
+    def replace(self, employees: Iterable["Employee"]) -> None:
+        """
+        Replaces every employee of the directory, views returned before follow the new employees.
+
+        Raises:
+            ValueError: If an employee is given more than once. The directory is not changed.
+        """
+        # Copied first, employees may be a view of this directory
+        employees = list(employees)
+        if len({employee.id for employee in employees}) != len(employees):
+            raise ValueError("Employee is already working in the branch.")
+
+        # Index entries are emptied, not removed, so their views stay valid
+        self.__employees.clear()
+        self.__keys.clear()
+        for index in (self.__by_role, self.__by_employment_type, self.__by_status):
+            for entry in index.values():
+                entry.clear()
+        for employee in employees:
+            self.add(employee)
+
+    def reindex(self, employee: "Employee") -> None:
+        """Moves an employee to the index entries of its current role, employment type and status"""
+        keys = self.__keys.get(employee.id)
+        if keys is None or keys == self.__index_keys(employee):
+            return
+        self.__unindex(employee.id)
+        self.__index(employee)
+
+    @staticmethod
+    def __view_of(
+        index: Dict[object, ViewableDict[str, "Employee"]], key: object
+    ) -> DictValuesView["Employee"]:
+        """Returns the view of an index entry, index entries are never replaced"""
+        return index.setdefault(key, ViewableDict()).view
+
+    def view(self) -> DictValuesView["Employee"]:
+        """Returns a read-only view of all employees"""
+        return self.__employees.view
+
+    def by_role(self, role: str) -> DictValuesView["Employee"]:
+        """Returns a read-only view of the employees with the given role, such as "agent" """
+        return self.__view_of(self.__by_role, role)
+
+    def by_employment_type(
+        self, employment_type: EmploymentType
+    ) -> DictValuesView["Employee"]:
+        """Returns a read-only view of the employees with the given employment type"""
+        return self.__view_of(self.__by_employment_type, employment_type)
+
+    def by_status(self, is_active: bool) -> DictValuesView["Employee"]:
+        """Returns a read-only view of the active or inactive employees"""
+        return self.__view_of(self.__by_status, is_active)
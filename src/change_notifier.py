@@ -0,0 +1,82 @@
+"""
+This module implements the ChangeNotifier mixin, the change listeners of domain objects.
+Indexes, caches and aggregates register a listener on the objects they depend on and are called
+as listener(obj, field_name) after a field changed, instead of polling the objects.
+
+Business Logic:
+    - Listeners are called in registration order after the new value is set.
+    - A listener can reject a change by raising. If the setter passes an undo callback, the old
+      value is restored, the listeners notified so far are notified again and the exception is
+      raised to the caller of the setter.
+    - Listeners are local to the process. They are not pickled, and objects decoded by the binary
+      codec or restored from a snapshot start without listeners.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Name mangled attribute of the listener list, transient in the binary codec schemas
+CHANGE_LISTENERS_ATTRIBUTE = "_ChangeNotifier__change_listeners"
+
+
+class ChangeNotifier:
+    """
+    Mixin keeping the change listeners of an object.
+    Classes call ChangeNotifier.__init__ in their constructor and _publish_change in their setters.
+    """
+
+    def __init__(self) -> None:
+        """Constructor method for ChangeNotifier class"""
+        self.__change_listeners: List[Callable[[Any, str], None]] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drops change listeners when the object is pickled"""
+        state = self.__dict__.copy()
+        state[CHANGE_LISTENERS_ATTRIBUTE] = []
+        return state
+
+    def add_change_listener(self, listener: Callable[[Any, str], None]) -> None:
+        """
+        Registers a listener which is called as listener(obj, field_name) after a change.
+
+        Args:
+            listener (Callable[[Any, str], None]): The listener to register.
+
+        Raises:
+            TypeError: If listener is not callable.
+        """
+        if not callable(listener):
+            raise TypeError("listener must be callable")
+
+        self.__change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[Any, str], None]) -> None:
+        """Removes a registered change listener"""
+        if listener in self.__change_listeners:
+            self.__change_listeners.remove(listener)
+
+    def _publish_change(
+        self, field_name: str, undo: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Notifies change listeners about a changed field.
+
+        Args:
+            field_name (str): Name of the changed field.
+            undo (Optional[Callable[[], None]]): Restores the old value if a listener raises.
+        """
+        if undo is None:
+            for listener in self.__change_listeners:
+                listener(self, field_name)
+            return
+
+        for index, listener in enumerate(self.__change_listeners):
+            try:
+                listener(self, field_name)
+            except Exception:
+                undo()
+                for notified in self.__change_listeners[:index]:
+                    notified(self, field_name)
+                raise
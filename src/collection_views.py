@@ -0,0 +1,236 @@
+"""
+This module implements read-only views of lists, returned by getters instead of defensive copies.
+A ListView wraps a list without copying it, so returning it costs nothing, and it has no methods
+that change the list. A ViewableList is a list which keeps one ListView of itself, so a getter
+returns the same view object on every access. A ViewableDict does the same for the values of
+a dict, so an index keyed by id is also a sequence in insertion order.
+
+Business Logic:
+    - A view follows later changes of its list, copy() or list(view) takes a snapshot.
+    - Indexing, len() and iteration are as fast as on the list, slicing returns a new list.
+    - A view compares equal to a list, tuple or view with equal items.
+    - Owners store a ViewableList and change it in place, also when the whole list is set,
+      so views handed out earlier follow every change.
+    - A DictValuesView indexes the values of its dict through a list of them, which is rebuilt
+      on the first indexing after the dict changed. Length, iteration and membership use the
+      dict directly.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+class ListView(Sequence[T]):
+    """
+    Read-only view of a list.
+
+    Args:
+        items (List[T]): The list to view, it is not copied.
+    """
+
+    __slots__ = ("__items",)
+
+    def __init__(self, items: List[T]) -> None:
+        """Constructor method for ListView class"""
+        self.__items = items
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        return self.__items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.__items)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self.__items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.__items
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ListView):
+            return self.__items == other.__items
+        if isinstance(other, (list, tuple)):
+            return len(self.__items) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self.__items, other)
+            )
+        return NotImplemented
+
+    # Views follow a mutable list, so they cannot be hashed
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.__items)
+
+    def index(self, item: T, start: int = 0, stop: int = None) -> int:
+        """Returns the first index of an item, raises ValueError if it is not in the list"""
+        if stop is None:
+            return self.__items.index(item, start)
+        return self.__items.index(item, start, stop)
+
+    def count(self, item: T) -> int:
+        """Returns the number of occurrences of an item"""
+        return self.__items.count(item)
+
+    def copy(self) -> List[T]:
+        """Returns a new list with the current items"""
+        return self.__items.copy()
+
+
+class ViewableList(List[T]):
+    """
+    List which keeps a read-only view of itself.
+
+    Args:
+        items (Iterable[T]): Initial items, copied into the list.
+    """
+
+    __slots__ = ("view",)
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        """Constructor method for ViewableList class"""
+        super().__init__(items)
+        self.view: ListView[T] = ListView(self)
+
+    def __reduce_ex__(self, protocol):
+        # Rebuilt from the items, so the view is created again instead of being pickled
+        return type(self), (list(self),)
+
+
+class DictValuesView(Sequence[T]):
+    """
+    Read-only sequence view of the values of a ViewableDict, in insertion order.
+
+    Args:
+        items (ViewableDict[K, T]): The dict to view, it is not copied.
+    """
+
+    __slots__ = ("__items", "__values")
+
+    def __init__(self, items: "ViewableDict") -> None:
+        """Constructor method for DictValuesView class"""
+        self.__items = items
+        self.__values: Optional[List[T]] = None
+
+    def _invalidate(self) -> None:
+        """Drops the list of values, called by the dict whenever it changes"""
+        self.__values = None
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if self.__values is None:
+            self.__values = list(self.__items.values())
+        return self.__values[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.__items.values())
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self.__items.values())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.__items.values()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (DictValuesView, ListView, list, tuple)):
+            return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other)
+            )
+        return NotImplemented
+
+    # Views follow a mutable dict, so they cannot be hashed
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self.__items.values()))
+
+    def copy(self) -> List[T]:
+        """Returns a new list with the current values"""
+        return list(self.__items.values())
+
+
+class ViewableDict(Dict[K, T]):
+    """
+    Dict which keeps a read-only sequence view of its values.
+
+    Args:
+        items (Iterable[Tuple[K, T]]): Initial items, copied into the dict.
+    """
+
+    __slots__ = ("view",)
+
+    def __init__(self, items: Iterable[Tuple[K, T]] = ()) -> None:
+        """Constructor method for ViewableDict class"""
+        super().__init__(items)
+        self.view: DictValuesView[T] = DictValuesView(self)
+
+    def __setitem__(self, key: K, value: T) -> None:
+        super().__setitem__(key, value)
+        self.view._invalidate()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        self.view._invalidate()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.view._invalidate()
+        return value
+
+    def popitem(self) -> Tuple[K, T]:
+        item = super().popitem()
+        self.view._invalidate()
+        return item
+
+    def setdefault(self, key: K, default: T = None) -> T:
+        value = super().setdefault(key, default)
+        self.view._invalidate()
+        return value
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.view._invalidate()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.view._invalidate()
+
+    def __reduce_ex__(self, protocol):
+        # Rebuilt from the items, so the view is created again instead of being pickled
+        return type(self), (list(self.items()),)
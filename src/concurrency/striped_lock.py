@@ -0,0 +1,64 @@
+"""
+This module implements StripedLock class which is used to guard state transitions of entities.
+Instead of having a single global lock (which serializes the whole application) or one lock per
+entity (which grows without bound), a fixed number of locks is created and every entity id is
+mapped to one of them by its hash. Operations on different entities almost never share a lock,
+so they can run concurrently, while operations on the same entity are always serialized.
+
+Business Logic:
+    - Number of stripes is fixed on initialization and must be a positive power of two.
+    - The same key is always mapped to the same lock.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import threading
+from typing import Hashable, List
+
+
+class StripedLock:
+    """
+    Concrete class representing a set of striped locks.
+
+    Args:
+        stripes (int): Number of locks in the set. Defaults to 256.
+
+    Raises:
+        TypeError: If stripes is not an integer.
+        ValueError: If stripes is not a positive power of two.
+    """
+
+    def __init__(self, stripes: int = 256) -> None:
+        """Constructor method for StripedLock class."""
+        # Validate stripes
+        if not isinstance(stripes, int) or isinstance(stripes, bool):
+            raise TypeError("stripes must be an integer.")
+        if stripes <= 0 or stripes & (stripes - 1) != 0:
+            raise ValueError("stripes must be a positive power of two.")
+
+        # Assign values
+        self.__mask = stripes - 1
+        self.__locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    @property
+    def stripes(self) -> int:
+        """Getter for stripes property."""
+        return len(self.__locks)
+
+    def lock_for(self, key: Hashable) -> threading.Lock:
+        """
+        Returns the lock which guards the given key.
+
+        Args:
+            key (Hashable): Key of the entity, usually its id.
+
+        Returns:
+            threading.Lock: Lock of the stripe that the key belongs to.
+        """
+        return self.__locks[hash(key) & self.__mask]
+
+
+# Shared lock sets of the application
+vehicle_locks = StripedLock()
+reservation_locks = StripedLock()
@@ -30,3 +30,25 @@ class ReservationNotApprovedError(Exception):
 class ReservationNotFoundError(Exception):
     def __init__(self, reservation_id: str):
         super().__init__(f"Reservation with ID {reservation_id} not found.")
+
+
+class UnresolvedReferenceError(Exception):
+    def __init__(self, object_id: str):
+        super().__init__(f"Referenced object with ID {object_id} is not known.")
+
+
+class DuplicateEmailError(Exception):
+    def __init__(self, email: str):
+        super().__init__(f"A customer with email {email} already exists.")
+
+
+class AddOnUnavailableError(Exception):
+    def __init__(self, add_on_id: str, pickup_date, return_date):
+        super().__init__(
+            f"Add-on {add_on_id} is not available from {pickup_date} to {return_date}."
+        )
+
+
+class WaitlistRequestNotFoundError(Exception):
+    def __init__(self, request_id: str):
+        super().__init__(f"Waitlist request with ID {request_id} is not waiting.")
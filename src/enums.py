@@ -48,3 +48,30 @@ class InvoiceStatus(Enum):
     PENDING = "pending"
     COMPLETED = "completed"
     FAILED = "failed"
+
+
+class ExportFormat(Enum):
+    """Invoice export format enumeration."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+    JSONL_GZIP = "jsonl.gz"
+
+
+class RepricingPolicy(Enum):
+    """Policy deciding whether an open reservation keeps its quoted total after a price change."""
+
+    REPRICE = "reprice"
+    HONOUR_QUOTE = "honour_quote"
+    HONOUR_APPROVED = "honour_approved"
+    LOWER_ONLY = "lower_only"
+
+
+class TelemetryAnomalyType(Enum):
+    """Vehicle telemetry anomaly type enumeration."""
+
+    UNKNOWN_VEHICLE = "unknown_vehicle"
+    INVALID_READING = "invalid_reading"
+    NEGATIVE_FUEL = "negative_fuel"
+    ODOMETER_ROLLBACK = "odometer_rollback"
+    ODOMETER_JUMP = "odometer_jump"
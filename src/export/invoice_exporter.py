@@ -0,0 +1,293 @@
+"""
+This module implements a streaming invoice exporter for accounting.
+Invoices flow through a pipeline of generators: they are filtered, turned into rows with their
+reservation, customer and line items, encoded as CSV or JSON lines and written in bounded-size
+chunks. Only one chunk is held in memory at a time, so memory stays flat for any number of
+invoices.
+
+Pipeline:
+    invoices_of(customers) -> filter_invoices(...) -> invoice_rows(...) -> encode_rows(...) -> file
+
+Business Logic:
+    - Line items and the discount are exported from the price quote of the invoice, the cents
+      which were billed. Later changes of prices or rates do not change exported amounts, and
+      amounts add up to the invoice total exactly.
+    - The branch filter matches the pickup branch of the reservation.
+    - Date filters are inclusive and use the invoice date.
+    - Invoices of archived reservations are read from the active reservation archive.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import io
+import csv
+import gzip
+import json
+from datetime import date
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    TYPE_CHECKING,
+)
+
+from src.enums import ExportFormat, InvoiceStatus
+from src.money import to_amount
+
+if TYPE_CHECKING:
+    from src.users.customer import Customer
+    from src.reservation.invoice import Invoice
+    from src.pricing_strategy.price_quote import LineItem
+
+# Columns of an exported row, line items are exported as a list in JSON and as totals in CSV
+CSV_COLUMNS: List[str] = [
+    "invoice_id",
+    "invoice_date",
+    "invoice_status",
+    "reservation_id",
+    "reservation_status",
+    "customer_id",
+    "customer_name",
+    "customer_email",
+    "pickup_branch_id",
+    "return_branch_id",
+    "pickup_date",
+    "return_date",
+    "rental_days",
+    "vehicle_id",
+    "vehicle_licence_plate",
+    "vehicle_class",
+    "insurance_tier",
+    "add_ons",
+    "vehicle_amount",
+    "insurance_amount",
+    "add_ons_amount",
+    "discount",
+    "total_price",
+]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# zlib default level, level 9 of GzipFile is about three times slower for a few percent smaller files
+GZIP_COMPRESS_LEVEL = 6
+
+
+def invoices_of(customers: Iterable["Customer"]) -> Iterator["Invoice"]:
+    """Yields the invoice of every reservation of the given customers, archived ones included"""
+    for customer in customers:
+        for reservation in customer.get_reservations():
+            yield reservation.invoice
+
+
+def filter_invoices(
+    invoices: Iterable["Invoice"],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    statuses: Optional[Iterable[InvoiceStatus]] = None,
+    branch_ids: Optional[Iterable[str]] = None,
+) -> Iterator["Invoice"]:
+    """
+    Yields invoices matching every given filter.
+
+    Args:
+        invoices (Iterable[Invoice]): Invoices to filter.
+        start_date (Optional[date]): First invoice date to include.
+        end_date (Optional[date]): Last invoice date to include.
+        statuses (Optional[Iterable[InvoiceStatus]]): Invoice statuses to include.
+        branch_ids (Optional[Iterable[str]]): Pickup branch ids to include.
+
+    Raises:
+        TypeError: If a status is not an InvoiceStatus enum.
+        ValueError: If end_date is before start_date.
+    """
+    if start_date is not None and end_date is not None and end_date < start_date:
+        raise ValueError("end_date cannot be before start_date.")
+    status_values = None
+    if statuses is not None:
+        statuses = list(statuses)
+        if not all(isinstance(status, InvoiceStatus) for status in statuses):
+            raise TypeError("statuses must be instances of InvoiceStatus enum.")
+        status_values = {status.value for status in statuses}
+    branch_ids = set(branch_ids) if branch_ids is not None else None
+
+    for invoice in invoices:
+        if start_date is not None and invoice.date < start_date:
+            continue
+        if end_date is not None and invoice.date > end_date:
+            continue
+        if status_values is not None and invoice.status not in status_values:
+            continue
+        if (
+            branch_ids is not None
+            and invoice.reservation.pickup_branch.id not in branch_ids
+        ):
+            continue
+        yield invoice
+
+
+def _line_item(line_item: "LineItem") -> Dict[str, Any]:
+    """Returns a line item of a price quote, with its cents exported as amounts"""
+    return {
+        "item": line_item.item,
+        "description": line_item.description,
+        "days": line_item.days,
+        "price_per_day": to_amount(line_item.price_per_day_cents),
+        "amount": to_amount(line_item.amount_cents),
+    }
+
+
+def invoice_rows(invoices: Iterable["Invoice"]) -> Iterator[Dict[str, Any]]:
+    """Yields one export row per invoice, with its reservation, customer and billed line items"""
+    for invoice in invoices:
+        reservation = invoice.reservation
+        customer = invoice.creator
+        vehicle = reservation.vehicle
+        quote = invoice.price_quote
+        rental_days = (reservation.return_date - reservation.pickup_date).days
+
+        yield {
+            "invoice_id": invoice.id,
+            "invoice_date": invoice.date.isoformat(),
+            "invoice_status": invoice.status,
+            "reservation_id": reservation.id,
+            "reservation_status": reservation.status,
+            "customer_id": customer.id,
+            "customer_name": f"{customer.first_name} {customer.last_name}",
+            "customer_email": customer.email,
+            "pickup_branch_id": reservation.pickup_branch.id,
+            "return_branch_id": reservation.return_branch.id,
+            "pickup_date": reservation.pickup_date.isoformat(),
+            "return_date": reservation.return_date.isoformat(),
+            "rental_days": rental_days,
+            "vehicle_id": vehicle.id,
+            "vehicle_licence_plate": vehicle.licence_plate,
+            "vehicle_class": vehicle.vehicle_class.name,
+            "insurance_tier": reservation.insurance_tier.tier_name,
+            "add_ons": ";".join(
+                line_item.description
+                for line_item in quote.line_items
+                if line_item.item == "add_on"
+            ),
+            "vehicle_amount": to_amount(quote.amount_of("vehicle")),
+            "insurance_amount": to_amount(quote.amount_of("insurance")),
+            "add_ons_amount": to_amount(quote.amount_of("add_on")),
+            "discount": to_amount(quote.discount_cents),
+            "total_price": invoice.total_price,
+            "line_items": [_line_item(line_item) for line_item in quote.line_items],
+        }
+
+
+def encode_rows(
+    rows: Iterable[Dict[str, Any]],
+    export_format: ExportFormat,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encodes rows and yields them as UTF-8 chunks of about chunk_size bytes.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Rows created by invoice_rows.
+        export_format (ExportFormat): Format of the rows, JSONL_GZIP rows are encoded as JSONL.
+        chunk_size (int): Size of a chunk in characters before it is yielded.
+
+    Raises:
+        TypeError: If export_format is not an ExportFormat enum.
+        ValueError: If chunk_size is not positive.
+    """
+    if not isinstance(export_format, ExportFormat):
+        raise TypeError("export_format must be an instance of ExportFormat enum.")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    buffer = io.StringIO()
+    if export_format is ExportFormat.CSV:
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        write_row = writer.writerow
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+        def write_row(row: Dict[str, Any]) -> None:
+            buffer.write(encoder.encode(row))
+            buffer.write("\n")
+
+    for row in rows:
+        write_row(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _counted(
+    rows: Iterable[Dict[str, Any]], counter: List[int]
+) -> Iterator[Dict[str, Any]]:
+    """Passes rows through and counts them"""
+    for row in rows:
+        counter[0] += 1
+        yield row
+
+
+def export_invoices(
+    invoices: Iterable["Invoice"],
+    destination: Union[str, Path, BinaryIO],
+    export_format: ExportFormat = ExportFormat.CSV,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    statuses: Optional[Iterable[InvoiceStatus]] = None,
+    branch_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Streams invoices into a file.
+
+    Args:
+        invoices (Iterable[Invoice]): Invoices to export, for example invoices_of(customers).
+        destination (Union[str, Path, BinaryIO]): Path of the file or a binary file object.
+        export_format (ExportFormat): CSV, JSONL or gzip-compressed JSONL.
+        chunk_size (int): Size of a written chunk before compression.
+        start_date, end_date, statuses, branch_ids: Filters, see filter_invoices.
+
+    Returns:
+        int: Number of exported invoices.
+    """
+    counter = [0]
+    rows = _counted(
+        invoice_rows(
+            filter_invoices(invoices, start_date, end_date, statuses, branch_ids)
+        ),
+        counter,
+    )
+    chunks = encode_rows(rows, export_format, chunk_size)
+
+    if isinstance(destination, (str, Path)):
+        with open(destination, "wb") as file:
+            _write_chunks(chunks, file, export_format)
+    else:
+        _write_chunks(chunks, destination, export_format)
+    return counter[0]
+
+
+def _write_chunks(
+    chunks: Iterable[bytes], file: BinaryIO, export_format: ExportFormat
+) -> None:
+    """Writes chunks into a binary file, compressing them for JSONL_GZIP"""
+    if export_format is ExportFormat.JSONL_GZIP:
+        with gzip.GzipFile(
+            fileobj=file, mode="wb", compresslevel=GZIP_COMPRESS_LEVEL
+        ) as compressed:
+            for chunk in chunks:
+                compressed.write(chunk)
+    else:
+        for chunk in chunks:
+            file.write(chunk)
@@ -0,0 +1,156 @@
+"""
+This module implements an HDR-style latency histogram.
+Values are recorded into log-linear buckets: every power of two is split into equally sized
+sub-buckets, so the relative error of a bucket is the same for microseconds and for seconds and
+the histogram has a fixed, small size no matter how many values are recorded.
+
+Business Logic:
+    - Values are non-negative integers, for example nanoseconds.
+    - With the default precision of 7 sub-bucket bits, a value is reported with a relative error
+      below 1/64 (about two significant digits).
+    - Updates are not locked. Under concurrent updates a count may be lost, which is acceptable
+      for latency statistics.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+# Largest value which can be recorded, larger values are clamped (about 18 minutes in nanoseconds)
+MAX_VALUE = (1 << 40) - 1
+
+
+class LatencyHistogram:
+    """
+    Concrete class representing a log-linear latency histogram.
+
+    Args:
+        sub_bucket_bits (int): Number of bits of precision, every power of two is split into
+            2 ** (sub_bucket_bits - 1) sub-buckets.
+
+    Raises:
+        ValueError: If sub_bucket_bits is not between 2 and 16.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7) -> None:
+        """Constructor method for LatencyHistogram class"""
+        if not isinstance(sub_bucket_bits, int) or not 2 <= sub_bucket_bits <= 16:
+            raise ValueError("sub_bucket_bits must be an integer between 2 and 16")
+
+        self.__bits = sub_bucket_bits
+        self.__half = 1 << (sub_bucket_bits - 1)
+        self.__counts: List[int] = [0] * (self.__index_of(MAX_VALUE) + 1)
+        self.__count = 0
+        self.__total = 0
+        self.__min = 0
+        self.__max = 0
+
+    def __index_of(self, value: int) -> int:
+        """Returns the bucket index of a value"""
+        shift = value.bit_length() - self.__bits
+        if shift <= 0:
+            return value
+        return shift * self.__half + (value >> shift)
+
+    def __lower_bound(self, index: int) -> int:
+        """Returns the smallest value of a bucket"""
+        if index < 2 * self.__half:
+            return index
+        shift = index // self.__half - 1
+        return (index - shift * self.__half) << shift
+
+    def __upper_bound(self, index: int) -> int:
+        """Returns the largest value of a bucket"""
+        return self.__lower_bound(index + 1) - 1
+
+    @property
+    def count(self) -> int:
+        """Getter for count property."""
+        return self.__count
+
+    @property
+    def total(self) -> int:
+        """Getter for total property, the sum of all recorded values."""
+        return self.__total
+
+    @property
+    def min(self) -> int:
+        """Getter for min property."""
+        return self.__min
+
+    @property
+    def max(self) -> int:
+        """Getter for max property."""
+        return self.__max
+
+    def record(self, value: int) -> None:
+        """Records one value, negative values are recorded as 0"""
+        if value < 0:
+            value = 0
+        elif value > MAX_VALUE:
+            value = MAX_VALUE
+        self.__counts[self.__index_of(value)] += 1
+        if self.__count == 0 or value < self.__min:
+            self.__min = value
+        if value > self.__max:
+            self.__max = value
+        self.__count += 1
+        self.__total += value
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Returns the value below which the given percentage of recorded values fall.
+
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            int: The upper bound of the bucket holding the percentile, 0 if nothing was recorded.
+
+        Raises:
+            ValueError: If percentile is not between 0 and 100.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if self.__count == 0:
+            return 0
+
+        rank = max(1, round(self.__count * percentile / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.__counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.__upper_bound(index), self.__max)
+        return self.__max
+
+    def buckets(self) -> Iterator[Tuple[int, int]]:
+        """Yields (upper bound, count) of every non-empty bucket in increasing order"""
+        for index, bucket_count in enumerate(self.__counts):
+            if bucket_count:
+                yield self.__upper_bound(index), bucket_count
+
+    def cumulative_counts(self, bounds: List[int]) -> Dict[int, int]:
+        """Returns the number of values less than or equal to each bound, as Prometheus buckets"""
+        result = dict.fromkeys(bounds, 0)
+        sorted_bounds = sorted(bounds)
+        position = 0
+        seen = 0
+        for upper_bound, bucket_count in self.buckets():
+            while (
+                position < len(sorted_bounds) and sorted_bounds[position] < upper_bound
+            ):
+                result[sorted_bounds[position]] = seen
+                position += 1
+            seen += bucket_count
+        for bound in sorted_bounds[position:]:
+            result[bound] = seen
+        return result
+
+    def reset(self) -> None:
+        """Removes all recorded values"""
+        self.__counts = [0] * len(self.__counts)
+        self.__count = 0
+        self.__total = 0
+        self.__min = 0
+        self.__max = 0
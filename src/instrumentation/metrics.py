@@ -0,0 +1,293 @@
+"""
+This module implements low-overhead timing spans and counters for the domain hot paths.
+Hot methods are wrapped with the `instrumented` decorator and ad-hoc blocks can be timed with `span`.
+Every measurement belongs to a subsystem which can be switched on and off at runtime, the
+collected metrics are exported in the Prometheus text format.
+
+Business Logic:
+    - Subsystems: reservation, pricing, payment, notification and agent. All are off by default.
+    - The CRFMS_INSTRUMENTATION environment variable switches subsystems on at import, as a comma
+      separated list or "all".
+    - When a subsystem is off, an instrumented call costs one attribute check on top of the call.
+    - When a subsystem is on, every call records its latency in nanoseconds into an HDR-style
+      histogram and increments a calls counter, failed calls also increment an errors counter.
+    - Metrics are exported as Prometheus text, either as a string or into a local file which is
+      replaced atomically so a scraper never reads a partial file.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+import functools
+from time import perf_counter_ns
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from src.instrumentation.histogram import LatencyHistogram
+
+SUBSYSTEMS = ("reservation", "pricing", "payment", "notification", "agent")
+
+ENVIRONMENT_VARIABLE = "CRFMS_INSTRUMENTATION"
+
+METRIC_PREFIX = "crfms"
+
+# Prometheus bucket bounds in seconds, from 1 microsecond to 10 seconds in a 1-2.5-5 series
+PROMETHEUS_BUCKETS = tuple(
+    round(mantissa * 10.0**exponent, 9)
+    for exponent in range(-6, 1)
+    for mantissa in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+F = TypeVar("F", bound=Callable)
+
+
+class Subsystem:
+    """
+    Concrete class holding the switch, histograms and counters of one subsystem.
+
+    Args:
+        name (str): Name of the subsystem.
+    """
+
+    __slots__ = ("name", "enabled", "histograms", "counters")
+
+    def __init__(self, name: str) -> None:
+        """Constructor method for Subsystem class"""
+        self.name = name
+        self.enabled = False
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def histogram(self, operation: str) -> LatencyHistogram:
+        """Returns the latency histogram of an operation, creating it on first use"""
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = LatencyHistogram()
+        return histogram
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """Increments a counter"""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self) -> None:
+        """Removes all collected metrics and keeps the switch as is"""
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.counters.clear()
+
+
+_subsystems: Dict[str, Subsystem] = {name: Subsystem(name) for name in SUBSYSTEMS}
+
+
+def get_subsystem(name: str) -> Subsystem:
+    """
+    Returns a subsystem by name.
+
+    Raises:
+        ValueError: If the subsystem does not exist.
+    """
+    subsystem = _subsystems.get(name)
+    if subsystem is None:
+        raise ValueError(
+            f"Unknown subsystem '{name}', expected one of {', '.join(SUBSYSTEMS)}"
+        )
+    return subsystem
+
+
+def _resolve(names: Iterable[str]) -> List[Subsystem]:
+    """Returns the subsystems for names, no names means all subsystems"""
+    names = list(names)
+    if not names:
+        return list(_subsystems.values())
+    return [get_subsystem(name) for name in names]
+
+
+def enable(*names: str) -> None:
+    """Switches the given subsystems on, all subsystems if none is given"""
+    for subsystem in _resolve(names):
+        subsystem.enabled = True
+
+
+def disable(*names: str) -> None:
+    """Switches the given subsystems off, all subsystems if none is given"""
+    for subsystem in _resolve(names):
+        subsystem.enabled = False
+
+
+def is_enabled(name: str) -> bool:
+    """Returns True if the subsystem is switched on"""
+    return get_subsystem(name).enabled
+
+
+def reset(*names: str) -> None:
+    """Removes collected metrics of the given subsystems, all subsystems if none is given"""
+    for subsystem in _resolve(names):
+        subsystem.reset()
+
+
+def configure_from_environment(value: Optional[str] = None) -> None:
+    """
+    Switches subsystems on from a comma separated list such as "pricing,payment" or "all".
+
+    Args:
+        value (Optional[str]): The list, the CRFMS_INSTRUMENTATION environment variable by default.
+
+    Raises:
+        ValueError: If a subsystem in the list does not exist.
+    """
+    if value is None:
+        value = os.environ.get(ENVIRONMENT_VARIABLE, "")
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    if "all" in names:
+        enable()
+    elif names:
+        enable(*names)
+
+
+def instrumented(subsystem_name: str, operation: str) -> Callable[[F], F]:
+    """
+    Decorator timing every call of a function while its subsystem is switched on.
+
+    Args:
+        subsystem_name (str): Subsystem the function belongs to.
+        operation (str): Name of the operation in the exported metrics.
+
+    Returns:
+        Callable: The decorator. The original function is available as __wrapped__.
+    """
+    subsystem = get_subsystem(subsystem_name)
+    histogram = subsystem.histogram(operation)
+    calls_counter = f"{operation}_calls"
+    errors_counter = f"{operation}_errors"
+    counters = subsystem.counters
+
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not subsystem.enabled:
+                return function(*args, **kwargs)
+
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                counters[errors_counter] = counters.get(errors_counter, 0) + 1
+                raise
+            finally:
+                histogram.record(perf_counter_ns() - start)
+                counters[calls_counter] = counters.get(calls_counter, 0) + 1
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def span(subsystem_name: str, operation: str) -> Iterator[None]:
+    """
+    Context manager timing a block of code while its subsystem is switched on.
+
+    Args:
+        subsystem_name (str): Subsystem the block belongs to.
+        operation (str): Name of the operation in the exported metrics.
+    """
+    subsystem = get_subsystem(subsystem_name)
+    if not subsystem.enabled:
+        yield
+        return
+
+    start = perf_counter_ns()
+    try:
+        yield
+    except BaseException:
+        subsystem.increment(f"{operation}_errors")
+        raise
+    finally:
+        subsystem.histogram(operation).record(perf_counter_ns() - start)
+        subsystem.increment(f"{operation}_calls")
+
+
+def count(subsystem_name: str, counter: str, amount: int = 1) -> None:
+    """Increments a counter of a subsystem while the subsystem is switched on"""
+    subsystem = get_subsystem(subsystem_name)
+    if subsystem.enabled:
+        subsystem.increment(counter, amount)
+
+
+def export_prometheus() -> str:
+    """
+    Returns all collected metrics in the Prometheus text exposition format.
+
+    Latencies are exported as one histogram per subsystem with an operation label, counters as
+    one counter per subsystem and counter name. Operations without calls are left out.
+    """
+    bounds_ns = [round(bound * 1e9) for bound in PROMETHEUS_BUCKETS]
+    lines: List[str] = []
+
+    for subsystem in _subsystems.values():
+        histograms = [
+            (operation, histogram)
+            for operation, histogram in sorted(subsystem.histograms.items())
+            if histogram.count
+        ]
+        if histograms:
+            metric = f"{METRIC_PREFIX}_{subsystem.name}_latency_seconds"
+            lines.append(f"# HELP {metric} Latency of {subsystem.name} operations.")
+            lines.append(f"# TYPE {metric} histogram")
+            for operation, histogram in histograms:
+                cumulative = histogram.cumulative_counts(bounds_ns)
+                for bound, bound_ns in zip(PROMETHEUS_BUCKETS, bounds_ns):
+                    lines.append(
+                        f'{metric}_bucket{{operation="{operation}",le="{bound:g}"}} {cumulative[bound_ns]}'
+                    )
+                lines.append(
+                    f'{metric}_bucket{{operation="{operation}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(
+                    f'{metric}_sum{{operation="{operation}"}} {histogram.total / 1e9:.9f}'
+                )
+                lines.append(
+                    f'{metric}_count{{operation="{operation}"}} {histogram.count}'
+                )
+
+        for counter, value in sorted(subsystem.counters.items()):
+            metric = f"{METRIC_PREFIX}_{subsystem.name}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write_prometheus(path: str) -> None:
+    """
+    Writes all collected metrics in the Prometheus text format into a local file.
+    The file is written next to its destination and renamed, so readers never see a partial file.
+
+    Args:
+        path (str): Destination file, for example in the node exporter textfile directory.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(export_prometheus())
+    os.replace(temporary_path, path)
+
+
+def latency_report() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Returns count and p50/p90/p99/max latency in microseconds per subsystem and operation"""
+    report: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for subsystem in _subsystems.values():
+        for operation, histogram in sorted(subsystem.histograms.items()):
+            if not histogram.count:
+                continue
+            report.setdefault(subsystem.name, {})[operation] = {
+                "count": histogram.count,
+                "p50_us": histogram.percentile(50) / 1e3,
+                "p90_us": histogram.percentile(90) / 1e3,
+                "p99_us": histogram.percentile(99) / 1e3,
+                "max_us": histogram.max / 1e3,
+            }
+    return report
+
+
+configure_from_environment()
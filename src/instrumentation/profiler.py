@@ -0,0 +1,383 @@
+"""
+This module implements a statistical sampling profiler for the application's entry points.
+Stacks of the profiled threads are recorded at a configurable rate: the main thread is sampled
+by a SIGPROF interval timer where available, other threads by a background thread. Samples are
+aggregated per subsystem and written as collapsed stacks, which flamegraph tools such as
+flamegraph.pl, inferno or speedscope read directly.
+
+Business Logic:
+    - The default rate is 100 samples per second of CPU time. The profiled code is never traced,
+      so the overhead only depends on the rate and the stack depth. The kernel may round the
+      timer to its tick, for example 4 ms, which limits the effective rate.
+    - Threads sampled by the background thread are biased towards calls which release the GIL,
+      the main thread is not.
+    - A sample belongs to the innermost frame of the pricing, reservation, payment, notification
+      or vehicle packages on its stack, samples without such a frame belong to "other".
+    - Stacks are written root first, one "frame;frame;frame count" line per distinct stack.
+    - The top-N report lists functions by self samples (the function was running) and total
+      samples (the function was on the stack).
+    - Run any script or module under the profiler with:
+      python -m src.instrumentation.profiler [--rate HZ] [--output DIR] [--top N] main.py
+      python -m src.instrumentation.profiler -m benchmarks.bench_snapshot 10000
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+import sys
+import runpy
+import signal
+import argparse
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_RATE = 100
+
+OTHER_SUBSYSTEM = "other"
+
+# Subsystem of every package below src, keyed by package directory name
+SUBSYSTEM_PACKAGES = {
+    "pricing_strategy": "pricing",
+    "reservation": "reservation",
+    "payment": "payment",
+    "notification": "notification",
+    "vehicle": "vehicle",
+}
+
+SUBSYSTEMS = tuple(SUBSYSTEM_PACKAGES.values()) + (OTHER_SUBSYSTEM,)
+
+_PROFILER_PATH = os.path.abspath(__file__)
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(_PROFILER_PATH))
+
+
+class SamplingProfiler:
+    """
+    Concrete class representing a sampling profiler.
+
+    Args:
+        rate (float): Samples per second.
+        thread_ids (Optional[Iterable[int]]): Threads to profile, the thread calling start() by default.
+
+    Raises:
+        ValueError: If rate is not between 1 and 10000.
+    """
+
+    def __init__(
+        self, rate: float = DEFAULT_RATE, thread_ids: Optional[Iterable[int]] = None
+    ) -> None:
+        """Constructor method for SamplingProfiler class"""
+        if not isinstance(rate, (int, float)) or not 1 <= rate <= 10_000:
+            raise ValueError("rate must be between 1 and 10000 samples per second")
+
+        self.__interval = 1.0 / rate
+        self.__thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.__stacks: Dict[str, Counter] = {name: Counter() for name in SUBSYSTEMS}
+        self.__frame_info: Dict[CodeType, Tuple[Optional[str], Optional[str]]] = {}
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__running = False
+        self.__signal_target: Optional[int] = None
+        self.__previous_handler = None
+
+    @property
+    def interval(self) -> float:
+        """Getter for interval property, seconds between two samples."""
+        return self.__interval
+
+    @property
+    def is_running(self) -> bool:
+        """Getter for is_running property."""
+        return self.__running
+
+    @property
+    def sample_count(self) -> int:
+        """Getter for sample_count property, number of recorded stacks."""
+        return sum(sum(stacks.values()) for stacks in self.__stacks.values())
+
+    def start(self) -> "SamplingProfiler":
+        """
+        Starts sampling in a background thread.
+
+        Raises:
+            RuntimeError: If the profiler is already running.
+        """
+        if self.__running:
+            raise RuntimeError("profiler is already running")
+
+        if self.__thread_ids is None:
+            self.__thread_ids = {threading.get_ident()}
+        self.__running = True
+        self.__start_interval_timer()
+        if self.__thread_ids - {self.__signal_target}:
+            self.__stop.clear()
+            self.__thread = threading.Thread(
+                target=self.__run, name="sampling-profiler", daemon=True
+            )
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops sampling and waits for the background thread"""
+        if not self.__running:
+            return
+        if self.__signal_target is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.__previous_handler or signal.SIG_DFL)
+            self.__signal_target = None
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+        self.__running = False
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __start_interval_timer(self) -> None:
+        """
+        Samples the main thread with an interval timer if it is profiled and signals are available.
+
+        A thread can only read another thread's stack while holding the GIL, and it usually gets
+        the GIL when the profiled thread releases it in a system call such as os.urandom, so
+        those calls would be heavily over-represented. The kernel delivers the SIGPROF signal of
+        the timer without waiting for the GIL and its handler runs in the main thread between
+        two bytecodes, so these samples are not biased.
+        """
+        main_id = threading.main_thread().ident
+        if (
+            main_id in self.__thread_ids
+            and threading.get_ident() == main_id
+            and hasattr(signal, "setitimer")
+        ):
+            self.__previous_handler = signal.signal(
+                signal.SIGPROF, lambda signal_number, frame: self.__sample(frame)
+            )
+            signal.setitimer(signal.ITIMER_PROF, self.__interval, self.__interval)
+            self.__signal_target = main_id
+
+    def __run(self) -> None:
+        """Samples the profiled threads which are not sampled by the interval timer"""
+        own_id = threading.get_ident()
+        signal_target = self.__signal_target
+        while not self.__stop.wait(self.__interval):
+            for thread_id, frame in sys._current_frames().items():
+                if (
+                    thread_id != own_id
+                    and thread_id != signal_target
+                    and thread_id in self.__thread_ids
+                ):
+                    self.__sample(frame)
+
+    def __describe(self, code: CodeType) -> Tuple[Optional[str], Optional[str]]:
+        """Returns the frame label and the subsystem of a code object"""
+        info = self.__frame_info.get(code)
+        if info is not None:
+            return info
+
+        path = os.path.abspath(code.co_filename)
+        subsystem = None
+        if code.co_filename.startswith("<"):
+            module = code.co_filename.strip("<>")
+        elif path == _PROFILER_PATH:
+            # Frames of the profiler itself are left out of the stacks
+            module = None
+        elif path.startswith(_SOURCE_ROOT + os.sep):
+            relative = os.path.relpath(path, os.path.dirname(_SOURCE_ROOT))
+            module = os.path.splitext(relative)[0].replace(os.sep, ".")
+            subsystem = SUBSYSTEM_PACKAGES.get(module.split(".")[1])
+        else:
+            module = os.path.splitext(os.path.basename(path))[0]
+        label = f"{module}:{code.co_qualname}" if module is not None else None
+        info = self.__frame_info[code] = (label, subsystem)
+        return info
+
+    def __sample(self, frame: Optional[FrameType]) -> None:
+        """Records one stack"""
+        labels: List[str] = []
+        subsystem = None
+        while frame is not None:
+            label, frame_subsystem = self.__describe(frame.f_code)
+            if label is not None:
+                labels.append(label)
+            if subsystem is None:
+                subsystem = frame_subsystem
+            frame = frame.f_back
+        labels.reverse()
+        self.__stacks[subsystem or OTHER_SUBSYSTEM][";".join(labels)] += 1
+
+    def samples_by_subsystem(self) -> Dict[str, int]:
+        """Returns the number of samples per subsystem"""
+        return {name: sum(stacks.values()) for name, stacks in self.__stacks.items()}
+
+    def collapsed_stacks(self, subsystem: Optional[str] = None) -> List[str]:
+        """
+        Returns collapsed stack lines, most sampled first.
+
+        Args:
+            subsystem (Optional[str]): Only stacks of this subsystem, all stacks by default.
+
+        Raises:
+            ValueError: If the subsystem does not exist.
+        """
+        if subsystem is not None and subsystem not in self.__stacks:
+            raise ValueError(
+                f"Unknown subsystem '{subsystem}', expected one of {', '.join(SUBSYSTEMS)}"
+            )
+
+        names = [subsystem] if subsystem is not None else SUBSYSTEMS
+        stacks: Counter = Counter()
+        for name in names:
+            stacks.update(self.__stacks[name])
+        return [f"{stack} {count}" for stack, count in stacks.most_common()]
+
+    def top_functions(self, count: int = 20) -> List[Tuple[str, int, int]]:
+        """
+        Returns the hottest functions as (function, self samples, total samples).
+        Functions are ordered by self samples, then by total samples.
+        """
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        for stacks in self.__stacks.values():
+            for stack, samples in stacks.items():
+                labels = stack.split(";")
+                self_samples[labels[-1]] += samples
+                for label in set(labels):
+                    total_samples[label] += samples
+
+        ranked = sorted(
+            total_samples,
+            key=lambda label: (self_samples[label], total_samples[label]),
+            reverse=True,
+        )
+        return [
+            (label, self_samples[label], total_samples[label])
+            for label in ranked[:count]
+        ]
+
+    def report(self, count: int = 20) -> str:
+        """Returns a text report with samples per subsystem and the top functions"""
+        total = self.sample_count or 1
+        lines = [f"{self.sample_count} samples every {self.__interval * 1000:.1f} ms"]
+        lines.append("")
+        lines.append(f"{'subsystem':<16}{'samples':>10}{'share':>9}")
+        for name, samples in sorted(
+            self.samples_by_subsystem().items(), key=lambda item: -item[1]
+        ):
+            lines.append(f"{name:<16}{samples:>10}{samples / total:>9.1%}")
+        lines.append("")
+        lines.append(f"{'self':>8}{'total':>8}  function")
+        for label, self_count, total_count in self.top_functions(count):
+            lines.append(
+                f"{self_count / total:>8.1%}{total_count / total:>8.1%}  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str, top: int = 20) -> List[str]:
+        """
+        Writes all.collapsed, one <subsystem>.collapsed file per sampled subsystem and top.txt.
+
+        Args:
+            directory (str): Output directory, created if missing.
+            top (int): Number of functions in top.txt.
+
+        Returns:
+            List[str]: Paths of the written files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        files = {"all.collapsed": self.collapsed_stacks()}
+        for name, samples in self.samples_by_subsystem().items():
+            if samples:
+                files[f"{name}.collapsed"] = self.collapsed_stacks(name)
+
+        paths = []
+        for file_name, lines in files.items():
+            path = os.path.join(directory, file_name)
+            with open(path, "w", encoding="utf-8") as file:
+                file.writelines(f"{line}\n" for line in lines)
+            paths.append(path)
+
+        path = os.path.join(directory, "top.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.report(top))
+        paths.append(path)
+        return paths
+
+
+def profile_entry_point(
+    target: str,
+    arguments: List[str],
+    is_module: bool = False,
+    rate: float = DEFAULT_RATE,
+) -> SamplingProfiler:
+    """
+    Runs a script or module as __main__ under the profiler.
+
+    Args:
+        target (str): Path of a script such as main.py, or a module name if is_module is True.
+        arguments (List[str]): Command line arguments of the target.
+        is_module (bool): Whether target is a module name.
+        rate (float): Samples per second.
+
+    Returns:
+        SamplingProfiler: The stopped profiler with all samples.
+    """
+    saved_argv = sys.argv
+    sys.argv = [target] + list(arguments)
+    profiler = SamplingProfiler(rate=rate)
+    try:
+        with profiler:
+            if is_module:
+                runpy.run_module(target, run_name="__main__", alter_sys=True)
+            else:
+                runpy.run_path(target, run_name="__main__")
+    finally:
+        sys.argv = saved_argv
+    return profiler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line interface of the profiler"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.instrumentation.profiler",
+        description="Run a CRFMS script or batch command under the sampling profiler",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE, help="samples per second"
+    )
+    parser.add_argument("--output", default="profile", help="output directory")
+    parser.add_argument("--top", type=int, default=20, help="functions in the report")
+    parser.add_argument(
+        "-m", dest="module", action="store_true", help="target is a module"
+    )
+    parser.add_argument("target", help="script path or module name")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+
+    sys.path.insert(
+        0,
+        (
+            os.getcwd()
+            if options.module
+            else os.path.dirname(os.path.abspath(options.target))
+        ),
+    )
+    try:
+        profiler = profile_entry_point(
+            options.target, options.arguments, options.module, options.rate
+        )
+    finally:
+        sys.path.pop(0)
+    paths = profiler.write(options.output, options.top)
+    print(profiler.report(options.top), file=sys.stderr)
+    print(f"Wrote {', '.join(paths)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+This module implements the money representation of the application.
+Money is an int number of cents, so prices are added, multiplied by days and compared exactly
+with plain int arithmetic. Amounts in currency units (e.g. 45.5) are only used at the edges:
+constructor arguments, getters kept for display and the HTTP API.
+
+Business Logic:
+    - Amounts are converted to cents from their decimal representation, so 0.1 is exactly 10 cents.
+    - Amounts with fractions of a cent are rounded half up to the nearest cent.
+    - A percentage discount is rounded half up to the nearest cent and then subtracted, so
+      15% off 0.50 is a discount of 0.08 and a total of 0.42.
+    - Bulk sums of NumPy arrays use int64 arithmetic and are exact up to 2^63 - 1 cents.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, Union
+
+import numpy as np
+
+# Type of money values, a number of cents
+Cents = int
+
+CENTS_PER_UNIT = 100
+
+_CENT = Decimal("0.01")
+
+
+def to_cents(amount: Union[int, float, Decimal]) -> Cents:
+    """
+    Converts an amount in currency units to cents.
+
+    Args:
+        amount (Union[int, float, Decimal]): The amount, e.g. 45.5 for 4550 cents.
+
+    Returns:
+        Cents: The amount in cents, rounded half up.
+
+    Raises:
+        TypeError: If amount is not a numeric value.
+        ValueError: If amount is not finite.
+    """
+    if isinstance(amount, bool) or not isinstance(amount, (int, float, Decimal)):
+        raise TypeError("amount must be a numeric value")
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    # repr of a float is its shortest decimal form, so 0.1 becomes Decimal("0.1")
+    decimal_amount = amount if isinstance(amount, Decimal) else Decimal(repr(amount))
+    if not decimal_amount.is_finite():
+        raise ValueError("amount must be finite")
+    return int(decimal_amount.quantize(_CENT, rounding=ROUND_HALF_UP) * CENTS_PER_UNIT)
+
+
+def to_amount(cents: Cents) -> float:
+    """Converts cents to an amount in currency units, e.g. 4550 to 45.5"""
+    return cents / CENTS_PER_UNIT
+
+
+def format_cents(cents: Cents) -> str:
+    """Formats cents as an amount with thousands separators, e.g. 123450 as '1,234.50'"""
+    units, remainder = divmod(abs(cents), CENTS_PER_UNIT)
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{units:,}.{remainder:02d}"
+
+
+def apply_discount(cents: Cents, percent: int) -> Cents:
+    """
+    Returns cents after a percentage discount, the discount is rounded half up to a cent.
+
+    Args:
+        cents (Cents): The price before the discount, not negative.
+        percent (int): The discount in whole percent between 0 and 100.
+
+    Raises:
+        ValueError: If percent is not between 0 and 100.
+    """
+    if not 0 <= percent <= 100:
+        raise ValueError("percent must be between 0 and 100")
+    discount = (cents * percent + 50) // 100
+    return cents - discount
+
+
+def cents_array(values: Iterable[Cents]) -> np.ndarray:
+    """Returns the values as an int64 NumPy array"""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind not in "iu":
+            raise TypeError("values must be integer cents")
+        return values.astype(np.int64, copy=False)
+    return np.fromiter(values, dtype=np.int64)
+
+
+def sum_cents(values: Iterable[Cents]) -> Cents:
+    """
+    Returns the exact sum of cents.
+
+    NumPy arrays are summed with int64 arithmetic. Other iterables are summed as Python ints,
+    which is faster than copying them into an array first.
+
+    Raises:
+        TypeError: If values is a NumPy array which is not of an integer dtype.
+    """
+    if isinstance(values, np.ndarray):
+        return int(cents_array(values).sum(dtype=np.int64))
+    return sum(values)
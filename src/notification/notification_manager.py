@@ -6,8 +6,11 @@ Author: Peyman Khodabandehlouei
 Date: 09-11-2025
 """
 
-from typing import List, TYPE_CHECKING
+from typing import TYPE_CHECKING
+
+from src.collection_views import ListView, ViewableList
 from src.notification.notification_manager_interface import NotificationManagerInterface
+from src.instrumentation.metrics import instrumented
 
 
 if TYPE_CHECKING:
@@ -17,11 +20,12 @@ if TYPE_CHECKING:
 class ConcreteNotificationManager(NotificationManagerInterface):
     """Concrete Subject. It manages subscribers"""
     def __init__(self):
-        self._subscribers: List["Subscriber"] = []
+        self._subscribers: ViewableList["Subscriber"] = ViewableList()
 
     @property
-    def subscribers(self) -> List["Subscriber"]:
-        return self._subscribers.copy()
+    def subscribers(self) -> ListView["Subscriber"]:
+        """Read-only view of the subscribers which follows later changes"""
+        return self._subscribers.view
 
     def attach(self, subscriber: "Subscriber"):
         self._subscribers.append(subscriber)
@@ -30,6 +34,7 @@ class ConcreteNotificationManager(NotificationManagerInterface):
         if subscriber in self._subscribers:
             self._subscribers.remove(subscriber)
 
+    @instrumented("notification", "notify")
     def notify(self):
         for subscriber in self._subscribers:
             subscriber.update(self)
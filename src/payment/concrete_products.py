@@ -6,6 +6,7 @@ Author: Peyman Khodabandehlouei
 Date: 08-11-2025
 """
 
+from src.money import Cents, format_cents
 from src.payment.product_interface import PaymentInterface
 
 
@@ -49,14 +50,14 @@ class CreditcardPayment(PaymentInterface):
         print(f"from payment product: Validating Card ending with {self.__card_number[-4:]}")
         return True
 
-    def process_payment(self, amount: float) -> bool:
-        print(f"from payment product: Processing ${amount:,} with card ending with {self.__card_number[-4:]}")
+    def process_payment(self, amount: Cents) -> bool:
+        print(f"from payment product: Processing ${format_cents(amount)} with card ending with {self.__card_number[-4:]}")
         return True
 
-    def generate_receipt(self, amount: float, success: bool) -> str:
+    def generate_receipt(self, amount: Cents, success: bool) -> str:
         status = "from payment product: successful" if success else "failed"
 
-        return f"Payment of ${amount:,} with card ending with {self.__card_number[-4:]} was {status}"
+        return f"Payment of ${format_cents(amount)} with card ending with {self.__card_number[-4:]} was {status}"
 
 
 class PayPalPayment(PaymentInterface):
@@ -93,10 +94,10 @@ class PayPalPayment(PaymentInterface):
         print(f"from payment product: Validating PayPal account with email {self.__email}")
         return True
 
-    def process_payment(self, amount: float) -> bool:
-        print(f"from payment product: Processing ${amount:,} with PayPal account {self.__email}")
+    def process_payment(self, amount: Cents) -> bool:
+        print(f"from payment product: Processing ${format_cents(amount)} with PayPal account {self.__email}")
         return False
 
-    def generate_receipt(self, amount: float, success: bool) -> str:
+    def generate_receipt(self, amount: Cents, success: bool) -> str:
         status = "successful" if success else "failed"
-        return f"Payment of ${amount:,} with PayPal account {self.__email} was {status}"
+        return f"Payment of ${format_cents(amount)} with PayPal account {self.__email} was {status}"
@@ -9,7 +9,10 @@ Date: 08-11-2025
 from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
 
+from src.instrumentation.metrics import instrumented
+
 if TYPE_CHECKING:
+    from src.money import Cents
     from src.payment.product_interface import PaymentInterface
 
 
@@ -21,8 +24,23 @@ class PaymentFactoryInterface(ABC):
         """Factory method to return a payment object"""
         pass
 
-    def execute_payment(self, amount: float) -> str:
-        """Main business logic for payment execution"""
+    @instrumented("payment", "execute_payment")
+    def execute_payment(self, amount: "Cents") -> str:
+        """
+        Main business logic for payment execution
+
+        Args:
+            amount (Cents): The amount to pay in cents.
+
+        Raises:
+            TypeError: If amount is not an int number of cents.
+            ValueError: If amount is negative.
+        """
+        if isinstance(amount, bool) or not isinstance(amount, int):
+            raise TypeError("amount must be an int number of cents")
+        if amount < 0:
+            raise ValueError("amount cannot be negative")
+
         # Create payment service
         payment_service = self.create_payment_product()
 
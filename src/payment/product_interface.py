@@ -7,6 +7,10 @@ Date: 08-11-2025
 """
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.money import Cents
 
 
 class PaymentInterface(ABC):
@@ -18,11 +22,11 @@ class PaymentInterface(ABC):
         pass
 
     @abstractmethod
-    def process_payment(self, amount: float) -> bool:
-        """Processes the transaction"""
+    def process_payment(self, amount: "Cents") -> bool:
+        """Processes the transaction of amount cents"""
         pass
 
     @abstractmethod
-    def generate_receipt(self, amount: float, success: bool) -> str:
-        """Generates a receipt for the payment"""
+    def generate_receipt(self, amount: "Cents", success: bool) -> str:
+        """Generates a receipt for the payment of amount cents"""
         pass
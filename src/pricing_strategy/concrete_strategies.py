@@ -8,6 +8,9 @@ There are three types of pricing strategies:
 Business Logic:
     - Pickup date must be before or equal to return date.
     - Pickup date cannot be in the past.
+    - Prices are calculated in integer cents, discounts are rounded half up to a cent.
+    - The vehicle cost follows the seasonal rates of the rate calendar.
+    - Strategies quote the line items and the discount, calculate returns the total of the quote.
 
 Author: Peyman Khodabandehlouei
 Date: 08-11-2025
@@ -16,28 +19,36 @@ Date: 08-11-2025
 from datetime import date
 from typing import Optional, List, TYPE_CHECKING
 
+from src.collection_views import ListView
+from src.pricing_strategy.price_quote import PriceQuote, quote_rental
+from src.pricing_strategy.rate_calendar import get_rate_calendar
 from src.pricing_strategy.strategy_interface import Strategy
 
 
 if TYPE_CHECKING:
+    from src.branch.branch import Branch
     from src.vehicle.vehicle import Vehicle
     from src.reservation.add_on import AddOn
     from src.reservation.insurance_tier import InsuranceTier
 
+FIRST_ORDER_DISCOUNT_PERCENT = 15
+LOYALTY_DISCOUNT_PERCENT = 10
+
 
 class DailyStrategy(Strategy):
     """Concrete strategy for first order pricing with no discount"""
 
-    def calculate(
+    def quote(
         self,
         vehicle: "Vehicle",
         insurance_tier: "InsuranceTier",
         pickup_date: date,
         return_date: date,
         add_ons: Optional[List["AddOn"]] = None,
-    ) -> float:
+        pickup_branch: Optional["Branch"] = None,
+    ) -> PriceQuote:
         """
-        Calculate the total price with no discount.
+        Quote the line items with no discount.
 
         Args:
             vehicle (Vehicle): The vehicle being rented.
@@ -45,9 +56,11 @@ class DailyStrategy(Strategy):
             pickup_date (date): The rental pickup date.
             return_date (date): The rental return date.
             add_ons (Optional[List[AddOn]]): Optional list of add-ons.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply, defaults to the
+                current branch of the vehicle.
 
         Returns:
-            float: The total calculated price.
+            PriceQuote: The line items and no discount, in cents.
         """
         # Validate vehicle
         from src.vehicle.vehicle import Vehicle
@@ -84,43 +97,46 @@ class DailyStrategy(Strategy):
             add_ons = []
         from src.reservation.add_on import AddOn
 
-        if not isinstance(add_ons, list):
+        if not isinstance(add_ons, (list, ListView)):
             raise TypeError("add_ons must be a list of AddOn instances.")
         if not all(isinstance(add_on, AddOn) for add_on in add_ons):
             raise TypeError("All add-ons must be instances of AddOn class.")
 
+        # Validate pickup branch
+        from src.branch.branch import Branch
+
+        if pickup_branch is not None and not isinstance(pickup_branch, Branch):
+            raise TypeError("pickup_branch must be an instance of Branch class.")
+
         # Business logic
         # Calculate rental days
         rental_days = (return_date - pickup_date).days
 
-        # Calculate vehicle cost
-        vehicle_cost = vehicle.price_per_day * rental_days
-
-        # Calculate insurance cost
-        insurance_cost = insurance_tier.price_per_day * rental_days
-
-        # Calculate add-ons cost
-        addons_cost = sum(addon.price_per_day for addon in add_ons) * rental_days
+        # Calculate vehicle cost with seasonal rates
+        vehicle_cost = get_rate_calendar().vehicle_cost(
+            vehicle, pickup_date, return_date, pickup_branch
+        )
 
-        # Calculate total price
-        total_price = vehicle_cost + insurance_cost + addons_cost
-
-        return total_price
+        # Quote insurance and add-ons with no discount
+        return quote_rental(
+            vehicle, insurance_tier, add_ons, rental_days, vehicle_cost, 0
+        )
 
 
 class FirstOrderStrategy(Strategy):
     """Concrete strategy for first order pricing with 15% discount"""
 
-    def calculate(
+    def quote(
         self,
         vehicle: "Vehicle",
         insurance_tier: "InsuranceTier",
         pickup_date: date,
         return_date: date,
         add_ons: Optional[List["AddOn"]] = None,
-    ) -> float:
+        pickup_branch: Optional["Branch"] = None,
+    ) -> PriceQuote:
         """
-        Calculate the total price with 15% first order discount.
+        Quote the line items with 15% first order discount.
 
         Args:
             vehicle (Vehicle): The vehicle being rented.
@@ -128,9 +144,11 @@ class FirstOrderStrategy(Strategy):
             pickup_date (date): The rental pickup date.
             return_date (date): The rental return date.
             add_ons (Optional[List[AddOn]]): Optional list of add-ons.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply, defaults to the
+                current branch of the vehicle.
 
         Returns:
-            float: The total calculated price with 15% discount applied.
+            PriceQuote: The line items and the 15% discount, in cents.
         """
         # Validate vehicle
         from src.vehicle.vehicle import Vehicle
@@ -167,47 +185,51 @@ class FirstOrderStrategy(Strategy):
             add_ons = []
         from src.reservation.add_on import AddOn
 
-        if not isinstance(add_ons, list):
+        if not isinstance(add_ons, (list, ListView)):
             raise TypeError("add_ons must be a list of AddOn instances.")
         if not all(isinstance(add_on, AddOn) for add_on in add_ons):
             raise TypeError("All add-ons must be instances of AddOn class.")
 
+        # Validate pickup branch
+        from src.branch.branch import Branch
+
+        if pickup_branch is not None and not isinstance(pickup_branch, Branch):
+            raise TypeError("pickup_branch must be an instance of Branch class.")
+
         # Business logic
         # Calculate rental days
         rental_days = (return_date - pickup_date).days
 
-        # Calculate vehicle cost
-        vehicle_cost = vehicle.price_per_day * rental_days
-
-        # Calculate insurance cost
-        insurance_cost = insurance_tier.price_per_day * rental_days
-
-        # Calculate add-ons cost
-        addons_cost = sum(addon.price_per_day for addon in add_ons) * rental_days
+        # Calculate vehicle cost with seasonal rates
+        vehicle_cost = get_rate_calendar().vehicle_cost(
+            vehicle, pickup_date, return_date, pickup_branch
+        )
 
-        # Calculate subtotal
-        subtotal = vehicle_cost + insurance_cost + addons_cost
-
-        # Apply 15% discount
-        discount = subtotal * 0.15
-        total_price = subtotal - discount
-
-        return total_price
+        # Quote insurance and add-ons with 15% discount
+        return quote_rental(
+            vehicle,
+            insurance_tier,
+            add_ons,
+            rental_days,
+            vehicle_cost,
+            FIRST_ORDER_DISCOUNT_PERCENT,
+        )
 
 
 class LoyaltyStrategy(Strategy):
     """Concrete strategy for loyalty pricing with 10% discount on every 5th order"""
 
-    def calculate(
+    def quote(
         self,
         vehicle: "Vehicle",
         insurance_tier: "InsuranceTier",
         pickup_date: date,
         return_date: date,
         add_ons: Optional[List["AddOn"]] = None,
-    ) -> float:
+        pickup_branch: Optional["Branch"] = None,
+    ) -> PriceQuote:
         """
-        Calculate the total price with 10% loyalty discount.
+        Quote the line items with 10% loyalty discount.
 
         Args:
             vehicle (Vehicle): The vehicle being rented.
@@ -215,9 +237,11 @@ class LoyaltyStrategy(Strategy):
             pickup_date (date): The rental pickup date.
             return_date (date): The rental return date.
             add_ons (Optional[List[AddOn]]): Optional list of add-ons.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply, defaults to the
+                current branch of the vehicle.
 
         Returns:
-            float: The total calculated price with 10% discount applied.
+            PriceQuote: The line items and the 10% discount, in cents.
         """
         # Validate vehicle
         from src.vehicle.vehicle import Vehicle
@@ -254,29 +278,32 @@ class LoyaltyStrategy(Strategy):
             add_ons = []
         from src.reservation.add_on import AddOn
 
-        if not isinstance(add_ons, list):
+        if not isinstance(add_ons, (list, ListView)):
             raise TypeError("add_ons must be a list of AddOn instances.")
         if not all(isinstance(add_on, AddOn) for add_on in add_ons):
             raise TypeError("All add-ons must be instances of AddOn class.")
 
+        # Validate pickup branch
+        from src.branch.branch import Branch
+
+        if pickup_branch is not None and not isinstance(pickup_branch, Branch):
+            raise TypeError("pickup_branch must be an instance of Branch class.")
+
         # Business logic
         # Calculate rental days
         rental_days = (return_date - pickup_date).days
 
-        # Calculate vehicle cost
-        vehicle_cost = vehicle.price_per_day * rental_days
-
-        # Calculate insurance cost
-        insurance_cost = insurance_tier.price_per_day * rental_days
-
-        # Calculate add-ons cost
-        addons_cost = sum(addon.price_per_day for addon in add_ons) * rental_days
-
-        # Calculate subtotal
-        subtotal = vehicle_cost + insurance_cost + addons_cost
-
-        # Apply 10% loyalty discount
-        discount = subtotal * 0.10
-        total_price = subtotal - discount
-
-        return total_price
+        # Calculate vehicle cost with seasonal rates
+        vehicle_cost = get_rate_calendar().vehicle_cost(
+            vehicle, pickup_date, return_date, pickup_branch
+        )
+
+        # Quote insurance and add-ons with 10% loyalty discount
+        return quote_rental(
+            vehicle,
+            insurance_tier,
+            add_ons,
+            rental_days,
+            vehicle_cost,
+            LOYALTY_DISCOUNT_PERCENT,
+        )
@@ -0,0 +1,166 @@
+"""
+This module implements PriceQuote class, the priced line items of a reservation.
+A quote is created when a reservation is priced and is kept with it, so invoices and exports
+show the amounts which were billed even after prices or rates change.
+
+Business Logic:
+    - Line items are in cents: the vehicle with the seasonal and branch rates of the rate
+      calendar, the insurance tier and one line item per add-on.
+    - The discount is a percentage of the subtotal rounded half up to a cent, like
+      apply_discount, so the total equals the total of the pricing strategy.
+    - Quotes are immutable and are encoded with the reservation by the binary codec.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import struct
+from typing import NamedTuple, Sequence, Tuple, TYPE_CHECKING
+
+from src.money import Cents, apply_discount
+from src.serialization.wire_format import decode_str, encode_str
+
+if TYPE_CHECKING:
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.add_on import AddOn
+    from src.reservation.insurance_tier import InsuranceTier
+
+# Encoded quote: line item count, then the discount after the line items
+_COUNT = struct.Struct("<I")
+_LINE_AMOUNTS = struct.Struct("<iqq")
+_DISCOUNT = struct.Struct("<q")
+
+
+class LineItem(NamedTuple):
+    """A priced line item, item is vehicle, insurance or add_on"""
+
+    item: str
+    description: str
+    days: int
+    price_per_day_cents: Cents
+    amount_cents: Cents
+
+
+class PriceQuote(NamedTuple):
+    """Line items of a reservation and the discount on their subtotal, in cents"""
+
+    line_items: Tuple[LineItem, ...]
+    discount_cents: Cents
+
+    @property
+    def subtotal_cents(self) -> Cents:
+        """Sum of the line items before the discount"""
+        return sum(line_item.amount_cents for line_item in self.line_items)
+
+    @property
+    def total_cents(self) -> Cents:
+        """Subtotal after the discount"""
+        return self.subtotal_cents - self.discount_cents
+
+    def amount_of(self, item: str) -> Cents:
+        """Returns the sum of the line items of one kind, e.g. add_on"""
+        return sum(
+            line_item.amount_cents
+            for line_item in self.line_items
+            if line_item.item == item
+        )
+
+    def to_bytes(self) -> bytes:
+        """Returns the quote encoded for the binary codec"""
+        parts = [_COUNT.pack(len(self.line_items))]
+        for line_item in self.line_items:
+            encode_str(parts, line_item.item)
+            encode_str(parts, line_item.description)
+            parts.append(
+                _LINE_AMOUNTS.pack(
+                    line_item.days,
+                    line_item.price_per_day_cents,
+                    line_item.amount_cents,
+                )
+            )
+        parts.append(_DISCOUNT.pack(self.discount_cents))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PriceQuote":
+        """
+        Creates a quote from the bytes of to_bytes.
+
+        Raises:
+            ValueError: If data is not an encoded quote.
+        """
+        try:
+            (count,) = _COUNT.unpack_from(data, 0)
+            offset = _COUNT.size
+            line_items = []
+            for _ in range(count):
+                item, offset = decode_str(data, offset)
+                description, offset = decode_str(data, offset)
+                days, price_per_day_cents, amount_cents = _LINE_AMOUNTS.unpack_from(
+                    data, offset
+                )
+                offset += _LINE_AMOUNTS.size
+                line_items.append(
+                    LineItem(item, description, days, price_per_day_cents, amount_cents)
+                )
+            (discount_cents,) = _DISCOUNT.unpack_from(data, offset)
+            offset += _DISCOUNT.size
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError("Invalid price quote") from error
+        if offset != len(data):
+            raise ValueError("Invalid price quote")
+        return cls(tuple(line_items), discount_cents)
+
+
+def quote_rental(
+    vehicle: "Vehicle",
+    insurance_tier: "InsuranceTier",
+    add_ons: Sequence["AddOn"],
+    rental_days: int,
+    vehicle_cents: Cents,
+    discount_percent: int,
+) -> PriceQuote:
+    """
+    Creates the quote of a rental from its vehicle cost.
+
+    Args:
+        vehicle (Vehicle): The rented vehicle.
+        insurance_tier (InsuranceTier): The selected insurance tier.
+        add_ons (Sequence[AddOn]): The selected add-ons.
+        rental_days (int): Number of rental days.
+        vehicle_cents (Cents): Vehicle cost of the rental window from the rate calendar.
+        discount_percent (int): Discount of the pricing strategy in whole percent.
+
+    Returns:
+        PriceQuote: The line items and the discount.
+    """
+    line_items = [
+        LineItem(
+            "vehicle",
+            f"{vehicle.brand} {vehicle.model}",
+            rental_days,
+            vehicle.price_per_day_cents,
+            vehicle_cents,
+        ),
+        LineItem(
+            "insurance",
+            insurance_tier.tier_name,
+            rental_days,
+            insurance_tier.price_per_day_cents,
+            insurance_tier.price_per_day_cents * rental_days,
+        ),
+    ]
+    line_items.extend(
+        LineItem(
+            "add_on",
+            add_on.name,
+            rental_days,
+            add_on.price_per_day_cents,
+            add_on.price_per_day_cents * rental_days,
+        )
+        for add_on in add_ons
+    )
+    subtotal = sum(line_item.amount_cents for line_item in line_items)
+    return PriceQuote(
+        tuple(line_items), subtotal - apply_discount(subtotal, discount_percent)
+    )
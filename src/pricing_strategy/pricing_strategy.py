@@ -18,14 +18,18 @@ from datetime import date
 from typing import Optional, List, TYPE_CHECKING
 
 from src.enums import ReservationStatus
+from src.instrumentation.metrics import instrumented
 
 
 if TYPE_CHECKING:
+    from src.money import Cents
+    from src.branch.branch import Branch
     from src.vehicle.vehicle import Vehicle
     from src.users.customer import Customer
     from src.reservation.add_on import AddOn
     from src.reservation.insurance_tier import InsuranceTier
     from src.pricing_strategy.strategy_interface import Strategy
+    from src.pricing_strategy.price_quote import PriceQuote
 
 
 class PricingStrategy:
@@ -67,7 +71,7 @@ class PricingStrategy:
             raise TypeError("customer must be an instance of Customer class")
 
         # Business logic - Automatic strategy selection
-        reservations_count = len(customer.reservations)
+        reservations_count = customer.reservation_count
 
         if reservations_count == 0:
             # First order - 15% discount
@@ -107,6 +111,7 @@ class PricingStrategy:
 
         self.__strategy = strategy
 
+    @instrumented("pricing", "calculate_price")
     def calculate_price(
         self,
         vehicle: "Vehicle",
@@ -114,6 +119,7 @@ class PricingStrategy:
         pickup_date: date,
         return_date: date,
         add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
     ) -> float:
         """
         Calculate the total price using the current strategy.
@@ -127,9 +133,12 @@ class PricingStrategy:
             pickup_date (date): The rental pickup date.
             return_date (date): The rental return date.
             add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
 
         Returns:
-            float: The total calculated price for the reservation.
+            float: The total calculated price for the reservation, use calculate_price_cents()
+                for the exact price in cents.
 
         Raises:
             TypeError: If any parameter has an incorrect type.
@@ -141,4 +150,84 @@ class PricingStrategy:
             pickup_date=pickup_date,
             return_date=return_date,
             add_ons=add_ons,
+            pickup_branch=pickup_branch,
+        )
+
+    @instrumented("pricing", "calculate_price_cents")
+    def calculate_price_cents(
+        self,
+        vehicle: "Vehicle",
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> "Cents":
+        """
+        Calculate the total price in cents using the current strategy.
+
+        Delegates the price calculation to the strategy object without
+        knowing the implementation details of the pricing algorithm.
+
+        Args:
+            vehicle (Vehicle): The vehicle being rented.
+            insurance_tier (InsuranceTier): The selected insurance tier.
+            pickup_date (date): The rental pickup date.
+            return_date (date): The rental return date.
+            add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
+
+        Returns:
+            Cents: The total calculated price for the reservation in cents.
+
+        Raises:
+            TypeError: If any parameter has an incorrect type.
+            ValueError: If any parameter violates business rules.
+        """
+        return self.__strategy.calculate_cents(
+            vehicle=vehicle,
+            insurance_tier=insurance_tier,
+            pickup_date=pickup_date,
+            return_date=return_date,
+            add_ons=add_ons,
+            pickup_branch=pickup_branch,
+        )
+
+    @instrumented("pricing", "quote_price")
+    def quote_price(
+        self,
+        vehicle: "Vehicle",
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> "PriceQuote":
+        """
+        Quote the line items and the discount using the current strategy.
+
+        Args:
+            vehicle (Vehicle): The vehicle being rented.
+            insurance_tier (InsuranceTier): The selected insurance tier.
+            pickup_date (date): The rental pickup date.
+            return_date (date): The rental return date.
+            add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
+
+        Returns:
+            PriceQuote: The line items and the discount in cents, its total is the total price.
+
+        Raises:
+            TypeError: If any parameter has an incorrect type.
+            ValueError: If any parameter violates business rules.
+        """
+        return self.__strategy.quote(
+            vehicle=vehicle,
+            insurance_tier=insurance_tier,
+            pickup_date=pickup_date,
+            return_date=return_date,
+            add_ons=add_ons,
+            pickup_branch=pickup_branch,
         )
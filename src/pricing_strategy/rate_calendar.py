@@ -0,0 +1,593 @@
+"""
+This module implements RateCalendar class, the seasonal pricing of vehicles.
+Branches, vehicle classes and vehicles get per-day price multipliers (e.g. 1.25 on weekends) or
+price overrides (e.g. 99.00 on New Year's Eve). Rules are stored in day-indexed NumPy arrays per
+branch, vehicle class and vehicle. The daily prices of a vehicle are combined from its three
+levels once and kept as prefix sums of multipliers and overrides, so the vehicle cost of any
+rental window is a few subtractions, no matter how many days it has. Vehicles without rules of
+their own share the prefix sums of their branch and vehicle class.
+
+Business Logic:
+    - A rental window is [pickup_date, return_date), the return day is not charged.
+    - Multipliers of the branch, vehicle class and vehicle are multiplied, rounded to a basis
+      point and apply to the price_per_day of the vehicle. The cost of a window is rounded half
+      up to a cent once, not per day.
+    - An override is the daily price itself. The vehicle override wins over the vehicle class
+      override, which wins over the branch override. Multipliers do not apply to overrides.
+    - Days without rules are charged price_per_day of the vehicle.
+    - The branch of a window is the pickup branch, or the current branch of the vehicle if the
+      pickup branch is not known.
+    - Updating rules of one branch, vehicle class or vehicle only invalidates the prefix sums
+      which depend on it, they are rebuilt on their next quote.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+import numpy as np
+
+from src.money import Cents, to_cents
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.vehicle.vehicle import Vehicle
+    from src.vehicle.vehicle_class import VehicleClass
+
+# Multipliers are stored in basis points, 10,000 is a multiplier of 1
+BASIS_POINTS = 10_000
+MAX_MULTIPLIER = 10
+# Overrides are stored as int32 cents
+MAX_OVERRIDE_CENTS = int(np.iinfo(np.int32).max)
+# Marks days without an override
+NO_OVERRIDE = -1
+# Days added to the calendar when it grows, so growing is rare
+_GROWTH_DAYS = 366
+
+
+class RateRule(NamedTuple):
+    """
+    A multiplier or an override for the days of [start, end) of a branch, vehicle class or vehicle.
+
+    weekdays limits the rule to some days of the week, 0 is Monday and 6 is Sunday.
+    """
+
+    target: Union["Branch", "VehicleClass", "Vehicle"]
+    start: date
+    end: date
+    multiplier: Optional[float] = None
+    override: Optional[float] = None
+    weekdays: Optional[Collection[int]] = None
+
+
+def to_basis_points(multiplier: Union[int, float]) -> int:
+    """
+    Converts a multiplier to basis points, e.g. 1.25 to 12,500.
+
+    Raises:
+        TypeError: If multiplier is not a numeric value.
+        ValueError: If multiplier is negative or greater than MAX_MULTIPLIER.
+    """
+    if isinstance(multiplier, bool) or not isinstance(multiplier, (int, float)):
+        raise TypeError("multiplier must be a numeric value")
+    if not 0 <= multiplier <= MAX_MULTIPLIER:
+        raise ValueError(f"multiplier must be between 0 and {MAX_MULTIPLIER}")
+    return int(
+        (Decimal(repr(multiplier)) * BASIS_POINTS).quantize(
+            Decimal(1), rounding=ROUND_HALF_UP
+        )
+    )
+
+
+class _Rates:
+    """Multipliers and overrides of one branch, vehicle class or vehicle over the calendar days"""
+
+    __slots__ = ("multipliers", "overrides", "version")
+
+    def __init__(self, days: int) -> None:
+        self.multipliers = np.full(days, BASIS_POINTS, dtype=np.int32)
+        self.overrides = np.full(days, NO_OVERRIDE, dtype=np.int32)
+        self.version = 0
+
+    def grow(self, before: int, after: int) -> None:
+        """Adds days without rules before and after the stored days"""
+        self.multipliers = np.pad(
+            self.multipliers, (before, after), constant_values=BASIS_POINTS
+        )
+        self.overrides = np.pad(
+            self.overrides, (before, after), constant_values=NO_OVERRIDE
+        )
+
+
+class RateCalendar:
+    """
+    Concrete class storing seasonal rates and pricing rental windows of vehicles.
+
+    Usage:
+        calendar = RateCalendar()
+        calendar.set_multiplier(branch, date(2026, 7, 1), date(2026, 9, 1), 1.2)
+        calendar.set_override(vehicle, date(2026, 12, 31), date(2027, 1, 1), 99.0)
+        calendar.vehicle_cost(vehicle, pickup_date, return_date)
+    """
+
+    def __init__(self) -> None:
+        """Constructor method for RateCalendar class"""
+        # Ordinal of the first stored day
+        self.__origin: Optional[int] = None
+        self.__days = 0
+        # Incremented whenever the stored days change, invalidates every prefix sum
+        self.__generation = 0
+        self.__rates: Dict[Tuple[str, str], _Rates] = {}
+        # (branch id, vehicle class id, vehicle id or None) -> (versions, prefix sums)
+        self.__prefix_sums: Dict[Tuple, Tuple[Tuple, np.ndarray, np.ndarray]] = {}
+        # Incremented whenever a rule changes, invalidates the lowest rates of every window
+        self.__revision = 0
+        self.__lowest_rates: Dict[Tuple, Tuple[int, Optional[Cents]]] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of branches, vehicle classes and vehicles with rules"""
+        return len(self.__rates)
+
+    @property
+    def first_day(self) -> Optional[date]:
+        """Getter for the first stored day, None if there are no rules"""
+        return None if self.__origin is None else date.fromordinal(self.__origin)
+
+    @property
+    def days(self) -> int:
+        """Getter for the number of stored days"""
+        return self.__days
+
+    @staticmethod
+    def __key_of(target: Union["Branch", "VehicleClass", "Vehicle"]) -> Tuple[str, str]:
+        """Returns the (level, id) key of a rule target"""
+        from src.branch.branch import Branch
+        from src.vehicle.vehicle import Vehicle
+        from src.vehicle.vehicle_class import VehicleClass
+
+        if isinstance(target, Vehicle):
+            return "vehicle", target.id
+        if isinstance(target, VehicleClass):
+            return "vehicle_class", target.id
+        if isinstance(target, Branch):
+            return "branch", target.id
+        raise TypeError("target must be a Branch, VehicleClass or Vehicle object")
+
+    def __cover(self, first: int, stop: int) -> None:
+        """Grows the stored days to cover the ordinals [first, stop)"""
+        if self.__origin is None:
+            self.__origin = first
+            self.__days = max(stop - first, _GROWTH_DAYS)
+            return
+        before = max(0, self.__origin - first)
+        after = max(0, stop - (self.__origin + self.__days))
+        if not before and not after:
+            return
+        # Grow by at least a year on the side which grows
+        before = max(before, _GROWTH_DAYS) if before else 0
+        after = max(after, _GROWTH_DAYS) if after else 0
+        for rates in self.__rates.values():
+            rates.grow(before, after)
+        self.__origin -= before
+        self.__days += before + after
+        self.__generation += 1
+        self.__revision += 1
+
+    def __validate_rule(self, rule: RateRule) -> Tuple[Tuple[str, str], int, int]:
+        """Validates a rule and returns its key and ordinal range"""
+        key = self.__key_of(rule.target)
+        if not isinstance(rule.start, date) or not isinstance(rule.end, date):
+            raise TypeError("start and end must be instances of date class.")
+        if rule.end <= rule.start:
+            raise ValueError("end must be after start.")
+        if rule.weekdays is not None and not all(
+            isinstance(day, int) and 0 <= day <= 6 for day in rule.weekdays
+        ):
+            raise ValueError("weekdays must be integers between 0 and 6.")
+        return key, rule.start.toordinal(), rule.end.toordinal()
+
+    def __apply(
+        self, key: Tuple[str, str], first: int, stop: int, rule: RateRule
+    ) -> None:
+        """Writes a validated rule into the rates of its target"""
+        rates = self.__rates.get(key)
+        if rates is None:
+            rates = self.__rates[key] = _Rates(self.__days)
+        start, end = first - self.__origin, stop - self.__origin
+        days = slice(start, end)
+        if rule.weekdays is not None:
+            # date.weekday() of an ordinal is (ordinal + 6) % 7
+            weekdays = (np.arange(first, stop) + 6) % 7
+            days = start + np.flatnonzero(np.isin(weekdays, list(rule.weekdays)))
+
+        if rule.multiplier is not None:
+            rates.multipliers[days] = to_basis_points(rule.multiplier)
+        if rule.override is not None:
+            rates.overrides[days] = to_cents(rule.override)
+        if rule.multiplier is None and rule.override is None:
+            rates.multipliers[days] = BASIS_POINTS
+            rates.overrides[days] = NO_OVERRIDE
+        rates.version += 1
+        self.__revision += 1
+
+    def update(self, rules: Iterable[RateRule]) -> int:
+        """
+        Applies several rules, later rules overwrite earlier ones on the same days.
+
+        A rule with a multiplier sets the multiplier, a rule with an override sets the override,
+        a rule with neither clears both.
+
+        Returns:
+            int: Number of applied rules.
+
+        Raises:
+            TypeError: If a target or date has an incorrect type.
+            ValueError: If a range, multiplier, override or weekday is invalid. No rule is
+                applied in that case.
+        """
+        validated = []
+        for rule in rules:
+            key, first, stop = self.__validate_rule(rule)
+            # Convert once here, so invalid values fail before anything is written
+            if rule.multiplier is not None:
+                to_basis_points(rule.multiplier)
+            if rule.override is not None:
+                override = to_cents(rule.override)
+                if override < 0:
+                    raise ValueError("override cannot be negative")
+                if override > MAX_OVERRIDE_CENTS:
+                    raise ValueError(
+                        f"override cannot be greater than {MAX_OVERRIDE_CENTS} cents"
+                    )
+            validated.append((key, first, stop, rule))
+        if not validated:
+            return 0
+
+        self.__cover(
+            min(first for _, first, _, _ in validated),
+            max(stop for _, _, stop, _ in validated),
+        )
+        for key, first, stop, rule in validated:
+            self.__apply(key, first, stop, rule)
+        return len(validated)
+
+    def set_multiplier(
+        self,
+        target: Union["Branch", "VehicleClass", "Vehicle"],
+        start: date,
+        end: date,
+        multiplier: float,
+        weekdays: Optional[Collection[int]] = None,
+    ) -> None:
+        """Sets the multiplier of a branch, vehicle class or vehicle for the days of [start, end)"""
+        self.update(
+            [RateRule(target, start, end, multiplier=multiplier, weekdays=weekdays)]
+        )
+
+    def set_override(
+        self,
+        target: Union["Branch", "VehicleClass", "Vehicle"],
+        start: date,
+        end: date,
+        price_per_day: float,
+        weekdays: Optional[Collection[int]] = None,
+    ) -> None:
+        """Sets the daily price of a branch, vehicle class or vehicle for the days of [start, end)"""
+        self.update(
+            [RateRule(target, start, end, override=price_per_day, weekdays=weekdays)]
+        )
+
+    def clear(
+        self,
+        target: Union["Branch", "VehicleClass", "Vehicle"],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> None:
+        """Removes the rules of a branch, vehicle class or vehicle, for [start, end) if given"""
+        key = self.__key_of(target)
+        if key not in self.__rates:
+            return
+        if start is None and end is None:
+            del self.__rates[key]
+            self.__generation += 1
+            self.__revision += 1
+            return
+        first_day = date.fromordinal(self.__origin)
+        last_day = date.fromordinal(self.__origin + self.__days)
+        self.update([RateRule(target, start or first_day, end or last_day)])
+
+    def has_rules(self, target: Union["Branch", "VehicleClass", "Vehicle"]) -> bool:
+        """Returns True if a branch, vehicle class or vehicle has rules"""
+        return self.__key_of(target) in self.__rates
+
+    def __levels_of(
+        self, branch_id: str, vehicle_class_id: str, vehicle_id: Optional[str]
+    ) -> Tuple:
+        """Returns the rates of a branch, vehicle class and vehicle, None for levels without rules"""
+        return (
+            self.__rates.get(("branch", branch_id)),
+            self.__rates.get(("vehicle_class", vehicle_class_id)),
+            self.__rates.get(("vehicle", vehicle_id)),
+        )
+
+    def __combine(self, levels: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the combined multipliers and overrides of the stored days"""
+        multipliers = None
+        overrides = np.full(self.__days, NO_OVERRIDE, dtype=np.int64)
+        # Levels are ordered from the least to the most specific
+        for rates in levels:
+            if rates is None:
+                continue
+            if multipliers is None:
+                multipliers = rates.multipliers.astype(np.int64)
+            else:
+                # Round the combined multiplier to a basis point, half up
+                multipliers = (
+                    multipliers * rates.multipliers + BASIS_POINTS // 2
+                ) // BASIS_POINTS
+            overrides = np.where(rates.overrides >= 0, rates.overrides, overrides)
+        if multipliers is None:
+            multipliers = np.full(self.__days, BASIS_POINTS, dtype=np.int64)
+        return multipliers, overrides
+
+    def __prefix_sums_of(
+        self,
+        branch_id: str,
+        vehicle_class_id: str,
+        vehicle_id: Optional[str],
+        levels: Tuple,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns prefix sums of the multipliers of days without override and of the overrides.
+
+        Vehicles without own rules share the prefix sums of their branch and vehicle class.
+        """
+        cache_key = (
+            branch_id,
+            vehicle_class_id,
+            None if levels[2] is None else vehicle_id,
+        )
+        versions = (self.__generation,) + tuple(
+            None if rates is None else rates.version for rates in levels
+        )
+        cached = self.__prefix_sums.get(cache_key)
+        if cached is not None and cached[0] == versions:
+            return cached[1], cached[2]
+
+        multipliers, overrides = self.__combine(levels)
+        has_override = overrides >= 0
+        multiplier_sums = np.zeros(self.__days + 1, dtype=np.int64)
+        np.cumsum(np.where(has_override, 0, multipliers), out=multiplier_sums[1:])
+        override_sums = np.zeros(self.__days + 1, dtype=np.int64)
+        np.cumsum(np.where(has_override, overrides, 0), out=override_sums[1:])
+        self.__prefix_sums[cache_key] = (versions, multiplier_sums, override_sums)
+        return multiplier_sums, override_sums
+
+    def vehicle_cost(
+        self,
+        vehicle: "Vehicle",
+        pickup_date: date,
+        return_date: date,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> Cents:
+        """
+        Returns the vehicle cost of the rental window [pickup_date, return_date) in cents.
+
+        The cost of the days with multipliers is rounded half up to a cent once for the window.
+
+        Args:
+            vehicle (Vehicle): The vehicle being rented.
+            pickup_date (date): First charged day.
+            return_date (date): Day after the last charged day.
+            pickup_branch (Optional[Branch]): Branch whose rules apply, defaults to the current
+                branch of the vehicle.
+
+        Returns:
+            Cents: The vehicle cost, 0 for an empty window.
+        """
+        price_per_day = vehicle.price_per_day_cents
+        rental_days = (return_date - pickup_date).days
+        if not self.__rates or rental_days <= 0:
+            return price_per_day * max(rental_days, 0)
+        branch = vehicle.current_branch if pickup_branch is None else pickup_branch
+        levels = self.__levels_of(branch.id, vehicle.vehicle_class.id, vehicle.id)
+        start = pickup_date.toordinal() - self.__origin
+        first, last = max(start, 0), min(start + rental_days, self.__days)
+        if first >= last or levels == (None, None, None):
+            return price_per_day * rental_days
+
+        multiplier_sums, override_sums = self.__prefix_sums_of(
+            branch.id, vehicle.vehicle_class.id, vehicle.id, levels
+        )
+        uncovered_days = rental_days - (last - first)
+        multiplier_sum = int(multiplier_sums[last] - multiplier_sums[first])
+        return (
+            (price_per_day * multiplier_sum + BASIS_POINTS // 2) // BASIS_POINTS
+            + int(override_sums[last] - override_sums[first])
+            + price_per_day * uncovered_days
+        )
+
+    def window_costs(
+        self,
+        price_per_day: np.ndarray,
+        pickup_ordinals: np.ndarray,
+        return_ordinals: np.ndarray,
+        branch_id: str,
+        vehicle_class_id: str,
+        vehicle_id: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Returns the vehicle costs of many rental windows in cents, like vehicle_cost.
+
+        All windows share the branch, vehicle class and vehicle whose rules apply, so they are
+        priced from the same prefix sums at once.
+
+        Args:
+            price_per_day (np.ndarray): Prices per day in cents.
+            pickup_ordinals (np.ndarray): Date ordinals of the first charged days.
+            return_ordinals (np.ndarray): Date ordinals of the days after the last charged days.
+            branch_id (str): Id of the pickup branch.
+            vehicle_class_id (str): Id of the vehicle class.
+            vehicle_id (Optional[str]): Id of the vehicle, None to ignore vehicle rules.
+
+        Returns:
+            np.ndarray: The vehicle costs as int64, 0 for empty windows.
+        """
+        prices = np.asarray(price_per_day, dtype=np.int64)
+        pickups = np.asarray(pickup_ordinals, dtype=np.int64)
+        rental_days = np.maximum(
+            np.asarray(return_ordinals, dtype=np.int64) - pickups, 0
+        )
+        levels = self.__levels_of(branch_id, vehicle_class_id, vehicle_id)
+        if levels == (None, None, None):
+            return prices * rental_days
+
+        multiplier_sums, override_sums = self.__prefix_sums_of(
+            branch_id, vehicle_class_id, vehicle_id, levels
+        )
+        start = pickups - self.__origin
+        first = np.clip(start, 0, self.__days)
+        last = np.clip(start + rental_days, first, self.__days)
+        uncovered_days = rental_days - (last - first)
+        multiplier_sum = multiplier_sums[last] - multiplier_sums[first]
+        return (
+            (prices * multiplier_sum + BASIS_POINTS // 2) // BASIS_POINTS
+            + (override_sums[last] - override_sums[first])
+            + prices * uncovered_days
+        )
+
+    def daily_prices(
+        self,
+        vehicle: "Vehicle",
+        start: date,
+        end: date,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> np.ndarray:
+        """
+        Returns the daily prices of a vehicle in cents for the days of [start, end).
+
+        Every day is rounded on its own, so the sum can differ by a few cents from vehicle_cost.
+        """
+        days = max(0, (end - start).days)
+        prices = np.full(days, vehicle.price_per_day_cents, dtype=np.int64)
+        if self.__origin is None or not days:
+            return prices
+        branch = vehicle.current_branch if pickup_branch is None else pickup_branch
+        offset = start.toordinal() - self.__origin
+        first, last = max(offset, 0), min(offset + days, self.__days)
+        if first >= last:
+            return prices
+
+        multipliers, overrides = self.__combine(
+            self.__levels_of(branch.id, vehicle.vehicle_class.id, vehicle.id)
+        )
+        multipliers, overrides = multipliers[first:last], overrides[first:last]
+        prices[first - offset : last - offset] = np.where(
+            overrides >= 0,
+            overrides,
+            (vehicle.price_per_day_cents * multipliers + BASIS_POINTS // 2)
+            // BASIS_POINTS,
+        )
+        return prices
+
+    def lowest_rates(
+        self, pickup_date: date, return_date: date
+    ) -> Tuple[int, Optional[Cents]]:
+        """
+        Returns the lowest combined multiplier and the lowest override of any vehicle on any day of
+        the window [pickup_date, return_date).
+
+        The multiplier is in basis points and at most BASIS_POINTS, since days without rules are
+        charged price_per_day. The override is None if no day of the window has one. Results are
+        cached until a rule changes.
+        """
+        rental_days = (return_date - pickup_date).days
+        if not self.__rates or rental_days <= 0:
+            return BASIS_POINTS, None
+        start = pickup_date.toordinal() - self.__origin
+        first, last = max(start, 0), min(start + rental_days, self.__days)
+        if first >= last:
+            return BASIS_POINTS, None
+        cache_key = (self.__revision, first, last)
+        cached = self.__lowest_rates.get(cache_key)
+        if cached is not None:
+            return cached
+
+        lowest = {
+            "branch": BASIS_POINTS,
+            "vehicle_class": BASIS_POINTS,
+            "vehicle": BASIS_POINTS,
+        }
+        lowest_override = None
+        for (level, _), rates in self.__rates.items():
+            lowest[level] = min(lowest[level], int(rates.multipliers[first:last].min()))
+            overrides = rates.overrides[first:last]
+            overrides = overrides[overrides >= 0]
+            if overrides.size:
+                override = int(overrides.min())
+                if lowest_override is None or override < lowest_override:
+                    lowest_override = override
+        # Combined like __combine, rounding is monotone so the result is a lower bound
+        multiplier = lowest["branch"]
+        for level in ("vehicle_class", "vehicle"):
+            multiplier = (
+                multiplier * lowest[level] + BASIS_POINTS // 2
+            ) // BASIS_POINTS
+
+        if (
+            self.__lowest_rates
+            and next(iter(self.__lowest_rates))[0] != self.__revision
+        ):
+            self.__lowest_rates.clear()
+        self.__lowest_rates[cache_key] = (multiplier, lowest_override)
+        return multiplier, lowest_override
+
+    def lowest_cost(
+        self, price_per_day: Cents, pickup_date: date, return_date: date
+    ) -> Cents:
+        """
+        Returns a lower bound of the vehicle cost of [pickup_date, return_date) for any vehicle
+        with the given price_per_day, at any branch.
+
+        Every day costs at least the lower of the lowest multiplier applied to price_per_day and
+        the lowest override, so the bound never exceeds vehicle_cost.
+        """
+        rental_days = max((return_date - pickup_date).days, 0)
+        multiplier, override = self.lowest_rates(pickup_date, return_date)
+        daily = price_per_day * multiplier
+        if override is not None:
+            daily = min(daily, override * BASIS_POINTS)
+        return daily * rental_days // BASIS_POINTS
+
+
+_rate_calendar = RateCalendar()
+
+
+def get_rate_calendar() -> RateCalendar:
+    """Returns the rate calendar used by the pricing strategies"""
+    return _rate_calendar
+
+
+def set_rate_calendar(rate_calendar: RateCalendar) -> None:
+    """
+    Replaces the rate calendar used by the pricing strategies.
+
+    Raises:
+        TypeError: If rate_calendar is not a RateCalendar object.
+    """
+    global _rate_calendar
+    if not isinstance(rate_calendar, RateCalendar):
+        raise TypeError("rate_calendar must be a RateCalendar object")
+    _rate_calendar = rate_calendar
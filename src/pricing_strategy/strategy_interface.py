@@ -10,11 +10,16 @@ from datetime import date
 from abc import ABC, abstractmethod
 from typing import Optional, List, TYPE_CHECKING
 
+from src.money import to_amount
+
 
 if TYPE_CHECKING:
+    from src.money import Cents
+    from src.branch.branch import Branch
     from src.vehicle.vehicle import Vehicle
     from src.reservation.add_on import AddOn
     from src.reservation.insurance_tier import InsuranceTier
+    from src.pricing_strategy.price_quote import PriceQuote
 
 
 class Strategy(ABC):
@@ -22,11 +27,66 @@ class Strategy(ABC):
     Abstract base class for pricing calculation strategies.
 
     This interface defines the Strategy pattern for calculating reservation prices.
-    Concrete strategies must implement the calculate() method with their specific
-    pricing algorithms.
+    Concrete strategies must implement the quote() method with their specific
+    pricing algorithms, calculate_cents() returns the total of the quote in cents
+    and calculate() returns it as an amount.
     """
 
     @abstractmethod
+    def quote(
+        self,
+        vehicle: "Vehicle",
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> "PriceQuote":
+        """
+        Abstract method to quote the line items and the discount of a reservation.
+
+        Args:
+            vehicle (Vehicle): The vehicle being rented.
+            insurance_tier (InsuranceTier): The selected insurance tier.
+            pickup_date (date): The rental pickup date.
+            return_date (date): The rental return date.
+            add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
+
+        Returns:
+            PriceQuote: The line items and the discount in cents.
+        """
+        pass
+
+    def calculate_cents(
+        self,
+        vehicle: "Vehicle",
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> "Cents":
+        """
+        Calculate the total price of a reservation in cents, the total of its quote.
+
+        Args:
+            vehicle (Vehicle): The vehicle being rented.
+            insurance_tier (InsuranceTier): The selected insurance tier.
+            pickup_date (date): The rental pickup date.
+            return_date (date): The rental return date.
+            add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
+
+        Returns:
+            Cents: The total calculated price for the reservation in cents.
+        """
+        return self.quote(
+            vehicle, insurance_tier, pickup_date, return_date, add_ons, pickup_branch
+        ).total_cents
+
     def calculate(
         self,
         vehicle: "Vehicle",
@@ -34,9 +94,10 @@ class Strategy(ABC):
         pickup_date: date,
         return_date: date,
         add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
     ) -> float:
         """
-        Abstract method to calculate the total price of a reservation.
+        Calculate the total price of a reservation as an amount in currency units.
 
         Args:
             vehicle (Vehicle): The vehicle being rented.
@@ -44,8 +105,19 @@ class Strategy(ABC):
             pickup_date (date): The rental pickup date.
             return_date (date): The rental return date.
             add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+            pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+                current branch of the vehicle.
 
         Returns:
             float: The total calculated price for the reservation.
         """
-        pass
+        return to_amount(
+            self.calculate_cents(
+                vehicle,
+                insurance_tier,
+                pickup_date,
+                return_date,
+                add_ons,
+                pickup_branch,
+            )
+        )
@@ -0,0 +1,285 @@
+"""
+This module implements VehicleRecommender class, the k best vehicles of a rental window.
+Vehicles are ranked by their total quoted price, or by a weighted score over price, features and
+fuel level. A full quote goes through the pricing strategy of the customer, so candidates are
+visited from a heap in the order of a cheap bound and a bounded heap keeps the k best quotes.
+A vehicle whose price_per_day alone cannot beat the current k-th best is never quoted.
+
+Business Logic:
+    - Insurance, add-ons and the customer discount are the same for every candidate, so the total
+      price only grows with the vehicle cost of the window.
+    - The lower bound of a vehicle cost is price_per_day for every rental day, lowered by the
+      lowest multiplier and override of the rate calendar in the window (see RateCalendar).
+    - Ties of the total price are ranked by the lower vehicle cost, then by the candidate order.
+    - The price score is (cheapest bound + 1) / (vehicle cost + 1), the feature score is the share
+      of the wanted features of the vehicle class, the fuel score is the share of a full tank.
+      Weights cannot be negative, so a score is never above the score of the vehicle cost bound.
+    - Ties of the score are ranked by the candidate order.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, TYPE_CHECKING
+
+from src.money import Cents
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.pricing_strategy.rate_calendar import get_rate_calendar
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.add_on import AddOn
+    from src.reservation.insurance_tier import InsuranceTier
+
+# Fuel level of a full tank, in the same unit as Vehicle.fuel_level
+FULL_TANK = 1.0
+
+
+class Recommendation(NamedTuple):
+    """A recommended vehicle with its quote, score is 0 when ranked by total price"""
+
+    vehicle: "Vehicle"
+    total_price_cents: Cents
+    vehicle_cost_cents: Cents
+    score: float = 0.0
+
+
+class ScoreWeights(NamedTuple):
+    """Non-negative weights of the price, feature and fuel scores"""
+
+    price: float = 1.0
+    features: float = 0.0
+    fuel: float = 0.0
+
+
+class VehicleRecommender:
+    """
+    Concrete class recommending the best vehicles of a rental window for a customer.
+
+    Args:
+        customer (Customer): The customer whose pricing strategy quotes the vehicles.
+        insurance_tier (InsuranceTier): The selected insurance tier.
+        pickup_date (date): The rental pickup date.
+        return_date (date): The rental return date.
+        add_ons (Optional[List[AddOn]]): Optional list of add-ons. Defaults to None.
+        pickup_branch (Optional[Branch]): Branch whose seasonal rates apply. Defaults to the
+            current branch of every vehicle.
+
+    Raises:
+        TypeError: If customer is not an instance of Customer class.
+
+    Usage:
+        recommender = VehicleRecommender(customer, insurance_tier, pickup_date, return_date)
+        recommender.cheapest(available_vehicles, k=5)
+        recommender.best_scored(available_vehicles, 5, ScoreWeights(1.0, 0.5, 0.2), ["GPS"])
+    """
+
+    def __init__(
+        self,
+        customer: "Customer",
+        insurance_tier: "InsuranceTier",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+        pickup_branch: Optional["Branch"] = None,
+    ) -> None:
+        """Constructor method for VehicleRecommender class"""
+        self.__pricing = PricingStrategy(customer)
+        self.__insurance_tier = insurance_tier
+        self.__pickup_date = pickup_date
+        self.__return_date = return_date
+        self.__add_ons = add_ons
+        self.__pickup_branch = pickup_branch
+        self.__quotes = 0
+
+    @property
+    def quotes(self) -> int:
+        """Getter for the number of full quotes calculated so far"""
+        return self.__quotes
+
+    def __quote(self, vehicle: "Vehicle") -> Recommendation:
+        """Returns the full quote of a vehicle"""
+        self.__quotes += 1
+        total_price = self.__pricing.calculate_price_cents(
+            vehicle,
+            self.__insurance_tier,
+            self.__pickup_date,
+            self.__return_date,
+            self.__add_ons,
+            self.__pickup_branch,
+        )
+        vehicle_cost = get_rate_calendar().vehicle_cost(
+            vehicle, self.__pickup_date, self.__return_date, self.__pickup_branch
+        )
+        return Recommendation(vehicle, total_price, vehicle_cost)
+
+    @staticmethod
+    def __validate(vehicles: Iterable["Vehicle"], k: int) -> List["Vehicle"]:
+        """Validates k and the candidates and returns them as a list"""
+        from src.vehicle.vehicle import Vehicle
+
+        if isinstance(k, bool) or not isinstance(k, int):
+            raise TypeError("k must be an integer.")
+        if k < 1:
+            raise ValueError("k must be positive.")
+        vehicles = list(vehicles)
+        if not all(isinstance(vehicle, Vehicle) for vehicle in vehicles):
+            raise TypeError("all vehicles must be instances of Vehicle class.")
+        return vehicles
+
+    def cheapest(
+        self, vehicles: Iterable["Vehicle"], k: int = 5
+    ) -> List[Recommendation]:
+        """
+        Returns the k vehicles with the lowest total price, cheapest first.
+
+        Args:
+            vehicles (Iterable[Vehicle]): Candidate vehicles, e.g. the available ones.
+            k (int): Number of recommendations. Defaults to 5.
+
+        Returns:
+            List[Recommendation]: At most k recommendations.
+
+        Raises:
+            TypeError: If k is not an integer or a candidate is not a Vehicle.
+            ValueError: If k is not positive, or the window is rejected by the pricing strategy.
+        """
+        vehicles = self.__validate(vehicles, k)
+        calendar = get_rate_calendar()
+        # Candidates by price_per_day, the lower bound of a vehicle cost grows with it
+        candidates = [
+            (vehicle.price_per_day_cents, position, vehicle)
+            for position, vehicle in enumerate(vehicles)
+        ]
+        heapq.heapify(candidates)
+
+        # Max-heap of the k best (total price, vehicle cost, position), the k-th best on top
+        best = []
+        while candidates:
+            price_per_day, position, vehicle = heapq.heappop(candidates)
+            if len(best) == k:
+                lowest_cost = calendar.lowest_cost(
+                    price_per_day, self.__pickup_date, self.__return_date
+                )
+                # Every remaining vehicle costs more than the k-th best, so it is priced higher
+                if lowest_cost > -best[0][1]:
+                    break
+            quote = self.__quote(vehicle)
+            entry = (
+                -quote.total_price_cents,
+                -quote.vehicle_cost_cents,
+                -position,
+                quote,
+            )
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:3] > best[0][:3]:
+                heapq.heapreplace(best, entry)
+
+        return [
+            entry[3]
+            for entry in sorted(best, key=lambda entry: entry[:3], reverse=True)
+        ]
+
+    def best_scored(
+        self,
+        vehicles: Iterable["Vehicle"],
+        k: int = 5,
+        weights: ScoreWeights = ScoreWeights(),
+        features: Optional[Iterable[str]] = None,
+        full_tank: float = FULL_TANK,
+    ) -> List[Recommendation]:
+        """
+        Returns the k vehicles with the highest weighted score, best first.
+
+        Args:
+            vehicles (Iterable[Vehicle]): Candidate vehicles, e.g. the available ones.
+            k (int): Number of recommendations. Defaults to 5.
+            weights (ScoreWeights): Weights of the price, feature and fuel scores.
+            features (Optional[Iterable[str]]): Wanted features, every vehicle matches if empty.
+            full_tank (float): Fuel level of a full tank. Defaults to FULL_TANK.
+
+        Returns:
+            List[Recommendation]: At most k recommendations.
+
+        Raises:
+            TypeError: If k or a weight is not a number or a candidate is not a Vehicle.
+            ValueError: If k is not positive, a weight is negative, full_tank is not positive,
+                or the window is rejected by the pricing strategy.
+        """
+        vehicles = self.__validate(vehicles, k)
+        if not isinstance(weights, ScoreWeights):
+            raise TypeError("weights must be a ScoreWeights object.")
+        for weight in weights:
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise TypeError("weights must be numeric values.")
+            if weight < 0:
+                raise ValueError("weights cannot be negative.")
+        if full_tank <= 0:
+            raise ValueError("full_tank must be positive.")
+        wanted = set(features or ())
+        calendar = get_rate_calendar()
+        pickup_date, return_date = self.__pickup_date, self.__return_date
+
+        # Feature scores only depend on the vehicle class
+        feature_scores: Dict[str, float] = {}
+        bounds = []
+        for vehicle in vehicles:
+            vehicle_class = vehicle.vehicle_class
+            feature_score = feature_scores.get(vehicle_class.id)
+            if feature_score is None:
+                feature_score = feature_scores[vehicle_class.id] = (
+                    len(wanted.intersection(vehicle_class.features)) / len(wanted)
+                    if wanted
+                    else 1.0
+                )
+            lowest_cost = calendar.lowest_cost(
+                vehicle.price_per_day_cents, pickup_date, return_date
+            )
+            fuel_score = min(vehicle.fuel_level, full_tank) / full_tank
+            bounds.append((lowest_cost, feature_score, fuel_score))
+        cheapest = min((bound[0] for bound in bounds), default=0) + 1
+
+        def score(
+            vehicle_cost: Cents, feature_score: float, fuel_score: float
+        ) -> float:
+            """Returns the weighted score of a vehicle cost, its feature and fuel scores"""
+            return (
+                weights.price * (cheapest / (vehicle_cost + 1))
+                + weights.features * feature_score
+                + weights.fuel * fuel_score
+            )
+
+        # Candidates by the highest possible score first
+        candidates = [
+            (-score(*bound), position, bound) for position, bound in enumerate(bounds)
+        ]
+        heapq.heapify(candidates)
+
+        # Min-heap of the k best (score, -position), the k-th best on top
+        best = []
+        while candidates:
+            highest, position, (_, feature_score, fuel_score) = heapq.heappop(
+                candidates
+            )
+            if len(best) == k and -highest < best[0][0]:
+                break
+            quote = self.__quote(vehicles[position])
+            entry = (
+                score(quote.vehicle_cost_cents, feature_score, fuel_score),
+                -position,
+                quote,
+            )
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:2] > best[0][:2]:
+                heapq.heapreplace(best, entry)
+
+        return [
+            entry[2]._replace(score=entry[0])
+            for entry in sorted(best, key=lambda entry: entry[:2], reverse=True)
+        ]
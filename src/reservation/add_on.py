@@ -4,6 +4,8 @@ It is a concrete class and can directly initialize in the app.
 
 Business Logic:
     - id is autogenerated and cannot be edited.
+    - price_per_day is stored in cents, see src/money.py.
+    - Change listeners are notified after price_per_day changes and are not pickled.
 
 Author: Peyman Khodabandehlouei
 Date: 07-11-2025
@@ -11,8 +13,11 @@ Date: 07-11-2025
 
 import uuid
 
+from src.money import Cents, to_amount, to_cents
+from src.change_notifier import ChangeNotifier
 
-class AddOn:
+
+class AddOn(ChangeNotifier):
     """
     Concrete class representing an add-on in the application.
     This class can be directly initialized and used during application runtime.
@@ -42,7 +47,8 @@ class AddOn:
         self.__id = str(uuid.uuid4())
         self.__name = name
         self.__description = description
-        self.__price_per_day = price_per_day
+        self.__price_per_day_cents = to_cents(price_per_day)
+        ChangeNotifier.__init__(self)
 
     @property
     def id(self) -> str:
@@ -80,7 +86,12 @@ class AddOn:
     @property
     def price_per_day(self) -> float:
         """Getter method for price_per_day property."""
-        return self.__price_per_day
+        return to_amount(self.__price_per_day_cents)
+
+    @property
+    def price_per_day_cents(self) -> Cents:
+        """Getter method for price_per_day property in cents."""
+        return self.__price_per_day_cents
 
     @price_per_day.setter
     def price_per_day(self, price_per_day: float) -> None:
@@ -91,8 +102,9 @@ class AddOn:
         if price_per_day < 0:
             raise ValueError("price_per_day cannot be negative")
 
-        self.__price_per_day = price_per_day
+        self.__price_per_day_cents = to_cents(price_per_day)
+        self._publish_change("price_per_day")
 
     def __str__(self):
         """String representation of the AddOn object."""
-        return f"AddOn(name={self.__name}, description={self.__description}, price_per_day={self.__price_per_day})"
\ No newline at end of file
+        return f"AddOn(name={self.__name}, description={self.__description}, price_per_day={self.price_per_day})"
\ No newline at end of file
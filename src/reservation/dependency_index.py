@@ -0,0 +1,294 @@
+"""
+This module implements ReservationDependencyIndex class which maps the catalog objects priced into
+a reservation to the open reservations referencing them. Vehicles, vehicle classes, add-ons,
+insurance tiers and pickup branches are reverse indexed, so a price change only reprices its
+dependent reservations instead of scanning every customer.
+
+Business Logic:
+    - Reservations are indexed while they are open, cancelled and completed reservations are
+      dropped from the index.
+    - The index follows changes of the vehicle, insurance tier, pickup branch and add-ons of
+      tracked reservations, and of the vehicle class of their vehicles.
+    - Price changes of a vehicle, vehicle class, add-on or insurance tier reprice the dependent
+      reservations at once, the repricing policy decides whether their quotes are honoured.
+    - Rate rules are repriced from the reservations of their targets.
+    - Change listeners are local to the process, the index is rebuilt from reservations.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from src.enums import RepricingPolicy, ReservationStatus
+from src.pricing_strategy.rate_calendar import RateRule
+from src.reservation.repricing_job import RepricingJob, RepricingReport
+
+if TYPE_CHECKING:
+    from src.reservation.reservation import Reservation
+
+# (level, id) of an indexed catalog object
+Key = Tuple[str, str]
+
+_CLOSED_STATUSES = (
+    ReservationStatus.CANCELLED.value,
+    ReservationStatus.COMPLETED.value,
+)
+_REINDEXED_FIELDS = ("vehicle", "insurance_tier", "pickup_branch", "add_ons")
+_PRICE_FIELDS = ("price_per_day", "base_daily_rate")
+
+
+class ReservationDependencyIndex:
+    """
+    Concrete class reverse indexing open reservations by the catalog objects they reference.
+
+    Args:
+        policy (RepricingPolicy): Decides whether repriced reservations keep their quotes.
+        job (Optional[RepricingJob]): Job repricing the dependent reservations, defaults to a job
+            which prices in the calling process.
+
+    Raises:
+        TypeError: If policy is not a RepricingPolicy enum or job is not a RepricingJob.
+    """
+
+    def __init__(
+        self,
+        policy: RepricingPolicy = RepricingPolicy.REPRICE,
+        job: Optional[RepricingJob] = None,
+    ) -> None:
+        """Constructor method for ReservationDependencyIndex class"""
+        if not isinstance(policy, RepricingPolicy):
+            raise TypeError("policy must be an instance of RepricingPolicy enum")
+        if job is not None and not isinstance(job, RepricingJob):
+            raise TypeError("job must be a RepricingJob object")
+
+        self.__policy = policy
+        self.__job = RepricingJob(workers=0) if job is None else job
+        self.__reservations: Dict[str, "Reservation"] = {}
+        # Keys of every tracked reservation and reservations of every key
+        self.__keys: Dict[str, Tuple[Key, ...]] = {}
+        self.__dependents: Dict[Key, Dict[str, "Reservation"]] = {}
+        # Catalog objects whose changes are listened to
+        self.__watched: Dict[Key, Any] = {}
+        self.__last_report: Optional[RepricingReport] = None
+
+    def __len__(self) -> int:
+        """Returns the number of tracked reservations"""
+        return len(self.__reservations)
+
+    def __contains__(self, reservation_id: str) -> bool:
+        return reservation_id in self.__reservations
+
+    @property
+    def policy(self) -> RepricingPolicy:
+        """Getter for policy property"""
+        return self.__policy
+
+    @policy.setter
+    def policy(self, policy: RepricingPolicy) -> None:
+        """
+        Setter for policy property.
+
+        Raises:
+            TypeError: If policy is not a RepricingPolicy enum.
+        """
+        if not isinstance(policy, RepricingPolicy):
+            raise TypeError("policy must be an instance of RepricingPolicy enum")
+
+        self.__policy = policy
+
+    @property
+    def last_report(self) -> Optional[RepricingReport]:
+        """Report of the last repricing, None before the first one"""
+        return self.__last_report
+
+    @staticmethod
+    def __key_of(target: Any) -> Key:
+        """Returns the (level, id) key of a catalog object"""
+        from src.branch.branch import Branch
+        from src.reservation.add_on import AddOn
+        from src.reservation.insurance_tier import InsuranceTier
+        from src.vehicle.vehicle import Vehicle
+        from src.vehicle.vehicle_class import VehicleClass
+
+        if isinstance(target, Vehicle):
+            return "vehicle", target.id
+        if isinstance(target, VehicleClass):
+            return "vehicle_class", target.id
+        if isinstance(target, AddOn):
+            return "add_on", target.id
+        if isinstance(target, InsuranceTier):
+            return "insurance_tier", target.id
+        if isinstance(target, Branch):
+            return "branch", target.id
+        raise TypeError(
+            "target must be a Vehicle, VehicleClass, AddOn, InsuranceTier or Branch object"
+        )
+
+    @staticmethod
+    def __targets_of(reservation: "Reservation") -> Dict[Key, Any]:
+        """Returns the catalog objects a reservation references by their keys"""
+        vehicle, tier = reservation.vehicle, reservation.insurance_tier
+        targets = {
+            ("vehicle", vehicle.id): vehicle,
+            ("vehicle_class", vehicle.vehicle_class.id): vehicle.vehicle_class,
+            ("insurance_tier", tier.id): tier,
+            ("branch", reservation.pickup_branch.id): reservation.pickup_branch,
+        }
+        for add_on in reservation.add_ons:
+            targets[("add_on", add_on.id)] = add_on
+        return targets
+
+    def track(self, reservation: "Reservation") -> None:
+        """
+        Indexes an open reservation and follows its changes. Closed reservations are ignored.
+
+        Args:
+            reservation (Reservation): The reservation to index.
+
+        Raises:
+            TypeError: If reservation is not a Reservation object.
+        """
+        from src.reservation.reservation import Reservation
+
+        if not isinstance(reservation, Reservation):
+            raise TypeError("reservation must be a Reservation object")
+        if (
+            reservation.id in self.__reservations
+            or reservation.status in _CLOSED_STATUSES
+        ):
+            return
+
+        self.__reservations[reservation.id] = reservation
+        reservation.add_change_listener(self.__on_reservation_changed)
+        self.__index(reservation)
+
+    def track_many(self, reservations: Iterable["Reservation"]) -> None:
+        """Indexes every open reservation of an iterable"""
+        for reservation in reservations:
+            self.track(reservation)
+
+    def untrack(self, reservation_id: str) -> None:
+        """Removes a reservation from the index"""
+        reservation = self.__reservations.pop(reservation_id, None)
+        if reservation is not None:
+            reservation.remove_change_listener(self.__on_reservation_changed)
+            self.__unindex(reservation_id)
+
+    def __index(self, reservation: "Reservation") -> None:
+        """Adds a reservation to the dependents of the catalog objects it references"""
+        targets = self.__targets_of(reservation)
+        self.__keys[reservation.id] = tuple(targets)
+        for key, target in targets.items():
+            dependents = self.__dependents.get(key)
+            if dependents is None:
+                dependents = self.__dependents[key] = {}
+                self.__watch(key, target)
+            dependents[reservation.id] = reservation
+
+    def __unindex(self, reservation_id: str) -> None:
+        """Removes a reservation from the dependents of the catalog objects it referenced"""
+        for key in self.__keys.pop(reservation_id, ()):
+            dependents = self.__dependents[key]
+            del dependents[reservation_id]
+            if not dependents:
+                del self.__dependents[key]
+                self.__unwatch(key)
+
+    def __watch(self, key: Key, target: Any) -> None:
+        """Listens to price changes of a catalog object, branches are repriced by rate rules"""
+        if key[0] != "branch":
+            self.__watched[key] = target
+            target.add_change_listener(self.__on_catalog_changed)
+
+    def __unwatch(self, key: Key) -> None:
+        """Stops listening to a catalog object without dependents"""
+        target = self.__watched.pop(key, None)
+        if target is not None:
+            target.remove_change_listener(self.__on_catalog_changed)
+
+    def __on_reservation_changed(
+        self, reservation: "Reservation", field_name: str
+    ) -> None:
+        """Change listener of tracked reservations"""
+        if field_name == "status" and reservation.status in _CLOSED_STATUSES:
+            self.untrack(reservation.id)
+        elif field_name in _REINDEXED_FIELDS:
+            self.__unindex(reservation.id)
+            self.__index(reservation)
+
+    def __on_catalog_changed(self, target: Any, field_name: str) -> None:
+        """Change listener of catalog objects with dependent reservations"""
+        if field_name == "vehicle_class":
+            # The reservations of the vehicle depend on its new class
+            for reservation in self.reservations_of(target):
+                self.__unindex(reservation.id)
+                self.__index(reservation)
+        elif field_name in _PRICE_FIELDS:
+            self.reprice(target)
+
+    def reservations_of(self, target: Any) -> List["Reservation"]:
+        """
+        Returns the tracked reservations referencing a catalog object, in the order they were
+        indexed.
+
+        Args:
+            target (Any): A Vehicle, VehicleClass, AddOn, InsuranceTier or Branch object.
+
+        Returns:
+            List[Reservation]: The dependent reservations.
+
+        Raises:
+            TypeError: If target is not a catalog object.
+        """
+        return list(self.__dependents.get(self.__key_of(target), {}).values())
+
+    def reprice(self, target: Any, dry_run: bool = False) -> RepricingReport:
+        """
+        Reprices the reservations referencing a catalog object with the policy of the index.
+
+        Args:
+            target (Any): A Vehicle, VehicleClass, AddOn, InsuranceTier or Branch object.
+            dry_run (bool): If True, the report is returned and no reservation is changed.
+
+        Returns:
+            RepricingReport: Old and new totals of the dependent reservations.
+
+        Raises:
+            TypeError: If target is not a catalog object.
+        """
+        report = self.__job.run(
+            self.reservations_of(target), dry_run=dry_run, policy=self.__policy
+        )
+        self.__last_report = report
+        return report
+
+    def reprice_rules(
+        self, rules: Iterable[RateRule], dry_run: bool = False
+    ) -> RepricingReport:
+        """
+        Reprices the reservations affected by changed rate rules, only the reservations of the
+        rule targets are considered.
+
+        Args:
+            rules (Iterable[RateRule]): The changed rate rules.
+            dry_run (bool): If True, the report is returned and no reservation is changed.
+
+        Returns:
+            RepricingReport: Old and new totals of the affected reservations.
+
+        Raises:
+            TypeError: If rules contain objects other than RateRule.
+        """
+        rules = list(rules)
+        candidates: Dict[str, "Reservation"] = {}
+        for rule in rules:
+            if not isinstance(rule, RateRule):
+                raise TypeError("rules must contain RateRule objects")
+            key = self.__key_of(rule.target)
+            candidates.update(self.__dependents.get(key, {}))
+        report = self.__job.run(
+            candidates.values(), rules=rules, dry_run=dry_run, policy=self.__policy
+        )
+        self.__last_report = report
+        return report
@@ -4,7 +4,10 @@ It is a concrete class and can directly initialize in the app.
 
 Business Logic:
     - id and date are autogenerated and cannot be edited.
-    - All Invoice attributes expect status are immutable and cannot be changed after initialization.
+    - total_price and the price quote with its line items are copied from the reservation in cents.
+    - All Invoice attributes expect status are immutable and cannot be changed after initialization,
+      except the total_price and price quote of a pending invoice when its reservation is repriced.
+    - Change listeners are notified after every status change and are not pickled with the invoice.
 
 Author: Peyman Khodabandehlouei
 Date: 07-11-2025
@@ -14,6 +17,9 @@ import uuid
 from datetime import date
 from typing import TYPE_CHECKING
 from src.enums import InvoiceStatus
+from src.money import Cents, to_amount
+from src.change_notifier import ChangeNotifier
+from src.pricing_strategy.price_quote import PriceQuote
 
 
 if TYPE_CHECKING:
@@ -21,7 +27,7 @@ if TYPE_CHECKING:
     from src.reservation.reservation import Reservation
 
 
-class Invoice:
+class Invoice(ChangeNotifier):
     """
     Concrete class representing an invoice in the application.
     This class can be directly initialized and used during application runtime.
@@ -47,9 +53,11 @@ class Invoice:
         self.__id = str(uuid.uuid4())
         self.__creator = creator
         self.__reservation = reservation
-        self.__total_price = reservation.total_price
+        self.__total_price_cents = reservation.total_price_cents
+        self.__price_quote = reservation.price_quote
         self.__date = date.today()
         self.__status = InvoiceStatus.PENDING
+        ChangeNotifier.__init__(self)
 
     @property
     def id(self) -> str:
@@ -69,7 +77,17 @@ class Invoice:
     @property
     def total_price(self) -> float:
         """Getter for total_price property."""
-        return self.__total_price
+        return to_amount(self.__total_price_cents)
+
+    @property
+    def total_price_cents(self) -> Cents:
+        """Getter for total_price property in cents."""
+        return self.__total_price_cents
+
+    @property
+    def price_quote(self) -> PriceQuote:
+        """Getter for price_quote property, the billed line items and discount."""
+        return self.__price_quote
 
     @property
     def date(self) -> date:
@@ -81,14 +99,36 @@ class Invoice:
         """Getter for status property."""
         return self.__status.value
 
+    def reprice(self, price_quote: PriceQuote) -> None:
+        """
+        Updates the price quote and total price of a pending invoice after its reservation was
+        repriced.
+
+        Raises:
+            TypeError: If price_quote is not a PriceQuote.
+            ValueError: If the total of price_quote is negative or the invoice is not pending.
+        """
+        if not isinstance(price_quote, PriceQuote):
+            raise TypeError("price_quote must be a PriceQuote object")
+        if price_quote.total_cents < 0:
+            raise ValueError("total_price_cents cannot be negative")
+        if self.__status != InvoiceStatus.PENDING:
+            raise ValueError("only pending invoices can be repriced")
+
+        self.__price_quote = price_quote
+        self.__total_price_cents = price_quote.total_cents
+        self._publish_change("total_price")
+
     def payment_completed(self):
         """Updates invoice status to COMPLETED"""
         self.__status = InvoiceStatus.COMPLETED
+        self._publish_change("status")
 
     def payment_failed(self):
         """Updates invoice status to FAILED"""
         self.__status = InvoiceStatus.FAILED
+        self._publish_change("status")
 
     def __str__(self):
         """String representation of the Invoice object"""
-        return f"Invoice(id={self.__id}, creator={self.__creator.id}, reservation={self.__reservation.id}, total_price={self.__total_price}, date={self.__date}, status={self.__status})"
+        return f"Invoice(id={self.__id}, creator={self.__creator.id}, reservation={self.__reservation.id}, total_price={self.total_price}, date={self.__date}, status={self.__status})"
@@ -0,0 +1,465 @@
+"""
+This module implements RepricingJob class which recomputes the totals of open reservations in bulk
+after rates changed. Affected reservations are encoded as a compact NumPy record array, split into
+chunks and priced by a process pool, and the new totals are applied back in one batch.
+
+Business Logic:
+    - Only PENDING and APPROVED reservations with a pending invoice and a pickup date which is not
+      in the past are repriced, every other reservation is skipped.
+    - Given the changed rate rules, only reservations whose pickup branch, vehicle class or vehicle
+      is a rule target and whose rental window overlaps the rule days are affected.
+    - New totals equal the totals of the pricing strategy of the reservation, a reservation with an
+      unknown strategy is priced by its strategy in the calling process.
+    - An applied total is set with its new quote, so the line items of the reservation add up to
+      the repriced total.
+    - Totals are applied with the version read at selection, reservations changed in the meantime
+      are reported as conflicts and keep their total.
+    - The repricing policy decides whether a changed total is applied or the quoted total is
+      honoured, honoured reservations are reported and keep their total.
+    - A dry run reports the differences without changing any reservation.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+import numpy as np
+
+from src.enums import InvoiceStatus, RepricingPolicy, ReservationStatus
+from src.money import format_cents
+from src.pricing_strategy.concrete_strategies import (
+    FIRST_ORDER_DISCOUNT_PERCENT,
+    LOYALTY_DISCOUNT_PERCENT,
+    DailyStrategy,
+    FirstOrderStrategy,
+    LoyaltyStrategy,
+)
+from src.pricing_strategy.price_quote import PriceQuote, quote_rental
+from src.pricing_strategy.rate_calendar import (
+    RateCalendar,
+    RateRule,
+    get_rate_calendar,
+)
+
+if TYPE_CHECKING:
+    from src.reservation.reservation import Reservation
+
+# Discount in percent of the strategies which are priced in bulk
+STRATEGY_DISCOUNTS = {
+    DailyStrategy: 0,
+    FirstOrderStrategy: FIRST_ORDER_DISCOUNT_PERCENT,
+    LoyaltyStrategy: LOYALTY_DISCOUNT_PERCENT,
+}
+
+# One record per reservation, 29 bytes. group indexes the (branch id, vehicle class id,
+# vehicle id or None) rule levels, daily_extras are the insurance and add-ons cents per day.
+RECORD_DTYPE = np.dtype(
+    [
+        ("price_per_day", np.int64),
+        ("group", np.int32),
+        ("pickup", np.int32),
+        ("return", np.int32),
+        ("daily_extras", np.int64),
+        ("discount", np.int8),
+    ],
+    align=False,
+)
+
+_REPRICED_STATUSES = (ReservationStatus.PENDING.value, ReservationStatus.APPROVED.value)
+
+# Rate calendar and rule levels of a worker process, installed by its initializer
+_worker_state: Optional[Tuple[RateCalendar, List[Tuple]]] = None
+
+
+class RepricingDiff(NamedTuple):
+    """Old and new total of a repriced reservation"""
+
+    reservation_id: str
+    old_total_cents: int
+    new_total_cents: int
+
+
+class RepricingReport(NamedTuple):
+    """
+    Result of a repricing run.
+
+    diffs lists the reservations whose total changed, conflicts the ids of the reservations which
+    changed during the run and honoured the ids of the reservations whose quote the policy kept.
+    """
+
+    diffs: List[RepricingDiff]
+    unchanged: int
+    skipped: int
+    conflicts: List[str]
+    honoured: List[str]
+    dry_run: bool
+
+    @property
+    def applied(self) -> int:
+        """Number of reservations whose new total was set"""
+        if self.dry_run:
+            return 0
+        return len(self.diffs) - len(self.conflicts) - len(self.honoured)
+
+    def summary(self) -> str:
+        """Returns the report as text, one line per changed reservation"""
+        mode = "dry run" if self.dry_run else f"{self.applied} applied"
+        lines = [
+            f"{len(self.diffs)} changed, {self.unchanged} unchanged, {self.skipped} skipped, "
+            f"{len(self.conflicts)} conflicts, {len(self.honoured)} honoured ({mode})"
+        ]
+        lines.extend(
+            f"{diff.reservation_id}: {format_cents(diff.old_total_cents)} -> "
+            f"{format_cents(diff.new_total_cents)}"
+            for diff in self.diffs
+        )
+        return "\n".join(lines)
+
+
+def record_vehicle_costs(
+    records: np.ndarray, calendar: RateCalendar, groups: List[Tuple]
+) -> np.ndarray:
+    """
+    Returns the vehicle costs of encoded reservations in cents.
+
+    Args:
+        records (np.ndarray): Reservations encoded as RECORD_DTYPE.
+        calendar (RateCalendar): Rate calendar whose rules apply.
+        groups (List[Tuple]): (branch id, vehicle class id, vehicle id or None) of every group.
+
+    Returns:
+        np.ndarray: The vehicle costs as int64, in the order of the records.
+    """
+    costs = np.empty(len(records), dtype=np.int64)
+    if len(records) == 0:
+        return costs
+
+    # Records of a group share their rules, so each group is priced at once
+    order = np.argsort(records["group"], kind="stable")
+    sorted_groups = records["group"][order]
+    bounds = np.flatnonzero(np.diff(sorted_groups)) + 1
+    for rows in np.split(order, bounds):
+        group = records[rows]
+        costs[rows] = calendar.window_costs(
+            group["price_per_day"],
+            group["pickup"],
+            group["return"],
+            *groups[group["group"][0]],
+        )
+    return costs
+
+
+def record_totals(records: np.ndarray, costs: np.ndarray) -> np.ndarray:
+    """Returns the totals of encoded reservations in cents from their vehicle costs"""
+    rental_days = np.maximum(records["return"].astype(np.int64) - records["pickup"], 0)
+    subtotals = costs + records["daily_extras"] * rental_days
+    # Discounts are rounded half up to a cent, like apply_discount
+    discounts = records["discount"].astype(np.int64)
+    return subtotals - (subtotals * discounts + 50) // 100
+
+
+def price_records(
+    records: np.ndarray, calendar: RateCalendar, groups: List[Tuple]
+) -> np.ndarray:
+    """
+    Returns the totals of encoded reservations in cents.
+
+    Args:
+        records (np.ndarray): Reservations encoded as RECORD_DTYPE.
+        calendar (RateCalendar): Rate calendar whose rules apply.
+        groups (List[Tuple]): (branch id, vehicle class id, vehicle id or None) of every group.
+
+    Returns:
+        np.ndarray: The totals as int64, in the order of the records.
+    """
+    return record_totals(records, record_vehicle_costs(records, calendar, groups))
+
+
+def _init_worker(calendar: RateCalendar, groups: List[Tuple]) -> None:
+    """Installs the rate calendar and rule levels of a worker process"""
+    global _worker_state
+    _worker_state = (calendar, groups)
+
+
+def _cost_chunk(records: np.ndarray) -> np.ndarray:
+    """Computes the vehicle costs of a chunk of records in a worker process"""
+    calendar, groups = _worker_state
+    return record_vehicle_costs(records, calendar, groups)
+
+
+class RepricingJob:
+    """
+    Concrete class recomputing the totals of open reservations after rates changed.
+
+    Args:
+        workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+            0 prices every chunk in the calling process.
+        chunk_size (int): Number of reservations sent to a worker at once.
+
+    Raises:
+        TypeError: If workers or chunk_size is not an integer.
+        ValueError: If workers is negative or chunk_size is less than 1.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 50_000) -> None:
+        """Constructor method for RepricingJob class"""
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if isinstance(workers, bool) or not isinstance(workers, int):
+            raise TypeError("workers must be an integer")
+        if workers < 0:
+            raise ValueError("workers cannot be negative")
+        if isinstance(chunk_size, bool) or not isinstance(chunk_size, int):
+            raise TypeError("chunk_size must be an integer")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.__workers = workers
+        self.__chunk_size = chunk_size
+
+    @property
+    def workers(self) -> int:
+        """Getter for workers property"""
+        return self.__workers
+
+    @property
+    def chunk_size(self) -> int:
+        """Getter for chunk_size property"""
+        return self.__chunk_size
+
+    @staticmethod
+    def __rule_windows(
+        rules: Iterable[RateRule],
+    ) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """Returns the [start, end) ordinals of the rules by their (level, id) target"""
+        from src.branch.branch import Branch
+        from src.vehicle.vehicle import Vehicle
+        from src.vehicle.vehicle_class import VehicleClass
+
+        windows: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for rule in rules:
+            if not isinstance(rule, RateRule):
+                raise TypeError("rules must contain RateRule objects")
+            if isinstance(rule.target, Vehicle):
+                key = ("vehicle", rule.target.id)
+            elif isinstance(rule.target, VehicleClass):
+                key = ("vehicle_class", rule.target.id)
+            elif isinstance(rule.target, Branch):
+                key = ("branch", rule.target.id)
+            else:
+                raise TypeError(
+                    "target must be a Branch, VehicleClass or Vehicle object"
+                )
+            windows.setdefault(key, []).append(
+                (rule.start.toordinal(), rule.end.toordinal())
+            )
+        return windows
+
+    @staticmethod
+    def __is_affected(
+        reservation: "Reservation",
+        windows: Dict[Tuple[str, str], List[Tuple[int, int]]],
+        pickup: int,
+        return_: int,
+    ) -> bool:
+        """Returns True if a rule target of the reservation changed on one of its rental days"""
+        vehicle = reservation.vehicle
+        for key in (
+            ("branch", reservation.pickup_branch.id),
+            ("vehicle_class", vehicle.vehicle_class.id),
+            ("vehicle", vehicle.id),
+        ):
+            for start, end in windows.get(key, ()):
+                if start < return_ and pickup < end:
+                    return True
+        return False
+
+    @staticmethod
+    def __honours_quote(
+        policy: RepricingPolicy,
+        reservation: "Reservation",
+        old_total: int,
+        new_total: int,
+    ) -> bool:
+        """Returns True if the policy keeps the quoted total of a reservation"""
+        if policy is RepricingPolicy.HONOUR_QUOTE:
+            return True
+        if policy is RepricingPolicy.HONOUR_APPROVED:
+            return reservation.status == ReservationStatus.APPROVED.value
+        if policy is RepricingPolicy.LOWER_ONLY:
+            return new_total > old_total
+        return False
+
+    def run(
+        self,
+        reservations: Iterable["Reservation"],
+        rules: Optional[Iterable[RateRule]] = None,
+        dry_run: bool = False,
+        policy: RepricingPolicy = RepricingPolicy.REPRICE,
+    ) -> RepricingReport:
+        """
+        Reprices reservations with the rates of the current rate calendar.
+
+        Args:
+            reservations (Iterable[Reservation]): Reservations to consider.
+            rules (Optional[Iterable[RateRule]]): Changed rate rules, only reservations they affect
+                are repriced. None reprices every open reservation.
+            dry_run (bool): If True, the report is returned and no reservation is changed.
+            policy (RepricingPolicy): Decides which changed totals are applied.
+
+        Returns:
+            RepricingReport: Old and new totals of the reservations whose total changed.
+
+        Raises:
+            TypeError: If rules contain objects other than RateRule.
+            TypeError: If policy is not a RepricingPolicy enum.
+        """
+        if not isinstance(policy, RepricingPolicy):
+            raise TypeError("policy must be an instance of RepricingPolicy enum")
+        calendar = get_rate_calendar()
+        windows = None if rules is None else self.__rule_windows(rules)
+        today = date.today().toordinal()
+
+        # Select the affected reservations and encode them
+        selected: List[Tuple["Reservation", int, int]] = []
+        fallback: List[Tuple["Reservation", int, int]] = []
+        groups: Dict[Tuple, int] = {}
+        vehicle_rules: Dict[str, bool] = {}
+        rows: List[Tuple[int, int, int, int, int, int]] = []
+        skipped = 0
+        for reservation in reservations:
+            pickup = reservation.pickup_date.toordinal()
+            return_ = reservation.return_date.toordinal()
+            if (
+                reservation.status not in _REPRICED_STATUSES
+                or reservation.invoice.status != InvoiceStatus.PENDING.value
+                or pickup < today
+                or (
+                    windows is not None
+                    and not self.__is_affected(reservation, windows, pickup, return_)
+                )
+            ):
+                skipped += 1
+                continue
+
+            # Read the version first, a change after it is detected when applying
+            version, old_total = reservation.version, reservation.total_price_cents
+            discount = STRATEGY_DISCOUNTS.get(
+                type(reservation.pricing_strategy.strategy)
+            )
+            if discount is None:
+                fallback.append((reservation, version, old_total))
+                continue
+
+            vehicle = reservation.vehicle
+            has_rules = vehicle_rules.get(vehicle.id)
+            if has_rules is None:
+                has_rules = vehicle_rules[vehicle.id] = calendar.has_rules(vehicle)
+            key = (
+                reservation.pickup_branch.id,
+                vehicle.vehicle_class.id,
+                vehicle.id if has_rules else None,
+            )
+            group = groups.setdefault(key, len(groups))
+            daily_extras = reservation.insurance_tier.price_per_day_cents + sum(
+                add_on.price_per_day_cents for add_on in reservation.add_ons
+            )
+            rows.append(
+                (
+                    vehicle.price_per_day_cents,
+                    group,
+                    pickup,
+                    return_,
+                    daily_extras,
+                    discount,
+                )
+            )
+            selected.append((reservation, version, old_total))
+
+        # Compute the new totals, the quotes of the bulk priced reservations are only created
+        # for the totals which are applied
+        records = np.array(rows, dtype=RECORD_DTYPE)
+        costs = self.__vehicle_costs(records, calendar, list(groups))
+        totals = record_totals(records, costs).tolist()
+        quotes: List[Optional[PriceQuote]] = [None] * len(totals)
+        for reservation, _, _ in fallback:
+            quote = reservation.pricing_strategy.quote_price(
+                vehicle=reservation.vehicle,
+                insurance_tier=reservation.insurance_tier,
+                pickup_date=reservation.pickup_date,
+                return_date=reservation.return_date,
+                add_ons=list(reservation.add_ons),
+                pickup_branch=reservation.pickup_branch,
+            )
+            totals.append(quote.total_cents)
+            quotes.append(quote)
+        selected.extend(fallback)
+
+        # Apply the changed totals in one batch
+        diffs: List[RepricingDiff] = []
+        conflicts: List[str] = []
+        honoured: List[str] = []
+        for index, ((reservation, version, old_total), new_total) in enumerate(
+            zip(selected, totals)
+        ):
+            if new_total == old_total:
+                continue
+            diffs.append(RepricingDiff(reservation.id, old_total, new_total))
+            if self.__honours_quote(policy, reservation, old_total, new_total):
+                honoured.append(reservation.id)
+                continue
+            if dry_run:
+                continue
+
+            quote = quotes[index]
+            if quote is None:
+                quote = quote_rental(
+                    reservation.vehicle,
+                    reservation.insurance_tier,
+                    reservation.add_ons,
+                    (reservation.return_date - reservation.pickup_date).days,
+                    int(costs[index]),
+                    int(records["discount"][index]),
+                )
+            if not reservation.reprice(quote, version):
+                conflicts.append(reservation.id)
+
+        return RepricingReport(
+            diffs=diffs,
+            unchanged=len(selected) - len(diffs),
+            skipped=skipped,
+            conflicts=conflicts,
+            honoured=honoured,
+            dry_run=dry_run,
+        )
+
+    def __vehicle_costs(
+        self, records: np.ndarray, calendar: RateCalendar, groups: List[Tuple]
+    ) -> np.ndarray:
+        """
+        Computes the vehicle costs of the records in chunks, in worker processes if there is more
+        than one chunk
+        """
+        chunk_count = -(-len(records) // self.__chunk_size)
+        if self.__workers == 0 or chunk_count <= 1:
+            return record_vehicle_costs(records, calendar, groups)
+
+        chunks = np.array_split(records, chunk_count)
+        with ProcessPoolExecutor(
+            max_workers=min(self.__workers, chunk_count),
+            initializer=_init_worker,
+            initargs=(calendar, groups),
+        ) as executor:
+            return np.concatenate(list(executor.map(_cost_chunk, chunks)))
@@ -6,23 +6,41 @@ Business Logic:
     - id is autogenerated and cannot be edited.
     - Having a InsuranceTier is mandatory.
     - Invoice is automatically created on reservation creation with PENDING status.
-    - Total price is calculated and cannot be modified.
+    - Total price is calculated in cents and cannot be modified, except by reprice() which a bulk
+      repricing job uses after rates changed.
+    - The price quote with the line items and the discount is kept with the total price, so the
+      billed amounts do not change when prices or rates change later.
     - PricingStrategy is created on initialization and cannot be modified.
     - Total price is calculated automatically with any change in reservation properties.
+    - version is incremented on every change and cannot be edited.
+    - Status transitions are guarded by striped per-reservation locks.
+    - Change listeners are notified after every change of status, total price, vehicle, insurance
+      tier, pickup branch and add-ons. They are local to the process and are not pickled with the
+      reservation.
+    - Every add-on holds a unit of the pickup branch stock from pickup_date to return_date. Holds
+      follow changes of add-ons, dates and pickup branch, and are released when the reservation
+      is cancelled or completed.
 
 Author: Peyman Khodabandehlouei
 Date: 07-11-2025
 """
 
 import uuid
+from contextlib import contextmanager
 from datetime import date
-from typing import Optional, TYPE_CHECKING
+from typing import Iterator, List, Optional, TYPE_CHECKING
 
-from src.enums import ReservationStatus
-from src.custom_errors import ReturnDateBeforePickupDateError
+from src.enums import InvoiceStatus, ReservationStatus
+from src.money import Cents, to_amount
+from src.collection_views import ListView, ViewableList
+from src.concurrency.striped_lock import reservation_locks
+from src.custom_errors import AddOnUnavailableError, ReturnDateBeforePickupDateError
+from src.change_notifier import ChangeNotifier
+from src.pricing_strategy.price_quote import PriceQuote
 
 if TYPE_CHECKING:
     from src.branch.branch import Branch
+    from src.branch.add_on_inventory import AddOnInventory
     from src.users.customer import Customer
     from src.vehicle.vehicle import Vehicle
     from src.reservation.add_on import AddOn
@@ -30,8 +48,11 @@ if TYPE_CHECKING:
     from src.reservation.insurance_tier import InsuranceTier
     from src.pricing_strategy.pricing_strategy import PricingStrategy
 
+# Reservations in these statuses do not hold add-on stock
+_CLOSED_STATUSES = (ReservationStatus.CANCELLED, ReservationStatus.COMPLETED)
 
-class Reservation:
+
+class Reservation(ChangeNotifier):
     """
     Concrete class representing a reservation in the application.
     This class can be directly initialized and used during application runtime.
@@ -50,6 +71,7 @@ class Reservation:
     Raises:
         TypeError: If any parameter has an incorrect type.
         ValueError: If dates violate business constraints (pickup_date > return_date or in the past).
+        AddOnUnavailableError: If an add-on is out of stock at the pickup branch for the dates.
     """
 
     def __init__(
@@ -111,7 +133,7 @@ class Reservation:
         if add_ons is None:
             add_ons = []
 
-        if not isinstance(add_ons, list):
+        if not isinstance(add_ons, (list, ListView)):
             raise TypeError("add_ons must be a list of AddOn instances.")
         from src.reservation.add_on import AddOn
 
@@ -132,15 +154,67 @@ class Reservation:
         self.__pricing_strategy = PricingStrategy(customer=creator)  # Adjust pricing strategy dynamically
         self.__pickup_date = pickup_date
         self.__return_date = return_date
-        self.__add_ons = add_ons.copy()
-        self.__total_price = self.__pricing_strategy.calculate_price(
+        self.__add_ons = ViewableList(add_ons)
+        self.__price_quote = self.__pricing_strategy.quote_price(
             vehicle=vehicle,
             insurance_tier=insurance_tier,
             pickup_date=pickup_date,
             return_date=return_date,
             add_ons=add_ons,
+            pickup_branch=pickup_branch,
         )
+        self.__total_price_cents = self.__price_quote.total_cents
+        if status not in _CLOSED_STATUSES:
+            self.__hold_add_ons(pickup_branch, pickup_date, return_date, self.__add_ons)
         self.__invoice = Invoice(creator, self)
+        self.__version = 0
+        ChangeNotifier.__init__(self)
+
+    def __hold_add_ons(
+        self,
+        branch: "Branch",
+        pickup_date: date,
+        return_date: date,
+        add_ons: List["AddOn"],
+    ) -> None:
+        """Reserves a unit of every add-on at a branch, nothing stays reserved if one is unavailable"""
+        inventory: "AddOnInventory" = branch.add_on_inventory
+        try:
+            for add_on in add_ons:
+                inventory.reserve(self.__id, add_on.id, pickup_date, return_date)
+        except AddOnUnavailableError:
+            inventory.release_all(self.__id)
+            raise
+
+    def __move_add_on_holds(
+        self,
+        branch: "Branch",
+        pickup_date: date,
+        return_date: date,
+        add_ons: List["AddOn"],
+    ) -> None:
+        """Moves the add-on holds to new values, the current holds are kept if one is unavailable"""
+        if self.__status in _CLOSED_STATUSES:
+            return
+
+        self.__pickup_branch.add_on_inventory.release_all(self.__id)
+        try:
+            self.__hold_add_ons(branch, pickup_date, return_date, add_ons)
+        except AddOnUnavailableError:
+            self.__hold_add_ons(
+                self.__pickup_branch, self.__pickup_date, self.__return_date, self.__add_ons
+            )
+            raise
+
+    def __update_add_on_holds(self, new_status: ReservationStatus) -> None:
+        """Releases the add-on holds when the reservation is closed and takes them on reopening"""
+        if new_status in _CLOSED_STATUSES:
+            if self.__status not in _CLOSED_STATUSES:
+                self.__pickup_branch.add_on_inventory.release_all(self.__id)
+        elif self.__status in _CLOSED_STATUSES:
+            self.__hold_add_ons(
+                self.__pickup_branch, self.__pickup_date, self.__return_date, self.__add_ons
+            )
 
     @property
     def id(self) -> str:
@@ -151,6 +225,22 @@ class Reservation:
         """
         return self.__id
 
+    @property
+    def version(self) -> int:
+        """
+        Getter for version property.
+
+        Note: version is incremented on every change and cannot be modified directly.
+        """
+        return self.__version
+
+    @contextmanager
+    def __changing(self) -> Iterator[None]:
+        """Holds the lock of the reservation while it changes, the version is incremented after it"""
+        with reservation_locks.lock_for(self.__id):
+            yield
+            self.__version += 1
+
     @property
     def status(self) -> ReservationStatus:
         """Getter for status property."""
@@ -166,11 +256,96 @@ class Reservation:
 
         Raises:
             TypeError: If status is not a ReservationStatus enum.
+            AddOnUnavailableError: If a reopened reservation cannot take its add-ons again.
         """
         if not isinstance(status, ReservationStatus):
             raise TypeError("status must be an instance of ReservationStatus enum.")
 
-        self.__status = status
+        with reservation_locks.lock_for(self.__id):
+            self.__update_add_on_holds(status)
+            self.__status = status
+            self.__version += 1
+        self._publish_change("status")
+
+    def compare_and_set_status(
+        self,
+        expected_status: ReservationStatus,
+        new_status: ReservationStatus,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Atomically changes the status of the reservation if it is still in the expected state.
+
+        Args:
+            expected_status (ReservationStatus): Status the reservation must currently have.
+            new_status (ReservationStatus): Status to move the reservation to.
+            expected_version (Optional[int]): If given, version the reservation must currently have.
+
+        Returns:
+            bool: True if the status was changed, False if another change happened first.
+
+        Raises:
+            TypeError: If expected_status or new_status is not a ReservationStatus enum.
+            TypeError: If expected_version is not an integer or None.
+            AddOnUnavailableError: If a reopened reservation cannot take its add-ons again.
+        """
+        if not isinstance(expected_status, ReservationStatus):
+            raise TypeError("expected_status must be an instance of ReservationStatus enum.")
+        if not isinstance(new_status, ReservationStatus):
+            raise TypeError("new_status must be an instance of ReservationStatus enum.")
+        if expected_version is not None and not isinstance(expected_version, int):
+            raise TypeError("expected_version must be an integer.")
+
+        with reservation_locks.lock_for(self.__id):
+            if self.__status is not expected_status:
+                return False
+            if expected_version is not None and self.__version != expected_version:
+                return False
+
+            self.__update_add_on_holds(new_status)
+            self.__status = new_status
+            self.__version += 1
+        self._publish_change("status")
+        return True
+
+    def reprice(
+        self, price_quote: PriceQuote, expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        Sets a quote computed outside the reservation, e.g. by a bulk repricing job after rates
+        changed. The total price is the total of the quote and the pending invoice follows it.
+
+        Args:
+            price_quote (PriceQuote): New line items and discount in cents.
+            expected_version (Optional[int]): If given, version the reservation must currently have.
+
+        Returns:
+            bool: True if the quote was set, False if another change happened first.
+
+        Raises:
+            TypeError: If price_quote is not a PriceQuote.
+            TypeError: If expected_version is not an integer or None.
+            ValueError: If the total of price_quote is negative.
+        """
+        if not isinstance(price_quote, PriceQuote):
+            raise TypeError("price_quote must be an instance of PriceQuote class.")
+        total_price_cents = price_quote.total_cents
+        if total_price_cents < 0:
+            raise ValueError("total_price_cents cannot be negative.")
+        if expected_version is not None and not isinstance(expected_version, int):
+            raise TypeError("expected_version must be an integer.")
+
+        with reservation_locks.lock_for(self.__id):
+            if expected_version is not None and self.__version != expected_version:
+                return False
+
+            self.__price_quote = price_quote
+            self.__total_price_cents = total_price_cents
+            self.__version += 1
+        if self.__invoice.status == InvoiceStatus.PENDING.value:
+            self.__invoice.reprice(price_quote)
+        self._publish_change("total_price")
+        return True
 
     @property
     def creator(self) -> "Customer":
@@ -193,7 +368,8 @@ class Reservation:
         if not isinstance(creator, Customer):
             raise TypeError("creator must be an instance of Customer class.")
 
-        self.__creator = creator
+        with self.__changing():
+            self.__creator = creator
 
     @property
     def vehicle(self) -> "Vehicle":
@@ -218,15 +394,19 @@ class Reservation:
         if not isinstance(vehicle, Vehicle):
             raise TypeError("vehicle must be an instance of Vehicle class.")
 
-        self.__vehicle = vehicle
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+        with self.__changing():
+            self.__vehicle = vehicle
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("vehicle")
 
     @property
     def insurance_tier(self) -> "InsuranceTier":
@@ -253,15 +433,19 @@ class Reservation:
                 "insurance_tier must be an instance of InsuranceTier class."
             )
 
-        self.__insurance_tier = insurance_tier
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+        with self.__changing():
+            self.__insurance_tier = insurance_tier
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("insurance_tier")
 
     @property
     def invoice(self) -> "Invoice":
@@ -278,18 +462,36 @@ class Reservation:
         """
         Setter for pickup_branch property.
 
+        Automatically recalculates total price, since seasonal rates depend on the branch.
+
         Args:
             pickup_branch (Branch): New pickup branch.
 
         Raises:
             TypeError: If pickup_branch is not a Branch instance.
+            AddOnUnavailableError: If an add-on is out of stock at the new branch.
         """
         from src.branch.branch import Branch
 
         if not isinstance(pickup_branch, Branch):
             raise TypeError("pickup_branch must be an instance of Branch class.")
 
-        self.__pickup_branch = pickup_branch
+        with self.__changing():
+            self.__move_add_on_holds(
+                pickup_branch, self.__pickup_date, self.__return_date, self.__add_ons
+            )
+            self.__pickup_branch = pickup_branch
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("pickup_branch")
 
     @property
     def return_branch(self) -> "Branch":
@@ -312,7 +514,9 @@ class Reservation:
         if not isinstance(return_branch, Branch):
             raise TypeError("return_branch must be an instance of Branch class.")
 
-        self.__return_branch = return_branch
+        with self.__changing():
+            self.__return_branch = return_branch
+        self._publish_change("return_branch")
 
     @property
     def pickup_date(self) -> date:
@@ -332,23 +536,31 @@ class Reservation:
         Raises:
             TypeError: If pickup_date is not a date instance.
             ValueError: If pickup_date is after return_date or in the past.
+            AddOnUnavailableError: If an add-on is out of stock for the new dates.
         """
         if not isinstance(pickup_date, date):
             raise TypeError("pickup_date must be an instance of date class.")
-        if pickup_date > self.__return_date:
-            raise ReturnDateBeforePickupDateError(self.__return_date, pickup_date)
-        if pickup_date < date.today():
-            raise ValueError("pickup_date cannot be in the past.")
-
-        self.__pickup_date = pickup_date
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+        with self.__changing():
+            if pickup_date > self.__return_date:
+                raise ReturnDateBeforePickupDateError(self.__return_date, pickup_date)
+            if pickup_date < date.today():
+                raise ValueError("pickup_date cannot be in the past.")
+
+            self.__move_add_on_holds(
+                self.__pickup_branch, pickup_date, self.__return_date, self.__add_ons
+            )
+            self.__pickup_date = pickup_date
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("pickup_date")
 
     @property
     def return_date(self) -> date:
@@ -368,26 +580,34 @@ class Reservation:
         Raises:
             TypeError: If return_date is not a date instance.
             ValueError: If return_date is before pickup_date.
+            AddOnUnavailableError: If an add-on is out of stock for the new dates.
         """
         if not isinstance(return_date, date):
             raise TypeError("return_date must be an instance of date class.")
-        if return_date < self.__pickup_date:
-            raise ValueError("return_date must be after or equal to pickup_date.")
+        with self.__changing():
+            if return_date < self.__pickup_date:
+                raise ValueError("return_date must be after or equal to pickup_date.")
 
-        self.__return_date = return_date
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+            self.__move_add_on_holds(
+                self.__pickup_branch, self.__pickup_date, return_date, self.__add_ons
+            )
+            self.__return_date = return_date
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("return_date")
 
     @property
-    def add_ons(self) -> list["AddOn"]:
-        """Getter for add_ons property."""
-        return self.__add_ons.copy()
+    def add_ons(self) -> ListView["AddOn"]:
+        """Getter for add_ons property, a read-only view which follows later changes."""
+        return self.__add_ons.view
 
     @add_ons.setter
     def add_ons(self, add_ons: list["AddOn"]) -> None:
@@ -401,8 +621,9 @@ class Reservation:
 
         Raises:
             TypeError: If add_ons is not a list or contains non-AddOn instances.
+            AddOnUnavailableError: If a new add-on is out of stock at the pickup branch.
         """
-        if not isinstance(add_ons, list):
+        if not isinstance(add_ons, (list, ListView)):
             raise TypeError("add_ons must be a list of AddOn instances.")
 
         from src.reservation.add_on import AddOn
@@ -410,15 +631,22 @@ class Reservation:
         if not all(isinstance(add_on, AddOn) for add_on in add_ons):
             raise TypeError("All add-ons must be instances of AddOn class.")
 
-        self.__add_ons = add_ons.copy()
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+        with self.__changing():
+            self.__move_add_on_holds(
+                self.__pickup_branch, self.__pickup_date, self.__return_date, add_ons
+            )
+            self.__add_ons[:] = add_ons
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("add_ons")
 
     @property
     def pricing_strategy(self) -> "PricingStrategy":
@@ -437,7 +665,21 @@ class Reservation:
         Note: Total price is calculated automatically and cannot be modified directly.
         It updates automatically when vehicle, insurance_tier, dates, or add_ons change.
         """
-        return self.__total_price
+        return to_amount(self.__total_price_cents)
+
+    @property
+    def total_price_cents(self) -> Cents:
+        """Getter for total_price property in cents."""
+        return self.__total_price_cents
+
+    @property
+    def price_quote(self) -> PriceQuote:
+        """
+        Getter for price_quote property, the line items and discount of the total price.
+
+        Note: The quote is replaced whenever the total price is calculated or repriced.
+        """
+        return self.__price_quote
 
     def has_addon(self, addon_id: str) -> bool:
         """
@@ -472,25 +714,34 @@ class Reservation:
         Raises:
             TypeError: If addon is not an AddOn instance.
             ValueError: If the add-on already exists in the reservation.
+            AddOnUnavailableError: If the add-on is out of stock at the pickup branch.
         """
         from src.reservation.add_on import AddOn
 
         if not isinstance(addon, AddOn):
             raise TypeError("addon must be an instance of AddOn class.")
 
-        if any(existing_addon.id == addon.id for existing_addon in self.__add_ons):
-            raise ValueError("Add-on already exists in the reservation.")
-
-        self.__add_ons.append(addon)
-
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+        with self.__changing():
+            if any(existing_addon.id == addon.id for existing_addon in self.__add_ons):
+                raise ValueError("Add-on already exists in the reservation.")
+
+            if self.__status not in _CLOSED_STATUSES:
+                self.__pickup_branch.add_on_inventory.reserve(
+                    self.__id, addon.id, self.__pickup_date, self.__return_date
+                )
+            self.__add_ons.append(addon)
+
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
+            )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("add_ons")
 
     def remove_addon(self, addon_id: str) -> None:
         """
@@ -510,22 +761,29 @@ class Reservation:
         if not addon_id:
             raise ValueError("addon_id cannot be empty.")
 
-        if not self.has_addon(addon_id):
-            raise ValueError(
-                "Add-on with the given ID is not found in the reservation."
+        with self.__changing():
+            if not self.has_addon(addon_id):
+                raise ValueError(
+                    "Add-on with the given ID is not found in the reservation."
+                )
+
+            self.__add_ons[:] = [
+                addon for addon in self.__add_ons if addon.id != addon_id
+            ]
+            self.__pickup_branch.add_on_inventory.release(self.__id, addon_id)
+
+            # Recalculate total price
+            self.__price_quote = self.__pricing_strategy.quote_price(
+                vehicle=self.__vehicle,
+                insurance_tier=self.__insurance_tier,
+                pickup_date=self.__pickup_date,
+                return_date=self.__return_date,
+                add_ons=self.__add_ons,
+                pickup_branch=self.__pickup_branch,
             )
-
-        self.__add_ons = [addon for addon in self.__add_ons if addon.id != addon_id]
-
-        # Recalculate total price
-        self.__total_price = self.__pricing_strategy.calculate_price(
-            vehicle=self.__vehicle,
-            insurance_tier=self.__insurance_tier,
-            pickup_date=self.__pickup_date,
-            return_date=self.__return_date,
-            add_ons=self.__add_ons,
-        )
+            self.__total_price_cents = self.__price_quote.total_cents
+        self._publish_change("add_ons")
 
     def __str__(self):
         """String representation of the Reservation object."""
-        return f"Reservation(id={self.id}, status={self.status}, creator={self.creator}, vehicle={self.vehicle}, insurance_tier={self.insurance_tier}, pickup_branch={self.pickup_branch}, return_branch={self.return_branch}, pickup_date={self.pickup_date}, return_date={self.return_date}, add_ons={self.add_ons}, total_price={self.total_price})"
\ No newline at end of file
+        return f"Reservation(id={self.id}, status={self.status}, creator={self.creator}, vehicle={self.vehicle}, insurance_tier={self.insurance_tier}, pickup_branch={self.pickup_branch}, return_branch={self.return_branch}, pickup_date={self.pickup_date}, return_date={self.return_date}, add_ons={self.__add_ons}, total_price={self.total_price})"
\ No newline at end of file
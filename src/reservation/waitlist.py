@@ -0,0 +1,421 @@
+"""
+This module implements the waitlist, which keeps booking requests for a vehicle class when no
+vehicle of the class is available and converts them into reservations as soon as one is freed.
+Requests are kept in a priority queue per pickup branch and vehicle class, so matching a freed
+vehicle with the best waiting request takes logarithmic time.
+
+Business Logic:
+    - A request is for a vehicle class at a pickup branch, with its rental window, insurance
+      tier, return branch and add-ons.
+    - Requests are served by pickup date, then in the order they joined the waitlist.
+    - Watched vehicles are matched when they become AVAILABLE, which happens when a reservation
+      is cancelled, a vehicle is returned or make_available is called. A vehicle is matched
+      with the requests of its current branch and vehicle class.
+    - Requests whose pickup date has passed are dropped. Requests whose add-ons are out of stock
+      at the branch keep their place and the next request is tried. Rolling back such a
+      reservation frees the vehicle again, which does not start a nested allocation.
+    - Joining the waitlist reserves an available watched vehicle of the class right away if
+      there is one.
+    - The reservation is created through Customer.create_reservation, so it is PENDING and goes
+      through the usual approval and payment.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import heapq
+import threading
+import uuid
+from datetime import date
+from itertools import count
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from src.collection_views import ListView
+from src.enums import VehicleStatus
+from src.custom_errors import (
+    AddOnUnavailableError,
+    ReturnDateBeforePickupDateError,
+    VehicleNotAvailableError,
+    WaitlistRequestNotFoundError,
+)
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.vehicle.vehicle_class import VehicleClass
+    from src.reservation.add_on import AddOn
+    from src.reservation.reservation import Reservation
+    from src.reservation.insurance_tier import InsuranceTier
+
+
+class WaitlistRequest(NamedTuple):
+    """A booking request waiting for a vehicle of its class"""
+
+    id: str
+    customer: "Customer"
+    vehicle_class: "VehicleClass"
+    insurance_tier: "InsuranceTier"
+    pickup_branch: "Branch"
+    return_branch: "Branch"
+    pickup_date: date
+    return_date: date
+    add_ons: Tuple["AddOn", ...]
+
+
+# Priority of a waiting request: pickup date ordinal, sequence number
+_QueueEntry = Tuple[int, int, WaitlistRequest]
+# Pickup branch id and vehicle class id
+_QueueKey = Tuple[str, str]
+
+
+class Waitlist:
+    """
+    Concrete class keeping booking requests per pickup branch and vehicle class, and allocating
+    freed vehicles to them.
+
+    Args:
+        on_allocate (Optional[Callable[[WaitlistRequest, Reservation], None]]): Called after a
+            request was converted into a reservation, for example to notify the customer.
+    """
+
+    def __init__(
+        self,
+        on_allocate: Optional[Callable[[WaitlistRequest, "Reservation"], None]] = None,
+    ) -> None:
+        """Constructor method for Waitlist class"""
+        if on_allocate is not None and not callable(on_allocate):
+            raise TypeError("on_allocate must be callable")
+
+        self.__on_allocate = on_allocate
+        self.__lock = threading.Lock()
+        self.__sequence = count()
+        self.__queues: Dict[_QueueKey, List[_QueueEntry]] = {}
+        self.__waiting: Dict[str, _QueueEntry] = {}
+        self.__allocated: Dict[str, "Reservation"] = {}
+        self.__dropped: Dict[str, WaitlistRequest] = {}
+        # Watched vehicles, their queue key and the available ones per queue key
+        self.__vehicles: Dict[str, "Vehicle"] = {}
+        self.__vehicle_keys: Dict[str, _QueueKey] = {}
+        self.__available: Dict[_QueueKey, Set[str]] = {}
+        # Vehicles being allocated, a failed reservation frees them again while it is rolled back
+        self.__allocating: Set[str] = set()
+
+    def __len__(self) -> int:
+        """Returns the number of waiting requests"""
+        return len(self.__waiting)
+
+    @staticmethod
+    def __key(branch: "Branch", vehicle_class: "VehicleClass") -> _QueueKey:
+        return branch.id, vehicle_class.id
+
+    def watch(self, vehicles: Iterable["Vehicle"]) -> int:
+        """
+        Starts matching vehicles with waiting requests when they become available.
+
+        Returns:
+            int: Number of newly watched vehicles.
+
+        Raises:
+            TypeError: If a vehicle is not a Vehicle object.
+        """
+        from src.vehicle.vehicle import Vehicle
+
+        watched = 0
+        for vehicle in vehicles:
+            if not isinstance(vehicle, Vehicle):
+                raise TypeError("vehicle must be a Vehicle object")
+            if vehicle.id in self.__vehicles:
+                continue
+            self.__vehicles[vehicle.id] = vehicle
+            vehicle.add_change_listener(self.__on_vehicle_change)
+            watched += 1
+            self.__on_vehicle_change(vehicle, "status")
+        return watched
+
+    def unwatch(self, vehicle: "Vehicle") -> None:
+        """Stops matching a vehicle"""
+        if self.__vehicles.pop(vehicle.id, None) is None:
+            return
+        vehicle.remove_change_listener(self.__on_vehicle_change)
+        with self.__lock:
+            self.__discard_available(vehicle.id)
+
+    def __discard_available(self, vehicle_id: str) -> None:
+        key = self.__vehicle_keys.pop(vehicle_id, None)
+        if key is not None:
+            self.__available[key].discard(vehicle_id)
+
+    def __on_vehicle_change(self, vehicle: "Vehicle", field_name: str) -> None:
+        """Allocates a vehicle which became available, or forgets one which is not anymore"""
+        if field_name not in ("status", "current_branch", "vehicle_class"):
+            return
+        with self.__lock:
+            self.__discard_available(vehicle.id)
+        if vehicle.status == VehicleStatus.AVAILABLE.value:
+            self.__allocate(vehicle)
+
+    def __next_request(
+        self, key: _QueueKey, vehicle: "Vehicle"
+    ) -> Optional[_QueueEntry]:
+        """
+        Pops the best waiting request of a queue. If there is none, the vehicle is recorded as
+        available in the same step, so a request joining concurrently finds it.
+        """
+        today = date.today().toordinal()
+        with self.__lock:
+            queue = self.__queues.get(key)
+            while queue:
+                entry = heapq.heappop(queue)
+                request = entry[2]
+                if self.__waiting.get(request.id) is not entry:
+                    continue  # Left the waitlist
+                if entry[0] < today:
+                    del self.__waiting[request.id]
+                    self.__dropped[request.id] = request
+                    continue
+                return entry
+            if vehicle.status == VehicleStatus.AVAILABLE.value:
+                self.__vehicle_keys[vehicle.id] = key
+                self.__available.setdefault(key, set()).add(vehicle.id)
+            return None
+
+    def __allocate(self, vehicle: "Vehicle") -> Optional["Reservation"]:
+        """
+        Reserves a freed vehicle for the best waiting request it fits. Change events of a vehicle
+        which is already being allocated return right away, the outer call tries the next
+        request.
+        """
+        with self.__lock:
+            if vehicle.id in self.__allocating:
+                return None
+            self.__allocating.add(vehicle.id)
+        key = self.__key(vehicle.current_branch, vehicle.vehicle_class)
+        skipped = []
+        try:
+            while True:
+                entry = self.__next_request(key, vehicle)
+                if entry is None:
+                    return None
+                try:
+                    reservation = self.__reserve(entry[2], vehicle)
+                except AddOnUnavailableError:
+                    skipped.append(entry)
+                    continue
+                except VehicleNotAvailableError:
+                    skipped.append(entry)
+                    return None
+                if reservation is not None:
+                    return reservation
+        finally:
+            with self.__lock:
+                for entry in skipped:
+                    heapq.heappush(self.__queues[key], entry)
+                self.__allocating.discard(vehicle.id)
+
+    def __reserve(
+        self, request: WaitlistRequest, vehicle: "Vehicle"
+    ) -> Optional["Reservation"]:
+        """Converts a request into a reservation, returns None if the request was dropped"""
+        try:
+            reservation = request.customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=request.insurance_tier,
+                pickup_branch=request.pickup_branch,
+                return_branch=request.return_branch,
+                pickup_date=request.pickup_date,
+                return_date=request.return_date,
+                add_ons=list(request.add_ons),
+            )
+        except ValueError:
+            # The pickup date passed while the request was waiting
+            with self.__lock:
+                self.__waiting.pop(request.id, None)
+                self.__dropped[request.id] = request
+            return None
+
+        with self.__lock:
+            self.__waiting.pop(request.id, None)
+            self.__allocated[request.id] = reservation
+        if self.__on_allocate is not None:
+            self.__on_allocate(request, reservation)
+        return reservation
+
+    def join(
+        self,
+        customer: "Customer",
+        vehicle_class: "VehicleClass",
+        insurance_tier: "InsuranceTier",
+        pickup_branch: "Branch",
+        return_branch: "Branch",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+    ) -> WaitlistRequest:
+        """
+        Adds a booking request to the waitlist. If a watched vehicle of the class is available
+        at the pickup branch, it is reserved right away.
+
+        Returns:
+            WaitlistRequest: The request, see reservation_of for its reservation.
+
+        Raises:
+            TypeError: If any parameter has an incorrect type.
+            ValueError: If pickup_date is in the past.
+            ReturnDateBeforePickupDateError: If return_date is before pickup_date.
+        """
+        from src.users.customer import Customer
+        from src.vehicle.vehicle_class import VehicleClass
+        from src.branch.branch import Branch
+        from src.reservation.add_on import AddOn
+        from src.reservation.insurance_tier import InsuranceTier
+
+        if not isinstance(customer, Customer):
+            raise TypeError("customer must be an instance of Customer class.")
+        if not isinstance(vehicle_class, VehicleClass):
+            raise TypeError("vehicle_class must be an instance of VehicleClass class.")
+        if not isinstance(insurance_tier, InsuranceTier):
+            raise TypeError(
+                "insurance_tier must be an instance of InsuranceTier class."
+            )
+        if not isinstance(pickup_branch, Branch) or not isinstance(
+            return_branch, Branch
+        ):
+            raise TypeError("pickup_branch and return_branch must be Branch instances.")
+        if not isinstance(pickup_date, date) or not isinstance(return_date, date):
+            raise TypeError(
+                "pickup_date and return_date must be instances of date class."
+            )
+        if pickup_date > return_date:
+            raise ReturnDateBeforePickupDateError(return_date, pickup_date)
+        if pickup_date < date.today():
+            raise ValueError("pickup_date cannot be in the past.")
+        if add_ons is None:
+            add_ons = []
+        if not isinstance(add_ons, (list, ListView)) or not all(
+            isinstance(add_on, AddOn) for add_on in add_ons
+        ):
+            raise TypeError("add_ons must be a list of AddOn instances.")
+
+        request = WaitlistRequest(
+            str(uuid.uuid4()),
+            customer,
+            vehicle_class,
+            insurance_tier,
+            pickup_branch,
+            return_branch,
+            pickup_date,
+            return_date,
+            tuple(add_ons),
+        )
+        key = self.__key(pickup_branch, vehicle_class)
+        entry = (pickup_date.toordinal(), next(self.__sequence), request)
+        with self.__lock:
+            heapq.heappush(self.__queues.setdefault(key, []), entry)
+            self.__waiting[request.id] = entry
+            available = list(self.__available.get(key, ()))
+
+        # Offer the available vehicles, the best waiting request gets the first one
+        for vehicle_id in available:
+            if request.id not in self.__waiting:
+                break
+            vehicle = self.__vehicles.get(vehicle_id)
+            if vehicle is not None and vehicle.status == VehicleStatus.AVAILABLE.value:
+                with self.__lock:
+                    self.__discard_available(vehicle_id)
+                self.__allocate(vehicle)
+        return request
+
+    def reserve_or_join(
+        self,
+        customer: "Customer",
+        vehicle: "Vehicle",
+        insurance_tier: "InsuranceTier",
+        pickup_branch: "Branch",
+        return_branch: "Branch",
+        pickup_date: date,
+        return_date: date,
+        add_ons: Optional[List["AddOn"]] = None,
+    ) -> Tuple[Optional["Reservation"], Optional[WaitlistRequest]]:
+        """
+        Reserves a vehicle, or puts the customer on the waitlist for its class if the vehicle is
+        not available.
+
+        Returns:
+            Tuple[Optional[Reservation], Optional[WaitlistRequest]]: The reservation, or the
+                waitlist request if the vehicle was not available.
+        """
+        try:
+            reservation = customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_branch=pickup_branch,
+                return_branch=return_branch,
+                pickup_date=pickup_date,
+                return_date=return_date,
+                add_ons=add_ons,
+            )
+        except VehicleNotAvailableError:
+            request = self.join(
+                customer,
+                vehicle.vehicle_class,
+                insurance_tier,
+                pickup_branch,
+                return_branch,
+                pickup_date,
+                return_date,
+                add_ons,
+            )
+            return self.reservation_of(request.id), request
+        return reservation, None
+
+    def leave(self, request_id: str) -> WaitlistRequest:
+        """
+        Removes a waiting request.
+
+        Raises:
+            WaitlistRequestNotFoundError: If the request is not waiting.
+        """
+        with self.__lock:
+            entry = self.__waiting.pop(request_id, None)
+        if entry is None:
+            raise WaitlistRequestNotFoundError(request_id)
+        return entry[2]
+
+    def is_waiting(self, request_id: str) -> bool:
+        """Returns True if the request is still waiting"""
+        return request_id in self.__waiting
+
+    def reservation_of(self, request_id: str) -> Optional["Reservation"]:
+        """Returns the reservation a request was converted into, None if it was not"""
+        return self.__allocated.get(request_id)
+
+    def waiting(
+        self, branch: "Branch", vehicle_class: "VehicleClass"
+    ) -> List[WaitlistRequest]:
+        """Returns the waiting requests for a vehicle class at a branch in serving order"""
+        with self.__lock:
+            entries = [
+                entry
+                for entry in self.__queues.get(self.__key(branch, vehicle_class), ())
+                if self.__waiting.get(entry[2].id) is entry
+            ]
+        return [entry[2] for entry in sorted(entries, key=lambda entry: entry[:2])]
+
+    def metrics(self) -> Dict[str, int]:
+        """Returns the number of waiting, allocated and dropped requests"""
+        return {
+            "waiting": len(self.__waiting),
+            "allocated": len(self.__allocated),
+            "dropped": len(self.__dropped),
+        }
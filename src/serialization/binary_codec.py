@@ -0,0 +1,610 @@
+"""
+This module implements a schema-driven binary codec for domain objects.
+Every encoded object is a frame: a one byte type tag, a one byte schema version and the fields of
+the object in schema order. Fixed-size fields next to each other are packed with one precompiled
+struct. References to other domain objects are encoded as their 16 byte UUID instead of a nested
+copy, so an object graph is encoded as a flat list of frames and linked again when decoding.
+
+Field kinds:
+    - id, ref: UUID as 16 bytes, ref is all zeros for None.
+    - str, optional_str: uint32 length and UTF-8 bytes, 0xFFFFFFFF for None.
+    - float, int, bool, date: float64, int64, bool and the date ordinal as int32.
+    - enum: uint8 index of the enum member.
+    - strategy: uint8 index of the pricing strategy class.
+    - ref_list, str_list: uint32 count followed by the items.
+    - blob: uint32 length and the bytes of to_bytes of the value, decoded with from_bytes of the
+      target class.
+
+Business Logic:
+    - Decoded objects are created without running constructors or validation.
+    - Change listeners are not encoded, decoded objects start without listeners.
+    - References are resolved against the objects decoded in the same batch and the known objects.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import struct
+from datetime import date
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from src.change_notifier import CHANGE_LISTENERS_ATTRIBUTE
+from src.collection_views import ViewableList
+from src.custom_errors import UnresolvedReferenceError
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.serialization.wire_format import decode_str, encode_str
+from src.enums import (
+    EmploymentType,
+    Gender,
+    InvoiceStatus,
+    ReservationStatus,
+    VehicleStatus,
+)
+
+SCHEMA_VERSION = 5
+
+_HEADER = struct.Struct("<BB")
+_LENGTH = struct.Struct("<I")
+_NULL_ID = bytes(16)
+
+# struct format of fixed-size field kinds
+_FIXED_FORMATS: Dict[str, str] = {
+    "id": "16s",
+    "ref": "16s",
+    "float": "d",
+    "int": "q",
+    "bool": "?",
+    "date": "i",
+    "enum": "B",
+    "strategy": "B",
+}
+
+
+class Field(NamedTuple):
+    """A field of a schema, attribute is the name mangled attribute of the object"""
+
+    attribute: str
+    kind: str
+    # Enum class of enum fields, container class of list fields which are not plain lists,
+    # class of blob fields
+    target: Optional[type] = None
+
+
+class Schema(NamedTuple):
+    """Binary layout of one domain class"""
+
+    tag: int
+    cls: type
+    fields: Tuple[Field, ...]
+    transient: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+
+
+def _fields(prefix: str, *fields: Tuple) -> Tuple[Field, ...]:
+    """Creates fields of a class from (name, kind[, target]) tuples"""
+    return tuple(Field(f"_{prefix}__{name}", *rest) for name, *rest in fields)
+
+
+@lru_cache(maxsize=1)
+def pricing_strategies() -> Tuple[type, ...]:
+    """Returns the pricing strategy classes in encoding order"""
+    from src.pricing_strategy.concrete_strategies import (
+        DailyStrategy,
+        FirstOrderStrategy,
+        LoyaltyStrategy,
+    )
+
+    return DailyStrategy, FirstOrderStrategy, LoyaltyStrategy
+
+
+@lru_cache(maxsize=1)
+def schemas() -> Dict[type, Schema]:
+    """Returns the schema of every encodable class"""
+    from src.branch.branch import Branch
+    from src.branch.add_on_inventory import AddOnInventory
+    from src.branch.employee_directory import EmployeeDirectory
+    from src.users.agent import Agent
+    from src.users.manager import Manager
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.vehicle.vehicle_class import VehicleClass
+    from src.vehicle.maintenance_record import MaintenanceRecord
+    from src.reservation.add_on import AddOn
+    from src.reservation.invoice import Invoice
+    from src.reservation.reservation import Reservation
+    from src.reservation.insurance_tier import InsuranceTier
+    from src.pricing_strategy.price_quote import PriceQuote
+
+    listener_transient = ((CHANGE_LISTENERS_ATTRIBUTE, list),)
+    user_fields = _fields(
+        "BaseUser",
+        ("id", "id"),
+        ("first_name", "str"),
+        ("last_name", "str"),
+        ("gender", "enum", Gender),
+        ("birth_date", "date"),
+        ("email", "str"),
+        ("address", "str"),
+        ("phone_number", "str"),
+    )
+    employee_fields = user_fields + _fields(
+        "Employee",
+        ("branch", "ref"),
+        ("is_active", "bool"),
+        ("salary", "float"),
+        ("hire_date", "date"),
+        ("employment_type", "enum", EmploymentType),
+    )
+    schema_list = [
+        Schema(
+            1,
+            Branch,
+            _fields(
+                "Branch",
+                ("id", "id"),
+                ("name", "str"),
+                ("city", "str"),
+                ("address", "str"),
+                ("phone_number", "str"),
+                ("employees", "ref_list", EmployeeDirectory),
+                ("latitude", "float"),
+                ("longitude", "float"),
+                ("add_on_inventory", "blob", AddOnInventory),
+            ),
+        ),
+        Schema(
+            2,
+            Customer,
+            user_fields + _fields("Customer", ("reservations", "ref_list")),
+            listener_transient + (("_Customer__remote_reservation_count", int),),
+        ),
+        Schema(3, Agent, employee_fields, listener_transient),
+        Schema(4, Manager, employee_fields, listener_transient),
+        Schema(
+            5,
+            VehicleClass,
+            _fields(
+                "VehicleClass",
+                ("id", "id"),
+                ("name", "str"),
+                ("description", "str"),
+                ("base_daily_rate_cents", "int"),
+                ("features", "str_list", ViewableList),
+            ),
+            listener_transient,
+        ),
+        Schema(
+            6,
+            Vehicle,
+            _fields(
+                "Vehicle",
+                ("id", "id"),
+                ("vehicle_class", "ref"),
+                ("current_branch", "ref"),
+                ("status", "enum", VehicleStatus),
+                ("fuel_level", "float"),
+                ("odometer", "float"),
+                ("last_service_odometer", "float"),
+                ("price_per_day_cents", "int"),
+                ("version", "int"),
+                ("brand", "str"),
+                ("model", "str"),
+                ("color", "str"),
+                ("licence_plate", "str"),
+                ("maintenance_records", "ref_list", ViewableList),
+            ),
+            listener_transient,
+        ),
+        Schema(
+            7,
+            MaintenanceRecord,
+            _fields(
+                "MaintenanceRecord",
+                ("id", "id"),
+                ("vehicle", "ref"),
+                ("service_date", "date"),
+                ("odometer", "float"),
+                ("note", "optional_str"),
+            ),
+        ),
+        Schema(
+            8,
+            InsuranceTier,
+            _fields(
+                "InsuranceTier",
+                ("id", "id"),
+                ("price_per_day_cents", "int"),
+                ("tier_name", "str"),
+                ("description", "str"),
+            ),
+            listener_transient,
+        ),
+        Schema(
+            9,
+            AddOn,
+            _fields(
+                "AddOn",
+                ("id", "id"),
+                ("price_per_day_cents", "int"),
+                ("name", "str"),
+                ("description", "str"),
+            ),
+            listener_transient,
+        ),
+        Schema(
+            10,
+            Reservation,
+            _fields(
+                "Reservation",
+                ("id", "id"),
+                ("status", "enum", ReservationStatus),
+                ("creator", "ref"),
+                ("vehicle", "ref"),
+                ("insurance_tier", "ref"),
+                ("pickup_branch", "ref"),
+                ("return_branch", "ref"),
+                ("pricing_strategy", "strategy"),
+                ("pickup_date", "date"),
+                ("return_date", "date"),
+                ("total_price_cents", "int"),
+                ("price_quote", "blob", PriceQuote),
+                ("invoice", "ref"),
+                ("version", "int"),
+                ("add_ons", "ref_list", ViewableList),
+            ),
+            listener_transient,
+        ),
+        Schema(
+            11,
+            Invoice,
+            _fields(
+                "Invoice",
+                ("id", "id"),
+                ("creator", "ref"),
+                ("reservation", "ref"),
+                ("total_price_cents", "int"),
+                ("price_quote", "blob", PriceQuote),
+                ("date", "date"),
+                ("status", "enum", InvoiceStatus),
+            ),
+            listener_transient,
+        ),
+    ]
+    return {schema.cls: schema for schema in schema_list}
+
+
+class _Segment(NamedTuple):
+    """Consecutive fields encoded together, packer is None for a single variable-size field"""
+
+    packer: Optional[struct.Struct]
+    fields: Tuple[Field, ...]
+
+
+class _CompiledSchema(NamedTuple):
+    """A schema with its fixed-size fields grouped into precompiled structs"""
+
+    schema: Schema
+    segments: Tuple[_Segment, ...]
+    enum_members: Dict[str, Tuple[Any, ...]]
+    enum_indexes: Dict[str, Dict[Any, int]]
+
+
+def _compile(schema: Schema) -> _CompiledSchema:
+    """Groups consecutive fixed-size fields of a schema into one struct each"""
+    segments: List[_Segment] = []
+    fixed: List[Field] = []
+    for field in schema.fields:
+        if field.kind in _FIXED_FORMATS:
+            fixed.append(field)
+            continue
+        if fixed:
+            formats = "".join(_FIXED_FORMATS[f.kind] for f in fixed)
+            segments.append(_Segment(struct.Struct("<" + formats), tuple(fixed)))
+            fixed = []
+        segments.append(_Segment(None, (field,)))
+    if fixed:
+        formats = "".join(_FIXED_FORMATS[f.kind] for f in fixed)
+        segments.append(_Segment(struct.Struct("<" + formats), tuple(fixed)))
+
+    enum_members = {
+        field.attribute: tuple(field.target)
+        for field in schema.fields
+        if field.kind == "enum"
+    }
+    enum_indexes = {
+        attribute: {member: index for index, member in enumerate(members)}
+        for attribute, members in enum_members.items()
+    }
+    return _CompiledSchema(schema, tuple(segments), enum_members, enum_indexes)
+
+
+@lru_cache(maxsize=1)
+def _compiled() -> Tuple[Dict[type, _CompiledSchema], Dict[int, _CompiledSchema]]:
+    """Returns compiled schemas by class and by tag"""
+    by_class = {cls: _compile(schema) for cls, schema in schemas().items()}
+    by_tag = {compiled.schema.tag: compiled for compiled in by_class.values()}
+    return by_class, by_tag
+
+
+def _id_bytes(object_id: str) -> bytes:
+    """Returns the 16 bytes of a UUID string"""
+    return bytes.fromhex(object_id.replace("-", ""))
+
+
+def _id_string(data: bytes) -> str:
+    """Returns the UUID string of 16 bytes, formatted like str(uuid.UUID(bytes=data))"""
+    text = data.hex()
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def _cached_id_bytes(id_cache: Dict[str, bytes], object_id: str) -> bytes:
+    """Returns the 16 bytes of a UUID string, objects referenced often are converted once"""
+    data = id_cache.get(object_id)
+    if data is None:
+        data = id_cache[object_id] = _id_bytes(object_id)
+    return data
+
+
+def _encode_into(obj: Any, parts: List[bytes], id_cache: Dict[str, bytes]) -> None:
+    """Appends the frame of an object to parts"""
+    compiled = _compiled()[0].get(type(obj))
+    if compiled is None:
+        raise TypeError(f"No binary schema for {type(obj).__name__}")
+
+    state = obj.__dict__
+    parts.append(_HEADER.pack(compiled.schema.tag, SCHEMA_VERSION))
+    for packer, fields in compiled.segments:
+        if packer is not None:
+            values = []
+            for attribute, kind, _ in fields:
+                value = state[attribute]
+                if kind == "ref":
+                    value = (
+                        _NULL_ID
+                        if value is None
+                        else _cached_id_bytes(id_cache, value.id)
+                    )
+                elif kind == "id":
+                    value = _cached_id_bytes(id_cache, value)
+                elif kind == "date":
+                    value = value.toordinal()
+                elif kind == "enum":
+                    value = compiled.enum_indexes[attribute][value]
+                elif kind == "strategy":
+                    value = pricing_strategies().index(type(value.strategy))
+                values.append(value)
+            parts.append(packer.pack(*values))
+            continue
+
+        field = fields[0]
+        value = state[field.attribute]
+        if field.kind in ("str", "optional_str"):
+            encode_str(parts, value)
+        elif field.kind == "ref_list":
+            parts.append(_LENGTH.pack(len(value)))
+            parts.extend(_cached_id_bytes(id_cache, item.id) for item in value)
+        elif field.kind == "str_list":
+            parts.append(_LENGTH.pack(len(value)))
+            for item in value:
+                encode_str(parts, item)
+        elif field.kind == "blob":
+            encoded = value.to_bytes()
+            parts.append(_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+
+
+def encode(obj: Any) -> bytes:
+    """
+    Encodes one domain object into a frame.
+
+    Args:
+        obj (Any): An object of a class with a schema.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        TypeError: If there is no schema for the class of obj.
+    """
+    parts: List[bytes] = []
+    _encode_into(obj, parts, {})
+    return b"".join(parts)
+
+
+def encode_many(objects: Iterable[Any]) -> bytes:
+    """Encodes objects into length-prefixed frames"""
+    parts: List[bytes] = []
+    id_cache: Dict[str, bytes] = {}
+    for obj in objects:
+        length_index = len(parts)
+        parts.append(b"")
+        _encode_into(obj, parts, id_cache)
+        parts[length_index] = _LENGTH.pack(sum(map(len, parts[length_index + 1 :])))
+    return b"".join(parts)
+
+
+def _decode_frame(
+    data: bytes, offset: int, end: int, pending: List[Tuple[dict, str, Any]]
+) -> Tuple[Any, bytes]:
+    """
+    Decodes one frame into a new object and returns it with its raw id.
+    References are added to pending as raw ids and linked after all frames are decoded.
+    A frame which ends before its fields or runs past end raises ValueError("truncated frame").
+    """
+    if end > len(data):
+        raise ValueError("truncated frame")
+    try:
+        tag, version = _HEADER.unpack_from(data, offset)
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported schema version {version}")
+        compiled = _compiled()[1].get(tag)
+        if compiled is None:
+            raise ValueError(f"Unknown type tag {tag}")
+        offset += _HEADER.size
+
+        schema = compiled.schema
+        obj = schema.cls.__new__(schema.cls)
+        state = obj.__dict__
+        raw_id = _NULL_ID
+        for packer, fields in compiled.segments:
+            if packer is not None:
+                values = packer.unpack_from(data, offset)
+                offset += packer.size
+                for (attribute, kind, _), value in zip(fields, values):
+                    if kind == "ref":
+                        if value != _NULL_ID:
+                            pending.append((state, attribute, value))
+                            continue
+                        value = None
+                    elif kind == "id":
+                        raw_id = value
+                        value = _id_string(value)
+                    elif kind == "date":
+                        value = date.fromordinal(value)
+                    elif kind == "enum":
+                        value = compiled.enum_members[attribute][value]
+                    elif kind == "strategy":
+                        value = _new_pricing_strategy(value)
+                    state[attribute] = value
+                continue
+
+            field = fields[0]
+            if field.kind in ("str", "optional_str"):
+                state[field.attribute], offset = decode_str(data, offset)
+            elif field.kind == "ref_list":
+                (count,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                raw_ids = [
+                    data[position : position + 16]
+                    for position in range(offset, offset + 16 * count, 16)
+                ]
+                offset += 16 * count
+                state[field.attribute] = []
+                pending.append((state, field.attribute, (raw_ids, field.target)))
+            elif field.kind == "str_list":
+                (count,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                items = []
+                for _ in range(count):
+                    item, offset = decode_str(data, offset)
+                    items.append(item)
+                state[field.attribute] = (
+                    items if field.target is None else field.target(items)
+                )
+            elif field.kind == "blob":
+                (length,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                if offset + length > end:
+                    raise ValueError("truncated frame")
+                state[field.attribute] = field.target.from_bytes(
+                    data[offset : offset + length]
+                )
+                offset += length
+    except struct.error:
+        raise ValueError("truncated frame") from None
+
+    if offset > end:
+        raise ValueError("truncated frame")
+    if offset != end:
+        raise ValueError("Frame length does not match its schema")
+    for attribute, factory in schema.transient:
+        state[attribute] = factory()
+    return obj, raw_id
+
+
+def _new_pricing_strategy(index: int):
+    """Creates a PricingStrategy with the encoded strategy, without selecting it again"""
+    pricing_strategy = PricingStrategy.__new__(PricingStrategy)
+    pricing_strategy.__dict__["_PricingStrategy__strategy"] = pricing_strategies()[
+        index
+    ]()
+    return pricing_strategy
+
+
+def _link(
+    pending: List[Tuple[dict, str, Any]],
+    decoded: Dict[bytes, Any],
+    known: Optional[Mapping[str, Any]],
+) -> None:
+    """Replaces raw referenced ids by the decoded or known objects"""
+
+    def lookup(raw_id: bytes) -> Any:
+        obj = decoded.get(raw_id)
+        if obj is not None:
+            return obj
+        object_id = _id_string(raw_id)
+        if known is None or object_id not in known:
+            raise UnresolvedReferenceError(object_id)
+        return known[object_id]
+
+    for state, attribute, raw_ids in pending:
+        if isinstance(raw_ids, tuple):
+            raw_ids, container = raw_ids
+            items = [lookup(raw_id) for raw_id in raw_ids]
+            state[attribute] = items if container is None else container(items)
+        else:
+            state[attribute] = lookup(raw_ids)
+
+
+def decode_many(data: bytes, known: Optional[Mapping[str, Any]] = None) -> List[Any]:
+    """
+    Decodes length-prefixed frames and links references between the decoded objects.
+
+    Args:
+        data (bytes): Frames created by encode_many.
+        known (Optional[Mapping[str, Any]]): Objects by id which references may point to and which
+            are not part of data.
+
+    Returns:
+        List[Any]: The decoded objects in frame order.
+
+    Raises:
+        UnresolvedReferenceError: If a reference is neither decoded nor known.
+        ValueError: If a frame is malformed.
+    """
+    data = bytes(data)
+    objects = []
+    decoded: Dict[bytes, Any] = {}
+    pending: List[Tuple[dict, str, Any]] = []
+    offset = 0
+    while offset < len(data):
+        if offset + _LENGTH.size > len(data):
+            raise ValueError("truncated frame")
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        obj, raw_id = _decode_frame(data, offset, offset + length, pending)
+        objects.append(obj)
+        decoded[raw_id] = obj
+        offset += length
+
+    _link(pending, decoded, known)
+    return objects
+
+
+def decode(data: bytes, known: Optional[Mapping[str, Any]] = None) -> Any:
+    """
+    Decodes one frame created by encode.
+
+    Args:
+        data (bytes): The frame.
+        known (Optional[Mapping[str, Any]]): Objects by id which references point to.
+
+    Raises:
+        UnresolvedReferenceError: If a reference is not known.
+        ValueError: If the frame is malformed.
+    """
+    data = bytes(data)
+    pending: List[Tuple[dict, str, Any]] = []
+    obj, raw_id = _decode_frame(data, 0, len(data), pending)
+    _link(pending, {raw_id: obj}, known)
+    return obj
@@ -0,0 +1,406 @@
+"""
+This module implements the archive tier of closed reservations. Completed and cancelled
+reservations whose return date is older than the hot window are moved out of their customers, with
+their invoices, into compressed segment files. The files are memory-mapped and indexed by customer
+and pickup date, and archived reservations are decoded again only when the history of a customer
+is requested.
+
+Every archive run writes one segment. A segment stores one zlib compressed block per customer and
+pickup year, holding the binary codec frames of the reservations and their invoices sorted by
+pickup date, and an index of its blocks at the end of the file.
+
+File layout:
+    header (magic, version, block count, index offset), compressed blocks, index of the blocks
+    (customer id, first and last pickup day, reservation count, offset, length).
+
+Business Logic:
+    - Only COMPLETED and CANCELLED reservations whose return date is more than hot_days before
+      today are archived, open reservations always stay in memory.
+    - Archived reservations are removed from the reservations of their customer once their segment
+      is written. Customer.reservation_count still counts them, so pricing strategies select the
+      same discounts.
+    - References of archived reservations to vehicles, branches, insurance tiers and add-ons are
+      resolved against the known objects when they are read, the customer is always known.
+    - Decoded blocks are kept in a least recently used cache, so repeated reads return the same
+      objects. Archived reservations are read-only history and start without change listeners.
+    - Customers count and read archived reservations from the active archive, which is replaced
+      with set_reservation_archive, so reservations are archived into the active archive.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+from collections import ChainMap, OrderedDict
+from datetime import date, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Union,
+    TYPE_CHECKING,
+)
+
+import numpy as np
+
+from src.enums import ReservationStatus
+from src.serialization.binary_codec import decode_many, encode_many
+
+if TYPE_CHECKING:
+    from src.reservation.reservation import Reservation
+    from src.users.customer import Customer
+
+MAGIC = b"CRFMARCH"
+ARCHIVE_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<8sIIQ")
+_SEGMENT_PATTERN = "segment-*.crfa"
+
+# zlib default level, higher levels are much slower for a few percent smaller blocks
+COMPRESS_LEVEL = 6
+
+BLOCK_DTYPE = np.dtype(
+    [
+        ("customer", "S16"),
+        ("first_day", "<i4"),
+        ("last_day", "<i4"),
+        ("count", "<u4"),
+        ("offset", "<u8"),
+        ("length", "<u8"),
+    ]
+)
+# Blocks of every segment, sorted by customer and first pickup day
+_INDEX_DTYPE = np.dtype(BLOCK_DTYPE.descr + [("segment", "<i4")])
+
+_CLOSED_STATUSES = (
+    ReservationStatus.CANCELLED.value,
+    ReservationStatus.COMPLETED.value,
+)
+
+
+class ArchiveReport(NamedTuple):
+    """Result of an archive run, segment is None when nothing was archived"""
+
+    segment: Optional[str]
+    reservations: int
+    customers: int
+    raw_bytes: int
+    compressed_bytes: int
+
+
+def _customer_key(customer_id: str) -> bytes:
+    """Returns the 16 bytes of a customer id"""
+    return uuid.UUID(customer_id).bytes
+
+
+class ReservationArchive:
+    """
+    Concrete class storing closed reservations of customers in compressed, memory-mapped segments.
+
+    Args:
+        directory (Union[str, Path]): Directory of the segment files, created if it is missing.
+            Segments already in the directory are opened.
+        known (Optional[Mapping[str, Any]]): Objects by id which archived reservations reference,
+            for example vehicles, branches, insurance tiers and add-ons. The mapping is read when
+            reservations are decoded, so objects added to it later are found.
+        hot_days (int): Days after their return date that closed reservations stay in memory.
+        cache_size (int): Number of decoded blocks kept in memory.
+
+    Raises:
+        TypeError: If hot_days or cache_size is not an integer.
+        ValueError: If hot_days is negative, cache_size is less than 1 or a segment file is not
+            a CRFMS archive segment.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        known: Optional[Mapping[str, Any]] = None,
+        hot_days: int = 90,
+        cache_size: int = 256,
+    ) -> None:
+        """Constructor method for ReservationArchive class"""
+        for name, value in (("hot_days", hot_days), ("cache_size", cache_size)):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"{name} must be an integer")
+        if hot_days < 0:
+            raise ValueError("hot_days cannot be negative")
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__known = {} if known is None else known
+        self.__hot_days = hot_days
+        self.__cache_size = cache_size
+        self.__segments: List[mmap.mmap] = []
+        self.__index = np.zeros(0, dtype=_INDEX_DTYPE)
+        self.__cache: "OrderedDict[tuple, List[Reservation]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+        for path in sorted(self.__directory.glob(_SEGMENT_PATTERN)):
+            self.__open_segment(path)
+
+    def __len__(self) -> int:
+        """Returns the number of archived reservations"""
+        return int(self.__index["count"].sum())
+
+    @property
+    def directory(self) -> Path:
+        """Getter for directory property"""
+        return self.__directory
+
+    @property
+    def hot_days(self) -> int:
+        """Getter for hot_days property"""
+        return self.__hot_days
+
+    @property
+    def segment_count(self) -> int:
+        """Getter for segment_count property"""
+        return len(self.__segments)
+
+    def __open_segment(self, path: Path) -> None:
+        """Maps a segment file and merges its blocks into the index"""
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _FILE_HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path.name} is not a CRFMS archive segment")
+        magic, version, count, index_offset = _FILE_HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"{path.name} is not a CRFMS archive segment")
+        if version != ARCHIVE_VERSION:
+            mapped.close()
+            raise ValueError(f"Unsupported archive version {version}")
+
+        # Copy the block index, so the map holds no exported buffers and can be closed
+        blocks = np.frombuffer(
+            mapped, dtype=BLOCK_DTYPE, count=count, offset=index_offset
+        ).copy()
+        merged = np.zeros(count, dtype=_INDEX_DTYPE)
+        for name in BLOCK_DTYPE.names:
+            merged[name] = blocks[name]
+        merged["segment"] = len(self.__segments)
+        self.__segments.append(mapped)
+
+        index = np.concatenate((self.__index, merged))
+        self.__index = index[np.lexsort((index["first_day"], index["customer"]))]
+
+    def archive(
+        self, customers: Iterable["Customer"], today: Optional[date] = None
+    ) -> ArchiveReport:
+        """
+        Moves the closed reservations of customers which left the hot window into a new segment.
+
+        Args:
+            customers (Iterable[Customer]): Customers whose reservations are archived.
+            today (Optional[date]): Day the hot window ends, defaults to today.
+
+        Returns:
+            ArchiveReport: The written segment and the archived counts and sizes.
+        """
+        cutoff = (date.today() if today is None else today) - timedelta(
+            days=self.__hot_days
+        )
+        selected = []
+        for customer in customers:
+            closed = [
+                reservation
+                for reservation in customer.reservations
+                if reservation.status in _CLOSED_STATUSES
+                and reservation.return_date < cutoff
+            ]
+            if closed:
+                closed.sort(key=lambda reservation: reservation.pickup_date)
+                selected.append((customer, closed))
+        if not selected:
+            return ArchiveReport(None, 0, 0, 0, 0)
+
+        with self.__lock:
+            number = len(self.__segments)
+            path = self.__directory / f"segment-{number:06d}.crfa"
+            raw_bytes = self.__write_segment(path, selected)
+            self.__open_segment(path)
+
+        for customer, closed in selected:
+            customer.detach_reservations(closed)
+        return ArchiveReport(
+            segment=path.name,
+            reservations=sum(len(closed) for _, closed in selected),
+            customers=len(selected),
+            raw_bytes=raw_bytes,
+            compressed_bytes=path.stat().st_size,
+        )
+
+    @staticmethod
+    def __write_segment(path: Path, selected: List[tuple]) -> int:
+        """Writes a segment with one block per customer and pickup year, returns the raw size"""
+        blocks = []
+        chunks = []
+        offset = _FILE_HEADER.size
+        raw_bytes = 0
+        for customer, closed in selected:
+            key = _customer_key(customer.id)
+            for _, group in groupby(
+                closed, key=lambda reservation: reservation.pickup_date.year
+            ):
+                group = list(group)
+                frames = encode_many(
+                    obj
+                    for reservation in group
+                    for obj in (reservation, reservation.invoice)
+                    if obj is not None
+                )
+                chunk = zlib.compress(frames, COMPRESS_LEVEL)
+                blocks.append(
+                    (
+                        key,
+                        group[0].pickup_date.toordinal(),
+                        group[-1].pickup_date.toordinal(),
+                        len(group),
+                        offset,
+                        len(chunk),
+                    )
+                )
+                chunks.append(chunk)
+                offset += len(chunk)
+                raw_bytes += len(frames)
+
+        index = np.array(blocks, dtype=BLOCK_DTYPE)
+        # Write next to the segment and rename it, readers never see a partial segment
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            file.write(_FILE_HEADER.pack(MAGIC, ARCHIVE_VERSION, len(index), offset))
+            for chunk in chunks:
+                file.write(chunk)
+            file.write(index.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        return raw_bytes
+
+    def __blocks_of(self, customer_id: str) -> np.ndarray:
+        """Returns the index entries of a customer"""
+        customers = self.__index["customer"]
+        key = np.array(_customer_key(customer_id), dtype="S16")
+        start = np.searchsorted(customers, key, side="left")
+        stop = np.searchsorted(customers, key, side="right")
+        return self.__index[start:stop]
+
+    def count(self, customer_id: str) -> int:
+        """Returns the number of archived reservations of a customer"""
+        return int(self.__blocks_of(customer_id)["count"].sum())
+
+    def reservations_of(
+        self,
+        customer: "Customer",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List["Reservation"]:
+        """
+        Returns the archived reservations of a customer, only the blocks overlapping the given
+        pickup dates are read.
+
+        Args:
+            customer (Customer): Customer of the reservations.
+            start_date (Optional[date]): First pickup date to include.
+            end_date (Optional[date]): Last pickup date to include.
+
+        Returns:
+            List[Reservation]: Archived reservations ordered by pickup date.
+
+        Raises:
+            UnresolvedReferenceError: If a referenced object is not known.
+        """
+        from src.reservation.reservation import Reservation
+
+        blocks = self.__blocks_of(customer.id)
+        if start_date is not None:
+            blocks = blocks[blocks["last_day"] >= start_date.toordinal()]
+        if end_date is not None:
+            blocks = blocks[blocks["first_day"] <= end_date.toordinal()]
+
+        reservations = []
+        for segment, offset, length in zip(
+            blocks["segment"].tolist(),
+            blocks["offset"].tolist(),
+            blocks["length"].tolist(),
+        ):
+            key = (segment, offset)
+            with self.__lock:
+                cached = self.__cache.get(key)
+                if cached is not None:
+                    self.__cache.move_to_end(key)
+                    reservations.extend(cached)
+                    continue
+                data = zlib.decompress(
+                    self.__segments[segment][offset : offset + length]
+                )
+
+            known = ChainMap({customer.id: customer}, self.__known)
+            decoded = [
+                obj for obj in decode_many(data, known) if isinstance(obj, Reservation)
+            ]
+            with self.__lock:
+                self.__cache[key] = decoded
+                if len(self.__cache) > self.__cache_size:
+                    self.__cache.popitem(last=False)
+            reservations.extend(decoded)
+
+        reservations = [
+            reservation
+            for reservation in reservations
+            if (start_date is None or reservation.pickup_date >= start_date)
+            and (end_date is None or reservation.pickup_date <= end_date)
+        ]
+        # Blocks of later segments may overlap the years of earlier ones
+        reservations.sort(key=lambda reservation: reservation.pickup_date)
+        return reservations
+
+    def close(self) -> None:
+        """Unmaps every segment, the archive cannot be read afterwards"""
+        with self.__lock:
+            for mapped in self.__segments:
+                mapped.close()
+            self.__cache.clear()
+
+    def __enter__(self) -> "ReservationArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_reservation_archive: Optional[ReservationArchive] = None
+
+
+def get_reservation_archive() -> Optional[ReservationArchive]:
+    """Returns the archive customers read their archived reservations from"""
+    return _reservation_archive
+
+
+def set_reservation_archive(reservation_archive: Optional[ReservationArchive]) -> None:
+    """
+    Replaces the archive customers read their archived reservations from, None detaches it.
+
+    Raises:
+        TypeError: If reservation_archive is not a ReservationArchive object or None.
+    """
+    global _reservation_archive
+    if reservation_archive is not None and not isinstance(
+        reservation_archive, ReservationArchive
+    ):
+        raise TypeError("reservation_archive must be a ReservationArchive object")
+    _reservation_archive = reservation_archive
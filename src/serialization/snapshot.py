@@ -0,0 +1,397 @@
+"""
+This module implements whole-system snapshots.
+A snapshot stores every domain object reachable from the given roots (branches, fleet, customers,
+catalog objects) in one file and restores them with all identity links, so a warm instance can be
+started without running constructors and validation again.
+
+Objects are stored column by column, one table per class, using the schemas of the binary codec.
+Columns are NumPy arrays: numbers, dates and enum codes are stored as they are, strings are joined
+into one UTF-8 buffer, blobs are joined into one byte buffer, and references are stored as
+indexes into the table of all objects.
+The columns are pickled with protocol 5 and written as out-of-band buffers after the pickle
+stream, so restoring maps the file into memory and reads the columns without copying them.
+
+File layout:
+    header (magic, version, pickle length, buffer count), buffer table (offset, length) per buffer,
+    pickle stream, buffers aligned to 64 bytes.
+
+Business Logic:
+    - Every object is stored once, references to it are restored as the same object.
+    - Change listeners are not stored, restored objects start without listeners.
+    - Restored pricing strategies of reservations share one stateless strategy object per class.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import gc
+import mmap
+import pickle
+import struct
+import traceback
+from datetime import date
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Union
+
+import numpy as np
+
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.serialization.binary_codec import Schema, pricing_strategies, schemas
+
+MAGIC = b"CRFMSNAP"
+SNAPSHOT_VERSION = 5
+
+_FILE_HEADER = struct.Struct("<8sIQI")
+_BUFFER_ENTRY = struct.Struct("<QQ")
+_ALIGNMENT = 64
+_SEPARATOR = "\0"
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector. Creating millions of objects triggers full collections
+    over the growing heap again and again, while none of the new objects is garbage.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def collect_objects(roots: Iterable[Any]) -> Dict[type, List[Any]]:
+    """
+    Returns every domain object reachable from roots, grouped by class.
+
+    Args:
+        roots (Iterable[Any]): Domain objects to start from, for example branches, vehicles and
+            customers.
+
+    Raises:
+        TypeError: If a reachable object has no schema.
+    """
+    by_class = schemas()
+    collected: Dict[type, List[Any]] = {cls: [] for cls in by_class}
+    seen = set()
+    stack = list(roots)
+    stack.reverse()
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        schema = by_class.get(type(obj))
+        if schema is None:
+            raise TypeError(f"No schema for {type(obj).__name__}")
+        seen.add(id(obj))
+        collected[type(obj)].append(obj)
+
+        state = obj.__dict__
+        for attribute, kind, _ in schema.fields:
+            if kind == "ref" and state[attribute] is not None:
+                stack.append(state[attribute])
+            elif kind == "ref_list":
+                stack.extend(reversed(state[attribute]))
+    return collected
+
+
+def _pack_strings(values: List[str]) -> np.ndarray:
+    """Joins strings into one UTF-8 buffer"""
+    text = _SEPARATOR.join(values)
+    if text.count(_SEPARATOR) != max(len(values) - 1, 0):
+        raise ValueError("Strings cannot contain NUL characters")
+    return np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_strings(packed: np.ndarray, count: int) -> List[str]:
+    """Splits a UTF-8 buffer created by _pack_strings"""
+    if count == 0:
+        return []
+    return packed.tobytes().decode("utf-8").split(_SEPARATOR)
+
+
+def _offsets(values: List[List[Any]]) -> np.ndarray:
+    """Returns start offsets of every list and the total length at the end"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(items) for items in values], out=offsets[1:])
+    return offsets
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Returns a NumPy object array holding values, without converting them"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _encode_columns(
+    schema: Schema, objects: List[Any], index_of: Dict[int, int]
+) -> Dict[str, Any]:
+    """Returns the columns of a table of objects"""
+    columns: Dict[str, Any] = {}
+    for attribute, kind, target in schema.fields:
+        values = [obj.__dict__[attribute] for obj in objects]
+        if kind in ("id", "str"):
+            column = _pack_strings(values)
+        elif kind == "optional_str":
+            column = (
+                np.array([value is None for value in values], dtype=bool),
+                _pack_strings(["" if value is None else value for value in values]),
+            )
+        elif kind == "float":
+            column = np.array(values, dtype=np.float64)
+        elif kind == "int":
+            column = np.array(values, dtype=np.int64)
+        elif kind == "bool":
+            column = np.array(values, dtype=bool)
+        elif kind == "date":
+            column = np.array([value.toordinal() for value in values], dtype=np.int32)
+        elif kind == "enum":
+            codes = {member: code for code, member in enumerate(target)}
+            column = np.array([codes[value] for value in values], dtype=np.uint8)
+        elif kind == "strategy":
+            classes = pricing_strategies()
+            column = np.array(
+                [classes.index(type(value.strategy)) for value in values],
+                dtype=np.uint8,
+            )
+        elif kind == "ref":
+            column = np.array(
+                [-1 if value is None else index_of[id(value)] for value in values],
+                dtype=np.int64,
+            )
+        elif kind == "ref_list":
+            column = (
+                _offsets(values),
+                np.array(
+                    [index_of[id(item)] for items in values for item in items],
+                    dtype=np.int64,
+                ),
+            )
+        elif kind == "str_list":
+            column = (
+                _offsets(values),
+                _pack_strings([item for items in values for item in items]),
+            )
+        elif kind == "blob":
+            encoded = [value.to_bytes() for value in values]
+            column = (
+                _offsets(encoded),
+                np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            )
+        else:
+            raise ValueError(f"Unknown field kind {kind}")
+        columns[attribute] = column
+    return columns
+
+
+def save_snapshot(path: Union[str, Path], roots: Iterable[Any]) -> int:
+    """
+    Writes every domain object reachable from roots into a snapshot file.
+
+    Args:
+        path (Union[str, Path]): Path of the snapshot file.
+        roots (Iterable[Any]): Domain objects to start from, for example all branches, vehicles,
+            customers and catalog objects.
+
+    Returns:
+        int: Number of stored objects.
+    """
+    with _gc_paused():
+        return _save(path, roots)
+
+
+def _save(path: Union[str, Path], roots: Iterable[Any]) -> int:
+    """Writes the snapshot file, see save_snapshot"""
+    collected = collect_objects(roots)
+    index_of: Dict[int, int] = {}
+    for objects in collected.values():
+        for obj in objects:
+            index_of[id(obj)] = len(index_of)
+
+    tables = [
+        (
+            schema.tag,
+            len(collected[cls]),
+            _encode_columns(schema, collected[cls], index_of),
+        )
+        for cls, schema in schemas().items()
+    ]
+    buffers: List[pickle.PickleBuffer] = []
+    stream = pickle.dumps(
+        {"version": SNAPSHOT_VERSION, "tables": tables},
+        protocol=5,
+        buffer_callback=buffers.append,
+    )
+
+    # Place buffers after the header, buffer table and pickle stream, aligned for mmap
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    position = _FILE_HEADER.size + _BUFFER_ENTRY.size * len(raw_buffers) + len(stream)
+    entries = []
+    for raw in raw_buffers:
+        position += -position % _ALIGNMENT
+        entries.append((position, raw.nbytes))
+        position += raw.nbytes
+
+    with open(path, "wb") as file:
+        file.write(
+            _FILE_HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(stream), len(raw_buffers))
+        )
+        for entry in entries:
+            file.write(_BUFFER_ENTRY.pack(*entry))
+        file.write(stream)
+        for (offset, _), raw in zip(entries, raw_buffers):
+            file.write(bytes(offset - file.tell()))
+            file.write(raw)
+    return len(index_of)
+
+
+def _decode_column(
+    kind: str, target: Any, column: Any, count: int, objects: np.ndarray
+) -> List[Any]:
+    """Returns the values of a column as a list"""
+    if kind in ("id", "str"):
+        return _unpack_strings(column, count)
+    if kind == "optional_str":
+        is_none, packed = column
+        values = _unpack_strings(packed, count)
+        return [
+            None if missing else value
+            for missing, value in zip(is_none.tolist(), values)
+        ]
+    if kind in ("float", "int", "bool"):
+        return column.tolist()
+    if kind == "date":
+        # Dates repeat a lot, every distinct day is created once
+        ordinals, inverse = np.unique(column, return_inverse=True)
+        days = _object_array(
+            [date.fromordinal(ordinal) for ordinal in ordinals.tolist()]
+        )
+        return days[inverse].tolist()
+    if kind == "enum":
+        return _object_array(list(target))[column].tolist()
+    if kind == "strategy":
+        strategies = [strategy_class() for strategy_class in pricing_strategies()]
+        values = []
+        for code in column.tolist():
+            pricing_strategy = PricingStrategy.__new__(PricingStrategy)
+            pricing_strategy.__dict__["_PricingStrategy__strategy"] = strategies[code]
+            values.append(pricing_strategy)
+        return values
+    if kind == "ref":
+        # Index -1 is the None at the end of objects
+        return objects[column].tolist()
+    if kind == "ref_list":
+        offsets, indexes = column
+        items = objects[indexes].tolist()
+        offsets = offsets.tolist()
+        return [items[start:stop] for start, stop in zip(offsets, offsets[1:])]
+    if kind == "str_list":
+        offsets, packed = column
+        items = _unpack_strings(packed, offsets[-1].item())
+        offsets = offsets.tolist()
+        return [items[start:stop] for start, stop in zip(offsets, offsets[1:])]
+    if kind == "blob":
+        offsets, packed = column
+        data = packed.tobytes()
+        offsets = offsets.tolist()
+        return [
+            target.from_bytes(data[start:stop])
+            for start, stop in zip(offsets, offsets[1:])
+        ]
+    raise ValueError(f"Unknown field kind {kind}")
+
+
+def _restore_tables(payload: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Creates the objects of every table and links their references"""
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported snapshot version")
+    schema_by_tag = {schema.tag: schema for schema in schemas().values()}
+
+    # Create every object first, so references can point to objects of any table
+    tables = []
+    all_objects: List[Any] = []
+    for tag, count, columns in payload["tables"]:
+        schema = schema_by_tag[tag]
+        new = schema.cls.__new__
+        objects = [new(schema.cls) for _ in range(count)]
+        tables.append((schema, objects, columns))
+        all_objects.extend(objects)
+    all_objects.append(None)
+    objects_array = _object_array(all_objects)
+
+    restored: Dict[str, List[Any]] = {}
+    for schema, objects, columns in tables:
+        attributes = [field.attribute for field in schema.fields]
+        values = [
+            _decode_column(
+                kind, target, columns[attribute], len(objects), objects_array
+            )
+            for attribute, kind, target in schema.fields
+        ]
+        transient = schema.transient
+        for obj, row in zip(objects, zip(*values)):
+            state = obj.__dict__
+            state.update(zip(attributes, row))
+            for attribute, factory in transient:
+                state[attribute] = factory()
+        restored[schema.cls.__name__] = objects
+
+    # Containers may index their items, so they are built once every object is restored
+    for schema, objects, _ in tables:
+        for attribute, kind, target in schema.fields:
+            if kind in ("ref_list", "str_list") and target is not None:
+                for obj in objects:
+                    state = obj.__dict__
+                    state[attribute] = target(state[attribute])
+    return restored
+
+
+def load_snapshot(path: Union[str, Path]) -> Dict[str, List[Any]]:
+    """
+    Restores a snapshot file.
+
+    Args:
+        path (Union[str, Path]): Path of the snapshot file.
+
+    Returns:
+        Dict[str, List[Any]]: Restored objects by class name, for example "Reservation".
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported version.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    payload = buffers = None
+    try:
+        magic, version, stream_length, buffer_count = _FILE_HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("File is not a CRFMS snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        position = _FILE_HEADER.size
+        buffers = []
+        for _ in range(buffer_count):
+            offset, length = _BUFFER_ENTRY.unpack_from(view, position)
+            buffers.append(view[offset : offset + length])
+            position += _BUFFER_ENTRY.size
+
+        payload = pickle.loads(
+            view[position : position + stream_length], buffers=buffers
+        )
+        restored = _restore_tables(payload)
+    except BaseException as error:
+        # Frames of the failed restore still reference columns in the mapped file
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        # Drop every view into the mapped file before it is closed
+        del payload, buffers
+        view.release()
+        mapped.close()
+    return restored
@@ -0,0 +1,39 @@
+"""
+This module implements the string encoding shared by the binary formats of the application.
+The binary codec, encoded price quotes and encoded add-on inventories store strings the same way,
+so the helpers live here, in a module without domain imports.
+
+Business Logic:
+    - A string is a uint32 length followed by its UTF-8 bytes.
+    - None is encoded as the length 0xFFFFFFFF without bytes.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import struct
+from typing import List, Optional, Tuple
+
+LENGTH = struct.Struct("<I")
+NONE_LENGTH = 0xFFFFFFFF
+
+
+def encode_str(parts: List[bytes], value: Optional[str]) -> None:
+    """Appends a length-prefixed UTF-8 string to parts"""
+    if value is None:
+        parts.append(LENGTH.pack(NONE_LENGTH))
+        return
+    encoded = value.encode("utf-8")
+    parts.append(LENGTH.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def decode_str(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Decodes a length-prefixed UTF-8 string and returns it with the offset after it"""
+    (length,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    if length == NONE_LENGTH:
+        return None, offset
+    if offset + length > len(data):
+        raise ValueError("truncated frame")
+    return data[offset : offset + length].decode("utf-8"), offset + length
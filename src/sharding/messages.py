@@ -0,0 +1,55 @@
+"""
+This module implements the messages exchanged between ShardedRuntime and its shard workers.
+Messages only carry ids and plain values, so they are cheap to pickle across processes.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+from typing import NamedTuple, Optional, Tuple
+
+
+class ReservationRequest(NamedTuple):
+    """Request to reserve a vehicle, routed to the shard owning pickup_branch_id."""
+
+    customer_id: str
+    vehicle_id: str
+    insurance_tier_id: str
+    pickup_branch_id: str
+    return_branch_id: str
+    pickup_date: date
+    return_date: date
+    add_on_ids: Tuple[str, ...] = ()
+
+
+class ReservationReceipt(NamedTuple):
+    """Summary of a reservation created on a shard."""
+
+    reservation_id: str
+    shard: int
+    pickup_branch_id: str
+    return_branch_id: str
+    vehicle_id: str
+    total_price_cents: int
+    status: str
+
+
+class VehicleHandoff(NamedTuple):
+    """
+    A vehicle leaving its shard after a one-way rental.
+
+    payload is the pickled vehicle where branches and vehicle classes are replaced by their ids,
+    the destination shard resolves them against its own objects.
+    """
+
+    vehicle_id: str
+    destination_branch_id: str
+    payload: bytes
+
+
+class ReturnResult(NamedTuple):
+    """Result of returning a vehicle, handoff is set when the vehicle changes shard."""
+
+    reservation_id: str
+    handoff: Optional[VehicleHandoff]
@@ -0,0 +1,103 @@
+"""
+This module implements ShardRouter class which decides which worker process owns a branch.
+Each branch is pinned to exactly one shard, and every request is routed by its branch id.
+
+Business Logic:
+    - Branches are assigned to the least loaded shard (by number of vehicles) when registered.
+    - A branch cannot be moved to another shard once assigned.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from typing import Dict, List
+
+
+class ShardRouter:
+    """
+    Concrete class representing the routing table of a sharded runtime.
+
+    Args:
+        shard_count (int): Number of shards.
+
+    Raises:
+        TypeError: If shard_count is not an integer.
+        ValueError: If shard_count is less than 1.
+    """
+
+    def __init__(self, shard_count: int) -> None:
+        """Constructor method for ShardRouter class."""
+        # Validate shard_count
+        if not isinstance(shard_count, int) or isinstance(shard_count, bool):
+            raise TypeError("shard_count must be an integer.")
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1.")
+
+        # Assign values
+        self.__shard_count = shard_count
+        self.__branch_shards: Dict[str, int] = {}
+        self.__shard_loads: List[int] = [0] * shard_count
+
+    @property
+    def shard_count(self) -> int:
+        """Getter for shard_count property."""
+        return self.__shard_count
+
+    @property
+    def shard_loads(self) -> List[int]:
+        """Getter for shard_loads property (number of vehicles on each shard)."""
+        return self.__shard_loads.copy()
+
+    def assign_branch(self, branch_id: str, weight: int = 1) -> int:
+        """
+        Pins a branch to the least loaded shard.
+
+        Args:
+            branch_id (str): ID of the branch.
+            weight (int): Load the branch adds to its shard, usually its number of vehicles.
+
+        Returns:
+            int: Index of the shard that owns the branch.
+
+        Raises:
+            TypeError: If branch_id is not a string or weight is not an integer.
+            ValueError: If the branch is already assigned.
+        """
+        # Validation
+        if not isinstance(branch_id, str):
+            raise TypeError("branch_id must be a string.")
+        if not isinstance(weight, int):
+            raise TypeError("weight must be an integer.")
+        if branch_id in self.__branch_shards:
+            raise ValueError("Branch is already assigned to a shard.")
+
+        # Logic
+        shard = min(range(self.__shard_count), key=self.__shard_loads.__getitem__)
+        self.__branch_shards[branch_id] = shard
+        self.__shard_loads[shard] += max(weight, 1)
+        return shard
+
+    def shard_for(self, branch_id: str) -> int:
+        """
+        Returns the shard that owns the branch.
+
+        Args:
+            branch_id (str): ID of the branch.
+
+        Raises:
+            KeyError: If the branch is not assigned to any shard.
+        """
+        try:
+            return self.__branch_shards[branch_id]
+        except KeyError:
+            raise KeyError(
+                f"Branch {branch_id} is not assigned to any shard."
+            ) from None
+
+    def branches_of(self, shard: int) -> List[str]:
+        """Returns ids of all branches owned by the shard."""
+        return [
+            branch_id
+            for branch_id, owner in self.__branch_shards.items()
+            if owner == shard
+        ]
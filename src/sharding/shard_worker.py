@@ -0,0 +1,316 @@
+"""
+This module implements the worker side of the sharded runtime.
+ShardState owns the branches assigned to one shard together with their vehicles, employees and
+pickup-side reservations. run_shard is the entry point of the worker process, it receives commands
+over a pipe and answers them one by one.
+
+Business Logic:
+    - Reservations live on the shard of their pickup branch.
+    - Every shard keeps a replica of all branches and customers, so a reservation can reference a
+      return branch owned by another shard. Only owned branches are ever modified.
+    - Pricing strategies count the reservations of a customer on every shard. The runtime sends
+      the count of the customer with every request, the reservations held by other shards are set
+      as remote_reservation_count of the customer replica.
+    - When a one-way rental is returned to a branch of another shard, the vehicle is removed from
+      the source shard and handed off to the destination shard.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import io
+import pickle
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from src.branch.branch import Branch
+from src.vehicle.vehicle_class import VehicleClass
+from src.sharding.messages import (
+    ReservationReceipt,
+    ReservationRequest,
+    ReturnResult,
+    VehicleHandoff,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.add_on import AddOn
+    from src.reservation.reservation import Reservation
+    from src.reservation.insurance_tier import InsuranceTier
+
+
+class _HandoffPickler(pickle.Pickler):
+    """Pickler that replaces shared catalog objects by their ids"""
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, str]]:
+        if isinstance(obj, Branch):
+            return "branch", obj.id
+        if isinstance(obj, VehicleClass):
+            return "vehicle_class", obj.id
+        return None
+
+
+class _HandoffUnpickler(pickle.Unpickler):
+    """Unpickler that resolves catalog ids against the objects of the receiving shard"""
+
+    def __init__(self, file: io.BytesIO, state: "ShardState") -> None:
+        super().__init__(file)
+        self.__state = state
+
+    def persistent_load(self, pid: Tuple[str, str]) -> Any:
+        kind, object_id = pid
+        if kind == "branch":
+            return self.__state.branch(object_id)
+        if kind == "vehicle_class":
+            return self.__state.vehicle_class(object_id)
+        raise pickle.UnpicklingError(f"Unknown persistent id {kind}")
+
+
+class ShardState:
+    """
+    Concrete class representing the objects owned by one shard.
+
+    Args:
+        shard (int): Index of the shard.
+        owned_branch_ids (List[str]): IDs of the branches owned by the shard.
+        branches (List[Branch]): All branches of the runtime.
+        vehicles (List[Vehicle]): Vehicles of the owned branches.
+        customers (List[Customer]): All customers of the runtime.
+        vehicle_classes (List[VehicleClass]): Vehicle class catalog.
+        insurance_tiers (List[InsuranceTier]): Insurance tier catalog.
+        add_ons (List[AddOn]): Add-on catalog.
+    """
+
+    # Commands which the runtime is allowed to call on a shard
+    COMMANDS = frozenset(
+        {
+            "create_reservations",
+            "approve_reservation",
+            "pay_reservation",
+            "pickup_vehicle",
+            "return_vehicle",
+            "cancel_reservation",
+            "adopt_vehicle",
+            "stats",
+        }
+    )
+
+    def __init__(
+        self,
+        shard: int,
+        owned_branch_ids: List[str],
+        branches: List["Branch"],
+        vehicles: List["Vehicle"],
+        customers: List["Customer"],
+        vehicle_classes: List["VehicleClass"],
+        insurance_tiers: List["InsuranceTier"],
+        add_ons: List["AddOn"],
+    ) -> None:
+        """Constructor method for ShardState class."""
+        self.__shard = shard
+        self.__owned_branch_ids = frozenset(owned_branch_ids)
+        self.__branches: Dict[str, "Branch"] = {b.id: b for b in branches}
+        self.__vehicles: Dict[str, "Vehicle"] = {v.id: v for v in vehicles}
+        self.__customers: Dict[str, "Customer"] = {c.id: c for c in customers}
+        self.__vehicle_classes = {vc.id: vc for vc in vehicle_classes}
+        self.__insurance_tiers = {it.id: it for it in insurance_tiers}
+        self.__add_ons = {a.id: a for a in add_ons}
+        self.__reservations: Dict[str, "Reservation"] = {}
+
+    def branch(self, branch_id: str) -> "Branch":
+        """Returns a branch known to the shard"""
+        return self.__branches[branch_id]
+
+    def vehicle_class(self, vehicle_class_id: str) -> "VehicleClass":
+        """Returns a vehicle class known to the shard"""
+        return self.__vehicle_classes[vehicle_class_id]
+
+    def __owned_branch(self, branch_id: str) -> "Branch":
+        """Returns a branch owned by the shard"""
+        if branch_id not in self.__owned_branch_ids:
+            raise ValueError(
+                f"Branch {branch_id} is not owned by shard {self.__shard}."
+            )
+        return self.__branches[branch_id]
+
+    def __receipt(self, reservation: "Reservation") -> ReservationReceipt:
+        """Builds a receipt for a reservation"""
+        return ReservationReceipt(
+            reservation_id=reservation.id,
+            shard=self.__shard,
+            pickup_branch_id=reservation.pickup_branch.id,
+            return_branch_id=reservation.return_branch.id,
+            vehicle_id=reservation.vehicle.id,
+            total_price_cents=reservation.total_price_cents,
+            status=reservation.status,
+        )
+
+    def create_reservation(
+        self, request: ReservationRequest, reservation_count: Optional[int] = None
+    ) -> ReservationReceipt:
+        """
+        Creates one reservation on an owned branch.
+
+        Args:
+            request (ReservationRequest): The reservation request.
+            reservation_count (Optional[int]): Reservations of the customer on all shards, None
+                counts the reservations of this shard only.
+        """
+        pickup_branch = self.__owned_branch(request.pickup_branch_id)
+        vehicle = self.__vehicles.get(request.vehicle_id)
+        if vehicle is None or vehicle.current_branch is not pickup_branch:
+            raise ValueError(
+                f"Vehicle {request.vehicle_id} is not at the pickup branch."
+            )
+
+        customer = self.__customers[request.customer_id]
+        if reservation_count is not None:
+            local_count = customer.reservation_count - customer.remote_reservation_count
+            customer.remote_reservation_count = max(reservation_count - local_count, 0)
+        reservation = customer.create_reservation(
+            vehicle=vehicle,
+            insurance_tier=self.__insurance_tiers[request.insurance_tier_id],
+            pickup_branch=pickup_branch,
+            return_branch=self.__branches[request.return_branch_id],
+            pickup_date=request.pickup_date,
+            return_date=request.return_date,
+            add_ons=[self.__add_ons[add_on_id] for add_on_id in request.add_on_ids],
+        )
+        self.__reservations[reservation.id] = reservation
+        return self.__receipt(reservation)
+
+    def create_reservations(
+        self,
+        requests: List[ReservationRequest],
+        reservation_counts: Optional[List[Optional[int]]] = None,
+    ) -> List[Tuple[bool, Any]]:
+        """Creates a batch of reservations, a failing request does not stop the batch"""
+        if reservation_counts is None:
+            reservation_counts = [None] * len(requests)
+        results = []
+        for request, reservation_count in zip(requests, reservation_counts):
+            try:
+                results.append(
+                    (True, self.create_reservation(request, reservation_count))
+                )
+            except Exception as error:
+                results.append((False, portable_error(error)))
+        return results
+
+    def approve_reservation(self, reservation_id: str) -> ReservationReceipt:
+        """Approves a reservation by an active agent of its pickup branch"""
+        reservation = self.__reservations[reservation_id]
+        agent = next(
+            (
+                employee
+                for employee in reservation.pickup_branch.get_employees_by_role("agent")
+                if employee.is_active
+            ),
+            None,
+        )
+        if agent is None:
+            raise ValueError("Pickup branch has no active agent.")
+
+        agent.approve_reservation(reservation)
+        return self.__receipt(reservation)
+
+    def pay_reservation(
+        self, reservation_id: str, card_number: str, cvv: str, expiry: str
+    ) -> str:
+        """Pays a reservation by credit card and returns the receipt"""
+        reservation = self.__reservations[reservation_id]
+        return reservation.creator.make_creditcard_payment(
+            reservation, card_number, cvv, expiry
+        )
+
+    def pickup_vehicle(self, reservation_id: str) -> ReservationReceipt:
+        """Picks up the vehicle of a reservation"""
+        reservation = self.__reservations[reservation_id]
+        reservation.creator.pickup_vehicle(reservation_id)
+        return self.__receipt(reservation)
+
+    def cancel_reservation(self, reservation_id: str) -> ReservationReceipt:
+        """Cancels a reservation"""
+        reservation = self.__reservations[reservation_id]
+        reservation.creator.cancel_reservation(reservation_id)
+        return self.__receipt(reservation)
+
+    def return_vehicle(self, reservation_id: str) -> ReturnResult:
+        """
+        Returns the vehicle of a reservation at its return branch.
+
+        If the return branch is owned by another shard, the vehicle is removed from this shard
+        and a handoff is returned, which the runtime forwards to the destination shard.
+        """
+        reservation = self.__reservations[reservation_id]
+        reservation.creator.return_vehicle(reservation_id)
+
+        vehicle = reservation.vehicle
+        return_branch = reservation.return_branch
+        vehicle.current_branch = return_branch
+        if return_branch.id in self.__owned_branch_ids:
+            return ReturnResult(reservation_id=reservation_id, handoff=None)
+
+        # One-way rental to another shard
+        del self.__vehicles[vehicle.id]
+        buffer = io.BytesIO()
+        _HandoffPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(vehicle)
+        return ReturnResult(
+            reservation_id=reservation_id,
+            handoff=VehicleHandoff(
+                vehicle_id=vehicle.id,
+                destination_branch_id=return_branch.id,
+                payload=buffer.getvalue(),
+            ),
+        )
+
+    def adopt_vehicle(self, handoff: VehicleHandoff) -> str:
+        """Takes ownership of a vehicle handed off by another shard"""
+        self.__owned_branch(handoff.destination_branch_id)
+        vehicle = _HandoffUnpickler(io.BytesIO(handoff.payload), self).load()
+        self.__vehicles[vehicle.id] = vehicle
+        return vehicle.id
+
+    def stats(self) -> Dict[str, int]:
+        """Returns number of objects owned by the shard"""
+        return {
+            "shard": self.__shard,
+            "branches": len(self.__owned_branch_ids),
+            "vehicles": len(self.__vehicles),
+            "reservations": len(self.__reservations),
+        }
+
+
+def portable_error(error: Exception) -> Exception:
+    """Returns error if it survives pickling, otherwise a RuntimeError with the same message"""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def run_shard(connection: "Connection") -> None:
+    """
+    Entry point of a shard worker process.
+
+    The first message is the pickled ShardState arguments, then each message is a
+    (command, args) tuple answered with (ok, result). None stops the worker.
+    """
+    state = ShardState(**pickle.loads(connection.recv_bytes()))
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        command, args = message
+        try:
+            if command not in ShardState.COMMANDS:
+                raise ValueError(f"Unknown shard command {command}.")
+            connection.send((True, getattr(state, command)(*args)))
+        except Exception as error:
+            connection.send((False, portable_error(error)))
+
+    connection.close()
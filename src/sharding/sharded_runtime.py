@@ -0,0 +1,332 @@
+"""
+This module implements ShardedRuntime class which runs the application in several worker processes.
+Every Branch, together with its vehicles, employees and pickup-side reservations, is owned by one
+shard. Requests are routed to the shard of their pickup branch, so shards never share mutable state
+and reservation creation is not limited by a single interpreter lock.
+
+Business Logic:
+    - Branches, vehicles, customers and catalog objects must be registered before start().
+    - Batches of reservation requests are split by shard and processed by all shards in parallel.
+    - The runtime counts the reservations of every customer on all shards and sends the count with
+      every request, so first-order and loyalty discounts are granted once per customer. Requests
+      of one customer in a batch are created in rounds, one per round, in the order of the batch.
+    - A failing shard command raises only after the replies of all other shards were read, so the
+      pipes stay in step with the commands.
+    - One-way rentals returned to a branch of another shard are handed off through the runtime.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pickle
+import multiprocessing
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from src.custom_errors import ReservationNotFoundError
+from src.sharding.shard_router import ShardRouter
+from src.sharding.shard_worker import run_shard
+from src.sharding.messages import (
+    ReservationReceipt,
+    ReservationRequest,
+    ReturnResult,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from src.branch.branch import Branch
+    from src.users.customer import Customer
+    from src.vehicle.vehicle import Vehicle
+    from src.reservation.add_on import AddOn
+    from src.vehicle.vehicle_class import VehicleClass
+    from src.reservation.insurance_tier import InsuranceTier
+
+
+class ShardedRuntime:
+    """
+    Concrete class representing a multi-process runtime sharded by branch.
+
+    Args:
+        shard_count (int): Number of worker processes.
+
+    Raises:
+        TypeError: If shard_count is not an integer.
+        ValueError: If shard_count is less than 1.
+    """
+
+    def __init__(self, shard_count: int) -> None:
+        """Constructor method for ShardedRuntime class."""
+        self.__router = ShardRouter(shard_count)
+        self.__branches: Dict[str, "Branch"] = {}
+        self.__vehicles: Dict[str, List["Vehicle"]] = {}
+        self.__customers: Dict[str, "Customer"] = {}
+        self.__vehicle_classes: Dict[str, "VehicleClass"] = {}
+        self.__insurance_tiers: Dict[str, "InsuranceTier"] = {}
+        self.__add_ons: Dict[str, "AddOn"] = {}
+        self.__connections: List["Connection"] = []
+        self.__processes: List[multiprocessing.Process] = []
+        self.__reservation_shards: Dict[str, int] = {}
+        # Reservations of every customer on all shards, for pricing strategies
+        self.__reservation_counts: Dict[str, int] = {}
+
+    @property
+    def router(self) -> ShardRouter:
+        """Getter for router property."""
+        return self.__router
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if worker processes are started."""
+        return bool(self.__processes)
+
+    def __ensure_not_running(self) -> None:
+        """Raises an error if objects are registered after start"""
+        if self.is_running:
+            raise RuntimeError("Objects must be registered before the runtime starts.")
+
+    def __ensure_running(self) -> None:
+        """Raises an error if the runtime is not started"""
+        if not self.is_running:
+            raise RuntimeError("Runtime is not running.")
+
+    def add_branch(self, branch: "Branch", vehicles: Sequence["Vehicle"]) -> int:
+        """
+        Registers a branch with its vehicles and pins it to a shard.
+
+        Args:
+            branch (Branch): The branch, its employees are moved together with it.
+            vehicles (Sequence[Vehicle]): Vehicles currently located at the branch.
+
+        Returns:
+            int: Index of the shard that owns the branch.
+
+        Raises:
+            RuntimeError: If the runtime is already running.
+            ValueError: If a vehicle is not located at the branch.
+        """
+        self.__ensure_not_running()
+        if any(vehicle.current_branch is not branch for vehicle in vehicles):
+            raise ValueError("All vehicles must be located at the branch.")
+
+        shard = self.__router.assign_branch(branch.id, weight=len(vehicles))
+        self.__branches[branch.id] = branch
+        self.__vehicles[branch.id] = list(vehicles)
+        for vehicle in vehicles:
+            self.__vehicle_classes.setdefault(
+                vehicle.vehicle_class.id, vehicle.vehicle_class
+            )
+        return shard
+
+    def add_customers(self, customers: Sequence["Customer"]) -> None:
+        """Registers customers, every shard gets a replica of them."""
+        self.__ensure_not_running()
+        for customer in customers:
+            self.__customers[customer.id] = customer
+            self.__reservation_counts[customer.id] = customer.reservation_count
+
+    def add_catalog(
+        self,
+        insurance_tiers: Sequence["InsuranceTier"] = (),
+        add_ons: Sequence["AddOn"] = (),
+        vehicle_classes: Sequence["VehicleClass"] = (),
+    ) -> None:
+        """Registers catalog objects, every shard gets a replica of them."""
+        self.__ensure_not_running()
+        for insurance_tier in insurance_tiers:
+            self.__insurance_tiers[insurance_tier.id] = insurance_tier
+        for add_on in add_ons:
+            self.__add_ons[add_on.id] = add_on
+        for vehicle_class in vehicle_classes:
+            self.__vehicle_classes[vehicle_class.id] = vehicle_class
+
+    def start(self) -> None:
+        """Starts one worker process per shard and sends it the objects it owns."""
+        self.__ensure_not_running()
+        context = multiprocessing.get_context()
+
+        for shard in range(self.__router.shard_count):
+            owned_branch_ids = self.__router.branches_of(shard)
+            state = {
+                "shard": shard,
+                "owned_branch_ids": owned_branch_ids,
+                "branches": list(self.__branches.values()),
+                "vehicles": [
+                    vehicle
+                    for branch_id in owned_branch_ids
+                    for vehicle in self.__vehicles[branch_id]
+                ],
+                "customers": list(self.__customers.values()),
+                "vehicle_classes": list(self.__vehicle_classes.values()),
+                "insurance_tiers": list(self.__insurance_tiers.values()),
+                "add_ons": list(self.__add_ons.values()),
+            }
+
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=run_shard, args=(child_connection,), daemon=True
+            )
+            process.start()
+            child_connection.close()
+            parent_connection.send_bytes(
+                pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+
+            self.__connections.append(parent_connection)
+            self.__processes.append(process)
+
+    def stop(self) -> None:
+        """Stops all worker processes."""
+        for connection in self.__connections:
+            connection.send(None)
+            connection.close()
+        for process in self.__processes:
+            process.join()
+
+        self.__connections = []
+        self.__processes = []
+
+    def __enter__(self) -> "ShardedRuntime":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __call(self, shard: int, command: str, *args: Any) -> Any:
+        """Sends a command to a shard and returns its result or raises its error"""
+        self.__ensure_running()
+        connection = self.__connections[shard]
+        connection.send((command, args))
+        ok, result = connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def __reservation_shard(self, reservation_id: str) -> int:
+        """Returns the shard which owns a reservation"""
+        if reservation_id not in self.__reservation_shards:
+            raise ReservationNotFoundError(reservation_id)
+        return self.__reservation_shards[reservation_id]
+
+    def create_reservations(
+        self, requests: Sequence[ReservationRequest]
+    ) -> List[Tuple[bool, Any]]:
+        """
+        Creates a batch of reservations on all shards in parallel.
+
+        Args:
+            requests (Sequence[ReservationRequest]): Reservation requests.
+
+        Returns:
+            List[Tuple[bool, Any]]: One (True, ReservationReceipt) or (False, Exception) per
+                request, in the order of the requests.
+        """
+        self.__ensure_running()
+
+        # A customer gets at most one request per round, so every request is priced with the
+        # reservations created by the earlier requests of the customer
+        results: List[Optional[Tuple[bool, Any]]] = [None] * len(requests)
+        pending = list(enumerate(requests))
+        while pending:
+            current, later, customers = [], [], set()
+            for position, request in pending:
+                if request.customer_id in customers:
+                    later.append((position, request))
+                else:
+                    customers.add(request.customer_id)
+                    current.append((position, request))
+            self.__create_round(current, results)
+            pending = later
+
+        return results
+
+    def __create_round(
+        self,
+        requests: List[Tuple[int, ReservationRequest]],
+        results: List[Optional[Tuple[bool, Any]]],
+    ) -> None:
+        """Creates reservations of different customers on all shards in parallel"""
+        # Split the round by shard, remembering the original positions
+        batches: Dict[int, List[ReservationRequest]] = {}
+        positions: Dict[int, List[int]] = {}
+        for position, request in requests:
+            shard = self.__router.shard_for(request.pickup_branch_id)
+            batches.setdefault(shard, []).append(request)
+            positions.setdefault(shard, []).append(position)
+
+        # Send every batch first so all shards work at the same time, then collect
+        for shard, batch in batches.items():
+            counts = [
+                self.__reservation_counts.get(request.customer_id) for request in batch
+            ]
+            self.__connections[shard].send(("create_reservations", (batch, counts)))
+
+        # Every reply is read before an error is raised, so no shard keeps a stale reply
+        error: Optional[Exception] = None
+        for shard, batch in batches.items():
+            ok, shard_results = self.__connections[shard].recv()
+            if not ok:
+                error = error or shard_results
+                continue
+            for position, request, result in zip(
+                positions[shard], batch, shard_results
+            ):
+                results[position] = result
+                if result[0]:
+                    self.__reservation_shards[result[1].reservation_id] = shard
+                    if request.customer_id in self.__reservation_counts:
+                        self.__reservation_counts[request.customer_id] += 1
+        if error is not None:
+            raise error
+
+    def create_reservation(self, request: ReservationRequest) -> ReservationReceipt:
+        """Creates one reservation and raises the error of the shard if it fails."""
+        ok, result = self.create_reservations([request])[0]
+        if not ok:
+            raise result
+        return result
+
+    def approve_reservation(self, reservation_id: str) -> ReservationReceipt:
+        """Approves a reservation by an agent of its pickup branch."""
+        shard = self.__reservation_shard(reservation_id)
+        return self.__call(shard, "approve_reservation", reservation_id)
+
+    def pay_reservation(
+        self, reservation_id: str, card_number: str, cvv: str, expiry: str
+    ) -> str:
+        """Pays a reservation by credit card."""
+        shard = self.__reservation_shard(reservation_id)
+        return self.__call(
+            shard, "pay_reservation", reservation_id, card_number, cvv, expiry
+        )
+
+    def pickup_vehicle(self, reservation_id: str) -> ReservationReceipt:
+        """Picks up the vehicle of a reservation."""
+        shard = self.__reservation_shard(reservation_id)
+        return self.__call(shard, "pickup_vehicle", reservation_id)
+
+    def cancel_reservation(self, reservation_id: str) -> ReservationReceipt:
+        """Cancels a reservation."""
+        shard = self.__reservation_shard(reservation_id)
+        return self.__call(shard, "cancel_reservation", reservation_id)
+
+    def return_vehicle(self, reservation_id: str) -> ReturnResult:
+        """
+        Returns the vehicle of a reservation.
+
+        For one-way rentals whose return branch is on another shard, the vehicle is handed off
+        from the pickup shard to the shard of the return branch.
+        """
+        shard = self.__reservation_shard(reservation_id)
+        result = self.__call(shard, "return_vehicle", reservation_id)
+
+        if result.handoff is not None:
+            destination = self.__router.shard_for(result.handoff.destination_branch_id)
+            self.__call(destination, "adopt_vehicle", result.handoff)
+
+        return result
+
+    def shard_stats(self) -> List[Dict[str, int]]:
+        """Returns number of objects owned by every shard."""
+        return [
+            self.__call(shard, "stats") for shard in range(self.__router.shard_count)
+        ]
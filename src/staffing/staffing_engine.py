@@ -0,0 +1,331 @@
+"""
+This module implements the on-duty staffing engine.
+Work schedules of employees are compiled into weekly bitmaps with one bit per 15-minute slot, and
+the bitmaps of the whole workforce are stored in one NumPy matrix grouped by branch. Staffing
+questions are answered with bitwise operations and vectorized sums over that matrix.
+
+Business Logic:
+    - A week has 7 * 96 = 672 slots starting Monday 00:00, a slot is on duty if the employee works
+      during the whole 15 minutes.
+    - Schedules come from Employee.get_work_schedule(). They only depend on the class and the
+      employment type of an employee, so every distinct schedule is compiled once.
+    - Inactive employees are never on duty.
+    - A coverage gap is a slot inside the branch opening hours with fewer on-duty employees than
+      required.
+    - The engine is a snapshot of the workforce, refresh() rebuilds it after employees changed.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.users.employee import Employee
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+# Bitmaps are padded to whole 64-bit words
+WORDS_PER_WEEK = -(-SLOTS_PER_WEEK // 64)
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint16)
+
+# Compiled bitmaps by employee class and employment type
+_compiled_schedules: Dict[Tuple[type, str], np.ndarray] = {}
+
+BRANCH_OPENING_HOURS = {
+    "monday": "09:00-18:00",
+    "tuesday": "09:00-18:00",
+    "wednesday": "09:00-18:00",
+    "thursday": "09:00-18:00",
+    "friday": "09:00-18:00",
+    "saturday": "10:00-15:00",
+    "sunday": "off",
+}
+
+
+def slot_of(moment: datetime) -> int:
+    """Returns the weekly slot of a moment"""
+    return (
+        moment.weekday() * SLOTS_PER_DAY
+        + (moment.hour * 60 + moment.minute) // SLOT_MINUTES
+    )
+
+
+def _minutes(clock_time: str) -> int:
+    """Converts "HH:MM" into minutes after midnight"""
+    hours, minutes = clock_time.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def compile_schedule(schedule: Dict[str, str]) -> np.ndarray:
+    """
+    Compiles a weekly schedule such as {"monday": "09:00-17:00", "sunday": "off"} into slots.
+    Keys which are not weekdays, such as "hours_per_week", are ignored.
+
+    Args:
+        schedule (Dict[str, str]): Working hours per weekday, "off" or a missing day is not worked.
+
+    Returns:
+        np.ndarray: Boolean array with one entry per weekly slot.
+
+    Raises:
+        ValueError: If working hours are not in the "HH:MM-HH:MM" format or end before they start.
+    """
+    slots = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+    for day_index, day in enumerate(WEEKDAYS):
+        hours = schedule.get(day, "off").strip().lower()
+        if hours == "off":
+            continue
+        try:
+            start, end = (_minutes(part) for part in hours.split("-"))
+        except ValueError:
+            raise ValueError(f"Invalid working hours '{hours}' on {day}")
+        if not 0 <= start < end <= 24 * 60:
+            raise ValueError(f"Invalid working hours '{hours}' on {day}")
+
+        first = day_index * SLOTS_PER_DAY + -(-start // SLOT_MINUTES)
+        last = day_index * SLOTS_PER_DAY + end // SLOT_MINUTES
+        slots[first:last] = True
+    return slots
+
+
+def pack_slots(slots: np.ndarray) -> np.ndarray:
+    """Packs boolean slots into little-endian 64-bit words, slot i is bit i % 64 of word i // 64"""
+    packed = np.zeros(WORDS_PER_WEEK * 8, dtype=np.uint8)
+    packed[: -(-SLOTS_PER_WEEK // 8)] = np.packbits(slots, bitorder="little")
+    return packed.view("<u8")
+
+
+def unpack_slots(bitmaps: np.ndarray) -> np.ndarray:
+    """Unpacks a matrix of bitmaps into one 0/1 column per slot"""
+    as_bytes = np.ascontiguousarray(bitmaps, dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=-1, bitorder="little")[..., :SLOTS_PER_WEEK]
+
+
+def schedule_bitmap(employee: "Employee") -> np.ndarray:
+    """Returns the read-only weekly bitmap of an employee's work schedule"""
+    key = (type(employee), employee.employment_type)
+    bitmap = _compiled_schedules.get(key)
+    if bitmap is None:
+        bitmap = pack_slots(compile_schedule(employee.get_work_schedule()))
+        bitmap.flags.writeable = False
+        _compiled_schedules[key] = bitmap
+    return bitmap
+
+
+class StaffingEngine:
+    """
+    Concrete class answering staffing questions for the employees of a set of branches.
+
+    Args:
+        branches (Iterable[Branch]): Branches whose employees are tracked.
+        opening_hours (Dict[str, str]): Opening hours of the branches, used for coverage gaps.
+    """
+
+    def __init__(
+        self,
+        branches: Iterable["Branch"],
+        opening_hours: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Constructor method for StaffingEngine class"""
+        self.__branches = list(branches)
+        self.__opening_slots = compile_schedule(opening_hours or BRANCH_OPENING_HOURS)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuilds the bitmaps and the coverage matrix from the current employees"""
+        employees: List["Employee"] = []
+        offsets = [0]
+        for branch in self.__branches:
+            employees.extend(branch.employees)
+            offsets.append(len(employees))
+
+        self.__employees = employees
+        self.__branch_rows = {
+            branch.id: slice(start, stop)
+            for branch, start, stop in zip(self.__branches, offsets, offsets[1:])
+        }
+        self.__roles = np.array(
+            [employee.get_role() for employee in employees], dtype=object
+        )
+        self.__active = np.fromiter(
+            (employee.is_active for employee in employees),
+            dtype=bool,
+            count=len(employees),
+        )
+
+        bitmaps = np.zeros((len(employees), WORDS_PER_WEEK), dtype="<u8")
+        if employees:
+            bitmaps[:] = [schedule_bitmap(employee) for employee in employees]
+        # Inactive employees are kept but never on duty
+        bitmaps[~self.__active] = 0
+        self.__bitmaps = bitmaps
+
+        # On-duty employees per branch and slot, for every role and for each role
+        slots = unpack_slots(bitmaps)
+        self.__coverage: Dict[Optional[str], np.ndarray] = {}
+        for role in [None] + sorted(set(self.__roles.tolist())):
+            selected = (
+                slots if role is None else slots * (self.__roles == role)[:, None]
+            )
+            self.__coverage[role] = (
+                np.stack(
+                    [
+                        selected[rows].sum(axis=0, dtype=np.int32)
+                        for rows in self.__branch_rows.values()
+                    ]
+                )
+                if self.__branches
+                else np.zeros((0, SLOTS_PER_WEEK), dtype=np.int32)
+            )
+
+    @property
+    def employees(self) -> List["Employee"]:
+        """Getter for employees property, in the row order of the bitmaps."""
+        return self.__employees.copy()
+
+    @property
+    def bitmaps(self) -> np.ndarray:
+        """Getter for bitmaps property, a read-only (employees, WORDS_PER_WEEK) uint64 matrix."""
+        view = self.__bitmaps.view()
+        view.flags.writeable = False
+        return view
+
+    def __rows(self, branch_id: Optional[str]) -> slice:
+        """Returns the bitmap rows of a branch, all rows for None"""
+        if branch_id is None:
+            return slice(0, len(self.__employees))
+        rows = self.__branch_rows.get(branch_id)
+        if rows is None:
+            raise ValueError(
+                f"Branch {branch_id} is not tracked by the staffing engine"
+            )
+        return rows
+
+    def on_shift(
+        self,
+        moment: Optional[datetime] = None,
+        branch_id: Optional[str] = None,
+        role: Optional[str] = None,
+    ) -> List["Employee"]:
+        """
+        Returns the employees on duty at a moment.
+
+        Args:
+            moment (Optional[datetime]): The moment, now by default.
+            branch_id (Optional[str]): Only employees of this branch, all branches by default.
+            role (Optional[str]): Only employees with this role, such as "agent".
+
+        Raises:
+            ValueError: If the branch is not tracked.
+        """
+        slot = slot_of(moment or datetime.now())
+        rows = self.__rows(branch_id)
+        word = self.__bitmaps[rows, slot // 64]
+        on_duty = (word >> np.uint64(slot % 64)) & np.uint64(1) == 1
+        if role is not None:
+            on_duty &= self.__roles[rows] == role
+        start = rows.start
+        return [
+            self.__employees[start + index]
+            for index in np.flatnonzero(on_duty).tolist()
+        ]
+
+    def hours_per_week(self, branch_id: Optional[str] = None) -> Dict[str, float]:
+        """
+        Returns scheduled hours per week by employee id, 0 for inactive employees.
+
+        Raises:
+            ValueError: If the branch is not tracked.
+        """
+        rows = self.__rows(branch_id)
+        as_bytes = self.__bitmaps[rows].view(np.uint8)
+        slot_counts = _POPCOUNT[as_bytes].sum(axis=1)
+        hours = slot_counts * (SLOT_MINUTES / 60)
+        return {
+            employee.id: value
+            for employee, value in zip(self.__employees[rows], hours.tolist())
+        }
+
+    def coverage_matrix(
+        self, role: Optional[str] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Returns branch ids and a read-only (branches, SLOTS_PER_WEEK) matrix of on-duty employees.
+
+        Args:
+            role (Optional[str]): Only count employees with this role.
+        """
+        coverage = self.__coverage.get(role)
+        if coverage is None:
+            coverage = np.zeros((len(self.__branches), SLOTS_PER_WEEK), dtype=np.int32)
+        view = coverage.view()
+        view.flags.writeable = False
+        return list(self.__branch_rows), view
+
+    def coverage_gaps(
+        self,
+        branch_id: str,
+        start: Optional[date] = None,
+        days: int = 7,
+        required: int = 1,
+        role: Optional[str] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Returns the periods inside opening hours with fewer than required on-duty employees.
+
+        Args:
+            branch_id (str): The branch.
+            start (Optional[date]): First day, tomorrow by default.
+            days (int): Number of days from start.
+            required (int): Minimum number of on-duty employees.
+            role (Optional[str]): Only count employees with this role, such as "agent".
+
+        Returns:
+            List[Tuple[datetime, datetime]]: Start and end of every gap, in time order.
+
+        Raises:
+            ValueError: If the branch is not tracked or days is not positive.
+        """
+        if days <= 0:
+            raise ValueError("days must be positive")
+        branch_ids, coverage = self.coverage_matrix(role)
+        if branch_id not in self.__branch_rows:
+            raise ValueError(
+                f"Branch {branch_id} is not tracked by the staffing engine"
+            )
+        start = start or date.today() + timedelta(days=1)
+
+        weekly_gaps = self.__opening_slots & (
+            coverage[branch_ids.index(branch_id)] < required
+        )
+        # Lay the weekly pattern over the requested days, starting at the weekday of start
+        first_slot = start.weekday() * SLOTS_PER_DAY
+        slots = np.resize(np.roll(weekly_gaps, -first_slot), days * SLOTS_PER_DAY)
+
+        edges = np.flatnonzero(
+            np.diff(np.concatenate(([0], slots.astype(np.int8), [0])))
+        )
+        origin = datetime.combine(start, datetime.min.time())
+        step = timedelta(minutes=SLOT_MINUTES)
+        return [
+            (origin + begin * step, origin + end * step)
+            for begin, end in zip(edges[::2].tolist(), edges[1::2].tolist())
+        ]
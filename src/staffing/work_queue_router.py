@@ -0,0 +1,336 @@
+"""
+This module implements the work-queue router which distributes pending reservations to agents.
+Every pickup branch has a priority queue of pending reservations and a heap of its active agents
+ordered by workload, so assigning a reservation to the least-loaded agent takes logarithmic time.
+
+Business Logic:
+    - Reservations are queued by pickup date, then by the time they were submitted.
+    - Only PENDING reservations can be submitted. Reservations which are no longer PENDING when
+      they reach the head of the queue, for example cancelled ones, are dropped.
+    - A reservation is assigned to the active agent of its pickup branch with the fewest
+      assigned and not yet acknowledged reservations. With a staffing engine, only agents on
+      shift are eligible.
+    - Acknowledging an assignment lets the agent approve the reservation and frees the agent,
+      releasing it puts the reservation back into the queue with its original priority.
+    - Queue depth, in-flight assignments and the wait between submission and assignment are
+      reported per branch.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import heapq
+import threading
+import time
+from itertools import count
+from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from src.enums import ReservationStatus
+from src.custom_errors import ReservationNotFoundError
+from src.instrumentation.histogram import LatencyHistogram
+
+if TYPE_CHECKING:
+    from src.branch.branch import Branch
+    from src.users.agent import Agent
+    from src.reservation.reservation import Reservation
+    from src.staffing.staffing_engine import StaffingEngine
+
+
+class Assignment(NamedTuple):
+    """A reservation handed out to an agent"""
+
+    reservation: "Reservation"
+    agent: "Agent"
+    submitted_at: int  # Clock value in nanoseconds
+    assigned_at: int
+
+
+# Priority of a queued reservation: pickup date ordinal, submission time and sequence number
+_QueueEntry = Tuple[int, int, int, "Reservation"]
+
+
+class _BranchQueue:
+    """Pending reservations, agents and metrics of one pickup branch"""
+
+    __slots__ = (
+        "pending",
+        "agents",
+        "agent_heap",
+        "loads",
+        "in_flight",
+        "wait_times",
+        "assigned",
+        "acknowledged",
+        "dropped",
+    )
+
+    def __init__(self) -> None:
+        self.pending: List[_QueueEntry] = []
+        self.agents: Dict[str, "Agent"] = {}
+        # (load, sequence, agent id), entries with an outdated load are skipped
+        self.agent_heap: List[Tuple[int, int, str]] = []
+        self.loads: Dict[str, int] = {}
+        self.in_flight = 0
+        self.wait_times = LatencyHistogram()
+        self.assigned = 0
+        self.acknowledged = 0
+        self.dropped = 0
+
+
+class WorkQueueRouter:
+    """
+    Concrete class routing pending reservations to the agents of their pickup branch.
+
+    Args:
+        staffing_engine (Optional[StaffingEngine]): If given, only agents on shift get assignments.
+        clock (Callable[[], int]): Monotonic clock in nanoseconds, used for wait times.
+    """
+
+    def __init__(
+        self,
+        staffing_engine: Optional["StaffingEngine"] = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        """Constructor method for WorkQueueRouter class"""
+        self.__staffing_engine = staffing_engine
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__sequence = count()
+        self.__branches: Dict[str, _BranchQueue] = {}
+        self.__queued: Dict[str, _QueueEntry] = {}
+        self.__assignments: Dict[str, Tuple[Assignment, _QueueEntry]] = {}
+
+    def __branch(self, branch_id: str) -> _BranchQueue:
+        """Returns the queue of a branch, creating it on first use"""
+        queue = self.__branches.get(branch_id)
+        if queue is None:
+            queue = self.__branches[branch_id] = _BranchQueue()
+        return queue
+
+    def submit(self, reservation: "Reservation") -> None:
+        """
+        Queues a pending reservation at its pickup branch.
+
+        Raises:
+            ValueError: If the reservation is not PENDING or is already queued or assigned.
+        """
+        self.submit_many([reservation])
+
+    def submit_many(self, reservations: Iterable["Reservation"]) -> int:
+        """
+        Queues pending reservations at their pickup branches.
+
+        Returns:
+            int: Number of queued reservations.
+
+        Raises:
+            ValueError: If a reservation is not PENDING or is already queued or assigned.
+        """
+        now = self.__clock()
+        submitted = 0
+        with self.__lock:
+            for reservation in reservations:
+                if reservation.status != ReservationStatus.PENDING.value:
+                    raise ValueError("Only pending reservations can be routed.")
+                if (
+                    reservation.id in self.__queued
+                    or reservation.id in self.__assignments
+                ):
+                    raise ValueError("Reservation is already routed.")
+
+                entry = (
+                    reservation.pickup_date.toordinal(),
+                    now,
+                    next(self.__sequence),
+                    reservation,
+                )
+                heapq.heappush(
+                    self.__branch(reservation.pickup_branch.id).pending, entry
+                )
+                self.__queued[reservation.id] = entry
+                submitted += 1
+        return submitted
+
+    def refresh_agents(self, branch: "Branch") -> None:
+        """Adds the active agents of a branch, call it after agents joined or became active"""
+        with self.__lock:
+            queue = self.__branch(branch.id)
+            for agent in branch.get_employees_by_role("agent"):
+                if not agent.is_active or agent.id in queue.agents:
+                    continue
+                queue.agents[agent.id] = agent
+                self.__set_load(queue, agent.id, queue.loads.get(agent.id, 0))
+
+    def __pop_agent(
+        self, branch_id: str, queue: _BranchQueue, on_shift: Optional[set]
+    ) -> Optional["Agent"]:
+        """Removes and returns the least-loaded eligible agent, None if there is none"""
+        off_shift = []
+        agent = None
+        while queue.agent_heap:
+            load, sequence, agent_id = heapq.heappop(queue.agent_heap)
+            candidate = queue.agents.get(agent_id)
+            if candidate is None or queue.loads[agent_id] != load:
+                continue  # Outdated entry
+            if not candidate.is_active or candidate.branch.id != branch_id:
+                # Inactive or moved agents come back with refresh_agents
+                del queue.agents[agent_id]
+                continue
+            if on_shift is not None and agent_id not in on_shift:
+                off_shift.append((load, sequence, agent_id))
+                continue
+            agent = candidate
+            break
+        for entry in off_shift:
+            heapq.heappush(queue.agent_heap, entry)
+        return agent
+
+    def __set_load(self, queue: _BranchQueue, agent_id: str, load: int) -> None:
+        """Changes the load of an agent and pushes its new heap entry"""
+        queue.loads[agent_id] = load
+        if agent_id in queue.agents:
+            heapq.heappush(queue.agent_heap, (load, next(self.__sequence), agent_id))
+
+    def assign(
+        self,
+        branch: "Branch",
+        limit: Optional[int] = None,
+        moment: Optional[datetime] = None,
+    ) -> List[Assignment]:
+        """
+        Hands out queued reservations of a branch to its least-loaded eligible agents.
+
+        Args:
+            branch (Branch): The pickup branch.
+            limit (Optional[int]): Maximum number of assignments, all queued reservations by default.
+            moment (Optional[datetime]): Moment for the on-shift check of the staffing engine.
+
+        Returns:
+            List[Assignment]: The new assignments in priority order. Fewer than limit if the queue
+                ran empty or no agent is eligible.
+        """
+        if branch.id not in self.__branches or not self.__branches[branch.id].agents:
+            self.refresh_agents(branch)
+
+        on_shift = None
+        if self.__staffing_engine is not None:
+            on_shift = {
+                agent.id
+                for agent in self.__staffing_engine.on_shift(moment, branch.id, "agent")
+            }
+
+        now = self.__clock()
+        assignments = []
+        with self.__lock:
+            queue = self.__branch(branch.id)
+            while queue.pending and (limit is None or len(assignments) < limit):
+                entry = queue.pending[0]
+                reservation = entry[3]
+                if reservation.status != ReservationStatus.PENDING.value:
+                    heapq.heappop(queue.pending)
+                    del self.__queued[reservation.id]
+                    queue.dropped += 1
+                    continue
+
+                agent = self.__pop_agent(branch.id, queue, on_shift)
+                if agent is None:
+                    break
+
+                heapq.heappop(queue.pending)
+                del self.__queued[reservation.id]
+                self.__set_load(queue, agent.id, queue.loads[agent.id] + 1)
+                assignment = Assignment(reservation, agent, entry[1], now)
+                self.__assignments[reservation.id] = (assignment, entry)
+                queue.in_flight += 1
+                queue.assigned += 1
+                queue.wait_times.record(now - entry[1])
+                assignments.append(assignment)
+        return assignments
+
+    def __finish(
+        self, reservation_id: str
+    ) -> Tuple[Assignment, _QueueEntry, _BranchQueue]:
+        """Removes an assignment and frees its agent"""
+        routed = self.__assignments.pop(reservation_id, None)
+        if routed is None:
+            raise ReservationNotFoundError(reservation_id)
+        assignment, entry = routed
+        queue = self.__branch(assignment.reservation.pickup_branch.id)
+        self.__set_load(
+            queue, assignment.agent.id, queue.loads[assignment.agent.id] - 1
+        )
+        queue.in_flight -= 1
+        return assignment, entry, queue
+
+    def acknowledge(self, reservation_id: str) -> "Reservation":
+        """
+        Completes an assignment: the agent approves the reservation and becomes available again.
+        The agent cancels the reservation instead if its vehicle is not available.
+
+        Raises:
+            ReservationNotFoundError: If the reservation is not assigned.
+        """
+        with self.__lock:
+            assignment, _, queue = self.__finish(reservation_id)
+            queue.acknowledged += 1
+        assignment.agent.approve_reservation(assignment.reservation)
+        return assignment.reservation
+
+    def release(self, reservation_id: str) -> None:
+        """
+        Gives an assignment back, the reservation is queued again with its original priority.
+
+        Raises:
+            ReservationNotFoundError: If the reservation is not assigned.
+        """
+        with self.__lock:
+            _, entry, queue = self.__finish(reservation_id)
+            heapq.heappush(queue.pending, entry)
+            self.__queued[reservation_id] = entry
+
+    def assignments_of(self, agent: "Agent") -> List[Assignment]:
+        """Returns the open assignments of an agent"""
+        with self.__lock:
+            return [
+                assignment
+                for assignment, _ in self.__assignments.values()
+                if assignment.agent is agent
+            ]
+
+    def queue_depth(self, branch_id: Optional[str] = None) -> int:
+        """Returns the number of queued reservations of a branch, of all branches by default"""
+        if branch_id is None:
+            return len(self.__queued)
+        queue = self.__branches.get(branch_id)
+        return 0 if queue is None else len(queue.pending)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns queue depth, in-flight assignments, counters and wait times in seconds per branch.
+        Queue depth includes reservations which are dropped when they reach the head of the queue.
+        """
+        with self.__lock:
+            return {
+                branch_id: {
+                    "queue_depth": len(queue.pending),
+                    "in_flight": queue.in_flight,
+                    "agents": len(queue.agents),
+                    "assigned": queue.assigned,
+                    "acknowledged": queue.acknowledged,
+                    "dropped": queue.dropped,
+                    "wait_p50_seconds": queue.wait_times.percentile(50) / 1e9,
+                    "wait_p99_seconds": queue.wait_times.percentile(99) / 1e9,
+                    "wait_max_seconds": queue.wait_times.max / 1e9,
+                }
+                for branch_id, queue in self.__branches.items()
+            }
@@ -10,6 +10,7 @@ from datetime import date
 from typing import Any, Optional, TYPE_CHECKING
 
 from src.users.employee import Employee
+from src.instrumentation.metrics import instrumented
 from src.enums import Gender, EmploymentType, VehicleStatus, ReservationStatus
 
 if TYPE_CHECKING:
@@ -118,6 +119,7 @@ class Agent(Employee):
         from src.vehicle.maintenance_record import MaintenanceRecord
         vehicle.add_maintenance_record(MaintenanceRecord(vehicle=vehicle, note=note))
 
+    @instrumented("agent", "approve_reservation")
     def approve_reservation(self, reservation: "Reservation") -> None:
         """
         Approves the reservation if a car is ready for the user to pick up the car
@@ -167,7 +169,9 @@ class Agent(Employee):
         Return work schedule details including hours and shift patterns.
         Schedules differ by employment type and role.
         """
-        if self.employment_type == EmploymentType.FULL_TIME:
+        # The employment_type getter returns the enum value
+        employment_type = EmploymentType(self.employment_type)
+        if employment_type == EmploymentType.FULL_TIME:
             return {
                 "hours_per_week": "40",
                 "monday": "09:00-17:00",
@@ -178,7 +182,7 @@ class Agent(Employee):
                 "saturday": "off",
                 "sunday": "off",
             }
-        elif self.employment_type == EmploymentType.PART_TIME:
+        elif employment_type == EmploymentType.PART_TIME:
             return {
                 "hours_per_week": "20",
                 "monday": "09:00-13:00",
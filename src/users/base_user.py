@@ -6,6 +6,9 @@ Business Rules:
     - id is auto-generated
     - Users must be at least 18 years old
     - Gender and ID are immutable once set
+    - Change listeners are notified after the name, email or phone number changed. A listener can
+      reject the change by raising, the old value is then restored. Listeners are local to the
+      process and are not pickled with the user.
 
 Author: Peyman Khodabandehlouei
 Date: 30-10-2025
@@ -14,11 +17,13 @@ Date: 30-10-2025
 import uuid
 from datetime import date
 from abc import ABC, abstractmethod
+from typing import Any, Callable
 
 from src.enums import Gender
+from src.change_notifier import ChangeNotifier
 
 
-class BaseUser(ABC):
+class BaseUser(ChangeNotifier, ABC):
     """
     Abstract base class representing a user in the application.
     This class is abstract and is not directly initialized, it provides common attributes for a person.
@@ -93,6 +98,11 @@ class BaseUser(ABC):
         self.__email = email
         self.__address = address
         self.__phone_number = phone_number
+        ChangeNotifier.__init__(self)
+
+    def __undo(self, field_name: str, old_value: Any) -> Callable[[], None]:
+        """Returns a callback restoring the old value of a field if a listener rejects the change"""
+        return lambda: setattr(self, f"_BaseUser__{field_name}", old_value)
 
     @property
     def id(self) -> str:
@@ -118,7 +128,8 @@ class BaseUser(ABC):
             raise ValueError("First name cannot be empty.")
 
         # Business logic
-        self.__first_name = new_value
+        old_value, self.__first_name = self.__first_name, new_value
+        self._publish_change("first_name", self.__undo("first_name", old_value))
 
     @property
     def last_name(self) -> str:
@@ -135,7 +146,8 @@ class BaseUser(ABC):
             raise ValueError("Last name cannot be empty.")
 
         # Business logic
-        self.__last_name = new_value
+        old_value, self.__last_name = self.__last_name, new_value
+        self._publish_change("last_name", self.__undo("last_name", old_value))
 
     @property
     def gender(self) -> Gender:
@@ -197,7 +209,8 @@ class BaseUser(ABC):
             raise ValueError("Email must be a valid email address.")
 
         # Business logic
-        self.__email = new_value
+        old_value, self.__email = self.__email, new_value
+        self._publish_change("email", self.__undo("email", old_value))
 
     @property
     def address(self) -> str:
@@ -231,7 +244,8 @@ class BaseUser(ABC):
             raise ValueError("Phone number cannot be empty.")
 
         # Business logic
-        self.__phone_number = new_value
+        old_value, self.__phone_number = self.__phone_number, new_value
+        self._publish_change("phone_number", self.__undo("phone_number", old_value))
 
     @abstractmethod
     def get_role(self) -> str:
@@ -5,6 +5,10 @@ It is a concrete class and can directly initialize in the app.
 Business Logic:
     - id is autogenerated and cannot be edited.
     - Customer can pay only for approved reservations.
+    - Closed reservations may be detached to the reservation archive, they are still counted and
+      returned by get_reservations.
+    - Reservations held by other shards of a sharded runtime are counted through
+      remote_reservation_count, so pricing strategies see every reservation of the customer.
 
 Author: Peyman Khodabandehlouei
 Date: 30-10-2025
@@ -14,6 +18,7 @@ from datetime import date
 from typing import Any, Optional, List, TYPE_CHECKING
 
 from src.users.base_user import BaseUser
+from src.instrumentation.metrics import instrumented
 from src.enums import Gender, ReservationStatus, VehicleStatus, InvoiceStatus
 from src.custom_errors import (
     VehicleNotAvailableError,
@@ -90,16 +95,96 @@ class Customer(BaseUser):
 
         # Assign reservations
         self.__reservations = reservations
+        self.__remote_reservation_count = 0
 
     @property
     def reservations(self) -> List["Reservation"]:
         """Getter method for reservations."""
         return self.__reservations
 
-    def get_reservations(self) -> List["Reservation"]:
-        """Returns all reservations created by the customer"""
-        return self.__reservations
+    @property
+    def reservation_count(self) -> int:
+        """Getter for reservation_count property, including archived reservations"""
+        from src.serialization.reservation_archive import get_reservation_archive
+
+        archive = get_reservation_archive()
+        archived = 0 if archive is None else archive.count(self.id)
+        return archived + len(self.__reservations) + self.__remote_reservation_count
+
+    @property
+    def remote_reservation_count(self) -> int:
+        """Getter for remote_reservation_count property, reservations held by other shards"""
+        return self.__remote_reservation_count
+
+    @remote_reservation_count.setter
+    def remote_reservation_count(self, count: int) -> None:
+        """Setter method for remote_reservation_count property."""
+        if isinstance(count, bool) or not isinstance(count, int):
+            raise TypeError("remote_reservation_count must be an integer.")
+        if count < 0:
+            raise ValueError("remote_reservation_count cannot be negative.")
+        self.__remote_reservation_count = count
+
+    def get_reservations(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List["Reservation"]:
+        """
+        Returns all reservations created by the customer, archived reservations are read from the
+        active reservation archive.
+
+        Args:
+            start_date (Optional[date]): First pickup date to include.
+            end_date (Optional[date]): Last pickup date to include.
 
+        Returns:
+            List[Reservation]: Archived reservations ordered by pickup date, then the reservations
+                in memory.
+        """
+        from src.serialization.reservation_archive import get_reservation_archive
+
+        archive = get_reservation_archive()
+        archived = (
+            []
+            if archive is None
+            else archive.reservations_of(self, start_date, end_date)
+        )
+        if start_date is None and end_date is None:
+            return archived + self.__reservations
+        return archived + [
+            reservation
+            for reservation in self.__reservations
+            if (start_date is None or reservation.pickup_date >= start_date)
+            and (end_date is None or reservation.pickup_date <= end_date)
+        ]
+
+    def detach_reservations(self, reservations: List["Reservation"]) -> None:
+        """
+        Removes closed reservations from the reservations in memory, the reservation archive
+        detaches them after storing them.
+
+        Args:
+            reservations (List[Reservation]): Cancelled or completed reservations of the customer.
+
+        Raises:
+            ValueError: If a reservation is open or not a reservation of the customer.
+        """
+        closed = (ReservationStatus.CANCELLED.value, ReservationStatus.COMPLETED.value)
+        detached = set()
+        for reservation in reservations:
+            if reservation.status not in closed:
+                raise ValueError("Only closed reservations can be detached.")
+            detached.add(id(reservation))
+        remaining = [
+            reservation
+            for reservation in self.__reservations
+            if id(reservation) not in detached
+        ]
+        if len(self.__reservations) - len(remaining) != len(detached):
+            raise ValueError("Reservation with the given ID is not found.")
+        # Change the list in place, the reservations getter returns it
+        self.__reservations[:] = remaining
+
+    @instrumented("reservation", "create_reservation")
     def create_reservation(
         self,
         vehicle: "Vehicle",
@@ -128,27 +213,38 @@ class Customer(BaseUser):
         Raises:
             TypeError: If any parameter has an incorrect type.
             ValueError: If dates violate business constraints.
+            VehicleNotAvailableError: If the vehicle is not available or another customer
+                reserved it concurrently.
+            AddOnUnavailableError: If an add-on is out of stock at the pickup branch.
         """
         from src.reservation.reservation import Reservation
 
-        if vehicle.status != VehicleStatus.AVAILABLE.value:
+        # Change vehicle status to RESERVED in one atomic step, so concurrent requests
+        # for the same vehicle cannot both pass the availability check
+        if not vehicle.compare_and_set_status(
+            VehicleStatus.AVAILABLE, VehicleStatus.RESERVED
+        ):
             raise VehicleNotAvailableError("This car is already reserved.")
 
-        # Change vehicle status to RESERVED
-        vehicle.reserve()
-
         # Create new reservation with PENDING status
-        new_reservation = Reservation(
-            status=ReservationStatus.PENDING,
-            creator=self,
-            vehicle=vehicle,
-            insurance_tier=insurance_tier,
-            pickup_branch=pickup_branch,
-            return_branch=return_branch,
-            pickup_date=pickup_date,
-            return_date=return_date,
-            add_ons=add_ons,
-        )
+        try:
+            new_reservation = Reservation(
+                status=ReservationStatus.PENDING,
+                creator=self,
+                vehicle=vehicle,
+                insurance_tier=insurance_tier,
+                pickup_branch=pickup_branch,
+                return_branch=return_branch,
+                pickup_date=pickup_date,
+                return_date=return_date,
+                add_ons=add_ons,
+            )
+        except Exception:
+            # Release the vehicle if the reservation is rejected
+            vehicle.compare_and_set_status(
+                VehicleStatus.RESERVED, VehicleStatus.AVAILABLE
+            )
+            raise
 
         # Add to customer's reservations
         self.__reservations.append(new_reservation)
@@ -187,18 +283,28 @@ class Customer(BaseUser):
         if reservation is None:
             raise ValueError("Reservation with the given ID is not found.")
 
+        # Take a snapshot of the reservation state
+        version = reservation.version
+        status = ReservationStatus(reservation.status)
+
         # Check if reservation can be canceled
-        if reservation.status == ReservationStatus.CANCELLED.value:
-            raise InvalidReservationStatusForCancellationError(reservation.status)
-        if reservation.status == ReservationStatus.COMPLETED.value:
-            raise InvalidReservationStatusForCancellationError(reservation.status)
-        if reservation.status == ReservationStatus.PICKED_UP.value:
+        if status == ReservationStatus.CANCELLED:
+            raise InvalidReservationStatusForCancellationError(status.value)
+        if status == ReservationStatus.COMPLETED:
+            raise InvalidReservationStatusForCancellationError(status.value)
+        if status == ReservationStatus.PICKED_UP:
+            raise InvalidReservationStatusForCancellationError(status.value)
+
+        # Cancel the reservation only if nobody changed it since the snapshot
+        if not reservation.compare_and_set_status(
+            status, ReservationStatus.CANCELLED, expected_version=version
+        ):
             raise InvalidReservationStatusForCancellationError(reservation.status)
 
-        # Cancel the reservation
-        reservation.status = ReservationStatus.CANCELLED
         # Change vehicle status to AVAILABLE
-        reservation.vehicle.status = VehicleStatus.AVAILABLE
+        reservation.vehicle.compare_and_set_status(
+            VehicleStatus.RESERVED, VehicleStatus.AVAILABLE
+        )
 
     def pickup_vehicle(self, reservation_id: str) -> None:
         """
@@ -325,7 +431,9 @@ class Customer(BaseUser):
         )
 
         # Execute payment
-        receipt = credit_card_payment_service.execute_payment(reservation.total_price)
+        receipt = credit_card_payment_service.execute_payment(
+            reservation.total_price_cents
+        )
 
         # Change invoice status
         if "successful" in receipt:
@@ -367,7 +475,9 @@ class Customer(BaseUser):
         )
 
         # Execute payment
-        receipt = credit_card_payment_service.execute_payment(reservation.total_price)
+        receipt = credit_card_payment_service.execute_payment(
+            reservation.total_price_cents
+        )
 
         # Change invoice status
         if "successful" in receipt:
@@ -393,6 +503,7 @@ class Customer(BaseUser):
             "phone_number": self.phone_number,
             "address": self.address,
             "reservations": self.__reservations,
+            "reservation_count": self.reservation_count,
         }
 
     def __str__(self):
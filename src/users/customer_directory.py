@@ -0,0 +1,324 @@
+"""
+This module implements CustomerDirectory class, the lookup structure for front-desk searches.
+Customers are indexed by id, by normalized email and phone number in hash indexes, and by name in
+a sorted index for prefix search. The directory listens to the setters of every customer, so the
+indexes stay correct when a customer changes their name, email or phone number.
+
+Business Logic:
+    - Emails are unique in the directory, compared after stripping spaces and ignoring case.
+    - Phone numbers are compared by their digits only, several customers can share one.
+    - A name prefix matches the start of "first last" or "last first", ignoring case and extra
+      spaces.
+    - Changing the email of a customer to an email of another customer raises
+      DuplicateEmailError and keeps the old email.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from src.custom_errors import DuplicateEmailError
+
+if TYPE_CHECKING:
+    from src.users.customer import Customer
+    from src.users.base_user import BaseUser
+
+# Separates the name from the customer id in name index keys, it sorts before every character
+_SEPARATOR = "\x00"
+# Maximum number of keys in one chunk of the name index
+_CHUNK_SIZE = 512
+
+
+def normalize_email(email: str) -> str:
+    """Returns the email without surrounding spaces in lower case"""
+    return email.strip().casefold()
+
+
+def normalize_phone_number(phone_number: str) -> str:
+    """Returns the digits of a phone number, so "+90 534 394" and "90534394" are equal"""
+    return "".join(character for character in phone_number if character.isdigit())
+
+
+def normalize_name(name: str) -> str:
+    """Returns the name in lower case with single spaces between words"""
+    return " ".join(name.casefold().split())
+
+
+class _SortedKeys:
+    """
+    Sorted list of strings split into chunks, so inserting and removing one key moves at most
+    one chunk instead of the whole list.
+    """
+
+    __slots__ = ("__chunks", "__maxes")
+
+    def __init__(self) -> None:
+        self.__chunks: List[List[str]] = []
+        # Largest key of every chunk
+        self.__maxes: List[str] = []
+
+    def rebuild(self, keys: List[str]) -> None:
+        """Replaces the keys with the given keys"""
+        keys.sort()
+        self.__chunks = [
+            keys[start : start + _CHUNK_SIZE]
+            for start in range(0, len(keys), _CHUNK_SIZE)
+        ]
+        self.__maxes = [chunk[-1] for chunk in self.__chunks]
+
+    def keys(self) -> List[str]:
+        """Returns every key in order"""
+        return [key for chunk in self.__chunks for key in chunk]
+
+    def insert(self, key: str) -> None:
+        if not self.__chunks:
+            self.__chunks.append([key])
+            self.__maxes.append(key)
+            return
+        position = bisect_left(self.__maxes, key)
+        if position == len(self.__maxes):
+            # Larger than every key, goes to the end of the last chunk
+            position -= 1
+            self.__chunks[position].append(key)
+            self.__maxes[position] = key
+        else:
+            chunk = self.__chunks[position]
+            chunk.insert(bisect_left(chunk, key), key)
+        chunk = self.__chunks[position]
+        if len(chunk) > 2 * _CHUNK_SIZE:
+            self.__chunks[position : position + 1] = [
+                chunk[:_CHUNK_SIZE],
+                chunk[_CHUNK_SIZE:],
+            ]
+            self.__maxes[position : position + 1] = [chunk[_CHUNK_SIZE - 1], chunk[-1]]
+
+    def remove(self, key: str) -> None:
+        position = bisect_left(self.__maxes, key)
+        chunk = self.__chunks[position]
+        del chunk[bisect_left(chunk, key)]
+        if not chunk:
+            del self.__chunks[position]
+            del self.__maxes[position]
+        else:
+            self.__maxes[position] = chunk[-1]
+
+    def starting_with(self, prefix: str) -> Iterator[str]:
+        """Yields the keys starting with the prefix in order"""
+        position = bisect_left(self.__maxes, prefix)
+        if position == len(self.__chunks):
+            return
+        chunk = self.__chunks[position]
+        index = bisect_left(chunk, prefix)
+        for chunk in self.__chunks[position:]:
+            for key in chunk[index:]:
+                if not key.startswith(prefix):
+                    return
+                yield key
+            index = 0
+
+
+class CustomerDirectory:
+    """
+    Concrete class representing an indexed directory of customers.
+
+    Args:
+        customers (Optional[Iterable[Customer]]): Initial customers.
+
+    Raises:
+        DuplicateEmailError: If two customers have the same email.
+    """
+
+    def __init__(self, customers: Optional[Iterable["Customer"]] = None) -> None:
+        """Constructor method for CustomerDirectory class"""
+        self.__customers: Dict[str, "Customer"] = {}
+        self.__by_email: Dict[str, "Customer"] = {}
+        self.__by_phone_number: Dict[str, Dict[str, "Customer"]] = {}
+        self.__names = _SortedKeys()
+        # Email, phone number and name keys every customer is indexed under
+        self.__keys: Dict[str, Tuple[str, str, Tuple[str, str]]] = {}
+
+        if customers is not None:
+            self.add_many(customers)
+
+    def __len__(self) -> int:
+        return len(self.__customers)
+
+    def __contains__(self, customer_id: object) -> bool:
+        return customer_id in self.__customers
+
+    @staticmethod
+    def __name_keys(customer: "BaseUser") -> Tuple[str, str]:
+        """Returns the name index keys of a customer"""
+        first_name = normalize_name(customer.first_name)
+        last_name = normalize_name(customer.last_name)
+        return (
+            f"{first_name} {last_name}{_SEPARATOR}{customer.id}",
+            f"{last_name} {first_name}{_SEPARATOR}{customer.id}",
+        )
+
+    def __index(self, customer: "Customer", email: str) -> Tuple[str, str]:
+        """Adds a customer to the hash indexes and returns its name keys"""
+        phone_number = normalize_phone_number(customer.phone_number)
+        name_keys = self.__name_keys(customer)
+        self.__customers[customer.id] = customer
+        self.__by_email[email] = customer
+        self.__by_phone_number.setdefault(phone_number, {})[customer.id] = customer
+        self.__keys[customer.id] = (email, phone_number, name_keys)
+        customer.add_change_listener(self.__on_change)
+        return name_keys
+
+    def __check_email(self, customer: "BaseUser", email: str) -> None:
+        """Raises DuplicateEmailError if another customer has the email"""
+        owner = self.__by_email.get(email)
+        if owner is not None and owner is not customer:
+            raise DuplicateEmailError(customer.email)
+
+    def add(self, customer: "Customer") -> None:
+        """
+        Adds a customer to the directory.
+
+        Raises:
+            TypeError: If customer is not a Customer object.
+            ValueError: If the customer is already in the directory.
+            DuplicateEmailError: If another customer has the same email.
+        """
+        from src.users.customer import Customer
+
+        if not isinstance(customer, Customer):
+            raise TypeError("customer must be a Customer object")
+        if customer.id in self.__customers:
+            raise ValueError("Customer is already in the directory.")
+        email = normalize_email(customer.email)
+        self.__check_email(customer, email)
+
+        for key in self.__index(customer, email):
+            self.__names.insert(key)
+
+    def add_many(self, customers: Iterable["Customer"]) -> int:
+        """
+        Adds customers to the directory, sorting the name index once at the end.
+
+        Returns:
+            int: Number of added customers.
+
+        Raises:
+            TypeError: If a customer is not a Customer object.
+            ValueError: If a customer is already in the directory.
+            DuplicateEmailError: If another customer has the same email. Customers before it
+                are added.
+        """
+        from src.users.customer import Customer
+
+        added = 0
+        names = self.__names.keys()
+        try:
+            for customer in customers:
+                if not isinstance(customer, Customer):
+                    raise TypeError("customer must be a Customer object")
+                if customer.id in self.__customers:
+                    raise ValueError("Customer is already in the directory.")
+                email = normalize_email(customer.email)
+                self.__check_email(customer, email)
+                names.extend(self.__index(customer, email))
+                added += 1
+        finally:
+            self.__names.rebuild(names)
+        return added
+
+    def remove(self, customer_id: str) -> "Customer":
+        """
+        Removes a customer from the directory and returns it.
+
+        Raises:
+            ValueError: If no customer has the given id.
+        """
+        customer = self.__customers.pop(customer_id, None)
+        if customer is None:
+            raise ValueError("Customer with the given ID is not found.")
+        email, phone_number, name_keys = self.__keys.pop(customer_id)
+        del self.__by_email[email]
+        self.__remove_phone_number(phone_number, customer_id)
+        for key in name_keys:
+            self.__names.remove(key)
+        customer.remove_change_listener(self.__on_change)
+        return customer
+
+    def __remove_phone_number(self, phone_number: str, customer_id: str) -> None:
+        customers = self.__by_phone_number[phone_number]
+        del customers[customer_id]
+        if not customers:
+            del self.__by_phone_number[phone_number]
+
+    def __on_change(self, customer: "BaseUser", field_name: str) -> None:
+        """Moves a customer to its new index entries after a setter call"""
+        keys = self.__keys.get(customer.id)
+        if keys is None:
+            return
+        email, phone_number, name_keys = keys
+
+        if field_name == "email":
+            new_email = normalize_email(customer.email)
+            if new_email != email:
+                # Raising makes the setter restore the old email
+                self.__check_email(customer, new_email)
+                del self.__by_email[email]
+                self.__by_email[new_email] = customer
+                email = new_email
+        elif field_name == "phone_number":
+            new_phone_number = normalize_phone_number(customer.phone_number)
+            if new_phone_number != phone_number:
+                self.__remove_phone_number(phone_number, customer.id)
+                self.__by_phone_number.setdefault(new_phone_number, {})[
+                    customer.id
+                ] = customer
+                phone_number = new_phone_number
+        elif field_name in ("first_name", "last_name"):
+            new_name_keys = self.__name_keys(customer)
+            if new_name_keys != name_keys:
+                for key in name_keys:
+                    self.__names.remove(key)
+                for key in new_name_keys:
+                    self.__names.insert(key)
+                name_keys = new_name_keys
+
+        self.__keys[customer.id] = (email, phone_number, name_keys)
+
+    def get(self, customer_id: str) -> Optional["Customer"]:
+        """Returns the customer with the given id, None if it is not in the directory"""
+        return self.__customers.get(customer_id)
+
+    def find_by_email(self, email: str) -> Optional["Customer"]:
+        """Returns the customer with the given email, None if there is none"""
+        return self.__by_email.get(normalize_email(email))
+
+    def find_by_phone_number(self, phone_number: str) -> List["Customer"]:
+        """Returns the customers with the given phone number"""
+        customers = self.__by_phone_number.get(normalize_phone_number(phone_number))
+        return [] if customers is None else list(customers.values())
+
+    def search_by_name(self, prefix: str, limit: int = 20) -> List["Customer"]:
+        """
+        Returns customers whose "first last" or "last first" name starts with the prefix.
+
+        Args:
+            prefix (str): Start of the name, case and extra spaces are ignored.
+            limit (int): Maximum number of customers, in alphabetical order of the matched name.
+
+        Raises:
+            ValueError: If the prefix is empty or limit is not positive.
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            raise ValueError("prefix cannot be empty")
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+
+        found: Dict[str, "Customer"] = {}
+        for key in self.__names.starting_with(prefix):
+            customer_id = key[key.index(_SEPARATOR) + 1 :]
+            found.setdefault(customer_id, self.__customers[customer_id])
+            if len(found) == limit:
+                break
+        return list(found.values())
@@ -117,6 +117,11 @@ class Employee(BaseUser, ABC):
         if not isinstance(new_branch, Branch):
             raise ValueError("Branch must be an instance of Branch class.")
 
+        # Move the employee to the new branch
+        if new_branch is not self.__branch:
+            if self.__branch.has_employee(self.id):
+                self.__branch.remove_employee(self.id)
+            new_branch.add_employee(self)
         self.__branch = new_branch
 
     @property
@@ -131,6 +136,7 @@ class Employee(BaseUser, ABC):
             raise ValueError("Is active must be a boolean value.")
 
         self.__is_active = new_value
+        self.__branch.reindex_employee(self)
 
     @property
     def salary(self) -> float:
@@ -174,6 +180,7 @@ class Employee(BaseUser, ABC):
             raise ValueError("Employment type must be a valid EmploymentType enum.")
 
         self.__employment_type = new_value
+        self.__branch.reindex_employee(self)
 
     @abstractmethod
     def get_work_schedule(self) -> float:
@@ -148,7 +148,9 @@ class Manager(Employee):
         Return work schedule details including hours and shift patterns.
         Schedules differ by employment type and role.
         """
-        if self.employment_type == EmploymentType.FULL_TIME:
+        # The employment_type getter returns the enum value
+        employment_type = EmploymentType(self.employment_type)
+        if employment_type == EmploymentType.FULL_TIME:
             return {
                 "hours_per_week": "40",
                 "monday": "09:00-17:00",
@@ -159,7 +161,7 @@ class Manager(Employee):
                 "saturday": "off",
                 "sunday": "off",
             }
-        elif self.employment_type == EmploymentType.PART_TIME:
+        elif employment_type == EmploymentType.PART_TIME:
             return {
                 "hours_per_week": "20",
                 "monday": "09:00-13:00",
@@ -0,0 +1,313 @@
+"""
+This module implements a shared-memory fleet status table.
+Processes which only need to read vehicle status, branch, odometer and fuel level can attach to the
+table by its name and scan it without owning any Vehicle objects and without copying data.
+
+The table is a NumPy structured array placed in multiprocessing.shared_memory, one row per vehicle
+indexed by a dense vehicle number. There is exactly one writer, it listens to Vehicle changes and
+writes them into the table. Readers are protected by a seqlock: the writer makes the sequence odd
+while it writes and even when it is done, a reader retries its scan if the sequence was odd or
+changed during the scan.
+
+Business Logic:
+    - Vehicle numbers and branch numbers are dense and assigned by the writer in registration order.
+    - Capacity of the table is fixed on creation.
+    - Only the writer may modify the table.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, TypeVar, TYPE_CHECKING
+
+import numpy as np
+
+from src.enums import VehicleStatus
+
+if TYPE_CHECKING:
+    from src.vehicle.vehicle import Vehicle
+
+T = TypeVar("T")
+
+# Status codes stored in the table, in the order of VehicleStatus members
+STATUS_CODES: Dict[VehicleStatus, int] = {
+    status: code for code, status in enumerate(VehicleStatus)
+}
+
+FLEET_RECORD_DTYPE = np.dtype(
+    [
+        ("status", np.uint8),
+        ("branch", np.int32),
+        ("odometer", np.float64),
+        ("last_service_odometer", np.float64),
+        ("fuel_level", np.float32),
+    ],
+    align=True,
+)
+
+# Header is [sequence, row count], padded to a cache line
+_HEADER_BYTES = 64
+
+
+def _table_views(buffer: memoryview, capacity: int):
+    """Returns the header and record views over a shared memory buffer"""
+    header = np.ndarray((2,), dtype=np.uint64, buffer=buffer)
+    records = np.ndarray(
+        (capacity,), dtype=FLEET_RECORD_DTYPE, buffer=buffer, offset=_HEADER_BYTES
+    )
+    return header, records
+
+
+class FleetTableWriter:
+    """
+    Concrete class representing the single writer of a shared-memory fleet table.
+
+    Args:
+        capacity (int): Maximum number of vehicles in the table.
+        name (Optional[str]): Name of the shared memory block. Generated if not provided.
+
+    Raises:
+        TypeError: If capacity is not an integer.
+        ValueError: If capacity is less than 1.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None) -> None:
+        """Constructor method for FleetTableWriter class."""
+        # Validate capacity
+        if not isinstance(capacity, int) or isinstance(capacity, bool):
+            raise TypeError("capacity must be an integer.")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        # Assign values
+        self.__capacity = capacity
+        self.__shared_memory = SharedMemory(
+            name=name,
+            create=True,
+            size=_HEADER_BYTES + capacity * FLEET_RECORD_DTYPE.itemsize,
+        )
+        self.__header, self.__records = _table_views(self.__shared_memory.buf, capacity)
+        self.__header[:] = 0
+        self.__vehicle_numbers: Dict[str, int] = {}
+        self.__vehicle_ids: List[str] = []
+        self.__vehicles: List["Vehicle"] = []
+        self.__branch_numbers: Dict[str, int] = {}
+
+    @property
+    def name(self) -> str:
+        """Getter for name property, readers attach to the table by this name."""
+        return self.__shared_memory.name
+
+    @property
+    def capacity(self) -> int:
+        """Getter for capacity property."""
+        return self.__capacity
+
+    @property
+    def vehicle_ids(self) -> List[str]:
+        """Getter for vehicle_ids property, vehicle id of each vehicle number."""
+        return self.__vehicle_ids.copy()
+
+    @property
+    def branch_numbers(self) -> Dict[str, int]:
+        """Getter for branch_numbers property, dense branch number of each branch id."""
+        return self.__branch_numbers.copy()
+
+    def vehicle_number(self, vehicle_id: str) -> int:
+        """Returns the dense number of a registered vehicle."""
+        return self.__vehicle_numbers[vehicle_id]
+
+    def branch_number(self, branch_id: str) -> int:
+        """Returns the dense number of a branch, assigning a new one if needed."""
+        number = self.__branch_numbers.get(branch_id)
+        if number is None:
+            number = self.__branch_numbers[branch_id] = len(self.__branch_numbers)
+        return number
+
+    def register(self, vehicle: "Vehicle") -> int:
+        """
+        Adds a vehicle to the table and starts mirroring its changes.
+
+        Args:
+            vehicle (Vehicle): The vehicle to add.
+
+        Returns:
+            int: Dense number of the vehicle.
+
+        Raises:
+            ValueError: If the vehicle is already registered or the table is full.
+        """
+        if vehicle.id in self.__vehicle_numbers:
+            raise ValueError("Vehicle is already registered in the fleet table.")
+        if len(self.__vehicle_ids) >= self.__capacity:
+            raise ValueError("Fleet table is full.")
+
+        number = len(self.__vehicle_ids)
+        self.__vehicle_numbers[vehicle.id] = number
+        self.__vehicle_ids.append(vehicle.id)
+        self.__write(number, vehicle)
+
+        self.__begin_write()
+        self.__header[1] = number + 1
+        self.__end_write()
+
+        self.__vehicles.append(vehicle)
+        vehicle.add_change_listener(self.on_vehicle_changed)
+        return number
+
+    def register_many(self, vehicles: List["Vehicle"]) -> None:
+        """Adds several vehicles to the table."""
+        for vehicle in vehicles:
+            self.register(vehicle)
+
+    def on_vehicle_changed(self, vehicle: "Vehicle", field_name: str) -> None:
+        """Change listener which mirrors a vehicle change into the table."""
+        number = self.__vehicle_numbers.get(vehicle.id)
+        if number is not None and self.__records is not None:
+            self.__write(number, vehicle)
+
+    def __begin_write(self) -> None:
+        """Makes the sequence odd, readers retry while it is odd"""
+        self.__header[0] += 1
+
+    def __end_write(self) -> None:
+        """Makes the sequence even again"""
+        self.__header[0] += 1
+
+    def __write(self, number: int, vehicle: "Vehicle") -> None:
+        """Writes one row of the table"""
+        row = (
+            STATUS_CODES[VehicleStatus(vehicle.status)],
+            self.branch_number(vehicle.current_branch.id),
+            vehicle.odometer,
+            vehicle.last_service_odometer,
+            vehicle.fuel_level,
+        )
+        self.__begin_write()
+        self.__records[number] = row
+        self.__end_write()
+
+    def close(self) -> None:
+        """Stops mirroring the registered vehicles, then closes and removes the shared memory block."""
+        for vehicle in self.__vehicles:
+            vehicle.remove_change_listener(self.on_vehicle_changed)
+        self.__vehicles.clear()
+        self.__header = None
+        self.__records = None
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
+
+    def __enter__(self) -> "FleetTableWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FleetTableReader:
+    """
+    Concrete class representing a read-only view of a shared-memory fleet table.
+    Any number of readers in any number of processes can attach to the same table. Reader
+    processes should be started with multiprocessing from the writer process, so they share its
+    resource tracker and the block is removed only when the writer closes it.
+
+    Args:
+        name (str): Name of the shared memory block, see FleetTableWriter.name.
+        capacity (int): Capacity the table was created with.
+    """
+
+    def __init__(self, name: str, capacity: int) -> None:
+        """Constructor method for FleetTableReader class."""
+        self.__shared_memory = SharedMemory(name=name)
+
+        self.__header, self.__records = _table_views(self.__shared_memory.buf, capacity)
+        self.__records.flags.writeable = False
+
+    def read(self, scan: Callable[[np.ndarray], T]) -> T:
+        """
+        Runs a scan over a consistent state of the table.
+
+        The scan receives a read-only zero-copy view of the filled rows. If the writer changed
+        the table during the scan, the scan is repeated.
+
+        Args:
+            scan (Callable[[np.ndarray], T]): Function computing a result from the rows.
+
+        Returns:
+            T: Result of the scan.
+        """
+        while True:
+            sequence = int(self.__header[0])
+            if sequence & 1:
+                time.sleep(0)
+                continue
+
+            result = scan(self.__records[: int(self.__header[1])])
+            if int(self.__header[0]) == sequence:
+                return result
+
+    def snapshot(self) -> np.ndarray:
+        """Returns a consistent copy of the filled rows."""
+        return self.read(np.copy)
+
+    def available_vehicles(self, branch_number: Optional[int] = None) -> np.ndarray:
+        """Returns numbers of AVAILABLE vehicles, optionally only at one branch."""
+        available = STATUS_CODES[VehicleStatus.AVAILABLE]
+
+        def scan(records: np.ndarray) -> np.ndarray:
+            mask = records["status"] == available
+            if branch_number is not None:
+                mask &= records["branch"] == branch_number
+            return np.flatnonzero(mask)
+
+        return self.read(scan)
+
+    def availability_by_branch(self, branch_count: int) -> np.ndarray:
+        """Returns number of AVAILABLE vehicles for every branch number."""
+        available = STATUS_CODES[VehicleStatus.AVAILABLE]
+
+        def scan(records: np.ndarray) -> np.ndarray:
+            branches = records["branch"][records["status"] == available]
+            return np.bincount(branches, minlength=branch_count)
+
+        return self.read(scan)
+
+    def fleet_health(
+        self, service_interval: float = 15_000.0, low_fuel_level: float = 0.25
+    ) -> Dict[str, int]:
+        """
+        Returns a summary of the fleet health.
+
+        Args:
+            service_interval (float): Distance after the last service when a vehicle is due.
+            low_fuel_level (float): Fuel level below which a vehicle counts as low on fuel,
+                in the same unit as Vehicle.fuel_level.
+        """
+
+        def scan(records: np.ndarray) -> Dict[str, int]:
+            driven = records["odometer"] - records["last_service_odometer"]
+            counts = np.bincount(records["status"], minlength=len(STATUS_CODES))
+            summary = {
+                status.value: int(counts[code]) for status, code in STATUS_CODES.items()
+            }
+            summary["service_due"] = int(np.count_nonzero(driven >= service_interval))
+            summary["low_fuel"] = int(
+                np.count_nonzero(records["fuel_level"] < low_fuel_level)
+            )
+            return summary
+
+        return self.read(scan)
+
+    def close(self) -> None:
+        """Detaches from the shared memory block."""
+        self.__header = None
+        self.__records = None
+        self.__shared_memory.close()
+
+    def __enter__(self) -> "FleetTableReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
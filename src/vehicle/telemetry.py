@@ -0,0 +1,515 @@
+"""
+This module implements batched ingestion of vehicle telemetry. Connected vehicles send odometer and
+fuel level readings which are pushed into a fixed-size ring buffer without validation. A flush
+drains the buffer, validates the whole batch with NumPy, coalesces it to the latest valid reading
+of every vehicle and applies those readings to the fleet in bulk.
+
+Business Logic:
+    - When the ring buffer is full, the oldest readings are overwritten and counted as dropped.
+    - Readings of unknown vehicles, readings which are not finite and negative fuel levels are
+      rejected as anomalies.
+    - Odometer readings must not decrease, and must not grow more than max_distance between two
+      readings of a vehicle. Every decreasing or jumping reading is rejected as an anomaly, the
+      next reading is compared to the last accepted one.
+    - Only the latest accepted reading of every vehicle is applied.
+    - A vehicle which drove service_interval since its last service gets one maintenance request
+      through Agent.create_maintenance_request, until its last_service_odometer changes.
+    - Direct changes of the odometer and last service odometer of registered vehicles are
+      followed through their change listeners.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from src.enums import TelemetryAnomalyType
+
+if TYPE_CHECKING:
+    from src.users.agent import Agent
+    from src.vehicle.vehicle import Vehicle
+
+TELEMETRY_DTYPE = np.dtype(
+    [
+        ("vehicle", np.int32),
+        ("timestamp", np.float64),
+        ("odometer", np.float64),
+        ("fuel_level", np.float64),
+    ]
+)
+
+# Anomaly codes of a batch, 0 is a valid reading
+_ANOMALY_CODES: Dict[int, TelemetryAnomalyType] = dict(
+    enumerate(TelemetryAnomalyType, start=1)
+)
+_CODE_OF = {kind: code for code, kind in _ANOMALY_CODES.items()}
+_UNKNOWN_VEHICLE = _CODE_OF[TelemetryAnomalyType.UNKNOWN_VEHICLE]
+
+
+def _group_running_max(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """
+    Returns the running maximum of values restarting at every group, groups are ascending.
+    Values are replaced by their ranks and offset by the group, so one accumulate of the whole
+    array never carries a maximum into the next group.
+    """
+    distinct, ranks = np.unique(values, return_inverse=True)
+    offsets = groups.astype(np.int64) * len(distinct)
+    return distinct[np.maximum.accumulate(offsets + ranks.reshape(-1)) - offsets]
+
+
+class TelemetryAnomaly(NamedTuple):
+    """A rejected telemetry reading, kind is a TelemetryAnomalyType value"""
+
+    vehicle_id: Optional[str]
+    timestamp: float
+    kind: str
+    odometer: float
+    fuel_level: float
+
+
+class TelemetryReport(NamedTuple):
+    """Result of a flush"""
+
+    received: int
+    accepted: int
+    applied: int
+    dropped: int
+    anomalies: List[TelemetryAnomaly]
+    maintenance_requests: List[str]
+
+
+class TelemetryBuffer:
+    """
+    Fixed-size ring buffer of telemetry readings, safe to push from several threads.
+
+    Args:
+        capacity (int): Maximum number of buffered readings.
+
+    Raises:
+        TypeError: If capacity is not an integer.
+        ValueError: If capacity is less than 1.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Constructor method for TelemetryBuffer class"""
+        if isinstance(capacity, bool) or not isinstance(capacity, int):
+            raise TypeError("capacity must be an integer")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.__records = np.zeros(capacity, dtype=TELEMETRY_DTYPE)
+        # Readings ever written and ever drained, their difference is the buffered count
+        self.__written = 0
+        self.__read = 0
+        self.__dropped = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of buffered readings"""
+        return self.__written - self.__read
+
+    @property
+    def capacity(self) -> int:
+        """Getter for capacity property"""
+        return len(self.__records)
+
+    @property
+    def dropped(self) -> int:
+        """Getter for dropped property, readings overwritten since the last drain"""
+        return self.__dropped
+
+    def push(
+        self, vehicle: int, odometer: float, fuel_level: float, timestamp: float
+    ) -> None:
+        """Appends one reading of a vehicle number"""
+        with self.__lock:
+            self.__records[self.__written % len(self.__records)] = (
+                vehicle,
+                timestamp,
+                odometer,
+                fuel_level,
+            )
+            self.__written += 1
+            self.__drop_overwritten()
+
+    def push_many(self, records: np.ndarray) -> None:
+        """Appends readings given as a TELEMETRY_DTYPE array"""
+        capacity = len(self.__records)
+        # Only the newest readings fit, older ones are dropped right away
+        skipped = max(len(records) - capacity, 0)
+        records = records[skipped:]
+        with self.__lock:
+            self.__dropped += skipped
+            start = self.__written % capacity
+            first = min(len(records), capacity - start)
+            self.__records[start : start + first] = records[:first]
+            self.__records[: len(records) - first] = records[first:]
+            self.__written += len(records)
+            self.__drop_overwritten()
+
+    def __drop_overwritten(self) -> None:
+        """Moves the read position past overwritten readings"""
+        overflow = self.__written - self.__read - len(self.__records)
+        if overflow > 0:
+            self.__read += overflow
+            self.__dropped += overflow
+
+    def drain(self) -> np.ndarray:
+        """Removes and returns every buffered reading, oldest first"""
+        capacity = len(self.__records)
+        with self.__lock:
+            start, count = self.__read % capacity, self.__written - self.__read
+            records = np.concatenate(
+                (
+                    self.__records[start : min(start + count, capacity)],
+                    self.__records[: max(start + count - capacity, 0)],
+                )
+            )
+            self.__read = self.__written
+            self.__dropped = 0
+        return records
+
+
+class TelemetryIngestor:
+    """
+    Concrete class ingesting odometer and fuel level readings of a fleet in batches.
+
+    Args:
+        vehicles (Iterable[Vehicle]): Vehicles which send telemetry.
+        agent (Agent): Agent creating maintenance requests of vehicles due for service.
+        service_interval (float): Distance after the last service when a vehicle is due.
+        max_distance (float): Largest odometer increase between two readings of a vehicle.
+        capacity (int): Capacity of the ring buffer.
+
+    Raises:
+        TypeError: If a vehicle is not a Vehicle object or agent is not an Agent object.
+        ValueError: If service_interval or max_distance is not positive.
+    """
+
+    def __init__(
+        self,
+        vehicles: Iterable["Vehicle"],
+        agent: "Agent",
+        service_interval: float = 15_000.0,
+        max_distance: float = 2_000.0,
+        capacity: int = 65_536,
+    ) -> None:
+        """Constructor method for TelemetryIngestor class"""
+        from src.users.agent import Agent
+
+        if not isinstance(agent, Agent):
+            raise TypeError("agent must be an Agent object")
+        for name, value in (
+            ("service_interval", service_interval),
+            ("max_distance", max_distance),
+        ):
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{name} must be a positive number")
+
+        self.__agent = agent
+        self.__service_interval = float(service_interval)
+        self.__max_distance = float(max_distance)
+        self.__buffer = TelemetryBuffer(capacity)
+        self.__vehicles: List["Vehicle"] = []
+        self.__numbers: Dict[str, int] = {}
+        self.__odometers = np.zeros(0, dtype=np.float64)
+        self.__last_service = np.zeros(0, dtype=np.float64)
+        self.__requested = np.zeros(0, dtype=bool)
+        self.__flush_lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.register_many(vehicles)
+
+    def __len__(self) -> int:
+        """Returns the number of registered vehicles"""
+        return len(self.__vehicles)
+
+    @property
+    def buffer(self) -> TelemetryBuffer:
+        """Getter for buffer property"""
+        return self.__buffer
+
+    def register_many(self, vehicles: Iterable["Vehicle"]) -> None:
+        """
+        Registers vehicles which send telemetry, registered vehicles are ignored.
+
+        Raises:
+            TypeError: If a vehicle is not a Vehicle object.
+        """
+        from src.vehicle.vehicle import Vehicle
+
+        added = []
+        for vehicle in vehicles:
+            if not isinstance(vehicle, Vehicle):
+                raise TypeError("vehicles must contain Vehicle objects")
+            if vehicle.id in self.__numbers:
+                continue
+            self.__numbers[vehicle.id] = len(self.__vehicles)
+            self.__vehicles.append(vehicle)
+            added.append(vehicle)
+
+        self.__odometers = np.concatenate(
+            (self.__odometers, [vehicle.odometer for vehicle in added])
+        )
+        self.__last_service = np.concatenate(
+            (self.__last_service, [vehicle.last_service_odometer for vehicle in added])
+        )
+        self.__requested = np.concatenate(
+            (self.__requested, np.zeros(len(added), dtype=bool))
+        )
+        for vehicle in added:
+            vehicle.add_change_listener(self.__on_vehicle_changed)
+
+    def register(self, vehicle: "Vehicle") -> None:
+        """Registers a vehicle which sends telemetry"""
+        self.register_many([vehicle])
+
+    def __on_vehicle_changed(self, vehicle: "Vehicle", field_name: str) -> None:
+        """Change listener of registered vehicles"""
+        number = self.__numbers[vehicle.id]
+        if field_name == "odometer":
+            self.__odometers[number] = vehicle.odometer
+        elif field_name == "last_service_odometer":
+            self.__last_service[number] = vehicle.last_service_odometer
+            self.__requested[number] = False
+
+    def push(
+        self,
+        vehicle_id: str,
+        odometer: float,
+        fuel_level: float,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Buffers one reading, it is validated by the next flush.
+
+        Args:
+            vehicle_id (str): Id of the vehicle.
+            odometer (float): Odometer reading.
+            fuel_level (float): Fuel level reading.
+            timestamp (Optional[float]): Time of the reading in seconds, defaults to now.
+        """
+        self.__buffer.push(
+            self.__numbers.get(vehicle_id, -1),
+            odometer,
+            fuel_level,
+            time.time() if timestamp is None else timestamp,
+        )
+
+    def push_many(
+        self,
+        vehicle_ids: Sequence[str],
+        odometers: Sequence[float],
+        fuel_levels: Sequence[float],
+        timestamps: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Buffers many readings, they are validated by the next flush.
+
+        Args:
+            vehicle_ids (Sequence[str]): Ids of the vehicles.
+            odometers (Sequence[float]): Odometer readings.
+            fuel_levels (Sequence[float]): Fuel level readings.
+            timestamps (Optional[Sequence[float]]): Times of the readings in seconds, defaults to
+                now for every reading.
+
+        Raises:
+            ValueError: If the sequences have different lengths.
+        """
+        count = len(vehicle_ids)
+        if len(odometers) != count or len(fuel_levels) != count:
+            raise ValueError(
+                "vehicle_ids, odometers and fuel_levels must have equal lengths"
+            )
+        if timestamps is not None and len(timestamps) != count:
+            raise ValueError("timestamps must have the length of vehicle_ids")
+
+        records = np.empty(count, dtype=TELEMETRY_DTYPE)
+        numbers = self.__numbers
+        records["vehicle"] = [numbers.get(vehicle_id, -1) for vehicle_id in vehicle_ids]
+        records["timestamp"] = time.time() if timestamps is None else timestamps
+        records["odometer"] = odometers
+        records["fuel_level"] = fuel_levels
+        self.__buffer.push_many(records)
+
+    def __validate(self, batch: np.ndarray) -> np.ndarray:
+        """Returns the anomaly code of every reading of a batch sorted by vehicle and time"""
+        vehicles = batch["vehicle"]
+        odometers, fuel_levels = batch["odometer"], batch["fuel_level"]
+        codes = np.zeros(len(batch), dtype=np.int8)
+
+        invalid = ~(np.isfinite(odometers) & np.isfinite(fuel_levels))
+        codes[invalid] = _CODE_OF[TelemetryAnomalyType.INVALID_READING]
+        codes[(codes == 0) & (fuel_levels < 0)] = _CODE_OF[
+            TelemetryAnomalyType.NEGATIVE_FUEL
+        ]
+        codes[(vehicles < 0) | (vehicles >= len(self.__vehicles))] = _UNKNOWN_VEHICLE
+
+        rows = np.flatnonzero(codes == 0)
+        if len(rows) == 0:
+            return codes
+        row_vehicles, row_odometers = vehicles[rows], odometers[rows]
+        starts = np.ones(len(rows), dtype=bool)
+        starts[1:] = row_vehicles[1:] != row_vehicles[:-1]
+        groups = np.cumsum(starts) - 1
+
+        # Without jumps, a reading is accepted if it is not below every earlier reading of its
+        # vehicle, so the last accepted reading is the running maximum of the earlier readings.
+        # Readings are never below the last service either.
+        previous = np.maximum(self.__odometers, self.__last_service)[row_vehicles]
+        earlier = np.empty(len(rows))
+        earlier[1:] = _group_running_max(row_odometers, groups)[:-1]
+        earlier[starts] = -np.inf
+        np.maximum(previous, earlier, out=previous)
+        rollback = row_odometers < previous
+        row_codes = np.where(
+            rollback, _CODE_OF[TelemetryAnomalyType.ODOMETER_ROLLBACK], 0
+        ).astype(np.int8)
+
+        # A rejected jump does not count as the last accepted reading, the readings of a vehicle
+        # from its first jump on are compared one by one
+        jumps = np.flatnonzero(
+            ~rollback & (row_odometers - previous > self.__max_distance)
+        )
+        if len(jumps):
+            first_jumps = jumps[
+                np.concatenate(([True], groups[jumps[1:]] != groups[jumps[:-1]]))
+            ]
+            ends = np.append(np.flatnonzero(starts)[1:], len(rows))[groups[first_jumps]]
+            for start, end in zip(first_jumps.tolist(), ends.tolist()):
+                row_codes[start:end] = self.__compare(
+                    row_odometers[start:end].tolist(), previous[start].item()
+                )
+        codes[rows] = row_codes
+        return codes
+
+    def __compare(self, odometers: List[float], last: float) -> List[int]:
+        """Returns the anomaly codes of readings of one vehicle after its last accepted one"""
+        rollback = _CODE_OF[TelemetryAnomalyType.ODOMETER_ROLLBACK]
+        jump = _CODE_OF[TelemetryAnomalyType.ODOMETER_JUMP]
+        max_distance = self.__max_distance
+        codes = []
+        for odometer in odometers:
+            if odometer < last:
+                codes.append(rollback)
+            elif odometer - last > max_distance:
+                codes.append(jump)
+            else:
+                codes.append(0)
+                last = odometer
+        return codes
+
+    def flush(self) -> TelemetryReport:
+        """
+        Validates the buffered readings, applies the latest valid reading of every vehicle and
+        requests maintenance of vehicles due for service.
+
+        Returns:
+            TelemetryReport: Counts of the batch, its anomalies and the ids of the vehicles
+                whose maintenance was requested.
+        """
+        with self.__flush_lock:
+            dropped = self.__buffer.dropped
+            batch = self.__buffer.drain()
+            batch = batch[np.lexsort((batch["timestamp"], batch["vehicle"]))]
+            codes = self.__validate(batch)
+
+            anomalies = [
+                TelemetryAnomaly(
+                    None if code == _UNKNOWN_VEHICLE else self.__vehicles[vehicle].id,
+                    timestamp,
+                    _ANOMALY_CODES[code].value,
+                    odometer,
+                    fuel_level,
+                )
+                for vehicle, timestamp, odometer, fuel_level, code in zip(
+                    batch["vehicle"].tolist(),
+                    batch["timestamp"].tolist(),
+                    batch["odometer"].tolist(),
+                    batch["fuel_level"].tolist(),
+                    codes.tolist(),
+                )
+                if code
+            ]
+
+            # Coalesce to the latest accepted reading of every vehicle
+            accepted = batch[codes == 0]
+            latest = np.ones(len(accepted), dtype=bool)
+            latest[:-1] = accepted["vehicle"][1:] != accepted["vehicle"][:-1]
+            latest = accepted[latest]
+
+            numbers = latest["vehicle"]
+            for number, odometer, fuel_level in zip(
+                numbers.tolist(),
+                latest["odometer"].tolist(),
+                latest["fuel_level"].tolist(),
+            ):
+                self.__vehicles[number].record_telemetry(odometer, fuel_level)
+
+            # Request maintenance once per service interval
+            driven = self.__odometers[numbers] - self.__last_service[numbers]
+            due = numbers[
+                (driven >= self.__service_interval) & ~self.__requested[numbers]
+            ]
+            self.__requested[due] = True
+            requested = []
+            for number in due.tolist():
+                vehicle = self.__vehicles[number]
+                driven = vehicle.odometer - vehicle.last_service_odometer
+                self.__agent.create_maintenance_request(
+                    vehicle, note=f"Service due after {driven:,.0f} km"
+                )
+                requested.append(vehicle.id)
+
+            return TelemetryReport(
+                received=len(batch),
+                accepted=len(accepted),
+                applied=len(latest),
+                dropped=dropped,
+                anomalies=anomalies,
+                maintenance_requests=requested,
+            )
+
+    def start(self, interval: float = 1.0) -> "TelemetryIngestor":
+        """
+        Flushes the buffer every interval seconds in a background thread.
+
+        Raises:
+            ValueError: If interval is not positive.
+            RuntimeError: If the ingestor is already running.
+        """
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError("interval must be a positive number")
+        if self.__thread is not None:
+            raise RuntimeError("ingestor is already running")
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, args=(interval,), name="telemetry-ingestor", daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread and flushes the remaining readings"""
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+        self.flush()
+
+    def __run(self, interval: float) -> None:
+        """Flushes the buffer periodically until stopped"""
+        while not self.__stop.wait(interval):
+            self.flush()
+
+    def __enter__(self) -> "TelemetryIngestor":
+        return self if self.__thread is not None else self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
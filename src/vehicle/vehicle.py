@@ -5,6 +5,12 @@ It is a concrete class and can directly initialize in the app.
 Business Logics:
     - id is autogenerated and cannot be changes.
     - Vehicle price cannot be lower than its VehicleClass base_price.
+    - price_per_day is stored in cents, see src/money.py.
+    - version is incremented on every status change and cannot be edited.
+    - Status transitions are guarded by striped per-vehicle locks, so concurrent
+      compare_and_set_status calls on the same vehicle are serialized.
+    - Change listeners are notified after every successful setter call. They are local to the
+      process and are not pickled with the vehicle.
 
 Author: Peyman Khodabandehlouei
 Date: 07-11-2025
@@ -13,6 +19,10 @@ Date: 07-11-2025
 import uuid
 from typing import List, Optional, TYPE_CHECKING
 from src.enums import VehicleStatus
+from src.money import Cents, to_amount, to_cents
+from src.collection_views import ListView, ViewableList
+from src.concurrency.striped_lock import vehicle_locks
+from src.change_notifier import ChangeNotifier
 
 if TYPE_CHECKING:
     from src.branch.branch import Branch
@@ -20,7 +30,7 @@ if TYPE_CHECKING:
     from src.vehicle.maintenance_record import MaintenanceRecord
 
 
-class Vehicle:
+class Vehicle(ChangeNotifier):
     """
     Concrete class representing a Vehicle in the application.
 
@@ -116,7 +126,8 @@ class Vehicle:
         # Validate price_per_day
         if not isinstance(price_per_day, (int, float)):
             raise TypeError("price_per_day must be a numeric value")
-        if price_per_day < vehicle_class.base_daily_rate:
+        price_per_day_cents = to_cents(price_per_day)
+        if price_per_day_cents < vehicle_class.base_daily_rate_cents:
             raise ValueError(
                 "price_per_day can not be less than vehicle_class.base_daily_rate"
             )
@@ -126,7 +137,7 @@ class Vehicle:
             maintenance_records = []
 
         # Validate maintenance_records is a list
-        if not isinstance(maintenance_records, list):
+        if not isinstance(maintenance_records, (list, ListView)):
             raise TypeError("maintenance_records must be a list")
 
         # Validate all items in the list are MaintenanceRecord instances
@@ -154,8 +165,10 @@ class Vehicle:
         self.__fuel_level = fuel_level
         self.__odometer = odometer
         self.__last_service_odometer = last_service_odometer
-        self.__price_per_day = price_per_day
-        self.__maintenance_records = maintenance_records.copy()
+        self.__price_per_day_cents = price_per_day_cents
+        self.__maintenance_records = ViewableList(maintenance_records)
+        self.__version = 0
+        ChangeNotifier.__init__(self)
 
     @property
     def id(self) -> str:
@@ -166,6 +179,15 @@ class Vehicle:
         """
         return self.__id
 
+    @property
+    def version(self) -> int:
+        """
+        Getter for version property.
+
+        Note: version is incremented on every status change and cannot be modified directly.
+        """
+        return self.__version
+
     @property
     def vehicle_class(self) -> "VehicleClass":
         """Getter for vehicle_class property"""
@@ -190,6 +212,7 @@ class Vehicle:
 
         # Logic
         self.__vehicle_class = vehicle_class
+        self._publish_change("vehicle_class")
 
     @property
     def current_branch(self) -> "Branch":
@@ -215,6 +238,7 @@ class Vehicle:
 
         # Logic
         self.__current_branch = branch
+        self._publish_change("current_branch")
 
     @property
     def status(self) -> str:
@@ -235,7 +259,52 @@ class Vehicle:
         if not isinstance(status, VehicleStatus):
             raise TypeError("status must be a VehicleStatus enum")
 
-        self.__status = status
+        with vehicle_locks.lock_for(self.__id):
+            self.__status = status
+            self.__version += 1
+        self._publish_change("status")
+
+    def compare_and_set_status(
+        self,
+        expected_status: VehicleStatus,
+        new_status: VehicleStatus,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Atomically changes the status of the vehicle if it is still in the expected state.
+
+        Args:
+            expected_status (VehicleStatus): Status the vehicle must currently have.
+            new_status (VehicleStatus): Status to move the vehicle to.
+            expected_version (Optional[int]): If given, version the vehicle must currently have.
+
+        Returns:
+            bool: True if the status was changed, False if another change happened first.
+
+        Raises:
+            TypeError: If expected_status or new_status is not a VehicleStatus enum.
+            TypeError: If expected_version is not an integer or None.
+        """
+        # Validation
+        if not isinstance(expected_status, VehicleStatus):
+            raise TypeError("expected_status must be a VehicleStatus enum")
+        if not isinstance(new_status, VehicleStatus):
+            raise TypeError("new_status must be a VehicleStatus enum")
+        if expected_version is not None and not isinstance(expected_version, int):
+            raise TypeError("expected_version must be an integer")
+
+        # Logic
+        with vehicle_locks.lock_for(self.__id):
+            if self.__status is not expected_status:
+                return False
+            if expected_version is not None and self.__version != expected_version:
+                return False
+
+            self.__status = new_status
+            self.__version += 1
+
+        self._publish_change("status")
+        return True
 
     @property
     def brand(self) -> str:
@@ -354,6 +423,7 @@ class Vehicle:
 
         # Logic
         self.__fuel_level = fuel_level
+        self._publish_change("fuel_level")
 
     @property
     def odometer(self) -> float:
@@ -380,6 +450,7 @@ class Vehicle:
 
         # Logic
         self.__odometer = odometer
+        self._publish_change("odometer")
 
     @property
     def last_service_odometer(self) -> float:
@@ -404,11 +475,43 @@ class Vehicle:
             raise ValueError("last_service_odometer cannot be negative.")
 
         self.__last_service_odometer = last_service_odometer
+        self._publish_change("last_service_odometer")
+
+    def record_telemetry(self, odometer: float, fuel_level: float) -> None:
+        """
+        Sets an odometer and fuel level reading at once, used by bulk telemetry ingestion which
+        validates readings before. Listeners are only notified about values which changed.
+
+        Args:
+            odometer (float): odometer value of the vehicle.
+            fuel_level (float): fuel level of the vehicle.
+
+        Raises:
+            ValueError: If odometer is less than last_service_odometer or fuel_level is negative.
+        """
+        if odometer < self.__last_service_odometer:
+            raise ValueError("odometer cannot be less than last_service_odometer")
+        if fuel_level < 0:
+            raise ValueError("fuel_level cannot be negative")
+
+        odometer_changed = odometer != self.__odometer
+        fuel_level_changed = fuel_level != self.__fuel_level
+        self.__odometer = odometer
+        self.__fuel_level = fuel_level
+        if odometer_changed:
+            self._publish_change("odometer")
+        if fuel_level_changed:
+            self._publish_change("fuel_level")
 
     @property
     def price_per_day(self) -> float:
         """Getter for price_per_day property"""
-        return self.__price_per_day
+        return to_amount(self.__price_per_day_cents)
+
+    @property
+    def price_per_day_cents(self) -> Cents:
+        """Getter for price_per_day property in cents"""
+        return self.__price_per_day_cents
 
     @price_per_day.setter
     def price_per_day(self, price_per_day: float) -> None:
@@ -424,17 +527,19 @@ class Vehicle:
         """
         if not isinstance(price_per_day, (int, float)):
             raise TypeError("price_per_day must be a numeric value.")
-        if price_per_day < self.vehicle_class.base_daily_rate:
+        price_per_day_cents = to_cents(price_per_day)
+        if price_per_day_cents < self.vehicle_class.base_daily_rate_cents:
             raise ValueError(
                 "price_per_day can not be less than vehicle_class.base_daily_rate"
             )
 
-        self.__price_per_day = price_per_day
+        self.__price_per_day_cents = price_per_day_cents
+        self._publish_change("price_per_day")
 
     @property
-    def maintenance_records(self) -> List["MaintenanceRecord"]:
-        """Getter for maintenance_records property"""
-        return self.__maintenance_records.copy()
+    def maintenance_records(self) -> ListView["MaintenanceRecord"]:
+        """Getter for maintenance_records property, a read-only view which follows later changes"""
+        return self.__maintenance_records.view
 
     @maintenance_records.setter
     def maintenance_records(self, maintenance_records: List["MaintenanceRecord"]) -> None:
@@ -450,7 +555,7 @@ class Vehicle:
         """
         from src.vehicle.maintenance_record import MaintenanceRecord
 
-        if not isinstance(maintenance_records, list):
+        if not isinstance(maintenance_records, (list, ListView)):
             raise TypeError("maintenance_records must be a list")
         if not all(
             isinstance(maintenance_record, MaintenanceRecord)
@@ -460,7 +565,7 @@ class Vehicle:
                 "All maintenance records must be an instances of MaintenanceRecord class"
             )
 
-        self.__maintenance_records = maintenance_records.copy()
+        self.__maintenance_records[:] = maintenance_records
 
     def reserve(self) -> None:
         """Updates the status of the Vehicle to RESERVED"""
@@ -480,7 +585,7 @@ class Vehicle:
         from src.vehicle.maintenance_record import MaintenanceRecord
         if not isinstance(maintenance_record, MaintenanceRecord):
             raise TypeError("maintenance_record must be an instance of MaintenanceRecord class")
-        if maintenance_record in self.maintenance_records:
+        if maintenance_record in self.__maintenance_records:
             raise ValueError("maintenance_record already exists in the list")
 
 
@@ -4,6 +4,8 @@ It is a concrete class and can directly initialize in the app.
 
 Business Logic:
     - id is autogenerated and can not be changes.
+    - base_daily_rate is stored in cents, see src/money.py.
+    - Change listeners are notified after base_daily_rate changes and are not pickled.
 
 Author: Peyman Khodabandehlouei
 Date: 07-11-2025
@@ -12,8 +14,12 @@ Date: 07-11-2025
 import uuid
 from typing import List, Optional
 
+from src.money import Cents, to_amount, to_cents
+from src.collection_views import ListView, ViewableList
+from src.change_notifier import ChangeNotifier
 
-class VehicleClass:
+
+class VehicleClass(ChangeNotifier):
     """
     Concrete class representing a VehicleClass in the application.
 
@@ -55,7 +61,7 @@ class VehicleClass:
         if features is None:
             features = []
 
-        if not isinstance(features, list):
+        if not isinstance(features, (list, ListView)):
             raise TypeError("features must be a list of strings.")
         if not all(isinstance(feature, str) for feature in features):
             raise TypeError("all items in features must be string")
@@ -63,8 +69,9 @@ class VehicleClass:
         self.__id = str(uuid.uuid4())
         self.__name = name
         self.__description = description
-        self.__base_daily_rate = base_daily_rate
-        self.__features = features.copy()  # To prevent external modifications
+        self.__base_daily_rate_cents = to_cents(base_daily_rate)
+        self.__features = ViewableList(features)  # To prevent external modifications
+        ChangeNotifier.__init__(self)
 
     @property
     def id(self) -> str:
@@ -120,7 +127,12 @@ class VehicleClass:
     @property
     def base_daily_rate(self) -> float:
         """Getter for base_daily_rate property"""
-        return self.__base_daily_rate
+        return to_amount(self.__base_daily_rate_cents)
+
+    @property
+    def base_daily_rate_cents(self) -> Cents:
+        """Getter for base_daily_rate property in cents"""
+        return self.__base_daily_rate_cents
 
     @base_daily_rate.setter
     def base_daily_rate(self, base_daily_rate: float) -> None:
@@ -141,12 +153,13 @@ class VehicleClass:
             raise ValueError("base_daily_rate rate must be greater than zero")
 
         # Logic
-        self.__base_daily_rate = base_daily_rate
+        self.__base_daily_rate_cents = to_cents(base_daily_rate)
+        self._publish_change("base_daily_rate")
 
     @property
-    def features(self) -> List[str]:
-        """Getter for features property"""
-        return self.__features.copy()  # To prevent external modifications
+    def features(self) -> ListView[str]:
+        """Getter for features property, a read-only view which follows later changes"""
+        return self.__features.view
 
     @features.setter
     def features(self, new_features: List[str]) -> None:
@@ -160,13 +173,13 @@ class VehicleClass:
             TypeError: If new_features is not a list.
             ValueError: If all items of new_features are not string.
         """
-        if not isinstance(new_features, list):
+        if not isinstance(new_features, (list, ListView)):
             raise TypeError("features must be a list of strings.")
         if not all(isinstance(feature, str) for feature in new_features):
             raise TypeError("all items in features must be string")
 
         # Logic
-        self.__features = new_features.copy()  # To prevent external modifications
+        self.__features[:] = new_features
 
     def add_feature(self, feature: str) -> None:
         """
@@ -227,4 +240,4 @@ class VehicleClass:
 
     def __str__(self):
         """String representation of the VehicleClass"""
-        return f"VehicleClass(name={self.__name}, description={self.__description}, base_daily_rate={self.__base_daily_rate}, features={self.__features})"
\ No newline at end of file
+        return f"VehicleClass(name={self.__name}, description={self.__description}, base_daily_rate={self.base_daily_rate}, features={self.__features})"
\ No newline at end of file
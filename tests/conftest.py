@@ -43,12 +43,18 @@ Here is a list of the available fixtures:
 - Clock
     - get_pickup_and_return_dates: Returns a tuple of pickup and return dates for testing.
 
+- Pricing:
+    - get_rate_calendar: Installs an empty RateCalendar for the test and restores the previous one.
+    - strategy_quote: Helper returning the quote of the pricing strategy of a reservation.
+    - strategy_total: Helper returning the total of the pricing strategy of a reservation, in cents.
+
 Author: Peyman Khodabandehlouei
 Date: 01-12-2025
 """
 
 import pytest
 from datetime import date, datetime, timedelta
+from typing import Iterator
 
 from src.branch.branch import Branch
 from src.users.agent import Agent
@@ -58,6 +64,10 @@ from src.vehicle.vehicle_class import VehicleClass
 from src.vehicle.vehicle import Vehicle
 from src.reservation.add_on import AddOn
 from src.reservation.insurance_tier import InsuranceTier
+from src.reservation.reservation import Reservation
+from src.pricing_strategy import rate_calendar
+from src.pricing_strategy.price_quote import PriceQuote
+from src.money import Cents
 from src.notification.notification_manager import ConcreteNotificationManager
 from src.notification.subscribers import AgentSubscriber, CustomerSubscriber
 from src.enums import Gender, EmploymentType, VehicleStatus
@@ -436,9 +446,32 @@ def get_premium_insurance_tier() -> InsuranceTier:
     )
 
 
-
 @pytest.fixture
 def get_pickup_and_return_dates(interval_days: int = 3) -> tuple[datetime, datetime]:
     pickup_date = date.today() + timedelta(days=1)
     return_date = pickup_date + timedelta(days=interval_days)
     return pickup_date, return_date
+
+
+@pytest.fixture
+def get_rate_calendar() -> Iterator[rate_calendar.RateCalendar]:
+    previous = rate_calendar.get_rate_calendar()
+    calendar = rate_calendar.RateCalendar()
+    rate_calendar.set_rate_calendar(calendar)
+    yield calendar
+    rate_calendar.set_rate_calendar(previous)
+
+
+def strategy_quote(reservation: Reservation) -> PriceQuote:
+    return reservation.pricing_strategy.quote_price(
+        vehicle=reservation.vehicle,
+        insurance_tier=reservation.insurance_tier,
+        pickup_date=reservation.pickup_date,
+        return_date=reservation.return_date,
+        add_ons=list(reservation.add_ons),
+        pickup_branch=reservation.pickup_branch,
+    )
+
+
+def strategy_total(reservation: Reservation) -> Cents:
+    return strategy_quote(reservation).total_cents
@@ -0,0 +1,164 @@
+"""
+Test add-on inventory module
+
+This module contains unit tests for per-branch add-on stock and its segment-tree day counters.
+Here is a list of the available tests:
+    1. Day counters match a day-by-day count after random reserves and releases.
+    2. Reservations hold add-ons and release them when they are removed or cancelled.
+    3. Moving dates to a full window keeps the current holds and the reservation unchanged.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.branch.add_on_inventory import AddOnInventory
+from src.custom_errors import AddOnUnavailableError
+
+START = date(2030, 1, 1)
+
+
+def test_counters_match_daily_counts():
+    """Tests day counters against a day-by-day count of random reserves and releases."""
+    rng = random.Random(7)
+    inventory = AddOnInventory(first_day=START)
+    inventory.set_stock("gps", 4)
+    # Small initial size forces the inventory to grow while holds exist
+    days = [0] * 1500
+    holds = {}
+
+    for step in range(600):
+        reservation_id = f"r{step % 40}"
+        if reservation_id in holds and rng.random() < 0.4:
+            first, stop = holds.pop(reservation_id)
+            assert inventory.release_all(reservation_id) == 1
+            for day in range(first, stop):
+                days[day] -= 1
+            continue
+        if reservation_id in holds:
+            continue
+
+        first = rng.randrange(0, 1400) if step % 3 else rng.randrange(0, 60)
+        stop = first + rng.randrange(0, 90)
+        pickup, return_ = START + timedelta(days=first), START + timedelta(days=stop)
+        expected = max(days[first : max(stop, first + 1)])
+        assert inventory.reserved("gps", pickup, return_) == expected
+        if expected >= 4:
+            with pytest.raises(AddOnUnavailableError):
+                inventory.reserve(reservation_id, "gps", pickup, return_)
+            continue
+        inventory.reserve(reservation_id, "gps", pickup, return_)
+        holds[reservation_id] = (first, max(stop, first + 1))
+        for day in range(first, max(stop, first + 1)):
+            days[day] += 1
+
+    assert inventory.daily_reserved("gps", START, 1500) == days
+    with pytest.raises(ValueError):
+        inventory.set_stock("gps", max(days) - 1)
+    # Add-ons without stock are unlimited
+    assert inventory.available("child_seat", START, START) is None
+
+
+def test_reservation_holds(
+    get_customer,
+    get_compact_vehicle,
+    get_suv_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_child_seat_addon,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that reservations hold add-ons and release them on removal or cancel."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    inventory = get_main_branch.add_on_inventory
+    inventory.set_stock(get_gps_addon.id, 1)
+
+    first = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_child_seat_addon, get_gps_addon],
+    )
+    assert inventory.holds_of(first.id) == [get_gps_addon.id]
+    assert inventory.available(get_gps_addon.id, pickup_date, return_date) == 0
+
+    # The second vehicle is released when its add-on is out of stock
+    with pytest.raises(AddOnUnavailableError):
+        get_customer.create_reservation(
+            vehicle=get_suv_vehicle,
+            insurance_tier=get_basic_insurance_tier,
+            pickup_branch=get_main_branch,
+            return_branch=get_main_branch,
+            pickup_date=pickup_date,
+            return_date=return_date,
+            add_ons=[get_gps_addon],
+        )
+    assert get_suv_vehicle.status == "available"
+
+    first.remove_addon(get_gps_addon.id)
+    assert inventory.available(get_gps_addon.id, pickup_date, return_date) == 1
+    first.add_addon(get_gps_addon)
+    get_customer.cancel_reservation(first.id)
+    assert inventory.holds_of(first.id) == []
+    assert inventory.available(get_gps_addon.id, pickup_date, return_date) == 1
+
+
+def test_moving_dates_keeps_holds_on_failure(
+    get_customer,
+    get_compact_vehicle,
+    get_suv_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that moving to a full window keeps the holds and the reservation."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    inventory = get_main_branch.add_on_inventory
+    inventory.set_stock(get_gps_addon.id, 1)
+
+    later = return_date + timedelta(days=5)
+    first = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    get_customer.create_reservation(
+        vehicle=get_suv_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=return_date,
+        return_date=later,
+        add_ons=[get_gps_addon],
+    )
+
+    version = first.version
+    with pytest.raises(AddOnUnavailableError):
+        first.return_date = later
+    assert first.return_date == return_date
+    assert first.version == version
+    assert inventory.holds_of(first.id) == [get_gps_addon.id]
+    assert inventory.daily_reserved(get_gps_addon.id, pickup_date, 8) == [1] * 8
+
+    # A branch without stock limits accepts the add-on
+    from src.branch.branch import Branch
+
+    other = Branch(
+        name="Other", city="Izmir", address="Konak", phone_number="+905343940797"
+    )
+    first.pickup_branch = other
+    assert inventory.holds_of(first.id) == []
+    assert inventory.available(get_gps_addon.id, pickup_date, return_date) == 1
@@ -0,0 +1,145 @@
+"""
+Test binary codec module
+
+This module contains unit tests for the schema-driven binary codec.
+Here is a list of the available tests:
+    1. A whole object graph round-trips with its values and identity links.
+    2. A single frame is decoded against known objects, unknown references fail.
+    3. Objects without a schema and malformed frames are rejected.
+    4. A reservation cut at any offset fails as a truncated frame.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pickle
+
+import pytest
+
+from src.custom_errors import UnresolvedReferenceError
+from src.serialization.binary_codec import decode, decode_many, encode, encode_many
+from src.vehicle.maintenance_record import MaintenanceRecord
+
+
+@pytest.fixture
+def get_object_graph(
+    get_customer,
+    get_active_agent,
+    get_active_manager,
+    get_main_branch,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Returns every object of a reservation graph"""
+    pickup_date, return_date = get_pickup_and_return_dates
+    get_economy_vehicle.add_maintenance_record(
+        MaintenanceRecord(vehicle=get_economy_vehicle, note="Oil change")
+    )
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    reservation.invoice.payment_completed()
+    return [
+        get_main_branch,
+        get_customer,
+        get_active_agent,
+        get_active_manager,
+        get_economy_vehicle.vehicle_class,
+        get_economy_vehicle,
+        get_economy_vehicle.maintenance_records[0],
+        get_basic_insurance_tier,
+        get_gps_addon,
+        reservation,
+        reservation.invoice,
+    ]
+
+
+def test_object_graph_round_trip(get_object_graph):
+    """Tests that a whole reservation graph round-trips with its values and links."""
+    data = encode_many(get_object_graph)
+    decoded = decode_many(data)
+    branch, customer, agent, _, vehicle_class, vehicle, record, _, add_on = decoded[:9]
+    reservation, invoice = decoded[9:]
+
+    assert len(data) < len(pickle.dumps(get_object_graph, protocol=5))
+    assert [type(obj) for obj in decoded] == [type(obj) for obj in get_object_graph]
+    assert [obj.id for obj in decoded] == [obj.id for obj in get_object_graph]
+    assert customer.email == get_object_graph[1].email
+    assert customer.birth_date == get_object_graph[1].birth_date
+    assert agent.get_information() == get_object_graph[2].get_information()
+    assert vehicle_class.features == get_object_graph[4].features
+    assert record.note == "Oil change"
+
+    # References are linked to the decoded objects, not copied
+    assert reservation.vehicle is vehicle
+    assert reservation.creator is customer
+    assert reservation.add_ons == [add_on]
+    assert reservation.invoice is invoice and invoice.reservation is reservation
+    assert customer.reservations == [reservation]
+    assert next(iter(branch.employees)) is agent and agent.branch is branch
+    assert vehicle.maintenance_records == [record] and record.vehicle is vehicle
+
+    original = get_object_graph[9]
+    assert reservation.status == original.status
+    assert reservation.total_price == original.total_price
+    assert reservation.price_quote == original.price_quote
+    assert invoice.price_quote == original.invoice.price_quote
+    assert reservation.pickup_date == original.pickup_date
+    assert invoice.status == "completed"
+    assert type(reservation.pricing_strategy.strategy) is type(
+        original.pricing_strategy.strategy
+    )
+
+    # Decoded objects work like constructed ones
+    vehicle.reserve()
+    assert vehicle.status == "reserved"
+    assert vehicle.version == get_object_graph[5].version + 1
+
+
+def test_decode_with_known_objects(get_object_graph):
+    """Tests decoding one vehicle frame against known objects."""
+    vehicle = get_object_graph[5]
+    known = {obj.id: obj for obj in get_object_graph}
+
+    decoded = decode(encode(vehicle), known)
+
+    assert decoded is not vehicle
+    assert decoded.vehicle_class is vehicle.vehicle_class
+    assert decoded.maintenance_records == vehicle.maintenance_records
+    with pytest.raises(UnresolvedReferenceError):
+        decode(encode(vehicle))
+
+
+def test_rejects_unknown_objects_and_malformed_frames(get_object_graph):
+    """Tests that objects without a schema and malformed frames are rejected."""
+    with pytest.raises(TypeError):
+        encode(object())
+
+    frame = encode(get_object_graph[7])
+    with pytest.raises(ValueError):
+        decode(frame + b"\x00")
+    with pytest.raises(ValueError):
+        decode(b"\xff" + frame[1:])
+
+
+def test_truncated_reservation_frames(get_object_graph):
+    """Tests that a reservation cut at any offset raises a truncated frame error."""
+    reservation = get_object_graph[9]
+    known = {obj.id: obj for obj in get_object_graph}
+    frame = encode(reservation)
+    frames = encode_many([reservation, reservation.invoice])
+
+    for size in range(len(frame)):
+        with pytest.raises(ValueError, match="truncated frame"):
+            decode(frame[:size], known)
+    for size in (1, 3, 5, len(frame), len(frames) - 1):
+        with pytest.raises(ValueError, match="truncated frame"):
+            decode_many(frames[:size], known)
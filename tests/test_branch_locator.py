@@ -0,0 +1,154 @@
+"""
+Test branch locator module
+
+This module contains unit tests for branch coordinates and the nearest-branch alternative search.
+Here is a list of the available tests:
+    1. KD-tree nearest branches match a brute force haversine ranking, also across the antimeridian.
+    2. Alternatives only contain other branches with an available vehicle and the add-ons in stock.
+    3. Coordinates survive the binary codec and the rental service returns alternatives.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+
+import pytest
+
+from src.enums import VehicleStatus
+from src.branch.branch import Branch
+from src.branch.branch_locator import BranchLocator, haversine_km
+from src.api.rental_service import RentalService
+from src.serialization.binary_codec import decode, encode
+from src.vehicle.vehicle import Vehicle
+
+
+def _branch(index, latitude=None, longitude=None):
+    return Branch(
+        name=f"Branch {index}",
+        city="Istanbul",
+        address=f"Street {index}",
+        phone_number="+905343940796",
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+def _vehicle(vehicle_class, branch):
+    return Vehicle(
+        vehicle_class=vehicle_class,
+        current_branch=branch,
+        status=VehicleStatus.AVAILABLE,
+        brand="Toyota",
+        model="Corolla",
+        color="White",
+        licence_plate="34ABC123",
+        fuel_level=100,
+        odometer=1000,
+        last_service_odometer=0,
+        price_per_day=60.0,
+    )
+
+
+def test_nearest_matches_brute_force():
+    """Tests KD-tree nearest branches against a brute force haversine ranking."""
+    rng = random.Random(11)
+    branches = [
+        _branch(index, rng.uniform(-89, 89), rng.uniform(-180, 180))
+        for index in range(500)
+    ]
+    # Branches on both sides of the antimeridian
+    branches.append(_branch(500, 10.0, 179.9))
+    branches.append(_branch(501, 10.0, -179.9))
+    branches.append(_branch(502))
+    locator = BranchLocator(branches)
+    assert len(locator) == 502
+
+    for _ in range(50):
+        latitude, longitude = rng.uniform(-89, 89), rng.uniform(-180, 180)
+        expected = sorted(
+            (haversine_km(latitude, longitude, b.latitude, b.longitude), b.name)
+            for b in branches[:-1]
+        )[:7]
+        found = locator.nearest(latitude, longitude, k=7)
+        assert [branch.name for branch, _ in found] == [name for _, name in expected]
+        for (_, distance), (expected_distance, _) in zip(found, expected):
+            assert distance == pytest.approx(expected_distance, abs=1e-6)
+
+    (nearest, distance), _ = locator.nearest(10.0, 179.95, k=2)
+    assert nearest.name in ("Branch 500", "Branch 501") and distance < 10
+
+
+def test_alternatives_with_availability(
+    get_compact_vehicle_class, get_gps_addon, get_pickup_and_return_dates
+):
+    """Tests that alternatives only list branches with a vehicle and the add-ons."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    origin = _branch(0, 41.0, 29.0)
+    near = _branch(1, 41.1, 29.0)
+    middle = _branch(2, 41.5, 29.0)
+    far = _branch(3, 45.0, 29.0)
+    vehicles = [
+        _vehicle(get_compact_vehicle_class, branch)
+        for branch in (origin, near, middle, far)
+    ]
+    locator = BranchLocator([origin, near, middle, far], vehicles)
+
+    def names(**kwargs):
+        return [
+            alternative.branch.name
+            for alternative in locator.alternatives(
+                origin, get_compact_vehicle_class, pickup_date, return_date, **kwargs
+            )
+        ]
+
+    assert names(k=2) == ["Branch 1", "Branch 2"]
+    vehicles[1].reserve()
+    assert names(k=2) == ["Branch 2", "Branch 3"]
+    vehicles[1].current_branch = far
+    vehicles[1].make_available()
+    assert locator.available_vehicles(far, get_compact_vehicle_class) == 2
+
+    middle.add_on_inventory.set_stock(get_gps_addon.id, 0)
+    assert names(add_ons=[get_gps_addon]) == ["Branch 3"]
+
+    # Moved branches are found at their new place after refresh
+    far.set_coordinates(41.05, 29.0)
+    locator.refresh()
+    assert names() == ["Branch 3", "Branch 2"]
+    with pytest.raises(ValueError):
+        locator.alternatives(
+            _branch(9), get_compact_vehicle_class, pickup_date, return_date
+        )
+
+
+def test_codec_and_rental_service(
+    get_customer,
+    get_compact_vehicle_class,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests coordinates in the binary codec and alternatives of the rental service."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    origin = _branch(0, 41.0, 29.0)
+    other = _branch(1, 39.9, 32.8)
+    restored = decode(encode(other))
+    assert (restored.latitude, restored.longitude) == (39.9, 32.8)
+    assert decode(encode(_branch(2))).latitude is None
+    with pytest.raises(ValueError):
+        _branch(3, 91.0, 0.0)
+
+    service = RentalService(
+        branches=[origin, other],
+        vehicles=[_vehicle(get_compact_vehicle_class, other)],
+        customers=[get_customer],
+        insurance_tiers=[get_basic_insurance_tier],
+    )
+    (alternative,) = service.alternatives(
+        origin.id, get_compact_vehicle_class.id, pickup_date, return_date
+    )
+    assert alternative["branch_id"] == other.id
+    assert alternative["available_vehicles"] == 1
+    assert alternative["distance_km"] == pytest.approx(
+        haversine_km(41.0, 29.0, 39.9, 32.8), abs=1e-3
+    )
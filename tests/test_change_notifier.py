@@ -0,0 +1,85 @@
+"""
+Test change notifier module
+
+This module contains unit tests for the change listeners shared by the domain classes.
+Here is a list of the available tests:
+    1. Listeners are called after a change until they are removed.
+    2. Listeners are not pickled and not decoded by the binary codec.
+    3. A listener can reject a change of a user, the old value is restored.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pickle
+
+import pytest
+
+from src.change_notifier import ChangeNotifier
+from src.serialization.binary_codec import decode, encode
+
+
+def test_listeners_are_notified_until_removed(
+    get_economy_vehicle, get_gps_addon, get_basic_insurance_tier
+):
+    """Tests that listeners are called after every change until they are removed."""
+    changes = []
+
+    def listener(obj, field_name):
+        changes.append((obj, field_name))
+
+    for obj in (get_economy_vehicle, get_gps_addon, get_basic_insurance_tier):
+        assert isinstance(obj, ChangeNotifier)
+        obj.add_change_listener(listener)
+    get_economy_vehicle.fuel_level = 0.5
+    get_gps_addon.price_per_day = 7.5
+    get_basic_insurance_tier.price_per_day = 12.0
+    assert changes == [
+        (get_economy_vehicle, "fuel_level"),
+        (get_gps_addon, "price_per_day"),
+        (get_basic_insurance_tier, "price_per_day"),
+    ]
+
+    get_gps_addon.remove_change_listener(listener)
+    get_gps_addon.remove_change_listener(listener)
+    get_gps_addon.price_per_day = 8.0
+    assert len(changes) == 3
+    with pytest.raises(TypeError):
+        get_gps_addon.add_change_listener("listener")
+
+
+def test_listeners_are_not_serialized(get_gps_addon, get_customer):
+    """Tests that listeners are neither pickled nor decoded by the binary codec."""
+    changes = []
+    get_gps_addon.add_change_listener(lambda obj, field_name: changes.append(obj))
+    get_customer.add_change_listener(lambda obj, field_name: changes.append(obj))
+
+    copies = [pickle.loads(pickle.dumps(get_gps_addon)), decode(encode(get_gps_addon))]
+    for copy in copies:
+        copy.price_per_day = 9.0
+    pickle.loads(pickle.dumps(get_customer)).first_name = "Other"
+    assert changes == []
+
+    # The original objects keep their listeners
+    get_gps_addon.price_per_day = 9.0
+    assert changes == [get_gps_addon]
+
+
+def test_listener_rejects_user_change(get_customer):
+    """Tests that a rejecting listener restores the old value of a user."""
+    notified = []
+    get_customer.add_change_listener(
+        lambda user, field_name: notified.append(field_name)
+    )
+
+    def reject(user, field_name):
+        if user.email.endswith("@blocked.com"):
+            raise ValueError("blocked domain")
+
+    get_customer.add_change_listener(reject)
+    email = get_customer.email
+    with pytest.raises(ValueError):
+        get_customer.email = "customer@blocked.com"
+    assert get_customer.email == email
+    # The first listener saw the change and its rollback
+    assert notified == ["email", "email"]
@@ -0,0 +1,202 @@
+"""
+Test collection views module
+
+This module contains unit tests for the read-only collection views returned by entity getters.
+Here is a list of the available tests:
+    1. A ListView follows its list, compares like a list and cannot change it.
+    2. Entity getters return the same view on every access, which follows adds, removes and setters.
+    3. Views are restored after the binary codec and pickling.
+    4. Views returned by getters are accepted back by setters and constructors.
+    5. Employee views of a branch are indexable sequences which follow the directory.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pickle
+
+import pytest
+
+from src.collection_views import DictValuesView, ListView, ViewableList
+from src.pricing_strategy.concrete_strategies import DailyStrategy
+from src.serialization.binary_codec import decode_many, encode_many
+from src.vehicle.maintenance_record import MaintenanceRecord
+
+
+def test_list_view_is_read_only():
+    """Tests that a ListView follows its list, compares like a list and is read-only."""
+    items = ViewableList(["AC", "GPS"])
+    view = items.view
+    assert isinstance(view, ListView) and items.view is view
+    assert view == ["AC", "GPS"] and view == ("AC", "GPS") and view != ["AC"]
+    assert len(view) == 2 and view[1] == "GPS" and view[-1] == "GPS"
+    assert view[:1] == ["AC"] and isinstance(view[:1], list)
+    assert "AC" in view and view.index("GPS") == 1 and view.count("AC") == 1
+    assert list(reversed(view)) == ["GPS", "AC"] and repr(view) == "['AC', 'GPS']"
+
+    # The view follows the list, copies do not
+    snapshot = view.copy()
+    items.append("4x4")
+    assert view == ["AC", "GPS", "4x4"] and snapshot == ["AC", "GPS"]
+
+    with pytest.raises(TypeError):
+        view[0] = "Heated seats"
+    with pytest.raises(TypeError):
+        del view[0]
+    with pytest.raises(AttributeError):
+        view.append("Heated seats")
+    with pytest.raises(TypeError):
+        hash(view)
+
+
+def test_entity_getters_return_live_views(
+    get_customer,
+    get_economy_vehicle,
+    get_main_branch,
+    get_active_agent,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_child_seat_addon,
+    get_pickup_and_return_dates,
+    get_notification_manager,
+    get_customer_notification_subscriber,
+):
+    """Tests that entity getters return one view which follows every change."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    add_ons = reservation.add_ons
+    assert reservation.add_ons is add_ons and add_ons == [get_gps_addon]
+    reservation.add_addon(get_child_seat_addon)
+    assert add_ons == [get_gps_addon, get_child_seat_addon]
+    reservation.remove_addon(get_gps_addon.id)
+    reservation.add_ons = [get_gps_addon]
+    assert add_ons == [get_gps_addon] and reservation.add_ons is add_ons
+
+    vehicle = get_economy_vehicle
+    records = vehicle.maintenance_records
+    record = MaintenanceRecord(vehicle)
+    vehicle.add_maintenance_record(record)
+    assert vehicle.maintenance_records is records and records == [record]
+    with pytest.raises(ValueError):
+        vehicle.add_maintenance_record(record)
+
+    features = vehicle.vehicle_class.features
+    vehicle.vehicle_class.add_feature("Bluetooth")
+    assert "Bluetooth" in features
+    vehicle.vehicle_class.features = ["Heated seats"]
+    assert features == ["Heated seats"]
+
+    subscribers = get_notification_manager.subscribers
+    get_notification_manager.attach(get_customer_notification_subscriber)
+    assert get_notification_manager.subscribers is subscribers
+    assert list(subscribers) == [get_customer_notification_subscriber]
+
+    branch = get_main_branch
+    assert branch.employees is branch.employees
+    assert branch.get_employees_by_role("agent") is branch.get_employees_by_role(
+        "agent"
+    )
+    assert get_active_agent in branch.get_employees_by_status(True)
+
+
+def test_views_survive_serialization(
+    get_economy_vehicle, get_main_branch, get_active_agent
+):
+    """Tests that views are restored after the binary codec and pickling."""
+    vehicle = get_economy_vehicle
+    record = MaintenanceRecord(vehicle)
+    vehicle.add_maintenance_record(record)
+
+    decoded_class, decoded_vehicle, _ = decode_many(
+        encode_many([vehicle.vehicle_class, vehicle, record]),
+        known={get_main_branch.id: get_main_branch},
+    )
+    assert decoded_vehicle.maintenance_records[0].vehicle is decoded_vehicle
+    decoded_class.add_feature("Bluetooth")
+    assert decoded_class.features == vehicle.vehicle_class.features.copy() + [
+        "Bluetooth"
+    ]
+
+    restored = pickle.loads(pickle.dumps(vehicle))
+    restored.add_maintenance_record(MaintenanceRecord(restored))
+    assert len(restored.maintenance_records) == 2
+    assert len(vehicle.maintenance_records) == 1
+
+    branch = pickle.loads(pickle.dumps(get_main_branch))
+    assert [employee.id for employee in branch.employees] == [get_active_agent.id]
+    assert branch.get_employees_by_role("agent") is branch.get_employees_by_role(
+        "agent"
+    )
+
+
+def test_setters_accept_views(
+    get_customer,
+    get_economy_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Tests that setters and constructors accept views returned by getters."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    reservation.add_ons = reservation.add_ons
+    assert reservation.add_ons == [get_gps_addon]
+    quote = DailyStrategy().quote(
+        get_economy_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+        add_ons=reservation.add_ons,
+    )
+    assert quote.subtotal_cents == reservation.price_quote.subtotal_cents
+
+    vehicle = get_economy_vehicle
+    vehicle.add_maintenance_record(MaintenanceRecord(vehicle))
+    vehicle.maintenance_records = vehicle.maintenance_records
+    assert len(vehicle.maintenance_records) == 1
+
+    vehicle_class = vehicle.vehicle_class
+    features = vehicle_class.features.copy()
+    vehicle_class.features = vehicle_class.features
+    assert vehicle_class.features == features
+
+
+def test_employee_views_are_sequences(
+    get_main_branch, get_active_agent, get_active_manager
+):
+    """Tests that employee views of a branch can be indexed and follow the directory."""
+    branch = get_main_branch
+    employees = branch.employees
+    agents = branch.get_employees_by_role("agent")
+    assert isinstance(employees, DictValuesView)
+    assert employees[0] is get_active_agent and employees[-1] is get_active_manager
+    assert employees[:1] == [get_active_agent] and agents[0] is get_active_agent
+    assert employees == [get_active_agent, get_active_manager]
+    assert repr(employees) == repr([get_active_agent, get_active_manager])
+
+    # Positions follow removals and additions
+    branch.remove_employee(get_active_agent.id)
+    assert employees[0] is get_active_manager and len(agents) == 0
+    with pytest.raises(IndexError):
+        agents[0]
+    branch.add_employee(get_active_agent)
+    assert employees[1] is get_active_agent and agents[0] is get_active_agent
+    with pytest.raises(TypeError):
+        employees[0] = get_active_agent
@@ -0,0 +1,291 @@
+"""
+Test concurrency module
+
+This module contains unit tests for thread-safe reservation creation.
+Here is a list of the available tests:
+    1. Compare-and-set changes vehicle status only from the expected status and version.
+    2. Compare-and-set changes reservation status only from the expected status and version.
+    3. 32 customers racing for the same vehicle, exactly one of them wins.
+    4. 32 customers reserving different vehicles concurrently, all of them succeed.
+    5. Vehicle is released when the reservation is rejected.
+    6. Compare-and-set waits for a setter which is changing the reservation.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import threading
+from datetime import date
+
+import pytest
+
+from src.users.customer import Customer
+from src.vehicle.vehicle import Vehicle
+from src.enums import Gender, VehicleStatus, ReservationStatus
+from src.custom_errors import (
+    VehicleNotAvailableError,
+    ReturnDateBeforePickupDateError,
+)
+
+THREADS = 32
+
+
+def _create_customer(index: int) -> Customer:
+    """Creates a customer with a unique email"""
+    return Customer(
+        first_name="Customer",
+        last_name=str(index),
+        gender=Gender.FEMALE,
+        birth_date=date(1990, 1, 1),
+        email=f"customer{index}@gmail.com",
+        address="Beşiktaş",
+        phone_number="+905343940796",
+    )
+
+
+def _create_vehicle(vehicle_class, branch, index: int) -> Vehicle:
+    """Creates an available vehicle with a unique licence plate"""
+    return Vehicle(
+        vehicle_class=vehicle_class,
+        current_branch=branch,
+        status=VehicleStatus.AVAILABLE,
+        brand="Toyota",
+        model="Yaris",
+        color="White",
+        licence_plate=f"ECN-{index:03d}",
+        fuel_level=0.8,
+        last_service_odometer=10_000,
+        odometer=12_500,
+        price_per_day=vehicle_class.base_daily_rate,
+    )
+
+
+def _run_concurrently(targets) -> None:
+    """Starts all targets at the same time and waits for them to finish"""
+    barrier = threading.Barrier(len(targets))
+
+    def run(target):
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_vehicle_compare_and_set_status(get_economy_vehicle):
+    """Tests vehicle compare-and-set with the expected status and version."""
+    version = get_economy_vehicle.version
+
+    # Wrong expected status
+    assert not get_economy_vehicle.compare_and_set_status(
+        VehicleStatus.RESERVED, VehicleStatus.AVAILABLE
+    )
+    # Wrong expected version
+    assert not get_economy_vehicle.compare_and_set_status(
+        VehicleStatus.AVAILABLE, VehicleStatus.RESERVED, expected_version=version + 1
+    )
+    assert get_economy_vehicle.version == version
+
+    # Successful transition
+    assert get_economy_vehicle.compare_and_set_status(
+        VehicleStatus.AVAILABLE, VehicleStatus.RESERVED, expected_version=version
+    )
+    assert get_economy_vehicle.status == VehicleStatus.RESERVED.value
+    assert get_economy_vehicle.version == version + 1
+
+    # Plain setter also bumps version
+    get_economy_vehicle.make_available()
+    assert get_economy_vehicle.version == version + 2
+
+
+def test_reservation_compare_and_set_status(
+    get_customer,
+    get_main_branch,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that a setter invalidates the version a compare-and-set expects."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    version = reservation.version
+
+    # Any change bumps the version, so a stale snapshot is rejected
+    reservation.pickup_branch = get_main_branch
+    assert reservation.version == version + 1
+    assert not reservation.compare_and_set_status(
+        ReservationStatus.PENDING, ReservationStatus.APPROVED, expected_version=version
+    )
+
+    assert reservation.compare_and_set_status(
+        ReservationStatus.PENDING,
+        ReservationStatus.APPROVED,
+        expected_version=reservation.version,
+    )
+    assert reservation.status == ReservationStatus.APPROVED.value
+
+
+def test_concurrent_reservations_of_same_vehicle(
+    get_main_branch,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that exactly one of 32 customers racing for one vehicle reserves it."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    customers = [_create_customer(index) for index in range(THREADS)]
+    successes, failures = [], []
+
+    def reserve(customer):
+        try:
+            successes.append(
+                customer.create_reservation(
+                    vehicle=get_economy_vehicle,
+                    insurance_tier=get_basic_insurance_tier,
+                    pickup_branch=get_main_branch,
+                    return_branch=get_main_branch,
+                    pickup_date=pickup_date,
+                    return_date=return_date,
+                )
+            )
+        except VehicleNotAvailableError:
+            failures.append(customer)
+
+    _run_concurrently([lambda c=customer: reserve(c) for customer in customers])
+
+    assert len(successes) == 1
+    assert len(failures) == THREADS - 1
+    assert get_economy_vehicle.status == VehicleStatus.RESERVED.value
+
+
+def test_concurrent_reservations_of_different_vehicles(
+    get_main_branch,
+    get_economy_vehicle_class,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that 32 customers reserving different vehicles all succeed."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    customers = [_create_customer(index) for index in range(THREADS)]
+    vehicles = [
+        _create_vehicle(get_economy_vehicle_class, get_main_branch, index)
+        for index in range(THREADS)
+    ]
+    errors = []
+
+    def reserve(customer, vehicle):
+        try:
+            customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=get_basic_insurance_tier,
+                pickup_branch=get_main_branch,
+                return_branch=get_main_branch,
+                pickup_date=pickup_date,
+                return_date=return_date,
+            )
+        except VehicleNotAvailableError as error:
+            errors.append(error)
+
+    _run_concurrently(
+        [
+            lambda c=customer, v=vehicle: reserve(c, v)
+            for customer, vehicle in zip(customers, vehicles)
+        ]
+    )
+
+    assert errors == []
+    assert all(vehicle.status == VehicleStatus.RESERVED.value for vehicle in vehicles)
+    assert all(len(customer.reservations) == 1 for customer in customers)
+
+
+def test_vehicle_released_when_reservation_rejected(
+    get_customer,
+    get_main_branch,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that a rejected reservation leaves its vehicle available."""
+    return_date, pickup_date = get_pickup_and_return_dates
+
+    with pytest.raises(ReturnDateBeforePickupDateError):
+        get_customer.create_reservation(
+            vehicle=get_economy_vehicle,
+            insurance_tier=get_basic_insurance_tier,
+            pickup_branch=get_main_branch,
+            return_branch=get_main_branch,
+            pickup_date=pickup_date,
+            return_date=return_date,
+        )
+
+    assert get_economy_vehicle.status == VehicleStatus.AVAILABLE.value
+
+
+def test_setter_and_compare_and_set_are_atomic(
+    get_customer,
+    get_main_branch,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_premium_insurance_tier,
+    get_pickup_and_return_dates,
+    monkeypatch,
+):
+    """Tests that compare-and-set waits for a running setter and sees its version."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    version = reservation.version
+
+    # The setter stops while repricing, after the insurance tier is already assigned
+    repricing, resume = threading.Event(), threading.Event()
+    quote_price = reservation.pricing_strategy.quote_price
+
+    def slow_quote_price(**kwargs):
+        repricing.set()
+        resume.wait(5)
+        return quote_price(**kwargs)
+
+    monkeypatch.setattr(reservation.pricing_strategy, "quote_price", slow_quote_price)
+    setter = threading.Thread(
+        target=setattr,
+        args=(reservation, "insurance_tier", get_premium_insurance_tier),
+    )
+    setter.start()
+    assert repricing.wait(5)
+
+    results = []
+    compare_and_set = threading.Thread(
+        target=lambda: results.append(
+            reservation.compare_and_set_status(
+                ReservationStatus.PENDING,
+                ReservationStatus.APPROVED,
+                expected_version=version,
+            )
+        )
+    )
+    compare_and_set.start()
+    compare_and_set.join(0.2)
+    assert compare_and_set.is_alive()
+
+    resume.set()
+    setter.join(5)
+    compare_and_set.join(5)
+    assert results == [False]
+    assert reservation.status == ReservationStatus.PENDING.value
+    assert reservation.version == version + 1
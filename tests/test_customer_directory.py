@@ -0,0 +1,104 @@
+"""
+Test customer directory module
+
+This module contains unit tests for the indexed customer directory.
+Here is a list of the available tests:
+    1. Customers are found by normalized email, phone number and id.
+    2. Setters keep the indexes correct and a duplicate email is rejected without changing the customer.
+    3. Name prefix search matches first or last name and removed customers are not found.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+
+import pytest
+
+from src.enums import Gender
+from src.users.customer import Customer
+from src.custom_errors import DuplicateEmailError
+from src.users.customer_directory import CustomerDirectory
+
+
+def create_customer(first_name: str, last_name: str, email: str, phone_number: str):
+    return Customer(
+        first_name=first_name,
+        last_name=last_name,
+        gender=Gender.FEMALE,
+        birth_date=date(1990, 1, 1),
+        email=email,
+        address="Beşiktaş",
+        phone_number=phone_number,
+    )
+
+
+def test_lookups(get_customer):
+    """Tests lookups by normalized email, phone number and id."""
+    other = create_customer("Ada", "Lovelace", "ada@crfms.com", "+90 534 394 0796")
+    directory = CustomerDirectory([get_customer, other])
+
+    assert len(directory) == 2
+    assert get_customer.id in directory
+    assert directory.get(other.id) is other
+    assert directory.find_by_email("  ITSPEEY@gmai.com ") is get_customer
+    assert directory.find_by_email("unknown@crfms.com") is None
+    assert set(directory.find_by_phone_number("905343940796")) == {get_customer, other}
+
+    with pytest.raises(ValueError):
+        directory.add(other)
+    with pytest.raises(DuplicateEmailError):
+        directory.add(create_customer("Ada", "Byron", "ADA@crfms.com", "1"))
+    assert len(directory) == 2
+
+
+def test_setters_maintain_indexes(get_customer):
+    """Tests that setters update the indexes and a duplicate email changes nothing."""
+    other = create_customer("Ada", "Lovelace", "ada@crfms.com", "+441234")
+    directory = CustomerDirectory([get_customer, other])
+
+    other.email = "countess@crfms.com"
+    other.phone_number = "+44 999"
+    other.last_name = "King"
+    assert directory.find_by_email("ada@crfms.com") is None
+    assert directory.find_by_email("countess@crfms.com") is other
+    assert directory.find_by_phone_number("+441234") == []
+    assert directory.find_by_phone_number("44999") == [other]
+    assert directory.search_by_name("lovelace") == []
+    assert directory.search_by_name("ada king") == [other]
+
+    with pytest.raises(DuplicateEmailError):
+        other.email = "itspeey@gmai.com"
+    assert other.email == "countess@crfms.com"
+    assert directory.find_by_email("itspeey@gmai.com") is get_customer
+    assert directory.find_by_email("countess@crfms.com") is other
+
+
+def test_name_search_and_remove():
+    """Tests name prefix search and that removed customers are not found."""
+    customers = [
+        create_customer("Ada", "Lovelace", "ada@crfms.com", "1"),
+        create_customer("Adam", "Smith", "adam@crfms.com", "2"),
+        create_customer("Grace", "Adams", "grace@crfms.com", "3"),
+        create_customer("Alan", "Turing", "alan@crfms.com", "4"),
+    ]
+    directory = CustomerDirectory()
+    assert directory.add_many(customers) == 4
+
+    assert directory.search_by_name("ADA") == [customers[0], customers[1], customers[2]]
+    assert directory.search_by_name("ada", limit=1) == [customers[0]]
+    assert directory.search_by_name("  adam   smi") == [customers[1]]
+    assert directory.search_by_name("turing a") == [customers[3]]
+    with pytest.raises(ValueError):
+        directory.search_by_name("  ")
+
+    removed = directory.remove(customers[0].id)
+    assert removed is customers[0]
+    assert directory.search_by_name("ada") == [customers[1], customers[2]]
+    assert directory.find_by_email("ada@crfms.com") is None
+    with pytest.raises(ValueError):
+        directory.remove(customers[0].id)
+
+    # Removed customers are not tracked anymore
+    customers[0].email = "adam@crfms.com"
+    assert directory.find_by_email("adam@crfms.com") is customers[1]
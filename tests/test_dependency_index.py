@@ -0,0 +1,177 @@
+"""
+Test dependency index module
+
+This module contains unit tests for the reverse index of reservations by catalog objects.
+Here is a list of the available tests:
+    1. Reservations are indexed by their catalog objects and the index follows their changes.
+    2. Price changes of catalog objects reprice only their dependent reservations.
+    3. Repricing policies honour quotes and rate rules reprice the reservations of their targets.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pytest
+
+from src.enums import RepricingPolicy, ReservationStatus, VehicleStatus
+from src.pricing_strategy.rate_calendar import RateRule
+from src.reservation.dependency_index import ReservationDependencyIndex
+from src.reservation.repricing_job import RepricingDiff
+
+
+@pytest.fixture
+def reservations(
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_standard_insurance_tier,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Returns a first order reservation with GPS and a regular one without it"""
+    pickup_date, return_date = get_pickup_and_return_dates
+    with_gps = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    without_gps = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_standard_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    return with_gps, without_gps
+
+
+def test_index_follows_reservations(
+    reservations,
+    get_economy_vehicle,
+    get_suv_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_standard_insurance_tier,
+    get_gps_addon,
+    get_child_seat_addon,
+):
+    """Tests that the index follows vehicle, insurance and add-on changes."""
+    with_gps, without_gps = reservations
+    index = ReservationDependencyIndex()
+    index.track_many(reservations)
+    assert len(index) == 2 and with_gps.id in index
+    assert index.reservations_of(get_gps_addon) == [with_gps]
+    assert index.reservations_of(get_main_branch) == [with_gps, without_gps]
+    assert index.reservations_of(get_economy_vehicle.vehicle_class) == [with_gps]
+    with pytest.raises(TypeError):
+        index.reservations_of("GPS")
+
+    # Changes of tracked reservations move them between catalog objects
+    with_gps.remove_addon(get_gps_addon.id)
+    with_gps.add_addon(get_child_seat_addon)
+    with_gps.insurance_tier = get_standard_insurance_tier
+    get_suv_vehicle.status = VehicleStatus.AVAILABLE
+    with_gps.vehicle = get_suv_vehicle
+    assert index.reservations_of(get_gps_addon) == []
+    assert index.reservations_of(get_child_seat_addon) == [with_gps]
+    assert index.reservations_of(get_basic_insurance_tier) == []
+    assert index.reservations_of(get_standard_insurance_tier) == [
+        without_gps,
+        with_gps,
+    ]
+    assert index.reservations_of(get_economy_vehicle) == []
+    assert index.reservations_of(get_suv_vehicle.vehicle_class) == [with_gps]
+
+    # Catalog objects without dependents are not listened to anymore
+    get_gps_addon.price_per_day = 99.0
+    assert index.last_report is None
+
+    # Closed reservations are dropped
+    without_gps.compare_and_set_status(
+        ReservationStatus.PENDING, ReservationStatus.CANCELLED
+    )
+    assert without_gps.id not in index
+    assert index.reservations_of(get_main_branch) == [with_gps]
+    index.untrack(with_gps.id)
+    assert len(index) == 0 and index.reservations_of(get_main_branch) == []
+
+
+def test_price_changes_reprice_dependents(
+    reservations, get_gps_addon, get_basic_insurance_tier, get_compact_vehicle
+):
+    """Tests the new totals of the reservations depending on a changed price."""
+    with_gps, without_gps = reservations
+    index = ReservationDependencyIndex()
+    index.track_many(reservations)
+    untouched_total = without_gps.total_price_cents
+
+    # 3 days of economy 35.00, basic insurance 5.00 and GPS 5.00, 15% discount
+    assert with_gps.total_price_cents == 11475
+    get_gps_addon.price_per_day = get_gps_addon.price_per_day + 4.5
+    assert index.last_report.diffs == [RepricingDiff(with_gps.id, 11475, 12622)]
+    assert with_gps.price_quote.amount_of("add_on") == 2850
+    assert with_gps.invoice.total_price_cents == with_gps.total_price_cents
+    assert without_gps.total_price_cents == untouched_total
+
+    get_basic_insurance_tier.price_per_day = 0.0
+    assert index.last_report.applied == 1
+    assert with_gps.price_quote.amount_of("insurance") == 0
+    assert with_gps.total_price_cents == 11347
+
+    # 3 days of compact vehicle 110.00 and standard insurance 10.00 without a discount
+    get_compact_vehicle.price_per_day = get_compact_vehicle.price_per_day * 2
+    assert index.last_report.diffs == [RepricingDiff(without_gps.id, 19500, 36000)]
+    assert without_gps.invoice.total_price_cents == 36000
+
+    # Base daily rates limit vehicle prices, the totals of the dependents stay the same
+    get_compact_vehicle.vehicle_class.base_daily_rate = 1.0
+    assert index.last_report.diffs == [] and index.last_report.unchanged == 1
+
+
+def test_policies_and_rate_rules(
+    get_rate_calendar, reservations, get_active_agent, get_gps_addon, get_main_branch
+):
+    """Tests the repricing policies and repricing by rate rules."""
+    with_gps, without_gps = reservations
+    index = ReservationDependencyIndex(policy=RepricingPolicy.HONOUR_QUOTE)
+    index.track_many(reservations)
+    quoted_total = with_gps.total_price_cents
+
+    get_gps_addon.price_per_day = get_gps_addon.price_per_day + 10.0
+    assert index.last_report.honoured == [with_gps.id]
+    assert with_gps.total_price_cents == quoted_total
+
+    # Lower totals are passed on, higher ones are not
+    index.policy = RepricingPolicy.LOWER_ONLY
+    assert index.reprice(get_gps_addon).honoured == [with_gps.id]
+    get_gps_addon.price_per_day = 0.0
+    assert index.last_report.applied == 1
+    assert with_gps.total_price_cents == 10200 < quoted_total
+
+    # Approved quotes are honoured, pending reservations are repriced
+    index.policy = RepricingPolicy.HONOUR_APPROVED
+    get_active_agent.approve_reservation(with_gps)
+    approved_total = with_gps.total_price_cents
+    rules = [
+        RateRule(
+            get_main_branch,
+            with_gps.pickup_date,
+            with_gps.return_date,
+            multiplier=1.5,
+        )
+    ]
+    get_rate_calendar.update(rules)
+    report = index.reprice_rules(rules, dry_run=True)
+    assert len(report.diffs) == 2 and report.honoured == [with_gps.id]
+    assert report.applied == 0
+    report = index.reprice_rules(rules)
+    assert report.applied == 1 and with_gps.total_price_cents == approved_total
+    # The compact vehicle costs 55.00 * 1.5 per day at the main branch
+    assert without_gps.total_price_cents == (8250 + 1000) * 3
@@ -0,0 +1,118 @@
+"""
+Test employee directory module
+
+This module contains unit tests for the indexed employees of a branch.
+Here is a list of the available tests:
+    1. Employees are added, found and removed by id and the employees view is read-only and live.
+    2. Secondary indexes follow changes of active status, employment type and branch.
+    3. A directory created from a list indexes every employee and rejects duplicates.
+    4. Branches accept employees views, setting employees keeps earlier views live.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pytest
+
+from src.enums import EmploymentType
+from src.branch.branch import Branch
+from src.branch.employee_directory import EmployeeDirectory
+
+
+def test_membership_operations(get_main_branch, get_active_agent, get_active_manager):
+    """Tests adding, finding and removing employees and the live read-only view."""
+    branch = get_main_branch
+    employees = branch.employees
+    assert list(employees) == [get_active_agent, get_active_manager]
+    assert branch.has_employee(get_active_agent.id)
+    assert branch.get_employee(get_active_manager.id) is get_active_manager
+    assert branch.get_employee("unknown") is None
+
+    with pytest.raises(ValueError):
+        branch.add_employee(get_active_agent)
+    with pytest.raises(AttributeError):
+        employees.append(get_active_agent)
+
+    branch.remove_employee(get_active_agent.id)
+    assert not branch.has_employee(get_active_agent.id)
+    assert list(employees) == [get_active_manager]
+    with pytest.raises(ValueError):
+        branch.remove_employee(get_active_agent.id)
+
+    branch.add_employee(get_active_agent)
+    assert list(employees) == [get_active_manager, get_active_agent]
+
+
+def test_indexes_follow_changes(get_main_branch, get_active_agent, get_active_manager):
+    """Tests that indexes follow active status, employment type and branch changes."""
+    branch = get_main_branch
+    agents = branch.get_employees_by_role("agent")
+    inactive = branch.get_employees_by_status(False)
+    part_time = branch.get_employees_by_employment_type(EmploymentType.PART_TIME)
+    assert list(agents) == [get_active_agent]
+    assert list(branch.get_employees_by_role("manager")) == [get_active_manager]
+    assert len(inactive) == 0 and len(part_time) == 0
+
+    get_active_agent.is_active = False
+    get_active_manager.employment_type = EmploymentType.PART_TIME
+    assert list(inactive) == [get_active_agent]
+    assert list(branch.get_employees_by_status(True)) == [get_active_manager]
+    assert list(part_time) == [get_active_manager]
+    assert list(branch.get_employees_by_employment_type(EmploymentType.FULL_TIME)) == [
+        get_active_agent
+    ]
+
+    other_branch = Branch(
+        name="Airport", city="Istanbul", address="Airport", phone_number="+905343940796"
+    )
+    get_active_agent.branch = other_branch
+    assert len(agents) == 0 and len(inactive) == 0
+    assert list(other_branch.get_employees_by_status(False)) == [get_active_agent]
+
+    with pytest.raises(TypeError):
+        branch.get_employees_by_employment_type("part_time")
+
+
+def test_directory_from_list(get_main_branch, get_active_agent, get_active_manager):
+    """Tests a directory created from a list and its rejection of duplicates."""
+    directory = EmployeeDirectory([get_active_manager, get_active_agent])
+    assert len(directory) == 2 and get_active_agent.id in directory
+    assert list(reversed(directory)) == [get_active_agent, get_active_manager]
+    assert list(directory.by_role("agent")) == [get_active_agent]
+    assert len(directory.by_role("driver")) == 0
+
+    with pytest.raises(ValueError):
+        EmployeeDirectory([get_active_agent, get_active_agent])
+
+    branch = get_main_branch
+    branch.employees = [get_active_manager]
+    assert list(branch.employees) == [get_active_manager]
+    assert len(branch.get_employees_by_role("agent")) == 0
+
+
+def test_set_employees_from_view(get_main_branch, get_active_agent, get_active_manager):
+    """Tests setting branch employees from a view, earlier views stay live."""
+    branch = get_main_branch
+    employees = branch.employees
+    agents = branch.get_employees_by_role("agent")
+
+    branch.employees = branch.employees
+    assert list(employees) == [get_active_agent, get_active_manager]
+    branch.employees = [get_active_manager]
+    assert list(employees) == [get_active_manager] and len(agents) == 0
+    branch.employees = [get_active_agent]
+    assert list(agents) == [get_active_agent]
+
+    # A rejected list leaves the employees unchanged
+    with pytest.raises(ValueError):
+        branch.employees = [get_active_manager, get_active_manager]
+    assert list(employees) == [get_active_agent]
+
+    other = Branch(
+        name="Other branch",
+        city="Ankara",
+        address="Çankaya",
+        phone_number="+905343940796",
+        employees=branch.employees,
+    )
+    assert list(other.employees) == [get_active_agent]
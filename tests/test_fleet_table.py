@@ -0,0 +1,102 @@
+"""
+Test fleet table module
+
+This module contains unit tests for the shared-memory fleet status table.
+Here is a list of the available tests:
+    1. Vehicle changes are mirrored into the table by the writer.
+    2. A reader in another process scans the table by its name.
+    3. Fleet health summary counts statuses, due services and low fuel.
+    4. Closing the writer unregisters its listeners from the vehicles.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import multiprocessing
+
+import pytest
+
+from src.change_notifier import CHANGE_LISTENERS_ATTRIBUTE
+from src.enums import VehicleStatus
+from src.vehicle.fleet_table import FleetTableReader, FleetTableWriter, STATUS_CODES
+
+
+@pytest.fixture
+def get_fleet_table(get_economy_vehicle, get_compact_vehicle, get_suv_vehicle):
+    """Returns a fleet table writer with the three test vehicles registered"""
+    with FleetTableWriter(capacity=8) as writer:
+        writer.register_many(
+            [get_economy_vehicle, get_compact_vehicle, get_suv_vehicle]
+        )
+        yield writer
+
+
+def _count_available(name, capacity, queue):
+    """Runs in a child process"""
+    with FleetTableReader(name, capacity) as reader:
+        queue.put(len(reader.available_vehicles()))
+
+
+def test_writer_mirrors_vehicle_changes(get_fleet_table, get_compact_vehicle):
+    """Tests that status, odometer and fuel changes are mirrored into the table."""
+    with FleetTableReader(get_fleet_table.name, get_fleet_table.capacity) as reader:
+        assert list(reader.available_vehicles()) == [0, 1, 2]
+
+        get_compact_vehicle.reserve()
+        get_compact_vehicle.odometer = 25_000
+        get_compact_vehicle.fuel_level = 0.1
+
+        row = reader.snapshot()[get_fleet_table.vehicle_number(get_compact_vehicle.id)]
+        assert row["status"] == STATUS_CODES[VehicleStatus.RESERVED]
+        assert row["odometer"] == 25_000
+        assert row["fuel_level"] == pytest.approx(0.1)
+        assert list(reader.available_vehicles()) == [0, 2]
+        assert list(reader.availability_by_branch(branch_count=1)) == [2]
+
+        # Readers cannot modify the table
+        with pytest.raises(ValueError):
+            reader.read(lambda records: records.__setitem__(0, records[1]))
+
+
+def test_reader_in_another_process(get_fleet_table, get_suv_vehicle):
+    """Tests a reader attached by name in a child process."""
+    get_suv_vehicle.move_to_maintenance()
+
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_count_available,
+        args=(get_fleet_table.name, get_fleet_table.capacity, queue),
+    )
+    process.start()
+    process.join()
+
+    assert queue.get() == 2
+
+
+def test_fleet_health(get_fleet_table, get_economy_vehicle, get_suv_vehicle):
+    """Tests the counts of statuses, due services and low fuel."""
+    get_economy_vehicle.odometer = 40_000
+    get_suv_vehicle.fuel_level = 0.05
+    get_suv_vehicle.move_to_maintenance()
+
+    with FleetTableReader(get_fleet_table.name, get_fleet_table.capacity) as reader:
+        health = reader.fleet_health(service_interval=15_000, low_fuel_level=0.25)
+
+    assert health["available"] == 2
+    assert health["out_of_service"] == 1
+    assert health["service_due"] == 1
+    assert health["low_fuel"] == 1
+
+
+def test_close_unregisters_listeners(get_economy_vehicle):
+    """Tests that a closed writer is no longer a listener of its vehicles."""
+    writer = FleetTableWriter(capacity=1)
+    writer.register(get_economy_vehicle)
+    writer.close()
+
+    get_economy_vehicle.reserve()
+    get_economy_vehicle.odometer = 30_000
+    assert (
+        writer.on_vehicle_changed
+        not in get_economy_vehicle.__dict__[CHANGE_LISTENERS_ATTRIBUTE]
+    )
@@ -0,0 +1,231 @@
+"""
+Test HTTP API module
+
+This module contains unit tests for the asyncio HTTP API.
+Here is a list of the available tests:
+    1. Full rental flow over one keep-alive connection: search, quote, reserve, approve, pay,
+       pickup and return.
+    2. Domain errors are mapped to HTTP status codes.
+    3. Quotes apply the rates of the pickup branch, like the reservation.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import json
+import asyncio
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from src.branch.branch import Branch
+from src.api.rental_service import RentalService
+from src.api.http_server import HttpServer, RentalApi, create_demo_service
+from src.pricing_strategy.rate_calendar import RateRule
+
+
+def _request(method, path, body=None, connection="keep-alive") -> bytes:
+    payload = json.dumps(body).encode() if body is not None else b""
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: {connection}\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n"
+    ).encode() + payload
+
+
+async def _read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _exchange(steps):
+    """
+    Starts a demo server and runs steps on one connection.
+
+    Each step receives the results so far and returns a list of requests which are sent
+    pipelined; their responses are appended to the results.
+    """
+
+    async def run():
+        executor = ThreadPoolExecutor(2)
+        service = create_demo_service(fleet_size=3, pricing_executor=executor)
+        server = HttpServer(RentalApi(service).handle, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        results = []
+        for step in steps:
+            requests = step(results)
+            writer.write(b"".join(requests))
+            await writer.drain()
+            for _ in requests:
+                results.append(await _read_response(reader))
+        writer.close()
+        await server.close()
+        executor.shutdown()
+        return results
+
+    return asyncio.run(run())
+
+
+def _dates():
+    pickup_date = date.today() + timedelta(days=1)
+    return pickup_date.isoformat(), (pickup_date + timedelta(days=3)).isoformat()
+
+
+def test_rental_flow_over_keep_alive_connection():
+    """Tests a full rental flow over one keep-alive connection."""
+    pickup_date, return_date = _dates()
+    state = {}
+
+    def index(results):
+        return [_request("GET", "/")]
+
+    def search(results):
+        state.update(results[-1][1])
+        return [
+            _request(
+                "GET",
+                f"/branches/{state['branches'][0]}/vehicles?customer_id={state['customers'][0]}"
+                f"&insurance_tier_id={state['insurance_tiers'][0]}"
+                f"&pickup_date={pickup_date}&return_date={return_date}",
+            )
+        ]
+
+    def reserve(results):
+        state["vehicle_id"] = results[-1][1][0]["vehicle_id"]
+        body = {
+            "customer_id": state["customers"][0],
+            "vehicle_id": state["vehicle_id"],
+            "insurance_tier_id": state["insurance_tiers"][0],
+            "pickup_date": pickup_date,
+            "return_date": return_date,
+            "add_on_ids": state["add_ons"][:1],
+        }
+        return [
+            _request("POST", "/quotes", body),
+            _request(
+                "POST",
+                "/reservations",
+                {
+                    **body,
+                    "pickup_branch_id": state["branches"][0],
+                    "return_branch_id": state["branches"][0],
+                },
+            ),
+        ]
+
+    def complete(results):
+        reservation_id = results[-1][1]["id"]
+        path = f"/reservations/{reservation_id}"
+        return [
+            _request("POST", f"{path}/approve", {"agent_id": state["agents"][0]}),
+            _request(
+                "POST",
+                f"{path}/pay",
+                {"card_number": "1234 1234 1234 1234", "cvv": "123", "expiry": "12/30"},
+            ),
+            _request("POST", f"{path}/pickup"),
+            _request("POST", f"{path}/return", connection="close"),
+        ]
+
+    results = _exchange([index, search, reserve, complete])
+    statuses = [status for status, _ in results]
+
+    assert statuses == [200, 200, 200, 201, 200, 200, 200, 200]
+    # Search returns all 3 available vehicles with quotes
+    assert len(results[1][1]) == 3
+    assert all("total_price" in vehicle for vehicle in results[1][1])
+    # Quote matches the reservation price
+    assert results[2][1]["total_price"] == results[3][1]["total_price"]
+    assert results[3][1]["status"] == "pending"
+    assert results[4][1]["status"] == "approved"
+    assert results[5][1]["invoice_status"] == "completed"
+    assert results[6][1]["status"] == "picked_up"
+    assert results[7][1]["status"] == "completed"
+
+
+def test_errors_are_mapped_to_status_codes():
+    """Tests the HTTP status codes of domain errors."""
+    pickup_date, return_date = _dates()
+    state = {}
+
+    def index(results):
+        return [_request("GET", "/")]
+
+    def requests(results):
+        state.update(results[-1][1])
+        reserve = {
+            "customer_id": state["customers"][0],
+            "vehicle_id": state["vehicles"][0],
+            "insurance_tier_id": state["insurance_tiers"][0],
+            "pickup_branch_id": state["branches"][0],
+            "return_branch_id": state["branches"][0],
+            "pickup_date": pickup_date,
+            "return_date": return_date,
+        }
+        return [
+            _request("GET", "/unknown"),
+            _request("POST", "/reservations/unknown/cancel"),
+            _request("POST", "/quotes", {"customer_id": state["customers"][0]}),
+            _request(
+                "POST",
+                "/reservations",
+                {**reserve, "pickup_date": return_date, "return_date": pickup_date},
+            ),
+            _request("POST", "/reservations", reserve),
+            _request("POST", "/reservations", reserve),
+        ]
+
+    results = _exchange([index, requests])
+
+    assert [status for status, _ in results[1:]] == [404, 404, 400, 400, 201, 409]
+    assert results[4][1]["error"] == "ReturnDateBeforePickupDateError"
+    # The vehicle is already reserved by the first successful request
+    assert results[6][1]["error"] == "VehicleNotAvailableError"
+
+
+def test_quote_applies_pickup_branch_rates(
+    get_rate_calendar,
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that quotes apply the rates of the pickup branch, like reservations."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    airport = Branch(
+        name="Airport branch",
+        city="Istanbul",
+        address="Istanbul Airport",
+        phone_number="+905343940797",
+        employees=[],
+    )
+    service = RentalService(
+        branches=[get_main_branch, airport],
+        vehicles=[get_economy_vehicle],
+        customers=[get_customer],
+        insurance_tiers=[get_basic_insurance_tier],
+    )
+    arguments = {
+        "customer_id": get_customer.id,
+        "vehicle_id": get_economy_vehicle.id,
+        "insurance_tier_id": get_basic_insurance_tier.id,
+        "pickup_date": pickup_date,
+        "return_date": return_date,
+    }
+    get_rate_calendar.update([RateRule(airport, pickup_date, return_date, 1.5)])
+    at_vehicle_branch = asyncio.run(service.quote(**arguments))
+    at_airport = asyncio.run(service.quote(**arguments, pickup_branch_id=airport.id))
+    reservation = service.reserve(
+        **arguments,
+        pickup_branch_id=airport.id,
+        return_branch_id=get_main_branch.id,
+    )
+
+    assert at_vehicle_branch["pickup_branch_id"] == get_main_branch.id
+    assert at_airport["total_price_cents"] > at_vehicle_branch["total_price_cents"]
+    assert at_airport["total_price"] == reservation["total_price"]
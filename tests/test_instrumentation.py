@@ -0,0 +1,140 @@
+"""
+Test instrumentation module
+
+This module contains unit tests for the latency histogram and the per-subsystem instrumentation.
+Here is a list of the available tests:
+    1. The histogram reports percentiles within its relative error.
+    2. Only switched on subsystems record calls of the instrumented hot paths.
+    3. Collected metrics are exported in the Prometheus text format and into a local file.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import pytest
+
+from src.instrumentation import metrics
+from src.instrumentation.histogram import LatencyHistogram
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    """Switches every subsystem off and resets the metrics around a test"""
+    metrics.disable()
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def _reserve_and_pay(customer, agent, vehicle, insurance_tier, branch, dates):
+    reservation = customer.create_reservation(
+        vehicle=vehicle,
+        insurance_tier=insurance_tier,
+        pickup_branch=branch,
+        return_branch=branch,
+        pickup_date=dates[0],
+        return_date=dates[1],
+    )
+    agent.approve_reservation(reservation)
+    customer.make_creditcard_payment(reservation, "1234 1234 1234 1234", "123", "12/30")
+    return reservation
+
+
+def test_histogram_percentiles():
+    """Tests histogram percentiles against their relative error."""
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value * 1_000)
+
+    assert histogram.count == 100_000
+    assert histogram.min == 1_000
+    assert histogram.max == 100_000_000
+    for percentile in (50, 90, 99, 99.9):
+        exact = percentile * 1_000_000
+        assert abs(histogram.percentile(percentile) - exact) / exact < 1 / 64
+    assert histogram.percentile(100) == histogram.max
+
+    histogram.reset()
+    assert histogram.count == 0
+    assert histogram.percentile(50) == 0
+    with pytest.raises(ValueError):
+        histogram.percentile(101)
+
+
+def test_only_enabled_subsystems_record(
+    get_customer,
+    get_active_agent,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that only switched on subsystems record calls."""
+    _reserve_and_pay(
+        get_customer,
+        get_active_agent,
+        get_economy_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        get_pickup_and_return_dates,
+    )
+    assert metrics.latency_report() == {}
+
+    metrics.enable("pricing", "payment")
+    _reserve_and_pay(
+        get_customer,
+        get_active_agent,
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        get_pickup_and_return_dates,
+    )
+
+    report = metrics.latency_report()
+    assert set(report) == {"pricing", "payment"}
+    assert report["payment"]["execute_payment"]["count"] == 1
+    assert report["pricing"]["quote_price"]["count"] >= 1
+    assert metrics.get_subsystem("payment").counters["execute_payment_calls"] == 1
+    assert not metrics.is_enabled("reservation")
+
+    with pytest.raises(ValueError):
+        metrics.enable("unknown")
+
+
+def test_prometheus_export(tmp_path):
+    """Tests the Prometheus text export and the local file export."""
+    metrics.configure_from_environment("notification, reservation")
+    assert metrics.is_enabled("notification") and metrics.is_enabled("reservation")
+    assert not metrics.is_enabled("pricing")
+
+    with metrics.span("reservation", "bulk_import"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.span("reservation", "bulk_import"):
+            raise RuntimeError("failed")
+    metrics.count("reservation", "imported", 5)
+    metrics.count("pricing", "ignored")
+
+    text = metrics.export_prometheus()
+    assert "# TYPE crfms_reservation_latency_seconds histogram" in text
+    assert (
+        'crfms_reservation_latency_seconds_bucket{operation="bulk_import",le="+Inf"} 2'
+        in text
+    )
+    assert 'crfms_reservation_latency_seconds_count{operation="bulk_import"} 2' in text
+    assert "crfms_reservation_bulk_import_errors_total 1" in text
+    assert "crfms_reservation_imported_total 5" in text
+    assert "crfms_pricing" not in text
+
+    buckets = [
+        int(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line.startswith("crfms_reservation_latency_seconds_bucket")
+    ]
+    assert buckets == sorted(buckets)
+
+    path = tmp_path / "crfms.prom"
+    metrics.write_prometheus(str(path))
+    assert path.read_text(encoding="utf-8") == text
@@ -0,0 +1,249 @@
+"""
+Test invoice exporter module
+
+This module contains unit tests for the streaming invoice exporter.
+Here is a list of the available tests:
+    1. CSV export contains every invoice with its reservation, customer and line item totals.
+    2. Gzip-compressed JSONL export with status and branch filters.
+    3. Rows are encoded in bounded-size chunks.
+    4. Invoices of archived reservations are still exported.
+    5. Vehicle amounts apply the multipliers of the rate calendar, the discount is not negative.
+    6. Exported amounts are the billed quote, price changes keep them and a reprice replaces them.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import io
+import csv
+import gzip
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from src.enums import ExportFormat, InvoiceStatus, ReservationStatus
+from src.export.invoice_exporter import (
+    encode_rows,
+    export_invoices,
+    invoice_rows,
+    invoices_of,
+)
+from src.pricing_strategy.rate_calendar import RateRule
+from src.reservation.repricing_job import RepricingJob
+from src.serialization.reservation_archive import (
+    ReservationArchive,
+    get_reservation_archive,
+    set_reservation_archive,
+)
+
+
+@pytest.fixture
+def get_invoices(
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Creates two reservations, the first one is paid"""
+    pickup_date, return_date = get_pickup_and_return_dates
+    for vehicle in [get_economy_vehicle, get_compact_vehicle]:
+        get_customer.create_reservation(
+            vehicle=vehicle,
+            insurance_tier=get_basic_insurance_tier,
+            pickup_branch=get_main_branch,
+            return_branch=get_main_branch,
+            pickup_date=pickup_date,
+            return_date=return_date,
+            add_ons=[get_gps_addon],
+        )
+    get_customer.reservations[0].invoice.payment_completed()
+    return list(invoices_of([get_customer]))
+
+
+def test_csv_export(get_invoices, get_customer):
+    """Tests the CSV export of invoices with reservation, customer and line items."""
+    destination = io.BytesIO()
+
+    count = export_invoices(get_invoices, destination, ExportFormat.CSV)
+
+    rows = list(csv.DictReader(io.StringIO(destination.getvalue().decode())))
+    assert count == 2
+    assert [row["invoice_id"] for row in rows] == [i.id for i in get_invoices]
+    assert rows[0]["invoice_status"] == "completed"
+    assert rows[0]["customer_email"] == get_customer.email
+    assert rows[0]["rental_days"] == "3"
+    # Line items and discount add up to the invoice total
+    amounts = [
+        float(rows[0][column])
+        for column in ["vehicle_amount", "insurance_amount", "add_ons_amount"]
+    ]
+    assert sum(amounts) - float(rows[0]["discount"]) == pytest.approx(
+        get_invoices[0].total_price
+    )
+
+
+def test_gzip_jsonl_export_with_filters(get_invoices, get_main_branch, tmp_path):
+    """Tests the gzip-compressed JSONL export with status and branch filters."""
+    path = tmp_path / "invoices.jsonl.gz"
+
+    count = export_invoices(
+        get_invoices,
+        path,
+        ExportFormat.JSONL_GZIP,
+        statuses=[InvoiceStatus.PENDING],
+        branch_ids=[get_main_branch.id],
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+
+    with gzip.open(path, "rt") as file:
+        rows = [json.loads(line) for line in file]
+    assert count == 1
+    assert rows[0]["invoice_id"] == get_invoices[1].id
+    assert [item["item"] for item in rows[0]["line_items"]] == [
+        "vehicle",
+        "insurance",
+        "add_on",
+    ]
+
+    # Nothing matches an unknown branch or a past date range
+    assert export_invoices(get_invoices, io.BytesIO(), branch_ids=["unknown"]) == 0
+    yesterday = date.today() - timedelta(days=1)
+    assert export_invoices(get_invoices, io.BytesIO(), end_date=yesterday) == 0
+
+
+def test_rows_are_encoded_in_bounded_chunks(get_invoices):
+    """Tests that rows are encoded in bounded-size chunks."""
+    rows = list(invoice_rows(get_invoices)) * 50
+    row_size = max(len(json.dumps(row)) for row in rows) * 2
+
+    chunks = list(encode_rows(rows, ExportFormat.JSONL, chunk_size=row_size))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < row_size * 2 for chunk in chunks)
+    assert sum(chunk.count(b"\n") for chunk in chunks) == len(rows)
+    with pytest.raises(ValueError):
+        list(encode_rows(rows, ExportFormat.CSV, chunk_size=0))
+
+
+def test_export_after_archiving(
+    get_invoices,
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_gps_addon,
+    tmp_path,
+):
+    """Tests that invoices of archived reservations are still exported."""
+    known = {
+        obj.id: obj
+        for obj in (
+            get_economy_vehicle,
+            get_compact_vehicle,
+            get_basic_insurance_tier,
+            get_main_branch,
+            get_gps_addon,
+        )
+    }
+    previous = get_reservation_archive()
+    archive = ReservationArchive(tmp_path / "archive", known)
+    set_reservation_archive(archive)
+    try:
+        get_customer.reservations[0].status = ReservationStatus.COMPLETED
+        report = archive.archive(
+            [get_customer], today=date.today() + timedelta(days=365)
+        )
+        assert report.reservations == 1 and len(get_customer.reservations) == 1
+
+        destination = io.BytesIO()
+        count = export_invoices(invoices_of([get_customer]), destination)
+        rows = list(csv.DictReader(io.StringIO(destination.getvalue().decode())))
+        assert count == 2
+        assert [row["invoice_id"] for row in rows] == [i.id for i in get_invoices]
+        assert rows[0]["invoice_status"] == "completed"
+    finally:
+        set_reservation_archive(previous)
+        archive.close()
+
+
+def test_vehicle_amount_applies_rate_calendar(
+    get_rate_calendar,
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Tests that vehicle amounts apply the rate calendar multipliers."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    get_rate_calendar.update([RateRule(get_main_branch, pickup_date, return_date, 2.0)])
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+
+    (row,) = invoice_rows([reservation.invoice])
+    vehicle_cents = 2 * get_economy_vehicle.price_per_day_cents * row["rental_days"]
+    assert row["vehicle_amount"] == vehicle_cents / 100
+    assert row["line_items"][0]["amount"] == row["vehicle_amount"]
+    assert row["line_items"][0]["price_per_day"] == get_economy_vehicle.price_per_day
+    assert row["discount"] >= 0
+    assert row["vehicle_amount"] + row["insurance_amount"] + row[
+        "add_ons_amount"
+    ] - row["discount"] == pytest.approx(row["total_price"])
+
+
+def test_exported_amounts_are_the_billed_quote(
+    get_rate_calendar,
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Tests that exported amounts stay the billed quote until a reprice."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_economy_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+        add_ons=[get_gps_addon],
+    )
+    (billed,) = invoice_rows([reservation.invoice])
+    assert billed["discount"] == reservation.price_quote.discount_cents / 100 > 0
+
+    # Price changes after billing do not change the exported amounts
+    get_economy_vehicle.price_per_day = get_economy_vehicle.price_per_day + 20
+    get_gps_addon.price_per_day = get_gps_addon.price_per_day + 5
+    assert list(invoice_rows([reservation.invoice])) == [billed]
+
+    # A reprice replaces the billed quote with the new line items and discount
+    get_rate_calendar.update([RateRule(get_main_branch, pickup_date, return_date, 0.5)])
+    assert RepricingJob(workers=0).run([reservation]).applied == 1
+    (repriced,) = invoice_rows([reservation.invoice])
+    quote = reservation.invoice.price_quote
+    assert (
+        repriced["line_items"][0]["price_per_day"] == get_economy_vehicle.price_per_day
+    )
+    assert repriced["line_items"][2]["price_per_day"] == get_gps_addon.price_per_day
+    assert repriced["discount"] == quote.discount_cents / 100
+    assert quote.total_cents == reservation.invoice.total_price_cents
+    assert sum(item["amount"] for item in repriced["line_items"]) - repriced[
+        "discount"
+    ] == pytest.approx(repriced["total_price"])
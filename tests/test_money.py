@@ -0,0 +1,159 @@
+"""
+Test money module
+
+This module contains unit tests for the integer cents money representation.
+Here is a list of the available tests:
+    1. Amounts are converted to cents exactly and sums of cents are exact.
+    2. Pricing strategies calculate in cents and round discounts half up to a cent.
+    3. Reservations, invoices and payments carry the same total in cents.
+    4. calculate_price keeps returning an amount, calculate_price_cents returns cents.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.money import (
+    apply_discount,
+    format_cents,
+    sum_cents,
+    to_amount,
+    to_cents,
+)
+from src.pricing_strategy.concrete_strategies import (
+    DailyStrategy,
+    FirstOrderStrategy,
+    LoyaltyStrategy,
+)
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.payment.concrete_factories import PaypalPaymentCreator
+
+
+def test_conversions_and_sums():
+    """Tests exact conversions to cents and exact sums of cents."""
+    assert to_cents(45) == 4500
+    assert to_cents(0.1) == 10
+    assert to_cents(19.99) == 1999
+    assert to_cents(0.285) == 29
+    assert to_cents(Decimal("2.675")) == 268
+    assert to_amount(1999) == 19.99
+    assert format_cents(123456789) == "1,234,567.89"
+    assert format_cents(-5) == "-0.05"
+    with pytest.raises(TypeError):
+        to_cents("10")
+    with pytest.raises(TypeError):
+        to_cents(True)
+    with pytest.raises(ValueError):
+        to_cents(float("nan"))
+
+    # Ten cents a million times, floats drift but cents do not
+    assert sum([0.1] * 1_000_000) != 100_000
+    assert sum_cents([to_cents(0.1)] * 1_000_000) == 10_000_000
+    assert sum_cents(np.full(1_000_000, 10, dtype=np.int32)) == 10_000_000
+    with pytest.raises(TypeError):
+        sum_cents(np.array([0.1]))
+
+
+def test_strategies_round_discounts(
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_pickup_and_return_dates,
+):
+    """Tests strategy totals in cents with discounts rounded half up."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    rental_days = (return_date - pickup_date).days
+    get_compact_vehicle.price_per_day = 55.03
+    subtotal = (
+        5503
+        + get_basic_insurance_tier.price_per_day_cents
+        + get_gps_addon.price_per_day_cents
+    ) * rental_days
+
+    arguments = (
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+    )
+    daily = DailyStrategy().calculate_cents(*arguments, add_ons=[get_gps_addon])
+    first_order = FirstOrderStrategy().calculate_cents(
+        *arguments, add_ons=[get_gps_addon]
+    )
+    loyalty = LoyaltyStrategy().calculate_cents(*arguments, add_ons=[get_gps_addon])
+
+    assert daily == subtotal
+    assert isinstance(first_order, int) and isinstance(loyalty, int)
+    assert first_order == apply_discount(subtotal, 15)
+    assert loyalty == apply_discount(subtotal, 10)
+    # 15% of 0.10 is 1.5 cents, rounded half up to a discount of 2 cents
+    assert apply_discount(10, 15) == 8
+    assert apply_discount(50, 15) == 42
+    assert apply_discount(999, 0) == 999
+    with pytest.raises(ValueError):
+        apply_discount(100, 101)
+
+
+def test_totals_in_cents_end_to_end(
+    get_customer,
+    get_active_agent,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that reservation, invoice and payment carry the same cents."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    assert isinstance(reservation.total_price_cents, int)
+    assert reservation.total_price == to_amount(reservation.total_price_cents)
+    assert reservation.invoice.total_price_cents == reservation.total_price_cents
+
+    get_active_agent.approve_reservation(reservation)
+    receipt = get_customer.make_paypal_payment(reservation, get_customer.email, "token")
+    assert f"${format_cents(reservation.total_price_cents)}" in receipt
+    assert reservation.invoice.status == "completed"
+
+    payment = PaypalPaymentCreator(email=get_customer.email, auth_token="token")
+    with pytest.raises(TypeError):
+        payment.execute_payment(reservation.total_price)
+    with pytest.raises(ValueError):
+        payment.execute_payment(-1)
+
+
+def test_calculate_price_returns_amount(
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that calculate_price returns an amount and calculate_price_cents cents."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    get_compact_vehicle.price_per_day = 55.03
+    arguments = (
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+    )
+    pricing = PricingStrategy(get_customer)
+
+    cents = pricing.calculate_price_cents(*arguments)
+    amount = pricing.calculate_price(*arguments)
+    assert isinstance(cents, int) and isinstance(amount, float)
+    assert amount == to_amount(cents)
+    assert cents == pricing.quote_price(*arguments).total_cents
+    assert DailyStrategy().calculate(*arguments) == to_amount(
+        DailyStrategy().calculate_cents(*arguments)
+    )
@@ -0,0 +1,128 @@
+"""
+Test profiler module
+
+This module contains unit tests for the sampling profiler.
+Here is a list of the available tests:
+    1. Samples of the main thread are aggregated per subsystem and written as collapsed stacks.
+    2. Other threads are sampled by the background thread.
+    3. Scripts run from the command line write collapsed stacks and a top functions report.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import time
+import threading
+
+import pytest
+
+from src.instrumentation.profiler import SamplingProfiler, main
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+
+SCRIPT = """
+from datetime import date, timedelta
+from src import utils
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+
+branch = utils.create_test_branch()
+vehicle = utils.create_bmw(utils.create_economy_vehicle_class(), branch)
+insurance_tier = utils.create_premium_insurance_tier()
+pricing = PricingStrategy(utils.create_test_customer())
+for _ in range(20_000):
+    pricing.calculate_price(vehicle, insurance_tier, date.today(), date.today() + timedelta(days=3))
+"""
+
+
+def _price_repeatedly(customer, vehicle, insurance_tier, dates, seconds):
+    pricing = PricingStrategy(customer)
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pricing.calculate_price(vehicle, insurance_tier, *dates)
+
+
+def test_main_thread_samples(
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests main thread samples per subsystem, written as collapsed stacks."""
+    with pytest.raises(ValueError):
+        SamplingProfiler(rate=0)
+
+    with SamplingProfiler(rate=1_000) as profiler:
+        with pytest.raises(RuntimeError):
+            profiler.start()
+        _price_repeatedly(
+            get_customer,
+            get_economy_vehicle,
+            get_basic_insurance_tier,
+            get_pickup_and_return_dates,
+            0.3,
+        )
+    assert not profiler.is_running
+
+    samples = profiler.samples_by_subsystem()
+    assert profiler.sample_count > 10
+    assert samples["pricing"] > samples["reservation"]
+
+    for line in profiler.collapsed_stacks("pricing"):
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert "src.pricing_strategy." in stack
+        assert "src.instrumentation.profiler" not in stack
+
+    top = profiler.top_functions(5)
+    assert [entry[1] for entry in top] == sorted(
+        (entry[1] for entry in top), reverse=True
+    )
+    assert all(self_count <= total for _, self_count, total in top)
+    assert "pricing" in profiler.report()
+    with pytest.raises(ValueError):
+        profiler.collapsed_stacks("unknown")
+
+
+def test_background_thread_samples(
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that other threads are sampled by the background thread."""
+    worker = threading.Thread(
+        target=_price_repeatedly,
+        args=(
+            get_customer,
+            get_economy_vehicle,
+            get_basic_insurance_tier,
+            get_pickup_and_return_dates,
+            0.3,
+        ),
+    )
+    worker.start()
+    with SamplingProfiler(rate=500, thread_ids=[worker.ident]) as profiler:
+        worker.join()
+
+    assert profiler.sample_count > 0
+    assert all(
+        "test_profiler:_price_repeatedly" in line
+        for line in profiler.collapsed_stacks()
+    )
+
+
+def test_command_line(tmp_path, capsys):
+    """Tests the collapsed stacks and top functions report of the command line."""
+    script = tmp_path / "batch_job.py"
+    script.write_text(SCRIPT, encoding="utf-8")
+    output = tmp_path / "profile"
+
+    main(["--rate", "1000", "--output", str(output), "--top", "5", str(script)])
+
+    assert (output / "all.collapsed").exists()
+    assert (output / "pricing.collapsed").exists()
+    assert "batch_job:<module>" in (output / "all.collapsed").read_text(
+        encoding="utf-8"
+    )
+    report = (output / "top.txt").read_text(encoding="utf-8")
+    assert "self" in report and "pricing" in report
+    assert "Wrote" in capsys.readouterr().err
@@ -0,0 +1,185 @@
+"""
+Test rate calendar module
+
+This module contains unit tests for seasonal rates and prefix-sum range pricing.
+Here is a list of the available tests:
+    1. Branch, vehicle class and vehicle rules are combined with overrides winning over multipliers.
+    2. Pricing strategies and reservations charge the seasonal vehicle cost.
+    3. Bulk updates with weekdays are validated at once and invalidate the cached prefix sums.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.branch.branch import Branch
+from src.money import apply_discount
+from src.pricing_strategy.concrete_strategies import DailyStrategy
+from src.pricing_strategy.rate_calendar import RateRule
+
+# A Tuesday far enough in the future
+START = date(2030, 1, 1)
+
+
+def _other_branch():
+    return Branch(
+        name="Other branch",
+        city="Ankara",
+        address="Çankaya",
+        phone_number="+905343940796",
+        employees=[],
+    )
+
+
+def test_levels_and_precedence(get_rate_calendar, get_compact_vehicle, get_main_branch):
+    """Tests how branch, vehicle class and vehicle rules combine."""
+    vehicle = get_compact_vehicle
+    assert vehicle.price_per_day_cents == 5500
+    get_rate_calendar.set_multiplier(
+        get_main_branch, START, START + timedelta(days=10), 1.1
+    )
+    get_rate_calendar.set_multiplier(
+        vehicle.vehicle_class,
+        START + timedelta(days=5),
+        START + timedelta(days=10),
+        1.2,
+    )
+    get_rate_calendar.set_override(
+        vehicle, START + timedelta(days=7), START + timedelta(days=8), 80.0
+    )
+    assert len(get_rate_calendar) == 3
+
+    # 5 days at 60.50, 4 days at 72.60 and one day at 80.00
+    assert (
+        get_rate_calendar.vehicle_cost(vehicle, START, START + timedelta(days=10))
+        == 67290
+    )
+    # Days before the calendar are charged price_per_day
+    window = (START - timedelta(days=3), START + timedelta(days=2))
+    assert get_rate_calendar.vehicle_cost(vehicle, *window) == 3 * 5500 + 2 * 6050
+    # Rules of another pickup branch do not apply
+    assert (
+        get_rate_calendar.vehicle_cost(
+            vehicle, START, START + timedelta(days=10), _other_branch()
+        )
+        == 5 * 5500 + 4 * 6600 + 8000
+    )
+    assert get_rate_calendar.daily_prices(
+        vehicle, START + timedelta(days=4), START + timedelta(days=8)
+    ).tolist() == [6050, 7260, 7260, 8000]
+    assert get_rate_calendar.vehicle_cost(vehicle, START, START) == 0
+
+    with pytest.raises(ValueError):
+        get_rate_calendar.set_multiplier(vehicle, START, START, 1.1)
+    with pytest.raises(ValueError):
+        get_rate_calendar.set_multiplier(vehicle, START, START + timedelta(days=1), 11)
+    with pytest.raises(ValueError):
+        get_rate_calendar.set_override(vehicle, START, START + timedelta(days=1), -1.0)
+    with pytest.raises(TypeError):
+        get_rate_calendar.set_multiplier(
+            "vehicle", START, START + timedelta(days=1), 1.1
+        )
+
+
+def test_strategies_use_seasonal_rates(
+    get_rate_calendar,
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that strategies and reservations charge the seasonal vehicle cost."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    rental_days = (return_date - pickup_date).days
+    get_rate_calendar.set_multiplier(get_main_branch, pickup_date, return_date, 1.5)
+    insurance_cost = get_basic_insurance_tier.price_per_day_cents * rental_days
+
+    assert DailyStrategy().calculate_cents(
+        get_compact_vehicle, get_basic_insurance_tier, pickup_date, return_date
+    ) == (8250 * rental_days + insurance_cost)
+
+    reservation = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    # First order discount applies to the seasonal price
+    assert reservation.total_price_cents == apply_discount(
+        8250 * rental_days + insurance_cost, 15
+    )
+
+    reservation.pickup_branch = _other_branch()
+    assert reservation.total_price_cents == apply_discount(
+        5500 * rental_days + insurance_cost, 15
+    )
+
+
+def test_bulk_updates_and_invalidation(get_rate_calendar, get_compact_vehicle):
+    """Tests validation of bulk updates and invalidation of the prefix sums."""
+    vehicle = get_compact_vehicle
+    vehicle_class = vehicle.vehicle_class
+    week = (START, START + timedelta(days=7))
+    weekend = {5, 6}
+
+    applied = get_rate_calendar.update(
+        [
+            RateRule(
+                vehicle_class,
+                START,
+                START + timedelta(days=14),
+                multiplier=1.25,
+                weekdays=weekend,
+            ),
+            RateRule(vehicle_class, START, START + timedelta(days=1), override=40.0),
+        ]
+    )
+    assert applied == 2
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 5500 + 2 * 6875
+
+    # Prefix sums follow the price of the vehicle and updated rules
+    vehicle.price_per_day = 60.0
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 6000 + 2 * 7500
+    get_rate_calendar.set_multiplier(vehicle_class, *week, 2, weekdays=weekend)
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 6000 + 2 * 12000
+
+    # An invalid rule rejects the whole update
+    with pytest.raises(ValueError):
+        get_rate_calendar.update(
+            [
+                RateRule(vehicle_class, *week, multiplier=1),
+                RateRule(vehicle, *week, weekdays={7}),
+            ]
+        )
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 6000 + 2 * 12000
+    with pytest.raises(ValueError):
+        get_rate_calendar.update(
+            [
+                RateRule(vehicle_class, *week, multiplier=1),
+                RateRule(vehicle, *week, override=30_000_000.0),
+            ]
+        )
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 6000 + 2 * 12000
+
+    # Growing the calendar keeps earlier rules
+    far = START + timedelta(days=1000)
+    get_rate_calendar.set_multiplier(vehicle, far, far + timedelta(days=1), 3)
+    assert get_rate_calendar.first_day == START
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 4000 + 4 * 6000 + 2 * 12000
+    assert (
+        get_rate_calendar.vehicle_cost(vehicle, far, far + timedelta(days=2))
+        == 18000 + 6000
+    )
+
+    get_rate_calendar.clear(vehicle_class, START, START + timedelta(days=1))
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 5 * 6000 + 2 * 12000
+    get_rate_calendar.clear(vehicle_class)
+    get_rate_calendar.clear(vehicle)
+    assert len(get_rate_calendar) == 0
+    assert get_rate_calendar.vehicle_cost(vehicle, *week) == 7 * 6000
@@ -0,0 +1,233 @@
+"""
+Test rental aggregates module
+
+This module contains unit tests for the incremental revenue and utilization aggregates.
+Here is a list of the available tests:
+    1. Payment, pickup, return and cancellation update the aggregates incrementally.
+    2. Rebuilding from reservations gives the same aggregates as incremental updates.
+    3. Range queries ignore unknown keys and days outside the stored history.
+    4. Rebuilding from open reservations of a new vehicle class numbers the class for queries.
+    5. Extending a picked up rental moves its rented days, like a rebuild.
+    6. Reopening a cancelled reservation removes its cancellation, like a rebuild.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.enums import ReservationStatus
+from src.analytics.rental_aggregates import RentalAggregates, METRIC_DTYPES
+
+
+def _create_rentals(customer, vehicles, insurance_tier, branch, dates):
+    """Creates two reservations for the same window"""
+    pickup_date, return_date = dates
+    completed, cancelled = [
+        customer.create_reservation(
+            vehicle=vehicle,
+            insurance_tier=insurance_tier,
+            pickup_branch=branch,
+            return_branch=branch,
+            pickup_date=pickup_date,
+            return_date=return_date,
+        )
+        for vehicle in vehicles
+    ]
+    return completed, cancelled
+
+
+def _complete(customer, agent, reservation):
+    agent.approve_reservation(reservation)
+    customer.make_creditcard_payment(reservation, "1234 1234 1234 1234", "123", "12/30")
+    customer.pickup_vehicle(reservation.id)
+    customer.return_vehicle(reservation.id)
+
+
+@pytest.fixture
+def get_rentals(
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Returns reservations of the economy and compact vehicles for one window"""
+    return _create_rentals(
+        get_customer,
+        [get_economy_vehicle, get_compact_vehicle],
+        get_basic_insurance_tier,
+        get_main_branch,
+        get_pickup_and_return_dates,
+    )
+
+
+def test_incremental_updates(
+    get_rentals,
+    get_customer,
+    get_active_agent,
+    get_main_branch,
+    get_economy_vehicle,
+    get_compact_vehicle,
+):
+    """Tests aggregate updates on payment, pickup, return and cancellation."""
+    completed, cancelled = get_rentals
+    aggregates = RentalAggregates()
+    aggregates.add_vehicles([get_economy_vehicle, get_compact_vehicle])
+    aggregates.track(completed)
+    aggregates.track(cancelled)
+
+    pickup_date, return_date = completed.pickup_date, completed.return_date
+    last_day = return_date - timedelta(days=1)
+    branch_id = get_main_branch.id
+    economy_id = get_economy_vehicle.vehicle_class.id
+    assert aggregates.total("revenue", date.min, date.max) == 0
+
+    _complete(get_customer, get_active_agent, completed)
+    get_customer.cancel_reservation(cancelled.id)
+
+    assert (
+        aggregates.total("revenue", date.today(), date.today())
+        == completed.total_price_cents
+    )
+    assert aggregates.total("pickups", pickup_date, pickup_date, branch_id) == 1
+    assert aggregates.total("returns", return_date, return_date, branch_id) == 1
+    assert aggregates.total("cancellations", pickup_date, pickup_date) == 1
+    assert aggregates.total("rented_days", pickup_date, return_date) == 3
+    assert list(aggregates.daily("rented_days", pickup_date, return_date)) == [
+        1,
+        1,
+        1,
+        0,
+    ]
+    assert aggregates.by_vehicle_class("rented_days", pickup_date, last_day) == {
+        economy_id: 3,
+        get_compact_vehicle.vehicle_class.id: 0,
+    }
+    # One of two vehicles is on rent for the whole window
+    assert aggregates.utilization(pickup_date, last_day) == pytest.approx(0.5)
+    assert aggregates.utilization(pickup_date, last_day, branch_id, economy_id) == 1
+
+    # Repeated status changes are not counted twice
+    completed.status = ReservationStatus.COMPLETED
+    assert aggregates.total("pickups", date.min, date.max) == 1
+
+
+def test_rebuild_matches_incremental_updates(
+    get_rentals, get_customer, get_active_agent
+):
+    """Tests that a rebuild gives the aggregates of the incremental updates."""
+    completed, cancelled = get_rentals
+    incremental = RentalAggregates()
+    incremental.track(completed)
+    incremental.track(cancelled)
+    _complete(get_customer, get_active_agent, completed)
+    get_customer.cancel_reservation(cancelled.id)
+
+    rebuilt = RentalAggregates()
+    rebuilt.rebuild(get_customer.reservations)
+
+    start, end = date.today(), date.today() + timedelta(days=30)
+    for metric in METRIC_DTYPES:
+        assert np.array_equal(
+            incremental.daily(metric, start, end), rebuilt.daily(metric, start, end)
+        )
+    assert rebuilt.tracked_count == 2
+
+
+def test_range_queries_outside_history(get_rentals, get_customer, get_active_agent):
+    """Tests range queries with unknown keys and days outside the history."""
+    completed, _ = get_rentals
+    aggregates = RentalAggregates()
+    aggregates.track(completed)
+    _complete(get_customer, get_active_agent, completed)
+
+    assert (
+        aggregates.total("revenue", date.min, date.max) == completed.total_price_cents
+    )
+    assert aggregates.total("revenue", date.min, date.min) == 0
+    assert aggregates.total("revenue", date.min, date.max, branch_id="unknown") == 0
+    assert aggregates.utilization(date.min, date.max) == 0
+    with pytest.raises(ValueError):
+        aggregates.total("profit", date.min, date.max)
+
+
+def test_rebuild_open_reservations_of_new_vehicle_class(
+    get_customer,
+    get_economy_vehicle,
+    get_suv_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests rebuilding from open reservations of a vehicle class seen first."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    aggregates = RentalAggregates()
+    aggregates.add_vehicle(get_economy_vehicle)
+    pending = get_customer.create_reservation(
+        vehicle=get_suv_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+
+    # Pending reservations have no events, their vehicle class is still numbered
+    aggregates.rebuild([pending])
+    suv_id = get_suv_vehicle.vehicle_class.id
+    assert suv_id in aggregates.vehicle_class_ids
+    assert aggregates.total("revenue", pickup_date, return_date) == 0
+    assert aggregates.by_vehicle_class("revenue", pickup_date, return_date)[suv_id] == 0
+    assert aggregates.utilization(pickup_date, return_date) == 0
+
+
+def test_extended_rental_moves_rented_days(get_rentals, get_customer, get_active_agent):
+    """Tests that extending a picked up rental moves its rented days."""
+    rental, _ = get_rentals
+    aggregates = RentalAggregates()
+    aggregates.track(rental)
+    get_active_agent.approve_reservation(rental)
+    get_customer.make_creditcard_payment(rental, "1234 1234 1234 1234", "123", "12/30")
+    get_customer.pickup_vehicle(rental.id)
+    pickup_date = rental.pickup_date
+    assert aggregates.total("rented_days", date.min, date.max) == 3
+
+    rental.return_date = rental.return_date + timedelta(days=4)
+    assert aggregates.total("rented_days", date.min, date.max) == 7
+    assert list(aggregates.daily("rented_days", pickup_date, rental.return_date)) == [
+        1
+    ] * 7 + [0]
+
+    rebuilt = RentalAggregates()
+    rebuilt.rebuild([rental])
+    start, end = date.today(), date.today() + timedelta(days=30)
+    for metric in METRIC_DTYPES:
+        assert np.array_equal(
+            aggregates.daily(metric, start, end), rebuilt.daily(metric, start, end)
+        )
+
+
+def test_reopened_cancellation_is_removed(get_rentals, get_customer):
+    """Tests that reopening a cancelled reservation removes its cancellation."""
+    _, cancelled = get_rentals
+    aggregates = RentalAggregates()
+    aggregates.track(cancelled)
+    get_customer.cancel_reservation(cancelled.id)
+    assert aggregates.total("cancellations", date.min, date.max) == 1
+
+    assert cancelled.compare_and_set_status(
+        ReservationStatus.CANCELLED, ReservationStatus.PENDING
+    )
+    assert aggregates.total("cancellations", date.min, date.max) == 0
+
+    rebuilt = RentalAggregates()
+    rebuilt.rebuild([cancelled])
+    for metric in METRIC_DTYPES:
+        assert aggregates.total(metric, date.min, date.max) == rebuilt.total(
+            metric, date.min, date.max
+        )
@@ -0,0 +1,181 @@
+"""
+Test repricing job module
+
+This module contains unit tests for the bulk repricing of open reservations after rates changed.
+Here is a list of the available tests:
+    1. New totals and quotes equal those of the pricing strategies, in the calling process and in
+       a pool.
+    2. A dry run reports the differences and changes no reservation, only rule targets are affected.
+    3. Closed, paid and concurrently changed reservations are skipped or reported as conflicts.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from src.enums import InvoiceStatus, ReservationStatus, VehicleStatus
+from src.pricing_strategy.rate_calendar import RateRule
+from src.reservation.repricing_job import RepricingJob
+from tests.conftest import strategy_quote, strategy_total
+
+
+@pytest.fixture
+def reservations(
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_suv_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_premium_insurance_tier,
+    get_gps_addon,
+    get_child_seat_addon,
+    get_pickup_and_return_dates,
+):
+    """Returns six reservations with different vehicles, insurance, add-ons and dates"""
+    pickup_date, return_date = get_pickup_and_return_dates
+    created = []
+    for index in range(6):
+        vehicle = [get_compact_vehicle, get_economy_vehicle, get_suv_vehicle][index % 3]
+        # Every vehicle is rented twice in different windows
+        vehicle.status = VehicleStatus.AVAILABLE
+        created.append(
+            get_customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=(
+                    get_basic_insurance_tier
+                    if index % 3
+                    else get_premium_insurance_tier
+                ),
+                pickup_branch=get_main_branch,
+                return_branch=get_main_branch,
+                pickup_date=pickup_date + timedelta(days=index),
+                return_date=return_date + timedelta(days=2 * index),
+                add_ons=[get_gps_addon, get_child_seat_addon][: index % 3],
+            )
+        )
+    return created
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_totals_match_pricing_strategies(
+    get_rate_calendar, reservations, get_main_branch, get_economy_vehicle, workers
+):
+    """Tests repriced totals and quotes against the pricing strategies."""
+    pickup_date = reservations[0].pickup_date
+    old_totals = [reservation.total_price_cents for reservation in reservations]
+    get_rate_calendar.set_multiplier(
+        get_main_branch, pickup_date, pickup_date + timedelta(days=6), 1.25
+    )
+    get_rate_calendar.set_override(
+        get_economy_vehicle,
+        pickup_date + timedelta(days=2),
+        pickup_date + timedelta(days=4),
+        99.99,
+    )
+    # One window is priced from the calendar, the vehicle cost of the others is equal
+    assert get_rate_calendar.window_costs(
+        [get_economy_vehicle.price_per_day_cents],
+        [pickup_date.toordinal()],
+        [pickup_date.toordinal() + 5],
+        get_main_branch.id,
+        get_economy_vehicle.vehicle_class.id,
+        get_economy_vehicle.id,
+    ).tolist() == [
+        get_rate_calendar.vehicle_cost(
+            get_economy_vehicle, pickup_date, pickup_date + timedelta(days=5)
+        )
+    ]
+
+    report = RepricingJob(workers=workers, chunk_size=2).run(reservations)
+
+    expected = [strategy_total(reservation) for reservation in reservations]
+    assert [reservation.total_price_cents for reservation in reservations] == expected
+    assert [reservation.invoice.total_price_cents for reservation in reservations] == (
+        expected
+    )
+    quotes = [strategy_quote(reservation) for reservation in reservations]
+    assert [reservation.invoice.price_quote for reservation in reservations] == quotes
+    assert report.applied == len(report.diffs) == 6 and report.unchanged == 0
+    assert [(diff.old_total_cents, diff.new_total_cents) for diff in report.diffs] == (
+        list(zip(old_totals, expected))
+    )
+
+
+def test_dry_run_reports_affected_reservations(
+    get_rate_calendar, reservations, get_economy_vehicle
+):
+    """Tests that a dry run reports the affected reservations and changes none."""
+    old_totals = [reservation.total_price_cents for reservation in reservations]
+    versions = [reservation.version for reservation in reservations]
+    pickup_date = reservations[0].pickup_date
+    rule_days = (pickup_date + timedelta(days=6), pickup_date + timedelta(days=30))
+    get_rate_calendar.set_multiplier(get_economy_vehicle, *rule_days, 2.0)
+
+    report = RepricingJob(workers=0).run(
+        reservations,
+        rules=[RateRule(get_economy_vehicle, *rule_days, multiplier=2.0)],
+        dry_run=True,
+    )
+
+    # Only rentals of the economy vehicle overlapping the rule days are affected
+    affected = [
+        reservation
+        for reservation in reservations
+        if reservation.vehicle is get_economy_vehicle
+        and reservation.return_date > rule_days[0]
+    ]
+    assert len(affected) == 1
+    assert [diff.reservation_id for diff in report.diffs] == [
+        reservation.id for reservation in affected
+    ]
+    assert report.skipped == len(reservations) - len(affected)
+    assert report.dry_run and report.applied == 0
+    assert "dry run" in report.summary()
+    assert [reservation.total_price_cents for reservation in reservations] == old_totals
+    assert [reservation.version for reservation in reservations] == versions
+
+
+def test_closed_paid_and_changed_reservations(
+    get_rate_calendar, reservations, get_main_branch, get_active_agent
+):
+    """Tests skipped closed and paid reservations and conflicts of changed ones."""
+    cancelled, paid, changed = reservations[:3]
+    cancelled.compare_and_set_status(
+        ReservationStatus.PENDING, ReservationStatus.CANCELLED
+    )
+    paid.invoice.payment_completed()
+    assert paid.invoice.status == InvoiceStatus.COMPLETED.value
+    get_rate_calendar.set_multiplier(
+        get_main_branch,
+        reservations[0].pickup_date,
+        reservations[0].pickup_date + timedelta(days=30),
+        0.5,
+    )
+
+    # The reservation changes after it was selected
+    def change_during_run():
+        for reservation in reservations:
+            yield reservation
+            if reservation is changed:
+                changed.compare_and_set_status(
+                    ReservationStatus.PENDING, ReservationStatus.APPROVED
+                )
+
+    old_total = changed.total_price_cents
+    report = RepricingJob(workers=0).run(change_during_run())
+
+    assert report.skipped == 2 and report.conflicts == [changed.id]
+    assert report.applied == len(reservations) - 3
+    assert changed.total_price_cents == old_total
+    assert cancelled.total_price_cents == cancelled.invoice.total_price_cents
+    assert paid.invoice.total_price_cents == paid.total_price_cents
+
+    # Reservations changed by others keep their total until the next run
+    assert RepricingJob(workers=0).run([changed]).applied == 1
+    assert changed.total_price_cents == strategy_total(changed)
+    with pytest.raises(ValueError):
+        paid.invoice.reprice(paid.price_quote)
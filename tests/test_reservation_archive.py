@@ -0,0 +1,192 @@
+"""
+Test reservation archive module
+
+This module contains unit tests for the archive tier of closed reservations.
+Here is a list of the available tests:
+    1. Only closed reservations out of the hot window are archived, they are still counted.
+    2. Archived reservations are read lazily by customer and pickup date, also after reopening.
+    3. Open reservations, unknown references and invalid segments are rejected.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.custom_errors import UnresolvedReferenceError
+from src.enums import ReservationStatus, VehicleStatus
+from src.pricing_strategy.concrete_strategies import LoyaltyStrategy
+from src.serialization.reservation_archive import (
+    ReservationArchive,
+    get_reservation_archive,
+    set_reservation_archive,
+)
+
+
+@pytest.fixture
+def known(
+    get_main_branch, get_economy_vehicle, get_basic_insurance_tier, get_gps_addon
+):
+    """Returns the objects archived reservations reference by id"""
+    return {
+        obj.id: obj
+        for obj in (
+            get_main_branch,
+            get_economy_vehicle,
+            get_basic_insurance_tier,
+            get_gps_addon,
+        )
+    }
+
+
+@pytest.fixture
+def archive(tmp_path, known):
+    """Installs an archive in a temporary directory, restores the previous one after"""
+    previous = get_reservation_archive()
+    reservation_archive = ReservationArchive(tmp_path / "archive", known, hot_days=30)
+    set_reservation_archive(reservation_archive)
+    yield reservation_archive
+    set_reservation_archive(previous)
+    reservation_archive.close()
+
+
+@pytest.fixture
+def history(
+    get_customer,
+    get_economy_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_gps_addon,
+):
+    """Returns reservations picked up 1, 400, 800 and 900 days from today, the last one is open"""
+    reservations = []
+    for days, status in (
+        (1, ReservationStatus.COMPLETED),
+        (400, ReservationStatus.CANCELLED),
+        (800, ReservationStatus.COMPLETED),
+        (900, None),
+    ):
+        pickup_date = date.today() + timedelta(days=days)
+        get_economy_vehicle.status = VehicleStatus.AVAILABLE
+        reservation = get_customer.create_reservation(
+            vehicle=get_economy_vehicle,
+            insurance_tier=get_basic_insurance_tier,
+            pickup_branch=get_main_branch,
+            return_branch=get_main_branch,
+            pickup_date=pickup_date,
+            return_date=pickup_date + timedelta(days=2),
+            add_ons=[get_gps_addon],
+        )
+        if status is not None:
+            reservation.status = status
+        reservations.append(reservation)
+    return reservations
+
+
+def _archive_all(archive, customer):
+    """Archives every closed reservation of the history"""
+    return archive.archive([customer], today=date.today() + timedelta(days=1_000))
+
+
+def test_archives_closed_reservations(
+    archive,
+    history,
+    get_customer,
+    get_compact_vehicle,
+    get_main_branch,
+    get_basic_insurance_tier,
+):
+    """Tests that only closed reservations out of the hot window are archived."""
+    # Only the first two reservations returned 30 days before the given day
+    report = archive.archive([get_customer], today=date.today() + timedelta(days=820))
+    assert report.segment == "segment-000000.crfa"
+    assert (report.reservations, report.customers) == (2, 1)
+    assert report.raw_bytes > 0 and report.compressed_bytes > 0
+    assert (archive.directory / report.segment).exists()
+    assert get_customer.reservations == history[2:]
+
+    report = _archive_all(archive, get_customer)
+    assert report.segment == "segment-000001.crfa" and report.reservations == 1
+    assert _archive_all(archive, get_customer).segment is None
+    assert len(archive) == 3 and archive.segment_count == 2
+
+    # Archived reservations are counted, the fifth reservation gets the loyalty discount
+    assert get_customer.reservations == history[3:]
+    assert get_customer.reservation_count == 4
+    information = get_customer.get_information()
+    assert information["reservations"] == history[3:]
+    assert information["reservation_count"] == 4
+    reservation = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=history[0].pickup_date,
+        return_date=history[0].return_date,
+    )
+    assert isinstance(reservation.pricing_strategy.strategy, LoyaltyStrategy)
+
+
+def test_reads_archived_reservations_lazily(
+    archive, known, history, get_customer, get_economy_vehicle, get_gps_addon
+):
+    """Tests lazy reads of archived reservations by customer and pickup date."""
+    _archive_all(archive, get_customer)
+
+    reservations = get_customer.get_reservations()
+    assert [reservation.id for reservation in reservations] == [
+        reservation.id for reservation in history
+    ]
+    assert reservations[3] is history[3]
+    first = reservations[0]
+    assert first is not history[0] and first.status == "completed"
+    assert first.creator is get_customer and first.vehicle is get_economy_vehicle
+    assert list(first.add_ons) == [get_gps_addon]
+    assert first.invoice.reservation is first
+    assert first.total_price_cents == history[0].total_price_cents
+    # Decoded blocks are cached
+    assert get_customer.get_reservations()[0] is first
+
+    # Only the blocks of the requested pickup dates are read
+    start_date = date.today() + timedelta(days=300)
+    end_date = date.today() + timedelta(days=850)
+    assert [
+        reservation.id
+        for reservation in get_customer.get_reservations(start_date, end_date)
+    ] == [history[1].id, history[2].id]
+
+    # Segments are opened again from the directory
+    reopened = ReservationArchive(archive.directory, known)
+    assert len(reopened) == 3 and reopened.count(get_customer.id) == 3
+    assert [
+        reservation.id for reservation in reopened.reservations_of(get_customer)
+    ] == [reservation.id for reservation in history[:3]]
+    reopened.close()
+
+
+def test_rejects_invalid_input(archive, history, get_customer, tmp_path):
+    """Tests the rejection of open reservations, unknown references and bad segments."""
+    with pytest.raises(ValueError):
+        get_customer.detach_reservations([history[3]])
+    _archive_all(archive, get_customer)
+    with pytest.raises(ValueError):
+        get_customer.detach_reservations([history[0]])
+
+    # Objects which are not known cannot be linked
+    with ReservationArchive(archive.directory) as unlinked:
+        with pytest.raises(UnresolvedReferenceError):
+            unlinked.reservations_of(get_customer)
+
+    invalid = tmp_path / "invalid"
+    invalid.mkdir()
+    (invalid / "segment-000000.crfa").write_bytes(b"not a segment" * 4)
+    with pytest.raises(ValueError):
+        ReservationArchive(invalid)
+    with pytest.raises(ValueError):
+        ReservationArchive(tmp_path / "other", hot_days=-1)
+    with pytest.raises(TypeError):
+        ReservationArchive(tmp_path / "other", cache_size="1")
+    with pytest.raises(TypeError):
+        set_reservation_archive("archive")
@@ -0,0 +1,252 @@
+"""
+Test sharded runtime module
+
+This module contains unit tests for the branch-sharded multi-process runtime.
+Here is a list of the available tests:
+    1. Branches are spread over shards by load.
+    2. Reservations are routed to the shard of their pickup branch, conflicting ones fail.
+    3. One-way rental to a branch of another shard hands the vehicle off to that shard.
+    4. Discounts count the reservations of a customer on every shard.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date
+
+import pytest
+
+from src.branch.branch import Branch
+from src.users.agent import Agent
+from src.enums import Gender, EmploymentType, VehicleStatus
+from src.vehicle.vehicle import Vehicle
+from src.sharding.shard_router import ShardRouter
+from src.sharding.sharded_runtime import ShardedRuntime
+from src.sharding.messages import ReservationRequest
+from src.custom_errors import VehicleNotAvailableError
+from src.pricing_strategy.concrete_strategies import DailyStrategy, FirstOrderStrategy
+
+
+@pytest.fixture
+def get_airport_branch() -> Branch:
+    """Returns a second branch with one active agent"""
+    branch = Branch(
+        name="Airport branch",
+        city="Istanbul",
+        address="Istanbul Airport",
+        phone_number="+905343940797",
+    )
+    Agent(
+        first_name="Deniz",
+        last_name="Kaya",
+        gender=Gender.FEMALE,
+        birth_date=date(1992, 1, 1),
+        email="deniz.kaya@business.com",
+        address="Arnavutköy",
+        phone_number="905343940797",
+        branch=branch,
+        is_active=True,
+        salary=20_000,
+        hire_date=date(2018, 1, 1),
+        employment_type=EmploymentType.FULL_TIME,
+    )
+    return branch
+
+
+@pytest.fixture
+def get_runtime(
+    get_main_branch,
+    get_active_agent,
+    get_airport_branch,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_customer,
+    get_basic_insurance_tier,
+):
+    """Returns a started runtime with the main and airport branch on different shards"""
+    runtime = ShardedRuntime(shard_count=2)
+    runtime.add_branch(get_main_branch, [get_economy_vehicle, get_compact_vehicle])
+    runtime.add_branch(get_airport_branch, [])
+    runtime.add_customers([get_customer])
+    runtime.add_catalog(insurance_tiers=[get_basic_insurance_tier])
+
+    with runtime:
+        yield runtime
+
+
+def _request(customer, vehicle, insurance_tier, pickup_branch, return_branch, dates):
+    pickup_date, return_date = dates
+    return ReservationRequest(
+        customer_id=customer.id,
+        vehicle_id=vehicle.id,
+        insurance_tier_id=insurance_tier.id,
+        pickup_branch_id=pickup_branch.id,
+        return_branch_id=return_branch.id,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+
+
+def test_router_assigns_least_loaded_shard():
+    """Tests that branches are assigned to the least loaded shard."""
+    router = ShardRouter(shard_count=2)
+
+    assert router.assign_branch("big", weight=10) == 0
+    assert router.assign_branch("small", weight=3) == 1
+    assert router.assign_branch("medium", weight=5) == 1
+    assert router.shard_for("medium") == 1
+    assert router.branches_of(1) == ["small", "medium"]
+
+    with pytest.raises(ValueError):
+        router.assign_branch("big")
+    with pytest.raises(KeyError):
+        router.shard_for("unknown")
+
+
+def test_reservations_routed_by_pickup_branch(
+    get_runtime,
+    get_main_branch,
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests routing by pickup branch and a conflicting reservation in one batch."""
+    main_shard = get_runtime.router.shard_for(get_main_branch.id)
+    requests = [
+        _request(
+            get_customer,
+            vehicle,
+            get_basic_insurance_tier,
+            get_main_branch,
+            get_main_branch,
+            get_pickup_and_return_dates,
+        )
+        for vehicle in (get_economy_vehicle, get_compact_vehicle, get_economy_vehicle)
+    ]
+
+    results = get_runtime.create_reservations(requests)
+
+    assert [ok for ok, _ in results] == [True, True, False]
+    assert all(receipt.shard == main_shard for _, receipt in results[:2])
+    assert isinstance(results[2][1], VehicleNotAvailableError)
+
+    # Objects of the parent process are not touched
+    assert get_economy_vehicle.status == VehicleStatus.AVAILABLE.value
+    assert get_runtime.shard_stats()[main_shard]["reservations"] == 2
+
+
+def test_one_way_rental_hands_vehicle_off(
+    get_runtime,
+    get_main_branch,
+    get_airport_branch,
+    get_customer,
+    get_economy_vehicle,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests the vehicle handoff of a one-way rental to another shard."""
+    main_shard = get_runtime.router.shard_for(get_main_branch.id)
+    airport_shard = get_runtime.router.shard_for(get_airport_branch.id)
+    assert main_shard != airport_shard
+
+    receipt = get_runtime.create_reservation(
+        _request(
+            get_customer,
+            get_economy_vehicle,
+            get_basic_insurance_tier,
+            get_main_branch,
+            get_airport_branch,
+            get_pickup_and_return_dates,
+        )
+    )
+    get_runtime.approve_reservation(receipt.reservation_id)
+    get_runtime.pay_reservation(
+        receipt.reservation_id, "1234 1234 1234 1234", "123", "12/30"
+    )
+    get_runtime.pickup_vehicle(receipt.reservation_id)
+    result = get_runtime.return_vehicle(receipt.reservation_id)
+
+    assert result.handoff is not None
+    assert result.handoff.vehicle_id == get_economy_vehicle.id
+    stats = get_runtime.shard_stats()
+    assert stats[main_shard]["vehicles"] == 1
+    assert stats[airport_shard]["vehicles"] == 1
+
+    # The vehicle can now be reserved at the airport branch
+    new_receipt = get_runtime.create_reservation(
+        _request(
+            get_customer,
+            get_economy_vehicle,
+            get_basic_insurance_tier,
+            get_airport_branch,
+            get_airport_branch,
+            get_pickup_and_return_dates,
+        )
+    )
+    assert new_receipt.shard == airport_shard
+
+
+def test_discounts_count_reservations_on_all_shards(
+    get_main_branch,
+    get_active_agent,
+    get_airport_branch,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_suv_vehicle,
+    get_customer,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that discounts count the reservations of a customer on every shard."""
+    get_suv_vehicle.current_branch = get_airport_branch
+    runtime = ShardedRuntime(shard_count=2)
+    runtime.add_branch(get_main_branch, [get_economy_vehicle, get_compact_vehicle])
+    runtime.add_branch(get_airport_branch, [get_suv_vehicle])
+    runtime.add_customers([get_customer])
+    runtime.add_catalog(insurance_tiers=[get_basic_insurance_tier])
+    pickup_date, return_date = get_pickup_and_return_dates
+    requests = [
+        _request(
+            get_customer,
+            vehicle,
+            get_basic_insurance_tier,
+            branch,
+            branch,
+            get_pickup_and_return_dates,
+        )
+        for vehicle, branch in (
+            (get_economy_vehicle, get_main_branch),
+            (get_suv_vehicle, get_airport_branch),
+            (get_compact_vehicle, get_main_branch),
+        )
+    ]
+
+    with runtime:
+        # Requests of one customer in one batch are priced in order, also across shards
+        first, second = runtime.create_reservations(requests[:2])
+        third = runtime.create_reservation(requests[2])
+
+    assert first[0] and second[0] and first[1].shard != second[1].shard
+    assert first[1].total_price_cents == FirstOrderStrategy().calculate_cents(
+        get_economy_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+        pickup_branch=get_main_branch,
+    )
+    assert second[1].total_price_cents == DailyStrategy().calculate_cents(
+        get_suv_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+        pickup_branch=get_airport_branch,
+    )
+    assert third.total_price_cents == DailyStrategy().calculate_cents(
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+        pickup_branch=get_main_branch,
+    )
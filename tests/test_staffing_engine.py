@@ -0,0 +1,89 @@
+"""
+Test staffing engine module
+
+This module contains unit tests for the schedule bitmaps and the on-duty staffing engine.
+Here is a list of the available tests:
+    1. Work schedules are compiled into 15-minute slots and hours per week follow the schedule.
+    2. Employees on duty are found by moment, branch and role, inactive employees are never on duty.
+    3. Coverage gaps inside opening hours are reported for the requested days.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from src.enums import EmploymentType
+from src.staffing.staffing_engine import (
+    SLOTS_PER_WEEK,
+    StaffingEngine,
+    compile_schedule,
+    pack_slots,
+    unpack_slots,
+)
+
+MONDAY = date(2026, 10, 19)
+
+
+def test_compile_schedule(get_main_branch, get_active_agent, get_active_manager):
+    """Tests compiling work schedules into 15-minute slots and hours per week."""
+    slots = compile_schedule({"monday": "09:00-17:00", "sunday": "22:30-24:00"})
+    assert slots.sum() == 32 + 6
+    assert slots[36] and not slots[35] and slots[-1]
+    assert np.array_equal(unpack_slots(pack_slots(slots)), slots)
+    with pytest.raises(ValueError):
+        compile_schedule({"monday": "17:00-09:00"})
+    with pytest.raises(ValueError):
+        compile_schedule({"monday": "all day"})
+
+    get_active_manager.employment_type = EmploymentType.PART_TIME
+    assert get_active_manager.get_work_schedule()["hours_per_week"] == "20"
+
+    engine = StaffingEngine([get_main_branch])
+    hours = engine.hours_per_week(get_main_branch.id)
+    assert hours == {get_active_agent.id: 40.0, get_active_manager.id: 17.0}
+    assert engine.bitmaps.shape == (2, 11) and not engine.bitmaps.flags.writeable
+
+
+def test_on_shift(get_main_branch, get_active_agent, get_active_manager):
+    """Tests the employees on duty by moment, branch and role."""
+    engine = StaffingEngine([get_main_branch])
+    monday_morning = datetime(2026, 10, 19, 9, 0)
+    assert engine.on_shift(monday_morning) == [get_active_agent, get_active_manager]
+    assert engine.on_shift(monday_morning, get_main_branch.id, "agent") == [
+        get_active_agent
+    ]
+    assert engine.on_shift(datetime(2026, 10, 19, 17, 0)) == []
+    assert engine.on_shift(datetime(2026, 10, 25, 10, 0)) == []
+    with pytest.raises(ValueError):
+        engine.on_shift(monday_morning, branch_id="unknown")
+
+    get_active_agent.is_active = False
+    engine.refresh()
+    assert engine.on_shift(monday_morning) == [get_active_manager]
+    assert engine.hours_per_week()[get_active_agent.id] == 0
+
+
+def test_coverage_gaps(get_main_branch, get_active_agent, get_active_manager):
+    """Tests the coverage gaps inside opening hours of the requested days."""
+    engine = StaffingEngine([get_main_branch])
+    branch_ids, coverage = engine.coverage_matrix(role="agent")
+    assert branch_ids == [get_main_branch.id]
+    assert coverage.shape == (1, SLOTS_PER_WEEK) and coverage.sum() == 5 * 32
+
+    gaps = engine.coverage_gaps(get_main_branch.id, MONDAY, days=7, role="agent")
+    assert gaps[0] == (datetime(2026, 10, 19, 17, 0), datetime(2026, 10, 19, 18, 0))
+    assert gaps[-1] == (datetime(2026, 10, 24, 10, 0), datetime(2026, 10, 24, 15, 0))
+    assert len(gaps) == 6
+
+    # Starting on Saturday, the weekly pattern wraps into the next week
+    gaps = engine.coverage_gaps(
+        get_main_branch.id, date(2026, 10, 24), days=3, required=2
+    )
+    assert gaps == [
+        (datetime(2026, 10, 24, 10, 0), datetime(2026, 10, 24, 15, 0)),
+        (datetime(2026, 10, 26, 17, 0), datetime(2026, 10, 26, 18, 0)),
+    ]
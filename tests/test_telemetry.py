@@ -0,0 +1,153 @@
+"""
+Test telemetry module
+
+This module contains unit tests for the batched ingestion of vehicle telemetry.
+Here is a list of the available tests:
+    1. The ring buffer returns readings oldest first and overwrites the oldest ones when full.
+    2. A flush rejects anomalies and applies the latest valid reading of every vehicle.
+    3. Vehicles due for service get one maintenance request, also from the background flush.
+    4. Readings after rejected jumps and rollbacks are compared to the last accepted reading.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import numpy as np
+import pytest
+
+from src.enums import TelemetryAnomalyType
+from src.vehicle.telemetry import TELEMETRY_DTYPE, TelemetryBuffer, TelemetryIngestor
+
+
+def test_ring_buffer():
+    """Tests reading order and overwriting of the ring buffer."""
+    buffer = TelemetryBuffer(4)
+    buffer.push(0, 100.0, 0.5, 1.0)
+    records = np.zeros(2, dtype=TELEMETRY_DTYPE)
+    records["vehicle"] = [1, 2]
+    records["timestamp"] = [2.0, 3.0]
+    buffer.push_many(records)
+    assert len(buffer) == 3 and buffer.dropped == 0
+    assert buffer.drain()["vehicle"].tolist() == [0, 1, 2]
+    assert len(buffer) == 0 and len(buffer.drain()) == 0
+
+    # Pushes wrap around, the oldest readings are dropped when the buffer is full
+    records = np.zeros(6, dtype=TELEMETRY_DTYPE)
+    records["vehicle"] = np.arange(6)
+    buffer.push_many(records[:3])
+    buffer.push(3, 0.0, 0.0, 0.0)
+    buffer.push_many(records[4:])
+    assert len(buffer) == 4 and buffer.dropped == 2
+    assert buffer.drain()["vehicle"].tolist() == [2, 3, 4, 5]
+    buffer.push_many(records)
+    assert buffer.dropped == 2 and buffer.drain()["vehicle"].tolist() == [2, 3, 4, 5]
+
+    with pytest.raises(ValueError):
+        TelemetryBuffer(0)
+
+
+def test_flush_validates_and_coalesces(
+    get_economy_vehicle, get_compact_vehicle, get_active_agent
+):
+    """Tests that a flush rejects anomalies and applies the latest valid readings."""
+    economy, compact = get_economy_vehicle, get_compact_vehicle
+    ingestor = TelemetryIngestor([economy, compact], get_active_agent)
+    changes = []
+    economy.add_change_listener(lambda vehicle, field_name: changes.append(field_name))
+
+    ingestor.push_many(
+        [economy.id] * 5 + [compact.id] * 3 + ["unknown"],
+        [12_600, 12_650, 90_000, 12_700, 12_690, 21_000, 22_100, float("nan"), 1],
+        [0.7, 0.6, 0.6, 0.5, 0.5, 0.6, -0.1, 0.5, 0.5],
+        [1, 2, 3, 4, 5, 1, 2, 3, 1],
+    )
+    # Readings are ordered by their timestamps, not by their arrival
+    ingestor.push(compact.id, 22_050, 0.65, timestamp=1.5)
+    report = ingestor.flush()
+
+    assert report.received == 10 and report.accepted == 4 and report.applied == 2
+    assert [(anomaly.vehicle_id, anomaly.kind) for anomaly in report.anomalies] == [
+        (None, TelemetryAnomalyType.UNKNOWN_VEHICLE.value),
+        (economy.id, TelemetryAnomalyType.ODOMETER_JUMP.value),
+        (economy.id, TelemetryAnomalyType.ODOMETER_ROLLBACK.value),
+        (compact.id, TelemetryAnomalyType.ODOMETER_ROLLBACK.value),
+        (compact.id, TelemetryAnomalyType.NEGATIVE_FUEL.value),
+        (compact.id, TelemetryAnomalyType.INVALID_READING.value),
+    ]
+    assert (economy.odometer, economy.fuel_level) == (12_700, 0.5)
+    assert (compact.odometer, compact.fuel_level) == (22_050, 0.65)
+    assert changes == ["odometer", "fuel_level"]
+    assert report.maintenance_requests == []
+
+    # Later batches are compared to the applied readings and to direct changes
+    compact.odometer = 25_000
+    ingestor.push(compact.id, 24_000, 0.6)
+    ingestor.push(economy.id, 12_700, 0.4)
+    report = ingestor.flush()
+    assert [anomaly.kind for anomaly in report.anomalies] == [
+        TelemetryAnomalyType.ODOMETER_ROLLBACK.value
+    ]
+    assert economy.fuel_level == 0.4 and changes[-1] == "fuel_level"
+
+
+def test_service_threshold_requests_maintenance(
+    get_economy_vehicle, get_compact_vehicle, get_active_agent
+):
+    """Tests a single maintenance request for vehicles due for service."""
+    economy, compact = get_economy_vehicle, get_compact_vehicle
+    ingestor = TelemetryIngestor(
+        [economy, compact], get_active_agent, service_interval=5_000, max_distance=5_000
+    )
+
+    # 10,000 km after the last service the economy vehicle is due
+    ingestor.push(economy.id, 14_000, 0.5, timestamp=1)
+    ingestor.push(economy.id, 15_000, 0.5, timestamp=2)
+    ingestor.push(compact.id, 24_000, 0.5, timestamp=1)
+    report = ingestor.flush()
+    assert report.maintenance_requests == [economy.id]
+    assert len(economy.maintenance_records) == 1
+    assert economy.maintenance_records[0].odometer == 15_000
+    assert compact.maintenance_records == []
+
+    # Only one request until the vehicle is serviced
+    ingestor.push(economy.id, 16_000, 0.5)
+    assert ingestor.flush().maintenance_requests == []
+    economy.last_service_odometer = 16_000
+
+    with ingestor.start(interval=0.01):
+        ingestor.push(economy.id, 21_000, 0.5)
+        ingestor.push(compact.id, 25_000, 0.5)
+    assert len(ingestor.buffer) == 0
+    assert len(economy.maintenance_records) == 2
+    assert len(compact.maintenance_records) == 1
+
+
+def test_readings_after_anomalies(get_economy_vehicle, get_active_agent):
+    """Tests readings after rejected jumps and rollbacks."""
+    vehicle = get_economy_vehicle
+    base = vehicle.odometer
+    ingestor = TelemetryIngestor([vehicle], get_active_agent, capacity=10_000)
+    jump = TelemetryAnomalyType.ODOMETER_JUMP.value
+    rollback = TelemetryAnomalyType.ODOMETER_ROLLBACK.value
+    # A reading below a rejected jump is still a jump from the last accepted reading
+    block = [100, 5_000, 50, 150, 9_000, 8_999, 200]
+    expected = [None, jump, rollback, None, jump, jump, None]
+    blocks = 1_000
+    odometers = [
+        base + 200 * index + distance for index in range(blocks) for distance in block
+    ]
+
+    ingestor.push_many(
+        [vehicle.id] * len(odometers),
+        odometers,
+        [0.5] * len(odometers),
+        np.arange(len(odometers), dtype=np.float64),
+    )
+    report = ingestor.flush()
+
+    kinds = [None] * len(odometers)
+    for anomaly in report.anomalies:
+        kinds[int(anomaly.timestamp)] = anomaly.kind
+    assert kinds == expected * blocks
+    assert report.accepted == 3 * blocks
+    assert vehicle.odometer == odometers[-1]
@@ -0,0 +1,206 @@
+"""
+Test vehicle recommender module
+
+This module contains unit tests for the top-k vehicle recommendation with lower-bound pruning.
+Here is a list of the available tests:
+    1. The cheapest vehicles match price-all-then-sort and expensive vehicles are not quoted.
+    2. Seasonal discounts and overrides keep the lower bound below every vehicle cost.
+    3. The best scored vehicles match a brute force weighted score and invalid input is rejected.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from src.enums import VehicleStatus
+from src.vehicle.vehicle import Vehicle
+from src.vehicle.vehicle_class import VehicleClass
+from src.pricing_strategy.pricing_strategy import PricingStrategy
+from src.pricing_strategy.vehicle_recommender import ScoreWeights, VehicleRecommender
+
+
+def _fleet(branch, size=60, seed=7):
+    generator = random.Random(seed)
+    vehicle_classes = [
+        VehicleClass("Economy", "Small cars", 30.0, ["AC"]),
+        VehicleClass("Compact", "Mid-size cars", 45.0, ["AC", "GPS"]),
+        VehicleClass("SUV", "Large cars", 80.0, ["AC", "GPS", "4x4"]),
+    ]
+    vehicles = []
+    for index in range(size):
+        vehicle_class = generator.choice(vehicle_classes)
+        vehicles.append(
+            Vehicle(
+                vehicle_class=vehicle_class,
+                current_branch=branch,
+                status=VehicleStatus.AVAILABLE,
+                brand="Brand",
+                model="Model",
+                color="White",
+                licence_plate=f"RCM-{index:03d}",
+                fuel_level=generator.choice([0.25, 0.5, 0.75, 1.0]),
+                last_service_odometer=0,
+                odometer=1_000,
+                # Some equal prices, so ties are ranked too
+                price_per_day=vehicle_class.base_daily_rate + generator.randint(0, 30),
+            )
+        )
+    return vehicles
+
+
+def _price_all_then_sort(
+    calendar, customer, vehicles, insurance_tier, pickup_date, return_date
+):
+    pricing = PricingStrategy(customer)
+    quotes = [
+        (
+            pricing.calculate_price_cents(vehicle, insurance_tier, pickup_date, return_date),
+            calendar.vehicle_cost(vehicle, pickup_date, return_date),
+            position,
+            vehicle,
+        )
+        for position, vehicle in enumerate(vehicles)
+    ]
+    return sorted(quotes, key=lambda quote: quote[:3])
+
+
+def test_cheapest_matches_price_all_then_sort(
+    get_rate_calendar,
+    get_customer,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests the cheapest vehicles against pricing all of them and sorting."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    vehicles = _fleet(get_main_branch)
+    recommender = VehicleRecommender(
+        get_customer, get_basic_insurance_tier, pickup_date, return_date
+    )
+    expected = _price_all_then_sort(
+        get_rate_calendar,
+        get_customer,
+        vehicles,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+    )
+
+    for k in (1, 5, len(vehicles) + 3):
+        recommendations = recommender.cheapest(vehicles, k)
+        assert [r.vehicle for r in recommendations] == [q[3] for q in expected[:k]]
+        assert [r.total_price_cents for r in recommendations] == [
+            q[0] for q in expected[:k]
+        ]
+    # Only vehicles whose price_per_day can beat the 5th best were quoted
+    before = recommender.quotes
+    recommender.cheapest(vehicles, 5)
+    fifth_price = expected[4][3].price_per_day_cents
+    assert recommender.quotes - before == sum(
+        vehicle.price_per_day_cents <= fifth_price for vehicle in vehicles
+    )
+    assert recommender.quotes - before < len(vehicles) // 2
+    assert recommender.cheapest([], 3) == []
+
+
+def test_seasonal_rates_keep_the_bound_valid(
+    get_rate_calendar,
+    get_customer,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests that seasonal discounts and overrides keep the lower bound valid."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    vehicles = _fleet(get_main_branch, seed=11)
+    expensive = max(vehicles, key=lambda vehicle: vehicle.price_per_day_cents)
+    suv_class = next(v.vehicle_class for v in vehicles if v.vehicle_class.name == "SUV")
+    # The most expensive vehicle is nearly free on one day, SUVs are half price
+    get_rate_calendar.set_override(
+        expensive, pickup_date, pickup_date + timedelta(days=1), 1.0
+    )
+    get_rate_calendar.set_multiplier(suv_class, pickup_date, return_date, 0.5)
+    get_rate_calendar.set_multiplier(get_main_branch, pickup_date, return_date, 0.9)
+
+    assert get_rate_calendar.lowest_rates(pickup_date, return_date) == (4500, 100)
+    for vehicle in vehicles:
+        assert get_rate_calendar.lowest_cost(
+            vehicle.price_per_day_cents, pickup_date, return_date
+        ) <= get_rate_calendar.vehicle_cost(vehicle, pickup_date, return_date)
+
+    recommender = VehicleRecommender(
+        get_customer, get_basic_insurance_tier, pickup_date, return_date
+    )
+    expected = _price_all_then_sort(
+        get_rate_calendar,
+        get_customer,
+        vehicles,
+        get_basic_insurance_tier,
+        pickup_date,
+        return_date,
+    )
+    recommendations = recommender.cheapest(vehicles, 5)
+    assert [r.vehicle for r in recommendations] == [q[3] for q in expected[:5]]
+
+    # The cached lowest rates follow rule changes
+    get_rate_calendar.clear(suv_class)
+    assert get_rate_calendar.lowest_rates(pickup_date, return_date) == (9000, 100)
+    get_rate_calendar.clear(expensive)
+    assert get_rate_calendar.lowest_rates(pickup_date, return_date) == (9000, None)
+
+
+def test_best_scored_and_validation(
+    get_rate_calendar,
+    get_customer,
+    get_main_branch,
+    get_basic_insurance_tier,
+    get_pickup_and_return_dates,
+):
+    """Tests the best scored vehicles against a brute force score and invalid input."""
+    pickup_date, return_date = get_pickup_and_return_dates
+    vehicles = _fleet(get_main_branch, seed=3)
+    recommender = VehicleRecommender(
+        get_customer, get_basic_insurance_tier, pickup_date, return_date
+    )
+    weights = ScoreWeights(price=1.0, features=0.5, fuel=0.3)
+    wanted = {"GPS", "4x4"}
+
+    days = (return_date - pickup_date).days
+    cheapest = min(vehicle.price_per_day_cents for vehicle in vehicles) * days + 1
+    scores = sorted(
+        (
+            -(
+                weights.price * (cheapest / (vehicle.price_per_day_cents * days + 1))
+                + weights.features
+                * (len(wanted.intersection(vehicle.vehicle_class.features)) / 2)
+                + weights.fuel * vehicle.fuel_level
+            ),
+            position,
+        )
+        for position, vehicle in enumerate(vehicles)
+    )
+    recommendations = recommender.best_scored(vehicles, 4, weights, wanted)
+    assert [r.vehicle for r in recommendations] == [
+        vehicles[position] for _, position in scores[:4]
+    ]
+    assert [r.score for r in recommendations] == pytest.approx(
+        [-score for score, _ in scores[:4]]
+    )
+    assert recommender.quotes < len(vehicles)
+
+    with pytest.raises(ValueError):
+        recommender.cheapest(vehicles, 0)
+    with pytest.raises(TypeError):
+        recommender.cheapest(["vehicle"], 1)
+    with pytest.raises(ValueError):
+        recommender.best_scored(vehicles, 1, ScoreWeights(price=-1.0))
+    with pytest.raises(TypeError):
+        recommender.best_scored(vehicles, 1, (1.0, 0.0, 0.0))
+    with pytest.raises(TypeError):
+        VehicleRecommender(
+            "customer", get_basic_insurance_tier, pickup_date, return_date
+        )
@@ -0,0 +1,256 @@
+"""
+Test waitlist module
+
+This module contains unit tests for the waitlist and its automatic allocation of freed vehicles.
+Here is a list of the available tests:
+    1. A cancelled reservation frees its vehicle for the waiting request with the earliest pickup.
+    2. Returned and re-available vehicles are allocated, joining takes an available vehicle.
+    3. Requests whose add-ons are out of stock keep their place and the next request is served.
+    4. Hundreds of out-of-stock requests ahead of a fitting one do not recurse into allocation.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.enums import Gender, ReservationStatus
+from src.users.customer import Customer
+from src.reservation.waitlist import Waitlist
+from src.custom_errors import WaitlistRequestNotFoundError
+
+
+def _customer(index):
+    return Customer(
+        first_name="Waiting",
+        last_name=f"Customer {index}",
+        gender=Gender.FEMALE,
+        birth_date=date(1990, 1, 1),
+        email=f"waiting{index}@example.com",
+        address="Kadıköy",
+        phone_number="+905343940796",
+    )
+
+
+def _join(waitlist, customer, vehicle, insurance_tier, branch, days, add_ons=None):
+    pickup_date = date.today() + timedelta(days=days)
+    return waitlist.join(
+        customer,
+        vehicle.vehicle_class,
+        insurance_tier,
+        branch,
+        branch,
+        pickup_date,
+        pickup_date + timedelta(days=2),
+        add_ons,
+    )
+
+
+def test_cancellation_allocates_earliest_request(
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that a cancellation serves the waiting request with the earliest pickup."""
+    allocations = []
+    waitlist = Waitlist(
+        on_allocate=lambda request, reservation: allocations.append(request)
+    )
+    waitlist.watch([get_compact_vehicle])
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation, request = waitlist.reserve_or_join(
+        get_customer,
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        get_main_branch,
+        pickup_date,
+        return_date,
+    )
+    assert request is None
+
+    late = _join(
+        waitlist,
+        _customer(1),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        9,
+    )
+    left = _join(
+        waitlist,
+        _customer(2),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        2,
+    )
+    early = _join(
+        waitlist,
+        _customer(3),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        5,
+    )
+    waitlist.leave(left.id)
+    with pytest.raises(WaitlistRequestNotFoundError):
+        waitlist.leave(left.id)
+    assert waitlist.waiting(get_main_branch, get_compact_vehicle.vehicle_class) == [
+        early,
+        late,
+    ]
+
+    get_customer.cancel_reservation(reservation.id)
+    allocated = waitlist.reservation_of(early.id)
+    assert allocations == [early]
+    assert allocated.creator is early.customer
+    assert allocated.vehicle is get_compact_vehicle
+    assert allocated.status == ReservationStatus.PENDING.value
+    assert get_compact_vehicle.status == "reserved"
+    assert waitlist.is_waiting(late.id) and len(waitlist) == 1
+
+
+def test_return_and_make_available_allocate(
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests allocation of returned and re-available vehicles and on joining."""
+    waitlist = Waitlist()
+    waitlist.watch([get_compact_vehicle])
+    pickup_date, return_date = get_pickup_and_return_dates
+
+    # Joining while the vehicle is available reserves it right away
+    first = _join(
+        waitlist,
+        get_customer,
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        1,
+    )
+    reservation = waitlist.reservation_of(first.id)
+    assert reservation is not None and not waitlist.is_waiting(first.id)
+
+    second = _join(
+        waitlist,
+        _customer(1),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        3,
+    )
+    third = _join(
+        waitlist,
+        _customer(2),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        4,
+    )
+    reservation.status = ReservationStatus.PICKED_UP
+    get_customer.return_vehicle(reservation.id)
+    assert waitlist.reservation_of(second.id).vehicle is get_compact_vehicle
+
+    get_compact_vehicle.make_available()
+    assert waitlist.reservation_of(third.id).vehicle is get_compact_vehicle
+    assert waitlist.metrics() == {"waiting": 0, "allocated": 3, "dropped": 0}
+
+
+def test_out_of_stock_add_ons_keep_their_place(
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_main_branch,
+):
+    """Tests that requests with out-of-stock add-ons keep their place."""
+    waitlist = Waitlist()
+    get_compact_vehicle.reserve()
+    waitlist.watch([get_compact_vehicle])
+    get_main_branch.add_on_inventory.set_stock(get_gps_addon.id, 0)
+
+    with_gps = _join(
+        waitlist,
+        get_customer,
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        1,
+        [get_gps_addon],
+    )
+    without = _join(
+        waitlist,
+        _customer(1),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        2,
+    )
+
+    get_compact_vehicle.make_available()
+    assert waitlist.reservation_of(without.id) is not None
+    assert waitlist.is_waiting(with_gps.id)
+    assert get_compact_vehicle.status == "reserved"
+    assert waitlist.waiting(get_main_branch, get_compact_vehicle.vehicle_class) == [
+        with_gps
+    ]
+
+
+def test_many_out_of_stock_requests_do_not_recurse(
+    get_customer,
+    get_compact_vehicle,
+    get_basic_insurance_tier,
+    get_gps_addon,
+    get_main_branch,
+    get_pickup_and_return_dates,
+):
+    """Tests that hundreds of out-of-stock requests do not recurse."""
+    waitlist = Waitlist()
+    waitlist.watch([get_compact_vehicle])
+    pickup_date, return_date = get_pickup_and_return_dates
+    reservation = get_customer.create_reservation(
+        vehicle=get_compact_vehicle,
+        insurance_tier=get_basic_insurance_tier,
+        pickup_branch=get_main_branch,
+        return_branch=get_main_branch,
+        pickup_date=pickup_date,
+        return_date=return_date,
+    )
+    get_main_branch.add_on_inventory.set_stock(get_gps_addon.id, 0)
+
+    # Every failed reservation frees the vehicle again while it is being allocated
+    out_of_stock = [
+        _join(
+            waitlist,
+            _customer(index),
+            get_compact_vehicle,
+            get_basic_insurance_tier,
+            get_main_branch,
+            1,
+            [get_gps_addon],
+        )
+        for index in range(500)
+    ]
+    fitting = _join(
+        waitlist,
+        _customer(500),
+        get_compact_vehicle,
+        get_basic_insurance_tier,
+        get_main_branch,
+        2,
+    )
+
+    get_customer.cancel_reservation(reservation.id)
+    assert reservation.status == ReservationStatus.CANCELLED.value
+    assert waitlist.reservation_of(fitting.id).vehicle is get_compact_vehicle
+    assert get_compact_vehicle.status == "reserved"
+    assert all(waitlist.is_waiting(request.id) for request in out_of_stock)
+    assert len(waitlist) == 500
@@ -0,0 +1,152 @@
+"""
+Test work-queue router module
+
+This module contains unit tests for routing pending reservations to agents.
+Here is a list of the available tests:
+    1. Reservations are assigned by pickup date to the least-loaded active agent.
+    2. Acknowledged assignments are approved, released ones are queued again and stale ones dropped.
+    3. Queue metrics report wait times and only agents on shift get assignments.
+
+Author: Peyman Khodabandehlouei
+Date: 19-10-2026
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.users.agent import Agent
+from src.enums import EmploymentType, Gender, ReservationStatus
+from src.custom_errors import ReservationNotFoundError
+from src.staffing.staffing_engine import StaffingEngine
+from src.staffing.work_queue_router import WorkQueueRouter
+
+
+@pytest.fixture
+def get_second_agent(get_main_branch) -> Agent:
+    """Returns another active agent of the main branch"""
+    return Agent(
+        first_name="Deniz",
+        last_name="Kaya",
+        gender=Gender.FEMALE,
+        birth_date=date(1992, 1, 1),
+        email="deniz.kaya@business.com",
+        address="Kadiköy",
+        phone_number="905343940796",
+        branch=get_main_branch,
+        is_active=True,
+        salary=20_000,
+        hire_date=date(2018, 1, 1),
+        employment_type=EmploymentType.FULL_TIME,
+    )
+
+
+@pytest.fixture
+def get_reservations(
+    get_customer,
+    get_economy_vehicle,
+    get_compact_vehicle,
+    get_suv_vehicle,
+    get_basic_insurance_tier,
+    get_main_branch,
+):
+    """Three reservations whose pickup dates are in the reverse order of creation"""
+    reservations = []
+    for days, vehicle in zip(
+        (3, 2, 1), (get_economy_vehicle, get_compact_vehicle, get_suv_vehicle)
+    ):
+        pickup_date = date.today() + timedelta(days=days)
+        reservations.append(
+            get_customer.create_reservation(
+                vehicle=vehicle,
+                insurance_tier=get_basic_insurance_tier,
+                pickup_branch=get_main_branch,
+                return_branch=get_main_branch,
+                pickup_date=pickup_date,
+                return_date=pickup_date + timedelta(days=2),
+            )
+        )
+    return reservations
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_loaded_assignment(
+    get_main_branch, get_active_agent, get_second_agent, get_reservations
+):
+    """Tests assignment by pickup date to the least-loaded active agent."""
+    router = WorkQueueRouter()
+    assert router.submit_many(get_reservations) == 3
+    assert router.queue_depth() == 3
+    with pytest.raises(ValueError):
+        router.submit(get_reservations[0])
+
+    first, second = router.assign(get_main_branch, limit=2)
+    assert [first.reservation, second.reservation] == get_reservations[:0:-1]
+    assert {first.agent, second.agent} == {get_active_agent, get_second_agent}
+    assert router.queue_depth(get_main_branch.id) == 1
+
+    # The agent without open assignments gets the next reservation
+    router.acknowledge(first.reservation.id)
+    (third,) = router.assign(get_main_branch)
+    assert third.reservation is get_reservations[0] and third.agent is first.agent
+    assert router.assignments_of(second.agent) == [second]
+
+    # Inactive agents get no assignments
+    get_second_agent.is_active = False
+    for assignment in router.assignments_of(get_active_agent) + router.assignments_of(
+        get_second_agent
+    ):
+        router.release(assignment.reservation.id)
+    assert {a.agent for a in router.assign(get_main_branch)} == {get_active_agent}
+
+
+def test_acknowledge_release_and_drop(
+    get_main_branch, get_active_agent, get_customer, get_reservations
+):
+    """Tests acknowledged, released and stale assignments."""
+    router = WorkQueueRouter()
+    router.submit_many(get_reservations)
+    get_customer.cancel_reservation(get_reservations[2].id)
+
+    first, second = router.assign(get_main_branch, limit=2)
+    assert first.reservation is get_reservations[1]
+    assert router.metrics()[get_main_branch.id]["dropped"] == 1
+
+    assert (
+        router.acknowledge(first.reservation.id).status
+        == ReservationStatus.APPROVED.value
+    )
+    router.release(second.reservation.id)
+    assert router.queue_depth() == 1
+    assert router.assign(get_main_branch)[0].reservation is get_reservations[0]
+
+    with pytest.raises(ReservationNotFoundError):
+        router.acknowledge(first.reservation.id)
+    with pytest.raises(ValueError):
+        router.submit(first.reservation)
+
+
+def test_metrics_and_on_shift_agents(
+    get_main_branch, get_active_agent, get_reservations
+):
+    """Tests queue wait time metrics and assignments to agents on shift only."""
+    clock = FakeClock()
+    router = WorkQueueRouter(StaffingEngine([get_main_branch]), clock=clock)
+    router.submit_many(get_reservations)
+
+    assert router.assign(get_main_branch, moment=datetime(2026, 10, 19, 20, 0)) == []
+    clock.now = 2_000_000_000
+    assignments = router.assign(get_main_branch, moment=datetime(2026, 10, 19, 10, 0))
+    assert [a.agent for a in assignments] == [get_active_agent] * 3
+
+    metrics = router.metrics()[get_main_branch.id]
+    assert metrics["queue_depth"] == 0 and metrics["in_flight"] == 3
+    assert metrics["assigned"] == 3 and metrics["agents"] == 1
+    assert metrics["wait_p50_seconds"] == pytest.approx(2.0, rel=1 / 64)